@@ -0,0 +1,57 @@
+"""
+bcrypt cost and executor benchmark for the password hasher.
+
+For each cost factor, reports the latency of a single hash and the throughput
+of a burst of verifications (simulating concurrent logins) on the process pool
+versus a thread pool of the same size. Pick BCRYPT_ROUNDS so a single hash
+stays well under your login latency budget; raising it by one doubles the cost.
+
+Usage:
+    python -m benchmarks.bcrypt_cost_bench --rounds 10 11 12 13 --burst 64
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from src.utilities.password_hasher import PasswordHasher
+
+
+async def burst(hasher: PasswordHasher, hashed: str, n: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(hasher.verify("benchmark-password", hashed) for _ in range(n)))
+    return n / (time.perf_counter() - start)
+
+
+def run(rounds: int, executor: str, workers: int, n: int) -> dict:
+    hasher = PasswordHasher(rounds=rounds, max_workers=workers, max_pending=n, executor=executor)
+    try:
+        hashed = hasher.hash_sync("benchmark-password")  # also warms the pool up
+        start = time.perf_counter()
+        hasher.hash_sync("benchmark-password")
+        single_ms = (time.perf_counter() - start) * 1000
+        per_sec = asyncio.run(burst(hasher, hashed, n))
+    finally:
+        hasher.shutdown()
+    return {"single_ms": single_ms, "verifies_per_sec": per_sec}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--burst", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{'rounds':>6} {'executor':>8} {'hash ms':>9} {'verify/s':>9}")
+    for rounds in args.rounds:
+        for executor in ("process", "thread"):
+            result = run(rounds, executor, args.workers, args.burst)
+            print(
+                f"{rounds:>6} {executor:>8} {result['single_ms']:>9.1f} "
+                f"{result['verifies_per_sec']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
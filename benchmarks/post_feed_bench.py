@@ -0,0 +1,104 @@
+"""
+Feed pagination benchmark: keyset cursors versus OFFSET as the posts table grows.
+
+Seeds a temporary SQLite database with N posts for each requested size and times
+the first page and a page deep into the feed, once with the keyset cursor used by
+`PostService.get_posts` and once with the equivalent LIMIT/OFFSET query.
+
+Usage:
+    python -m benchmarks.post_feed_bench --sizes 1000 100000 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from src.config.settings import settings
+from src.database.engine_profiles import build_engine
+from src.database.models.base import Base
+from src.database.models.post import Post
+from src.database.models.user import User  # noqa: F401  (registers the users table)
+from src.services.post_service import PostService
+from sqlalchemy.orm import sessionmaker
+
+
+def seed(engine, rows: int) -> None:
+    start = datetime(2024, 1, 1)
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            batch.append({
+                "title": f"post {i}",
+                "content": "body",
+                "category": random.choice(("tech", "news", "life")),
+                "likes": random.randint(0, 5000),
+                "created_at": start + timedelta(seconds=i),
+            })
+            if len(batch) == 10_000:
+                conn.execute(insert(Post), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(Post), batch)
+
+
+def timed(fn, repeat: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def run(rows: int, page_size: int, depth: int) -> None:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine, _ = build_engine(f"sqlite:///{path}", settings, profile="sqlite")
+    Base.metadata.create_all(engine)
+    seed(engine, rows)
+    db = sessionmaker(bind=engine)()
+    service = PostService(db)
+
+    # Walk `depth` pages to obtain a deep cursor (bounded by table size).
+    cursor = None
+    pages = min(depth, max(rows // page_size - 1, 0))
+    for _ in range(pages):
+        _, cursor = service.get_posts(sort_by="likes", limit=page_size, cursor=cursor)
+
+    first = timed(lambda: service.get_posts(sort_by="likes", limit=page_size))
+    deep_keyset = timed(lambda: service.get_posts(sort_by="likes", limit=page_size, cursor=cursor))
+    deep_offset = timed(lambda: (
+        db.query(Post)
+        .order_by(Post.likes.desc(), Post.id.desc())
+        .offset(pages * page_size)
+        .limit(page_size)
+        .all()
+    ))
+    print(
+        f"{rows:>9} rows: first={first:7.2f}ms  keyset@page{pages}={deep_keyset:7.2f}ms  "
+        f"offset@page{pages}={deep_offset:8.2f}ms"
+    )
+    db.close()
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=500)
+    args = parser.parse_args()
+    random.seed(0)
+    for rows in args.sizes:
+        run(rows, args.page_size, args.depth)
+
+
+if __name__ == "__main__":
+    main()
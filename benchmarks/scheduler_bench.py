@@ -0,0 +1,85 @@
+"""
+Planned post scheduler benchmark: window loads and due queries over a large backlog.
+
+Seeds a temporary SQLite database with N scheduled posts spread over a year and
+times the scheduler's window load (the posts of the next hour, bounded by
+SCHEDULER_MAX_LOADED) and its due-post query, which both run as range scans on
+the (queued_at, scheduled_time) index. An idle scheduler only runs these once
+per resync interval.
+
+Usage:
+    python -m benchmarks.scheduler_bench --sizes 10000 300000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from src.config.settings import settings
+from src.database.engine_profiles import build_engine
+from src.database.models.base import Base
+from src.database.models.post import Post  # noqa: F401  (registers the posts table)
+from src.database.models.post_planning import PlannedPost, PostPlan
+from src.database.models.publish_job import PublishJob  # noqa: F401  (registers the table)
+from src.database.models.user import User
+from src.services.post_scheduler import PostScheduler
+from src.services.publish_queue import PublishQueue, utcnow
+
+
+def seed(engine, rows: int) -> None:
+    now = utcnow()
+    year = 365 * 86400
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "username": "bench"}])
+        conn.execute(insert(PostPlan), [{"id": 1, "account_id": 1, "plan_date": now}])
+        conn.execute(insert(PlannedPost), [{
+            "plan_id": 1,
+            "content": "scheduled",
+            "platform": random.choice(("linkedin", "x")),
+            "scheduled_time": now + timedelta(seconds=random.uniform(60, year)),
+        } for _ in range(rows)])
+
+
+def timed(fn, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def run(rows: int, max_loaded: int) -> None:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine, _ = build_engine(f"sqlite:///{path}", settings, profile="sqlite")
+    Base.metadata.create_all(engine)
+    seed(engine, rows)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    scheduler = PostScheduler(PublishQueue(factory, tempfile.gettempdir()), factory, max_loaded=max_loaded)
+    now = utcnow()
+    loaded = scheduler.load_window(now)
+    load_ms = timed(lambda: scheduler.load_window(now))
+    due_ms = timed(lambda: scheduler.due_posts(now, 100))
+    print(f"{rows:>9} posts: window={loaded:5d} posts in {load_ms:7.2f}ms  due query={due_ms:6.2f}ms")
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 300_000])
+    parser.add_argument("--max-loaded", type=int, default=settings.SCHEDULER_MAX_LOADED)
+    args = parser.parse_args()
+    random.seed(0)
+    for rows in args.sizes:
+        run(rows, args.max_loaded)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Gunicorn settings for running several workers that share the image model.
+
+    IMAGE_MODEL_PRELOAD=true gunicorn -c gunicorn.conf.py src.main:app
+
+The app (and, with IMAGE_MODEL_PRELOAD, the Stable Diffusion weights) is loaded once in
+the master, which then forks the uvicorn workers: the weights are shared copy-on-write,
+so N workers cost about one copy of the model. /debug/memory and the
+quibble_process_memory_bytes metric report each worker's rss/pss/uss to verify it.
+
+Set PROMETHEUS_MULTIPROC_DIR (in the environment, before gunicorn starts) for /metrics
+to aggregate all workers; the directory is emptied here on every start.
+"""
+import gc
+import glob
+import os
+
+from src.utilities.process_memory import MASTER_PID_ENV
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+# samples of a previous run would otherwise be added to this one's.
+_multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if _multiproc_dir:
+    os.makedirs(_multiproc_dir, exist_ok=True)
+    for _path in glob.glob(os.path.join(_multiproc_dir, "*.db")):
+        os.remove(_path)
+
+
+def on_starting(server):
+    # lets workers find their siblings for the per-worker memory report.
+    os.environ[MASTER_PID_ENV] = str(os.getpid())
+
+
+def pre_fork(server, worker):
+    # moves everything loaded so far out of the collector's reach: collections would
+    # otherwise write to those objects' headers and unshare their pages in every worker.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # connections opened in the master must not be shared with the workers.
+    from src.database.db_config import engine
+
+    engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    # drops the exited worker's live gauges (requests in flight, checked-out connections).
+    if _multiproc_dir:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -9,6 +9,9 @@ load_dotenv()
 ACCESS_TOKEN = os.getenv("ACCESS_TOKEN")
 AUTHOR_URN = os.getenv("AUTHOR_URN")
 
+# Placeholder SECRET_KEY for local development; never used to encrypt stored tokens.
+DEFAULT_SECRET_KEY = "your-default-secret"
+
 
 class Settings:
     """
@@ -21,17 +24,169 @@ class Settings:
         DATABASE_URL (str): Connection string for the database (defaults to SQLite for local dev).
         SECRET_KEY (str): Key for JWT signing; should be unique and secret in production.
         ALGORITHM (str): JWT encoding algorithm (e.g., HS256); configurable for security needs.
+        DB_PROFILE (str): Engine profile name ('auto', 'sqlite', 'postgres' or 'default').
+
+    The remaining DB_* and SQLITE_* attributes tune the selected engine profile and are
+    described inline.
     """
     
     # Defaults to a local SQLite file; override via .env var for production (e.g., PostgreSQL).
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
     
     # Used for cryptographic operations like token signing; never commit to version control.
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "your-default-secret")
+    SECRET_KEY: str = os.getenv("SECRET_KEY", DEFAULT_SECRET_KEY)
     
     # Specifies the hashing method for tokens; HS256 is common but can be swapped for others.
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
 
+    # Engine profile: 'auto' picks one from the DATABASE_URL scheme; 'default' disables tuning.
+    DB_PROFILE: str = os.getenv("DB_PROFILE", "auto")
+
+    # SQLite tuning, applied on every new connection by the 'sqlite' profile.
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    # Negative values are KiB (SQLite convention), positive values are pages.
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_TEMP_STORE: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
+    # Postgres pool sizing, used by the 'postgres' profile.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+
+    # Response cache: empty backend URL keeps it in-process; 'redis://...' shares it across workers.
+    CACHE_BACKEND_URL: str = os.getenv("CACHE_BACKEND_URL", "")
+    POST_CACHE_ENABLED: bool = os.getenv("POST_CACHE_ENABLED", "true").lower() == "true"
+    POST_CACHE_TTL: float = float(os.getenv("POST_CACHE_TTL", "30"))
+    POST_CACHE_MAX_ENTRIES: int = int(os.getenv("POST_CACHE_MAX_ENTRIES", "2048"))
+    POST_CACHE_MAX_BYTES: int = int(os.getenv("POST_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+    # Principal cache for get_current_user; entries live at most AUTH_PRINCIPAL_CACHE_TTL seconds.
+    AUTH_PRINCIPAL_CACHE_TTL: float = float(os.getenv("AUTH_PRINCIPAL_CACHE_TTL", "30"))
+    AUTH_PRINCIPAL_CACHE_SIZE: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_SIZE", "10000"))
+    # Embed user id and token version in JWTs (cache misses become primary-key lookups).
+    AUTH_EMBED_PRINCIPAL: bool = os.getenv("AUTH_EMBED_PRINCIPAL", "false").lower() == "true"
+
+    # Password hashing: bcrypt cost, and the executor it runs on (0 = default sizing:
+    # one worker per core, 8 queued operations per worker before answering 429).
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "process")
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "0"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "0"))
+
+    # LinkedIn token storage: comma-separated Fernet keys (first one encrypts); when empty a
+    # key is derived from SECRET_KEY, unless that is the default, in which case startup fails
+    # while LinkedIn or X is enabled. Cached tokens are re-read from the DB after the TTL.
+    TOKEN_ENCRYPTION_KEYS: str = os.getenv("TOKEN_ENCRYPTION_KEYS", "")
+    LINKEDIN_TOKEN_CACHE_TTL: float = float(os.getenv("LINKEDIN_TOKEN_CACHE_TTL", "60"))
+    # Background refresh: sweep every INTERVAL seconds (0 disables) and refresh tokens
+    # expiring within AHEAD seconds.
+    LINKEDIN_TOKEN_REFRESH_INTERVAL: float = float(os.getenv("LINKEDIN_TOKEN_REFRESH_INTERVAL", "600"))
+    LINKEDIN_TOKEN_REFRESH_AHEAD: float = float(os.getenv("LINKEDIN_TOKEN_REFRESH_AHEAD", "86400"))
+    # Uploaded LinkedIn images are reused by content hash for this many seconds (0 disables).
+    LINKEDIN_ASSET_CACHE_TTL: float = float(os.getenv("LINKEDIN_ASSET_CACHE_TTL", str(7 * 86400)))
+
+    # Shared outbound HTTP client (LinkedIn API and OAuth): pool limits and default
+    # timeouts in seconds; per-phase timeouts are set by the services.
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT: float = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+    HTTP_WRITE_TIMEOUT: float = float(os.getenv("HTTP_WRITE_TIMEOUT", "20"))
+    HTTP_POOL_TIMEOUT: float = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+    # X (Twitter): app consumer key/secret; X_ACCESS_TOKEN/_SECRET is the fallback account
+    # for users who have not stored their own credentials (PUT /x/credentials). Clients
+    # are pooled per account (LRU of X_CLIENT_POOL_SIZE, re-read after X_CLIENT_POOL_TTL seconds).
+    X_CONSUMER_KEY: str = os.getenv("X_CONSUMER_KEY", "")
+    X_CONSUMER_SECRET: str = os.getenv("X_CONSUMER_SECRET", "")
+    X_ACCESS_TOKEN: str = os.getenv("X_ACCESS_TOKEN", "")
+    X_ACCESS_TOKEN_SECRET: str = os.getenv("X_ACCESS_TOKEN_SECRET", "")
+    X_CLIENT_POOL_SIZE: int = int(os.getenv("X_CLIENT_POOL_SIZE", "1024"))
+    X_CLIENT_POOL_TTL: float = float(os.getenv("X_CLIENT_POOL_TTL", "300"))
+    # Chunked media uploads (large images, GIFs, video): segment size and segments in flight.
+    X_MEDIA_SEGMENT_BYTES: int = int(os.getenv("X_MEDIA_SEGMENT_BYTES", str(4 * 1024 * 1024)))
+    X_MEDIA_PARALLEL_SEGMENTS: int = int(os.getenv("X_MEDIA_PARALLEL_SEGMENTS", "4"))
+
+    # Largest image accepted by the LinkedIn/X publishing endpoints (larger uploads get 413).
+    MAX_IMAGE_UPLOAD_BYTES: int = int(os.getenv("MAX_IMAGE_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+    MAX_VIDEO_UPLOAD_BYTES: int = int(os.getenv("MAX_VIDEO_UPLOAD_BYTES", str(512 * 1024 * 1024)))
+
+    # Post images: content-addressed store served at /uploads; files unreferenced for
+    # UPLOAD_GC_GRACE seconds are deleted by the artifact lifecycle sweeps.
+    UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", os.path.join(os.getenv("ARTIFACTS_DIR", "artifacts"), "uploads"))
+    UPLOAD_GC_GRACE: float = float(os.getenv("UPLOAD_GC_GRACE", "86400"))
+    # Renditions (/uploads/<name>/w<width>.<webp|jpg|png>): offered widths and the disk
+    # budget of the rendition cache (least recently served are deleted first).
+    RENDITION_DIR: str = os.getenv("RENDITION_DIR", os.path.join(os.getenv("ARTIFACTS_DIR", "artifacts"), "renditions"))
+    RENDITION_WIDTHS: str = os.getenv("RENDITION_WIDTHS", "160,320,640,1280")
+    RENDITION_CACHE_BYTES: int = int(os.getenv("RENDITION_CACHE_BYTES", str(512 * 1024 * 1024)))
+
+    # Image preprocessing before LinkedIn/X uploads: executor ('process' or 'thread'), pool
+    # size (0 = one worker per core) and where processed images are cached.
+    MEDIA_PREPROCESS_EXECUTOR: str = os.getenv("MEDIA_PREPROCESS_EXECUTOR", "process")
+    MEDIA_PREPROCESS_WORKERS: int = int(os.getenv("MEDIA_PREPROCESS_WORKERS", "0"))
+    MEDIA_CACHE_DIR: str = os.getenv(
+        "MEDIA_CACHE_DIR", os.path.join(os.getenv("ARTIFACTS_DIR", "artifacts"), "media_cache")
+    )
+
+    # Artifact lifecycle: seconds between sweeps of ARTIFACTS_DIR (0 disables them), and
+    # the TTL (seconds) and disk quota (bytes) of each category; 0 means no limit.
+    ARTIFACT_SWEEP_INTERVAL: float = float(os.getenv("ARTIFACT_SWEEP_INTERVAL", "300"))
+    GENERATED_POSTS_TTL: float = float(os.getenv("GENERATED_POSTS_TTL", str(30 * 86400)))
+    GENERATED_POSTS_MAX_BYTES: int = int(os.getenv("GENERATED_POSTS_MAX_BYTES", str(256 * 1024 * 1024)))
+    MEDIA_CACHE_TTL: float = float(os.getenv("MEDIA_CACHE_TTL", str(7 * 86400)))
+    MEDIA_CACHE_MAX_BYTES: int = int(os.getenv("MEDIA_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+    # Publish queue: background workers per process (0 disables them), idle poll interval,
+    # job lease, retry policy (exponential backoff from BASE, capped at MAX seconds) and
+    # the directory holding images until their job is done.
+    PUBLISH_WORKERS: int = int(os.getenv("PUBLISH_WORKERS", "2"))
+    PUBLISH_POLL_INTERVAL: float = float(os.getenv("PUBLISH_POLL_INTERVAL", "5"))
+    PUBLISH_LEASE_SECONDS: float = float(os.getenv("PUBLISH_LEASE_SECONDS", "300"))
+    PUBLISH_MAX_ATTEMPTS: int = int(os.getenv("PUBLISH_MAX_ATTEMPTS", "5"))
+    PUBLISH_BACKOFF_BASE: float = float(os.getenv("PUBLISH_BACKOFF_BASE", "30"))
+    PUBLISH_BACKOFF_MAX: float = float(os.getenv("PUBLISH_BACKOFF_MAX", "3600"))
+    PUBLISH_MEDIA_DIR: str = os.getenv(
+        "PUBLISH_MEDIA_DIR", os.path.join(os.getenv("ARTIFACTS_DIR", "artifacts"), "publish_media")
+    )
+
+    # Planned post scheduler: keeps posts due within SCHEDULER_HORIZON seconds (at most
+    # SCHEDULER_MAX_LOADED) in memory and reloads that window at least every
+    # SCHEDULER_RESYNC_INTERVAL seconds.
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    SCHEDULER_HORIZON: float = float(os.getenv("SCHEDULER_HORIZON", "3600"))
+    SCHEDULER_MAX_LOADED: int = int(os.getenv("SCHEDULER_MAX_LOADED", "10000"))
+    SCHEDULER_RESYNC_INTERVAL: float = float(os.getenv("SCHEDULER_RESYNC_INTERVAL", "300"))
+
+    # Feature groups: a switched-off group's routes, background tasks and modules are not
+    # loaded, e.g. for workers that only serve auth and posts. Publishing and cross-posting
+    # cover the enabled networks and are off when neither LinkedIn nor X is enabled.
+    LINKEDIN_ENABLED: bool = os.getenv("LINKEDIN_ENABLED", "true").lower() == "true"
+    X_ENABLED: bool = os.getenv("X_ENABLED", "true").lower() == "true"
+    MISTRAL_ENABLED: bool = os.getenv("MISTRAL_ENABLED", "true").lower() == "true"
+    IMAGE_GENERATION_ENABLED: bool = os.getenv("IMAGE_GENERATION_ENABLED", "true").lower() == "true"
+    # Loads the image model when the app is created rather than on the first request; with
+    # gunicorn.conf.py (preload_app) that is in the master, and the workers share the weights.
+    IMAGE_MODEL_PRELOAD: bool = os.getenv("IMAGE_MODEL_PRELOAD", "false").lower() == "true"
+
+    # Debug mode: enables /debug endpoints and per-response DB query headers.
+    DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
+
+    # Query instrumentation: statements per request before a warning, and the repeat
+    # count at which an identical SELECT is reported as a possible N+1.
+    DB_QUERY_BUDGET: int = int(os.getenv("DB_QUERY_BUDGET", "20"))
+    DB_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "5"))
+
+    # Postgres text search configuration used for the full-text index (e.g. 'english', 'simple').
+    SEARCH_TEXT_CONFIG: str = os.getenv("SEARCH_TEXT_CONFIG", "english")
+
 
 # Singleton instance: Provides global access to settings, useful for importing in services/routers.
 settings = Settings()
@@ -1,15 +1,16 @@
 from src.config.settings import settings
-from sqlalchemy import create_engine
+from src.database.engine_profiles import build_engine
+from src.database.instrumentation import install_query_instrumentation
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 # Database engine: Core connection pool for SQLAlchemy; configured with the app's DATABASE_URL.
-# The connect_args handle SQLite-specific threading behavior to prevent concurrency issues
-# in FastAPI's async environment.
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+# The engine profile (DB_PROFILE, 'auto' by default) applies backend-specific tuning such as
+# SQLite WAL pragmas or Postgres pool sizing; the observer tracks pool usage.
+engine, pool_observer = build_engine(settings.DATABASE_URL, settings)
+
+# Per-request statement counting/timing; inert unless a request is being tracked.
+install_query_instrumentation(engine)
 
 
 # Session factory: Creates ORM sessions for database interactions; configured without
@@ -40,3 +41,13 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_pool_stats() -> dict:
+    """
+    Returns connection pool statistics for the application engine.
+
+    Returns:
+        dict: Current pool state plus cumulative connect/checkout/checkin counters.
+    """
+    return pool_observer.stats()
@@ -0,0 +1,231 @@
+import threading
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+
+from src.utilities.metrics import DB_POOL_CHECKED_OUT, DB_POOL_EVENTS
+
+
+class PoolObserver:
+    """
+    Collects connection pool counters from SQLAlchemy pool events.
+
+    The pool itself only reports its current state (size, checked out, overflow);
+    this observer adds cumulative counters so that churn and invalidations are
+    visible as well. The events and the checked-out count are also exported to
+    Prometheus (summed over all workers).
+
+    Args:
+        engine (Engine): Engine whose pool should be observed.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._counters = {
+            "connects": 0,
+            "checkouts": 0,
+            "checkins": 0,
+            "invalidations": 0,
+        }
+        event.listen(engine, "connect", self._on("connects"))
+        event.listen(engine, "checkout", self._on("checkouts"))
+        event.listen(engine, "checkin", self._on("checkins"))
+        event.listen(engine, "invalidate", self._on("invalidations"))
+
+    def _on(self, counter: str):
+        event_total = DB_POOL_EVENTS.labels(counter)
+        checked_out = {"checkouts": 1, "checkins": -1}.get(counter, 0)
+
+        def listener(*_args):
+            with self._lock:
+                self._counters[counter] += 1
+            event_total.inc()
+            if checked_out:
+                DB_POOL_CHECKED_OUT.inc(checked_out)
+        return listener
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the pool state and cumulative counters.
+
+        Returns:
+            dict: Pool class, current size/checked-in/checked-out/overflow (when the
+            pool type supports them) and the event counters.
+        """
+        pool = self.engine.pool
+        snapshot: Dict[str, Any] = {"pool": type(pool).__name__}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            getter = getattr(pool, name, None)
+            if callable(getter):
+                snapshot[name] = getter()
+        with self._lock:
+            snapshot.update(self._counters)
+        return snapshot
+
+
+class EngineProfile:
+    """
+    Base engine profile: plain `create_engine` with no dialect-specific tuning.
+
+    Subclasses override `engine_kwargs` to size the pool and `configure` to attach
+    connection-level event listeners.
+
+    Args:
+        settings: Settings object providing the DB_* / SQLITE_* tuning values.
+    """
+
+    name = "default"
+
+    def __init__(self, settings):
+        self.settings = settings
+
+    def engine_kwargs(self, url: str) -> Dict[str, Any]:
+        return {}
+
+    def configure(self, engine: Engine) -> None:
+        pass
+
+    def create_engine(self, url: str) -> Engine:
+        engine = create_engine(url, **self.engine_kwargs(url))
+        self.configure(engine)
+        return engine
+
+
+class SQLiteProfile(EngineProfile):
+    """
+    SQLite profile tuned for concurrent readers alongside a single writer.
+
+    WAL lets readers proceed while a write transaction is open, synchronous=NORMAL
+    is durable under WAL except on power loss, and busy_timeout makes writers wait
+    for the lock instead of failing immediately with 'database is locked'.
+    """
+
+    name = "sqlite"
+
+    def engine_kwargs(self, url: str) -> Dict[str, Any]:
+        # FastAPI runs sync endpoints in a threadpool, so connections cross threads.
+        return {"connect_args": {"check_same_thread": False}}
+
+    def pragmas(self) -> Dict[str, Any]:
+        s = self.settings
+        return {
+            "journal_mode": s.SQLITE_JOURNAL_MODE,
+            "synchronous": s.SQLITE_SYNCHRONOUS,
+            "mmap_size": s.SQLITE_MMAP_SIZE,
+            "cache_size": s.SQLITE_CACHE_SIZE,
+            "busy_timeout": s.SQLITE_BUSY_TIMEOUT_MS,
+            "temp_store": s.SQLITE_TEMP_STORE,
+        }
+
+    def configure(self, engine: Engine) -> None:
+        pragmas = self.pragmas()
+
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, _record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for key, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {key}={value}")
+            finally:
+                cursor.close()
+
+
+class PostgresProfile(EngineProfile):
+    """
+    Postgres profile with an explicitly sized pool and a server-side statement timeout.
+
+    pool_pre_ping and pool_recycle drop connections that were closed by the server
+    or a proxy, and statement_timeout stops a runaway query from holding a pooled
+    connection indefinitely.
+    """
+
+    name = "postgres"
+
+    def engine_kwargs(self, url: str) -> Dict[str, Any]:
+        s = self.settings
+        return {
+            "pool_size": s.DB_POOL_SIZE,
+            "max_overflow": s.DB_MAX_OVERFLOW,
+            "pool_timeout": s.DB_POOL_TIMEOUT,
+            "pool_recycle": s.DB_POOL_RECYCLE,
+            "pool_pre_ping": True,
+        }
+
+    def configure(self, engine: Engine) -> None:
+        timeout_ms = int(self.settings.DB_STATEMENT_TIMEOUT_MS)
+
+        @event.listens_for(engine, "connect")
+        def _set_statement_timeout(dbapi_connection, _record):
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute(f"SET statement_timeout = {timeout_ms}")
+            finally:
+                cursor.close()
+            dbapi_connection.commit()
+
+
+class DefaultSQLiteProfile(EngineProfile):
+    """Untuned SQLite profile; keeps only the cross-thread connection flag."""
+
+    name = "sqlite-default"
+
+    def engine_kwargs(self, url: str) -> Dict[str, Any]:
+        return {"connect_args": {"check_same_thread": False}}
+
+
+# Registry of named profiles; DB_PROFILE selects one explicitly.
+PROFILES = {
+    profile.name: profile
+    for profile in (EngineProfile, SQLiteProfile, PostgresProfile, DefaultSQLiteProfile)
+}
+
+
+def resolve_profile(url: str, name: Optional[str], settings) -> EngineProfile:
+    """
+    Picks an engine profile for a database URL.
+
+    Args:
+        url (str): SQLAlchemy database URL.
+        name (Optional[str]): Profile name; 'auto' or None selects by URL backend.
+        settings: Settings object passed to the profile.
+
+    Returns:
+        EngineProfile: The profile instance.
+
+    Raises:
+        ValueError: If the profile name is unknown.
+    """
+    if not name or name == "auto":
+        backend = make_url(url).get_backend_name()
+        if backend == "sqlite":
+            name = "sqlite"
+        elif backend == "postgresql":
+            name = "postgres"
+        else:
+            name = "default"
+    elif name == "default" and make_url(url).get_backend_name() == "sqlite":
+        name = "sqlite-default"
+    try:
+        return PROFILES[name](settings)
+    except KeyError:
+        raise ValueError(f"Unknown DB_PROFILE '{name}'; expected one of {sorted(PROFILES)}")
+
+
+def build_engine(url: str, settings, profile: Optional[str] = None):
+    """
+    Creates an engine using the selected profile and attaches a pool observer.
+
+    Args:
+        url (str): SQLAlchemy database URL.
+        settings: Settings object with the tuning values.
+        profile (Optional[str]): Profile name; defaults to settings.DB_PROFILE.
+
+    Returns:
+        tuple[Engine, PoolObserver]: The configured engine and its observer.
+    """
+    selected = resolve_profile(url, profile or settings.DB_PROFILE, settings)
+    engine = selected.create_engine(url)
+    return engine, PoolObserver(engine)
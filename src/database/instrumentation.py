@@ -0,0 +1,187 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Stats object of the request (or test block) currently being tracked, if any.
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+_NUMBER = re.compile(r"\b\d+(\.\d+)?\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapses whitespace and inlined literals so equivalent statements compare equal."""
+    statement = _STRING.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryStats:
+    """
+    Statement count, database time and statement patterns for one unit of work.
+
+    Instances are filled by the engine listeners installed with
+    `install_query_instrumentation` while they are the active stats object (see
+    `track_queries`).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.patterns: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        normalized = normalize_statement(statement)
+        with self._lock:
+            self.count += 1
+            self.total_time += elapsed
+            self.patterns[normalized] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Returns SELECT patterns executed at least `threshold` times.
+
+        The same parameterised SELECT issued once per row of an earlier result is
+        the signature of an N+1 query (typically a lazy-loaded relationship
+        accessed in a loop).
+        """
+        with self._lock:
+            return [
+                (pattern, n) for pattern, n in self.patterns.most_common()
+                if n >= threshold and pattern.upper().startswith("SELECT")
+            ]
+
+    def assert_within(self, max_statements: int, n_plus_one_threshold: Optional[int] = None) -> None:
+        """
+        Raises QueryBudgetExceeded when the budget is exceeded or an N+1 pattern is seen.
+
+        Intended for tests, e.g.:
+
+            with track_queries() as stats:
+                client.get("/posts/")
+            stats.assert_within(3, n_plus_one_threshold=3)
+        """
+        if self.count > max_statements:
+            raise QueryBudgetExceeded(
+                f"{self.count} statements exceeds budget of {max_statements}: {dict(self.patterns)}"
+            )
+        if n_plus_one_threshold is not None:
+            repeated = self.repeated(n_plus_one_threshold)
+            if repeated:
+                raise QueryBudgetExceeded(f"Possible N+1 query pattern: {repeated}")
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Collects statements executed in the current context into a new QueryStats.
+
+    The context variable propagates into threadpool workers started from this
+    context (e.g. FastAPI sync endpoints), so statements issued there are counted.
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+class RouteQueryAggregates:
+    """
+    Per-route aggregates of request query stats, plus budget/N+1 warnings.
+
+    Args:
+        budget (int): Statement budget per request; exceeding it logs a warning.
+        n_plus_one_threshold (int): Repeat count at which a SELECT pattern is
+            reported as a possible N+1.
+    """
+
+    def __init__(self, budget: int, n_plus_one_threshold: int):
+        self.budget = budget
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._lock = threading.Lock()
+        self._routes: Dict[str, dict] = {}
+
+    def observe(self, route: str, stats: QueryStats) -> None:
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        over_budget = stats.count > self.budget
+        with self._lock:
+            agg = self._routes.setdefault(route, {
+                "requests": 0,
+                "statements": 0,
+                "max_statements": 0,
+                "db_time_ms": 0.0,
+                "over_budget": 0,
+                "n_plus_one": 0,
+            })
+            agg["requests"] += 1
+            agg["statements"] += stats.count
+            agg["max_statements"] = max(agg["max_statements"], stats.count)
+            agg["db_time_ms"] += stats.total_time * 1000
+            agg["over_budget"] += over_budget
+            agg["n_plus_one"] += bool(repeated)
+        if over_budget:
+            logger.warning(
+                "Route %s issued %d SQL statements (budget %d)", route, stats.count, self.budget
+            )
+        if repeated:
+            logger.warning("Possible N+1 queries on route %s: %s", route, repeated[:3])
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {route: dict(agg) for route, agg in self._routes.items()}
+
+
+def install_query_instrumentation(engine: Engine) -> None:
+    """
+    Registers cursor-execute listeners on `engine` that feed the active QueryStats.
+
+    When nothing is being tracked the listeners only perform a context variable
+    lookup, so the overhead outside tracked requests is negligible.
+
+    Args:
+        engine (Engine): Engine to instrument.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current_stats.get() is not None:
+            conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        if stats is None:
+            return
+        starts = conn.info.get("query_start_time")
+        elapsed = time.perf_counter() - starts.pop() if starts else 0.0
+        stats.record(statement, elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        # Failed statements never reach after_cursor_execute; drop their start time.
+        conn = exception_context.connection
+        starts = conn.info.get("query_start_time") if conn is not None else None
+        if starts:
+            starts.pop()
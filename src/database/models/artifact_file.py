@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Float, Index, Integer, String
+
+from .base import Base
+
+
+class ArtifactFile(Base):
+    """
+    SQLAlchemy ORM model indexing a file written under ARTIFACTS_DIR.
+
+    Writers record each file they create, so the lifecycle manager can expire
+    and evict files by category without walking the directories; the
+    (category, created_at) index serves both the oldest-first scans and the
+    per-category totals.
+
+    Attributes:
+        id (int): Primary key.
+        category (str): Artifact category ('generated_posts', 'media_cache', ...).
+        path (str): File path, unique.
+        size (int): Size in bytes.
+        created_at (float): When the file was written, epoch seconds.
+    """
+    __tablename__ = "artifact_files"
+    __table_args__ = (
+        Index("ix_artifact_files_category_created_at", "category", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    category = Column(String, nullable=False)
+    path = Column(String, nullable=False, unique=True)
+    size = Column(Integer, nullable=False)
+    created_at = Column(Float, nullable=False)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Float, String
+
+from .base import Base
+
+
+class LinkedInAsset(Base):
+    """
+    SQLAlchemy ORM model for an image already uploaded to LinkedIn.
+
+    Maps the SHA-256 of the image bytes to the asset LinkedIn created for it, per
+    owner (assets belong to the member or organization that registered them), so
+    the same image can be attached again without uploading it. `expires_at` is
+    indexed so expired entries can be purged without scanning the table.
+
+    Attributes:
+        owner_urn (str): LinkedIn URN that owns the asset.
+        sha256 (str): Hex digest of the image bytes.
+        asset_urn (str): The uploaded asset's URN.
+        expires_at (float): When the entry stops being reused, epoch seconds.
+    """
+    __tablename__ = "linkedin_assets"
+
+    owner_urn = Column(String, primary_key=True)
+    sha256 = Column(String(64), primary_key=True)
+    asset_urn = Column(String, nullable=False)
+    expires_at = Column(Float, nullable=False, index=True)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Float, ForeignKey, Integer, String, Text
+
+from .base import Base
+
+
+class LinkedInCredential(Base):
+    """
+    SQLAlchemy ORM model for a user's connected LinkedIn OAuth token.
+    
+    Tokens are stored encrypted (see `TokenCipher`) and shared by every worker
+    process; `expires_at` is indexed so the refresh sweeper can find tokens that
+    are about to expire without scanning the table.
+    
+    Attributes:
+        user_id (int): Owning user; one LinkedIn connection per user.
+        owner_urn (str): LinkedIn member URN (e.g. 'urn:li:person:ID').
+        access_token (str): Encrypted access token.
+        refresh_token (str | None): Encrypted refresh token, if LinkedIn issued one.
+        expires_at (float): Access token expiry, epoch seconds.
+        refresh_lease_until (float | None): Set while a worker is refreshing the
+            token, so concurrent sweepers do not refresh it twice.
+    """
+    __tablename__ = "linkedin_tokens"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    owner_urn = Column(String, nullable=False)
+    access_token = Column(Text, nullable=False)
+    refresh_token = Column(Text, nullable=True)
+    expires_at = Column(Float, nullable=False, index=True)
+    refresh_lease_until = Column(Float, nullable=True)
@@ -1,6 +1,10 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, String, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 
+from src.database.search_index import register_search_index
+
 from .base import Base
 
 
@@ -17,10 +21,22 @@ class Post(Base):
         content (str): Main body/content of the post.
         image_url (str, optional): URL to an associated image.
         owner_id (int): Foreign key referencing the user who owns the post.
+        category (str, optional): Feed category used for filtering.
+        likes (int): Like counter used by the 'likes' feed ordering.
+        created_at (datetime): Creation timestamp used by the 'newest' feed ordering.
         owner (relationship): Many-to-one relationship back to User.
     """
     __tablename__ = "posts" 
 
+    # Composite indexes matching the feed orderings; the trailing id makes every
+    # sort key unique so keyset pagination can seek straight to the next page.
+    __table_args__ = (
+        Index("ix_posts_likes_id", "likes", "id"),
+        Index("ix_posts_category_likes_id", "category", "likes", "id"),
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_category_created_at_id", "category", "created_at", "id"),
+    )
+
     # Primary key: Unique identifier for each post.
     id = Column(Integer, primary_key=True, index=True)
     
@@ -35,6 +51,24 @@ class Post(Base):
     
     # Foreign key: Links post to its owner, enforcing referential integrity.
     owner_id = Column(Integer, ForeignKey("users.id"))
+
+    # Optional feed category; filtered together with the feed ordering.
+    category = Column(String, nullable=True)
+
+    # Denormalised like counter; NOT NULL so keyset comparisons never meet NULLs.
+    likes = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Creation timestamp (naive UTC), used by the 'newest' feed ordering.
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+        server_default=func.now(),
+    )
     
     # Relationship: Allows navigation from post to owner, useful for API serialization.
     owner = relationship("User", back_populates="posts")
+
+
+# Full-text index over title/content, kept in sync by the database on every write.
+register_search_index(Post.__table__, ["title", "content"])
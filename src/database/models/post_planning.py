@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 
+from src.database.search_index import register_search_index
+
 from .base import Base
 
 
@@ -8,6 +10,9 @@ class PostPlan(Base):
     __tablename__ = "post_plans"
     id = Column(Integer, primary_key=True, index=True)
     account_id = Column(Integer, nullable=False)
+    # Authenticated user who created the plan; its posts are published as them. Plans
+    # without one (created before the planning routes required auth) are never published.
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     plan_date = Column(DateTime, nullable=False, index=True)
     status = Column(Enum("draft", "scheduled", "published", name="plan_status"), default="draft")
 
@@ -16,10 +21,25 @@ class PostPlan(Base):
 
 class PlannedPost(Base):
     __tablename__ = "planned_posts"
+    __table_args__ = (
+        # The scheduler's due/upcoming queries: posts not yet handed to publishing,
+        # by scheduled_time (a range scan, however many posts are scheduled).
+        Index("ix_planned_posts_due", "queued_at", "scheduled_time"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     plan_id = Column(Integer, ForeignKey("post_plans.id"), nullable=False)
     content = Column(String, nullable=False)
     scheduled_time = Column(DateTime, nullable=True)
     ai_suggested = Column(Integer, default=0)
+    # Network to publish to once scheduled_time arrives ('linkedin' or 'x'); None = never.
+    platform = Column(String(16), nullable=True)
+    # Set once the scheduler has queued the post for publishing; while it is being
+    # handed over, dispatch_lease_until keeps other replicas off it.
+    queued_at = Column(DateTime, nullable=True)
+    dispatch_lease_until = Column(DateTime, nullable=True)
+
+    plan = relationship("PostPlan", back_populates="posts")
+
 
-    plan = relationship("PostPlan", back_populates="posts")
\ No newline at end of file
+# Full-text index over planned post drafts.
+register_search_index(PlannedPost.__table__, ["content"])
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+
+from .base import Base
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class PublishJob(Base):
+    """
+    SQLAlchemy ORM model for a queued publish to a social network (the outbox).
+
+    Requests enqueue a job and return immediately; publish workers claim due jobs
+    with a lease, publish them and record the outcome. Retryable failures are
+    rescheduled via `next_attempt_at`.
+
+    Attributes:
+        id (int): Primary key.
+        user_id (int): User whose connected account publishes the post.
+        platform (str): 'linkedin' or 'x'.
+        status (str): 'queued', 'running', 'succeeded' or 'failed'.
+        idempotency_key (str, optional): Client-supplied key; one job per user and key.
+        payload (dict): Platform-independent content, e.g. {"text": ...}.
+        media_path (str, optional): Stored image to attach, removed once the job is done.
+        planned_post_id (int, optional): PlannedPost this job publishes, if any.
+        attempts (int): Publish attempts made so far.
+        max_attempts (int): Attempts before the job is marked failed.
+        next_attempt_at (datetime): Earliest time (UTC) a worker may pick the job up.
+        lease_owner (str, optional): Worker currently publishing the job.
+        lease_until (datetime, optional): When the lease lapses if the worker dies.
+        external_id (str, optional): Id of the published post on the platform.
+        last_error (str, optional): Error message of the last failed attempt.
+    """
+    __tablename__ = "publish_jobs"
+
+    __table_args__ = (
+        # Workers claim by status and due time; a range scan on this index.
+        Index("ix_publish_jobs_status_next_attempt", "status", "next_attempt_at"),
+        UniqueConstraint("user_id", "idempotency_key", name="uq_publish_jobs_user_idempotency_key"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    platform = Column(String(16), nullable=False)
+    status = Column(String(16), nullable=False, default="queued")
+    idempotency_key = Column(String(255), nullable=True)
+    payload = Column(JSON, nullable=False, default=dict)
+    media_path = Column(String, nullable=True)
+    planned_post_id = Column(Integer, ForeignKey("planned_posts.id"), nullable=True, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    next_attempt_at = Column(DateTime, nullable=False, default=_utcnow)
+    lease_owner = Column(String(64), nullable=True)
+    lease_until = Column(DateTime, nullable=True)
+    external_id = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=_utcnow)
+    updated_at = Column(DateTime, nullable=False, default=_utcnow, onupdate=_utcnow)
+    completed_at = Column(DateTime, nullable=True)
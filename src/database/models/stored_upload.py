@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Float, Integer, String
+
+from .base import Base
+
+
+class StoredUpload(Base):
+    """
+    SQLAlchemy ORM model for a file in the content-addressed upload store.
+
+    Files are named by the SHA-256 of their bytes, so identical uploads share
+    one file and one row. `ref_count` counts the records (e.g. posts) that use
+    the file; `orphaned_at` is set while nothing does, and is indexed so the
+    garbage collector finds unused files without scanning the table.
+
+    Attributes:
+        sha256 (str): Hex digest of the content; the file's name.
+        content_type (str): Sniffed MIME type.
+        size (int): Size in bytes.
+        ref_count (int): Number of references to the file.
+        created_at (float): When the file was first stored, epoch seconds.
+        orphaned_at (float | None): Since when nothing references the file.
+    """
+    __tablename__ = "stored_uploads"
+
+    sha256 = Column(String(64), primary_key=True)
+    content_type = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(Float, nullable=False)
+    orphaned_at = Column(Float, nullable=True, index=True)
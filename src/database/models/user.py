@@ -15,6 +15,7 @@ class User(Base):
         id (int): Primary key, auto-incremented.
         username (str): Unique identifier for the user.
         hashed_password (str): Securely stored password hash.
+        token_version (int): Bumped on password change to revoke issued tokens.
         posts (relationship): One-to-many relationship with Post model.
     """
     __tablename__ = "users"  # Table name in the database.
@@ -23,10 +24,13 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     
     # Must be unique; indexed for fast lookups in auth queries.
-    username = Column(String, unique=True)
+    username = Column(String, unique=True, index=True)
     
     # Stores bcrypt or similar hash for security; never store plain text.
     hashed_password = Column(String)
+
+    # Embedded in tokens as 'ver'; tokens with an older version are rejected.
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationship: Links to posts owned by this user, enabling eager loading in API responses.
     posts = relationship("Post", back_populates="owner")
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Float, ForeignKey, Integer, String, Text
+
+from .base import Base
+
+
+class XCredential(Base):
+    """
+    SQLAlchemy ORM model for a user's connected X (Twitter) account.
+
+    The OAuth 1.0a access token and secret are stored encrypted (see
+    `TokenCipher`); the app's consumer key and secret come from the environment.
+
+    Attributes:
+        user_id (int): Owning user; one X account per user.
+        access_token (str): Encrypted access token.
+        access_token_secret (str): Encrypted access token secret.
+        screen_name (str | None): Handle of the connected account.
+        updated_at (float): When the credentials were saved, epoch seconds.
+    """
+    __tablename__ = "x_credentials"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    access_token = Column(Text, nullable=False)
+    access_token_secret = Column(Text, nullable=False)
+    screen_name = Column(String, nullable=True)
+    updated_at = Column(Float, nullable=False)
@@ -0,0 +1,78 @@
+import logging
+from typing import List
+
+from sqlalchemy import Column, Table, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+# every model module, so Base.metadata knows all tables.
+from src.database.models import (  # noqa: F401
+    artifact_file,
+    linkedin_asset,
+    linkedin_token,
+    post,
+    post_planning,
+    publish_job,
+    stored_upload,
+    user,
+    x_credential,
+)
+from src.database.models.base import Base
+
+logger = logging.getLogger(__name__)
+
+
+def _add_column(conn: Connection, table: Table, column: Column) -> None:
+    dialect = conn.dialect
+    preparer = dialect.identifier_preparer
+    default = column.server_default
+    constant = default is not None and isinstance(default.arg, str)
+    spec = f"{preparer.format_column(column)} {column.type.compile(dialect=dialect)}"
+    if constant:
+        spec += f" DEFAULT {dialect.ddl_compiler(dialect, None).get_column_default_string(column)}"
+        if not column.nullable:
+            spec += " NOT NULL"
+    conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {spec}"))
+    if default is not None and not constant:
+        # SQLite cannot add a column with a non-constant default (e.g. now()): the column
+        # is added nullable and existing rows are backfilled; new rows get the ORM default.
+        conn.execute(table.update().values({column.name: default.arg}))
+
+
+def ensure_schema(engine: Engine) -> List[str]:
+    """
+    Brings the database schema up to date with the models.
+
+    Missing tables are created (with their indexes and full-text DDL). Tables that
+    already exist get the columns and indexes added to their models since they were
+    created: columns with a constant server default are added with it (and NOT NULL),
+    others are added nullable and backfilled from their server default. Columns are
+    never dropped or altered. Idempotent, and cheap when the schema is current.
+
+    Args:
+        engine (Engine): Engine of the application database.
+
+    Returns:
+        List[str]: What was changed ('table', 'table.column' or 'index name').
+    """
+    changes: List[str] = []
+    existing = set(inspect(engine).get_table_names())
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing:
+                table.create(conn)
+                changes.append(table.name)
+                continue
+            inspector = inspect(conn)
+            columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in columns:
+                    _add_column(conn, table, column)
+                    changes.append(f"{table.name}.{column.name}")
+            indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(conn)
+                    changes.append(index.name)
+    if changes:
+        logger.info("Updated database schema: %s", ", ".join(changes))
+    return changes
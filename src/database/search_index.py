@@ -0,0 +1,113 @@
+from typing import Dict, List, Sequence
+
+from sqlalchemy import DDL, Table, event, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from src.config.settings import settings
+
+# Tables with a full-text index, keyed by table name -> indexed text columns.
+SEARCHABLE_TABLES: Dict[str, List[str]] = {}
+
+
+def fts_table(table_name: str) -> str:
+    """Name of the SQLite FTS5 shadow table for `table_name`."""
+    return f"{table_name}_fts"
+
+
+def _sqlite_ddl(table: str, columns: Sequence[str]) -> List[str]:
+    # External-content FTS5 table: the index stores only tokens and reads column
+    # values back from the base table, and the triggers apply each write as a
+    # delta (FTS5 'delete' command + insert) instead of re-indexing the table.
+    fts = fts_table(table)
+    cols = ", ".join(columns)
+    new_vals = ", ".join(f"new.{c}" for c in columns)
+    old_vals = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals}); END",
+    ]
+
+
+def _postgres_ddl(table: str, columns: Sequence[str]) -> List[str]:
+    # A stored generated tsvector column is recomputed by Postgres for each written
+    # row only, and the GIN index over it is maintained incrementally. Earlier
+    # columns get a higher weight (title 'A' before content 'B').
+    config = settings.SEARCH_TEXT_CONFIG
+    weights = "ABCD"
+    vector = " || ".join(
+        f"setweight(to_tsvector('{config}', coalesce({c}, '')), '{weights[min(i, 3)]}')"
+        for i, c in enumerate(columns)
+    )
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING GIN (search_vector)",
+    ]
+
+
+def register_search_index(table: Table, columns: Sequence[str]) -> None:
+    """
+    Attaches full-text index DDL to a table so it is created with the table.
+
+    On SQLite this creates an FTS5 external-content table plus sync triggers; on
+    Postgres a generated tsvector column with a GIN index. Other dialects are
+    skipped (search is then unavailable).
+
+    Args:
+        table (Table): The SQLAlchemy table to index; must have an integer `id` key.
+        columns (Sequence[str]): Text columns to index, most important first.
+    """
+    SEARCHABLE_TABLES[table.name] = list(columns)
+    for statement in _sqlite_ddl(table.name, columns):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in _postgres_ddl(table.name, columns):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    event.listen(
+        table,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {fts_table(table.name)}").execute_if(dialect="sqlite"),
+    )
+
+
+def _ensure_table(conn: Connection, table: str, columns: Sequence[str]) -> None:
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": fts_table(table)},
+        ).first()
+        for statement in _sqlite_ddl(table, columns):
+            conn.execute(text(statement))
+        if not exists:
+            # One-off backfill for tables that predate the index; later writes go
+            # through the triggers.
+            conn.execute(text(f"INSERT INTO {fts_table(table)}({fts_table(table)}) VALUES ('rebuild')"))
+    elif dialect == "postgresql":
+        for statement in _postgres_ddl(table, columns):
+            conn.execute(text(statement))
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """
+    Creates missing full-text indexes for tables that already exist.
+
+    `register_search_index` covers tables created through `metadata.create_all`;
+    this covers databases whose tables were created before search was added. It is
+    idempotent and cheap when the indexes are already present.
+
+    Args:
+        engine (Engine): Engine of the application database.
+    """
+    existing = set(inspect(engine).get_table_names())
+    with engine.begin() as conn:
+        for table, columns in SEARCHABLE_TABLES.items():
+            if table in existing:
+                _ensure_table(conn, table, columns)
@@ -1,21 +1,61 @@
+import importlib
+from typing import Any, Callable
+
 from dependency_injector import containers, providers
 
 from src.database.db_config import SessionLocal
+from src.database.instrumentation import RouteQueryAggregates
 from src.repositories.planned_post_repo import PlannedPostRepo
 from src.repositories.post_plan_repo import PostPlanRepo
 
 from src.routers.auth_router import AuthRouter
-from src.routers.image_generation_router import ImageGenerationRouter
-from src.routers.linkedin_router import LinkedInRouter
-from src.routers.mistral_router import MistralRouter
+from src.routers.debug_router import DebugRouter
+from src.routers.metrics_router import MetricsRouter
 from src.routers.post_planning_router import PostPlanningRouter
 from src.routers.post_router import PostRouter
+from src.routers.publish_router import PublishRouter
+from src.routers.search_router import SearchRouter
+from src.routers.upload_router import UploadRouter
 from src.routers.user_router import UserRouter
-from src.routers.x_router import XRouter
 
+from src.services.artifact_lifecycle import ArtifactLifecycleManager, ArtifactPolicy
 from src.services.auth_service import AuthService
+from src.services.post_cache import PostCache
+from src.services.principal_cache import PrincipalCache
 from src.services.post_planning_service import PostPlanningService
+from src.services.post_scheduler import PostScheduler
+from src.services.publish_queue import PublishQueue
+from src.utilities.artifact_index import artifact_index as shared_artifact_index
+from src.utilities.cache import create_cache_backend
+from src.utilities.media_preprocessor import media_preprocessor as shared_media_preprocessor
 from src.utilities.mistral_client import MistralClient
+from src.utilities.password_hasher import password_hasher as shared_password_hasher
+from src.utilities.rate_limit import RateLimiterRegistry
+from src.utilities.renditions import RenditionCache
+from src.utilities.upload_store import UploadStore
+
+
+def _deferred(path: str) -> Callable[..., Any]:
+    """
+    Returns a callable that imports `module:attribute` on first call and calls it.
+
+    Feature modules (LinkedIn, X, publishing, image generation, Mistral) and the
+    libraries they pull in are referenced this way, so importing the container stays
+    cheap and a process with a feature switched off never imports its modules.
+    """
+    module, _, attribute = path.partition(":")
+
+    def create(*args, **kwargs):
+        return getattr(importlib.import_module(module), attribute)(*args, **kwargs)
+
+    create.__qualname__ = create.__name__ = attribute
+    return create
+
+
+def _imported(path: str) -> Any:
+    """Imports and returns `module:attribute` (a module-level shared instance)."""
+    module, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module), attribute)
 
 
 class Container(containers.DeclarativeContainer):
@@ -32,37 +72,273 @@ class Container(containers.DeclarativeContainer):
 
     # Auth service: Singleton to share a single instance across requests,
     # avoiding repeated initialization of security-sensitive components.
+    principal_cache = providers.Singleton(
+        PrincipalCache,
+        ttl=config.auth_principal_cache_ttl,
+        max_entries=config.auth_principal_cache_size,
+    )
+
+    # Password hasher: the module-level instance, shared with password_utils.
+    password_hasher = providers.Object(shared_password_hasher)
+
     auth_service = providers.Singleton(
         AuthService,
         secret_key=config.secret_key,
         algorithm=config.algorithm,
+        principal_cache=principal_cache,
+        embed_principal=config.auth_embed_principal,
+        password_hasher=password_hasher,
     )
 
     # Auth router: Injects auth_service for handling authentication endpoints.
     auth_router = providers.Singleton(AuthRouter, auth_service=auth_service)
 
+    # Cache backend: in-process LRU by default, or a shared Redis instance when configured.
+    cache_backend = providers.Singleton(
+        create_cache_backend,
+        url=config.cache_backend_url,
+        max_entries=config.post_cache_max_entries,
+        max_bytes=config.post_cache_max_bytes,
+        default_ttl=config.post_cache_ttl,
+    )
+
+    # Post cache: serialized feed pages and posts, invalidated by PostService writes.
+    post_cache = providers.Singleton(
+        PostCache,
+        backend=cache_backend,
+        ttl=config.post_cache_ttl,
+        enabled=config.post_cache_enabled,
+    )
+
+    # Image preprocessing (module-level, process pool created on first use): fits images
+    # to each platform's limits before upload and renders upload renditions; shut down
+    # in the app lifespan.
+    media_preprocessor = providers.Object(shared_media_preprocessor)
+
+    # Content-addressed store for post images, their renditions, and the router serving them.
+    upload_store = providers.Singleton(
+        UploadStore,
+        root=config.upload_dir,
+        session_factory=providers.Object(SessionLocal),
+        max_bytes=config.max_image_upload_bytes,
+    )
+    rendition_cache = providers.Singleton(
+        RenditionCache,
+        store=upload_store,
+        root=config.rendition_dir,
+        pool=media_preprocessor,
+        max_bytes=config.rendition_cache_bytes,
+        widths=config.rendition_widths,
+    )
+    upload_router = providers.Singleton(UploadRouter, store=upload_store, renditions=rendition_cache)
+
+    # Index of files under ARTIFACTS_DIR (module-level, shared with the writers) and the
+    # background sweeper enforcing each category's TTL and quota; started in the app lifespan.
+    artifact_index = providers.Object(shared_artifact_index)
+    artifact_lifecycle = providers.Singleton(
+        ArtifactLifecycleManager,
+        index=artifact_index,
+        policies=providers.List(
+            providers.Factory(
+                ArtifactPolicy,
+                category="generated_posts",
+                directory=config.generated_posts_path,
+                ttl=config.generated_posts_ttl,
+                max_bytes=config.generated_posts_max_bytes,
+            ),
+            providers.Factory(
+                ArtifactPolicy,
+                category="media_cache",
+                directory=config.media_cache_dir,
+                ttl=config.media_cache_ttl,
+                max_bytes=config.media_cache_max_bytes,
+            ),
+        ),
+        interval=config.artifact_sweep_interval,
+        upload_store=upload_store,
+        upload_gc_grace=config.upload_gc_grace,
+    )
+
     # Post router: Injects auth_service for protected post-related operations.
-    post_router = providers.Singleton(PostRouter, auth_service=auth_service)
+    post_router = providers.Singleton(PostRouter, auth_service=auth_service, cache=post_cache, uploads=upload_store)
+
+    # Query aggregates: shared by the query stats middleware and the debug router.
+    query_aggregates = providers.Singleton(
+        RouteQueryAggregates,
+        budget=config.db_query_budget,
+        n_plus_one_threshold=config.db_n_plus_one_threshold,
+    )
+
+    debug_router = providers.Singleton(DebugRouter, query_aggregates=query_aggregates)
+
+    # Search router: Stateless; opens its own per-request sessions via get_db.
+    search_router = providers.Singleton(SearchRouter)
+
+    metrics_router = providers.Singleton(MetricsRouter)
 
     # User router: Injects auth_service for user management with auth checks.
     user_router = providers.Singleton(UserRouter, auth_service=auth_service)
 
-    # X (Twitter) router: No injected dependencies; handles its own service internally.
-    x_router = providers.Singleton(XRouter)
+    # Outbound HTTP client: one pooled (HTTP/2, keep-alive) client for the app lifetime,
+    # shared by the LinkedIn API service and OAuth helpers; closed in the app lifespan.
+    http_client = providers.Singleton(
+        _deferred("src.utilities.http_client:create_http_client"),
+        max_connections=config.http_max_connections,
+        max_keepalive_connections=config.http_max_keepalive_connections,
+        keepalive_expiry=config.http_keepalive_expiry,
+        connect_timeout=config.http_connect_timeout,
+        read_timeout=config.http_read_timeout,
+        write_timeout=config.http_write_timeout,
+        pool_timeout=config.http_pool_timeout,
+        http2=config.http2_enabled,
+    )
 
-    # LinkedIn router: No injected dependencies; manages service per-request.
-    linkedin_router = providers.Singleton(LinkedInRouter)
+    # X (Twitter): per-user credentials (encrypted, module-level store) and a pool of
+    # authenticated async clients sharing the outbound HTTP client.
+    x_credential_store = providers.Singleton(_imported, "src.utilities.x_credential_store:x_credential_store")
 
-    image_generation_router = providers.Singleton(ImageGenerationRouter)
+    x_client_pool = providers.Singleton(
+        _deferred("src.services.x_client_pool:XClientPool"),
+        store=x_credential_store,
+        consumer_key=config.x_consumer_key,
+        consumer_secret=config.x_consumer_secret,
+        client=http_client,
+        default_credentials=providers.Callable(
+            _deferred("src.oauth.x_oauth:default_credentials"),
+            access_token=config.x_access_token,
+            access_token_secret=config.x_access_token_secret,
+        ),
+        max_clients=config.x_client_pool_size,
+        ttl=config.x_client_pool_ttl,
+        segment_size=config.x_media_segment_bytes,
+        parallel_segments=config.x_media_parallel_segments,
+    )
+
+    x_router = providers.Singleton(
+        _deferred("src.routers.x_router:XRouter"),
+        auth_service=auth_service,
+        pool=x_client_pool,
+        store=x_credential_store,
+        max_image_bytes=config.max_image_upload_bytes,
+        max_video_bytes=config.max_video_upload_bytes,
+        preprocessor=media_preprocessor,
+    )
+
+    # Content hash → LinkedIn asset cache (module-level, table-backed), so repeated
+    # images are not uploaded again.
+    linkedin_asset_cache = providers.Singleton(
+        _imported, "src.utilities.linkedin_asset_cache:linkedin_asset_cache"
+    )
+
+    # LinkedIn router: Injects auth_service to resolve the user's LinkedIn token.
+    linkedin_router = providers.Singleton(
+        _deferred("src.routers.linkedin_router:LinkedInRouter"),
+        auth_service=auth_service,
+        http_client=http_client,
+        max_image_bytes=config.max_image_upload_bytes,
+        asset_cache=linkedin_asset_cache,
+        preprocessor=media_preprocessor,
+    )
+
+    # LinkedIn OAuth callback: stores the token for the authenticated user.
+    linkedin_callback_router = providers.Singleton(
+        _deferred("src.routers.linkedin_callback_routes:LinkedInCallbackRouter"),
+        auth_service=auth_service,
+        http_client=http_client,
+    )
+
+    # LinkedIn token store (module-level, shared with the LinkedIn dependencies) and the
+    # background sweeper that refreshes tokens ahead of expiry; started in the app lifespan.
+    linkedin_token_store = providers.Singleton(_imported, "src.utilities.token_store:token_store")
+
+    linkedin_token_refresher = providers.Singleton(
+        _deferred("src.services.linkedin_token_refresher:LinkedInTokenRefresher"),
+        store=linkedin_token_store,
+        client=http_client,
+        interval=config.linkedin_token_refresh_interval,
+        refresh_ahead=config.linkedin_token_refresh_ahead,
+    )
+
+    # Publish queue (durable outbox in the database) and the workers draining it; the
+    # workers and the per-account rate limiters are per process, started in the app lifespan.
+    publish_queue = providers.Singleton(
+        PublishQueue,
+        session_factory=providers.Object(SessionLocal),
+        media_dir=config.publish_media_dir,
+        max_attempts=config.publish_max_attempts,
+    )
+
+    publish_rate_limiter = providers.Singleton(RateLimiterRegistry)
+
+    # Per-network publishers, shared by the publish workers and cross-posting.
+    linkedin_publisher = providers.Singleton(
+        _deferred("src.services.publishers:LinkedInPublisher"),
+        client=http_client,
+        asset_cache=linkedin_asset_cache,
+        preprocessor=media_preprocessor,
+    )
+    x_publisher = providers.Singleton(
+        _deferred("src.services.publishers:XPublisher"), pool=x_client_pool, preprocessor=media_preprocessor
+    )
+
+    publish_worker_pool = providers.Singleton(
+        _deferred("src.services.publish_worker:PublishWorkerPool"),
+        queue=publish_queue,
+        publishers=providers.List(linkedin_publisher, x_publisher),
+        limiter=publish_rate_limiter,
+        workers=config.publish_workers,
+        poll_interval=config.publish_poll_interval,
+        lease_seconds=config.publish_lease_seconds,
+        backoff_base=config.publish_backoff_base,
+        backoff_max=config.publish_backoff_max,
+    )
+
+    # Planned post scheduler: hands due planned posts to the publish queue; started in
+    # the app lifespan when enabled.
+    post_scheduler = providers.Singleton(
+        PostScheduler,
+        queue=publish_queue,
+        session_factory=providers.Object(SessionLocal),
+        horizon=config.scheduler_horizon,
+        max_loaded=config.scheduler_max_loaded,
+        resync_interval=config.scheduler_resync_interval,
+    )
+
+    publish_router = providers.Singleton(
+        PublishRouter,
+        auth_service=auth_service,
+        queue=publish_queue,
+        platforms=config.publish_platforms,
+        max_image_bytes=config.max_image_upload_bytes,
+    )
+
+    # Cross-posting: publishes one upload to several networks concurrently.
+    cross_post_service = providers.Singleton(
+        _deferred("src.services.cross_post_service:CrossPostService"),
+        publishers=providers.List(linkedin_publisher, x_publisher),
+        limiter=publish_rate_limiter,
+    )
+
+    cross_post_router = providers.Singleton(
+        _deferred("src.routers.cross_post_router:CrossPostRouter"),
+        auth_service=auth_service,
+        service=cross_post_service,
+        max_image_bytes=config.max_image_upload_bytes,
+    )
+
+    image_generation_router = providers.Singleton(
+        _deferred("src.routers.image_generation_router:ImageGenerationRouter")
+    )
 
     mistral_client = providers.Singleton(
         MistralClient,
         hf_token=config.hf_token,
         model_id=config.mistral_model_id,
-        save_dir=config.generated_posts_path
+        save_dir=config.generated_posts_path,
+        artifacts=artifact_index,
     )
 
-    mistral_router = providers.Singleton(MistralRouter, client=mistral_client)
+    mistral_router = providers.Singleton(_deferred("src.routers.mistral_router:MistralRouter"), client=mistral_client)
 
     db_session = providers.Singleton(SessionLocal)
 
@@ -81,9 +357,11 @@ class Container(containers.DeclarativeContainer):
         plan_repo=post_planning_repo,
         post_repo=planned_post_repo,
         ai_client=mistral_client,
+        scheduler=post_scheduler,
     )
 
     post_planning_router = providers.Factory(
         PostPlanningRouter,
         service=post_planning_service,
+        auth_service=auth_service,
     )
\ No newline at end of file
@@ -1,7 +1,28 @@
-from diffusers import StableDiffusionPipeline, EulerDiscreteScheduler
+import functools
+import logging
 import psutil
 import os
-import torch
+import threading
+import time
+
+from src.utilities.metrics import MODEL_PHASE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# diffusers and torch are imported by initialize_pipeline: they take seconds to import
+# (and the model longer to load), so only processes serving image generation pay for them.
+
+def _device(torch):
+    # DEVICE overrides; otherwise the best available accelerator, falling back to the CPU.
+    device_arg = os.getenv("DEVICE", None)
+    if device_arg:
+        return torch.device(device_arg)
+    if torch.cuda.is_available():
+        return torch.device("cuda")
+    if torch.backends.mps.is_available():
+        return torch.device("mps")
+    return torch.device("cpu")
+
 
 def initialize_pipeline():
     """
@@ -13,16 +34,10 @@ def initialize_pipeline():
     Returns:
         StableDiffusionPipeline: Configured pipeline instance.
     """
-    device_arg = os.getenv("DEVICE", None)
-    if device_arg:
-        device = torch.device(device_arg)
-    else:
-        if torch.cuda.is_available():
-            device = torch.device("cuda")
-        elif torch.backends.mps.is_available():
-            device = torch.device("mps")
-        else:
-            device = torch.device("cpu")
+    from diffusers import StableDiffusionPipeline, EulerDiscreteScheduler
+    import torch
+
+    device = _device(torch)
 
     os.environ["PYTORCH_ENABLE_MPS_FALLBACK"] = "1"
     
@@ -39,10 +54,91 @@ def initialize_pipeline():
     total_memory = psutil.virtual_memory().total
     total_memory_gb = total_memory / (1024 ** 3)
     if (device in ['cpu', 'mps']) and total_memory_gb < 64:
-        print("Enabling attention slicing")
+        logger.info("Enabling attention slicing")
         pipeline.enable_attention_slicing()
-    
+
+    instrument_pipeline(pipeline)
     return pipeline
 
-# Global pipeline: Load once at import time (or app startup) for efficiency.
-pipeline = initialize_pipeline()
+
+def _timed(fn, phase: str):
+    # records each call of `fn` as a model phase (on GPUs: until the kernels are queued).
+    observe = MODEL_PHASE_SECONDS.labels("stable_diffusion", phase).observe
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            observe(time.perf_counter() - start)
+    return wrapper
+
+
+def instrument_pipeline(pipeline) -> None:
+    """Times the prompt encoding and VAE decoding of every generation (see MODEL_PHASE_SECONDS)."""
+    pipeline.encode_prompt = _timed(pipeline.encode_prompt, "encode")
+    pipeline.vae.decode = _timed(pipeline.vae.decode, "vae_decode")
+
+
+class StepTimer:
+    """
+    `callback_on_step_end` for diffusers pipelines recording the duration of each denoising step.
+
+    The first callback only starts the clock, so encoding and setup are not counted as a step.
+    """
+
+    def __init__(self):
+        self._last = None
+        self._observe = MODEL_PHASE_SECONDS.labels("stable_diffusion", "step").observe
+
+    def __call__(self, pipeline, step: int, timestep, callback_kwargs: dict) -> dict:
+        now = time.perf_counter()
+        if self._last is not None:
+            self._observe(now - self._last)
+        self._last = now
+        return callback_kwargs
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+# The pipeline and its scheduler keep per-call state (timesteps, step index), so one
+# generation runs at a time; concurrent requests queue on this lock.
+generation_lock = threading.Lock()
+
+
+def get_pipeline():
+    """
+    Returns the shared pipeline, loading it on first use (thread-safe; blocks while loading).
+
+    Returns:
+        StableDiffusionPipeline: Configured pipeline instance.
+    """
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = initialize_pipeline()
+        return _pipeline
+
+
+
+def preload_pipeline() -> bool:
+    """
+    Loads the pipeline now instead of on first use (IMAGE_MODEL_PRELOAD).
+
+    Under gunicorn with `preload_app` (gunicorn.conf.py) this runs in the master before
+    the workers are forked, so the workers share the weights copy-on-write: inference
+    only reads them, so their pages stay shared and N workers cost about one copy of the
+    model. CUDA and MPS state does not survive a fork, so on those devices nothing is
+    preloaded and each worker loads its own pipeline on first use.
+
+    Returns:
+        bool: Whether the pipeline was loaded.
+    """
+    import torch
+
+    device = _device(torch)
+    if device.type != "cpu":
+        logger.warning("Not preloading the image pipeline on %s: it cannot be shared across forks", device)
+        return False
+    get_pipeline()
+    return True
@@ -1,10 +1,78 @@
+import logging
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from dependency_injector import providers
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
+from src.config.settings import settings
+from src.database.db_config import engine
+from src.database.schema import ensure_schema
+from src.database.search_index import ensure_search_index
 from src.di.di_container import Container
+from src.middleware.query_stats import QueryStatsMiddleware
+from src.middleware.request_metrics import RequestMetricsMiddleware
+from src.utilities.password_hasher import HasherBusy, password_hasher
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: runs one-off startup work before serving requests.
+
+    Checks that OAuth tokens can be encrypted when LinkedIn or X is enabled, creates the
+    tables, columns and full-text indexes missing from databases that predate them and
+    starts the artifact lifecycle sweeper, plus, for the enabled feature groups, drops expired
+    LinkedIn asset cache entries and starts the LinkedIn token refresh sweeper, the
+    publish workers and the planned post scheduler; on shutdown stops them, closes the
+    shared outbound HTTP client and stops the media preprocessing and password hashing pools.
+    """
+    publishing = settings.LINKEDIN_ENABLED or settings.X_ENABLED
+    if publishing:
+        # fails fast (TokenKeyMissing) instead of on the first connected account.
+        app.container.linkedin_token_store().cipher.require()
+    ensure_schema(engine)
+    ensure_search_index(engine)
+    artifacts = app.container.artifact_lifecycle()
+    artifacts.start()
+    if settings.LINKEDIN_ENABLED:
+        try:
+            app.container.linkedin_asset_cache().purge_expired()
+        except Exception:
+            # Housekeeping only: a failed purge must not keep the app from starting.
+            logger.exception("Purging expired LinkedIn assets failed")
+        refresher = app.container.linkedin_token_refresher()
+        refresher.start()
+    if publishing:
+        publish_workers = app.container.publish_worker_pool()
+        publish_workers.start()
+        scheduler = app.container.post_scheduler()
+        if settings.SCHEDULER_ENABLED:
+            scheduler.start()
+    yield
+    if publishing:
+        await scheduler.stop()
+        await publish_workers.stop()
+    if settings.LINKEDIN_ENABLED:
+        await refresher.stop()
+    await artifacts.stop()
+    if publishing:
+        await app.container.http_client().aclose()
+    app.container.media_preprocessor().shutdown()
+    password_hasher.shutdown()
+
+
+async def hasher_busy_handler(request: Request, exc: HasherBusy) -> JSONResponse:
+    # The bcrypt queue is full: ask the client to back off instead of queueing more work.
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many authentication requests, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
 
 
 def create_app() -> FastAPI:
@@ -36,28 +104,126 @@ def create_app() -> FastAPI:
         str(ARTIFACTS_DIR / "generated_posts")
     )
 
-    app = FastAPI()
+    container.config.auth_principal_cache_ttl.from_value(settings.AUTH_PRINCIPAL_CACHE_TTL)
+    container.config.auth_principal_cache_size.from_value(settings.AUTH_PRINCIPAL_CACHE_SIZE)
+    container.config.auth_embed_principal.from_value(settings.AUTH_EMBED_PRINCIPAL)
+
+    container.config.linkedin_token_refresh_interval.from_value(settings.LINKEDIN_TOKEN_REFRESH_INTERVAL)
+    container.config.linkedin_token_refresh_ahead.from_value(settings.LINKEDIN_TOKEN_REFRESH_AHEAD)
+
+    container.config.http_max_connections.from_value(settings.HTTP_MAX_CONNECTIONS)
+    container.config.http_max_keepalive_connections.from_value(settings.HTTP_MAX_KEEPALIVE_CONNECTIONS)
+    container.config.http_keepalive_expiry.from_value(settings.HTTP_KEEPALIVE_EXPIRY)
+    container.config.http_connect_timeout.from_value(settings.HTTP_CONNECT_TIMEOUT)
+    container.config.http_read_timeout.from_value(settings.HTTP_READ_TIMEOUT)
+    container.config.http_write_timeout.from_value(settings.HTTP_WRITE_TIMEOUT)
+    container.config.http_pool_timeout.from_value(settings.HTTP_POOL_TIMEOUT)
+    container.config.http2_enabled.from_value(settings.HTTP2_ENABLED)
+
+    container.config.x_consumer_key.from_value(settings.X_CONSUMER_KEY)
+    container.config.x_consumer_secret.from_value(settings.X_CONSUMER_SECRET)
+    container.config.x_access_token.from_value(settings.X_ACCESS_TOKEN)
+    container.config.x_access_token_secret.from_value(settings.X_ACCESS_TOKEN_SECRET)
+    container.config.x_client_pool_size.from_value(settings.X_CLIENT_POOL_SIZE)
+    container.config.x_client_pool_ttl.from_value(settings.X_CLIENT_POOL_TTL)
+    container.config.x_media_segment_bytes.from_value(settings.X_MEDIA_SEGMENT_BYTES)
+    container.config.x_media_parallel_segments.from_value(settings.X_MEDIA_PARALLEL_SEGMENTS)
+
+    container.config.max_image_upload_bytes.from_value(settings.MAX_IMAGE_UPLOAD_BYTES)
+    container.config.max_video_upload_bytes.from_value(settings.MAX_VIDEO_UPLOAD_BYTES)
+    container.config.upload_dir.from_value(settings.UPLOAD_DIR)
+    container.config.upload_gc_grace.from_value(settings.UPLOAD_GC_GRACE)
+    container.config.rendition_dir.from_value(settings.RENDITION_DIR)
+    container.config.rendition_cache_bytes.from_value(settings.RENDITION_CACHE_BYTES)
+    container.config.rendition_widths.from_value(
+        [int(width) for width in settings.RENDITION_WIDTHS.split(",") if width.strip()]
+    )
+
+    container.config.media_cache_dir.from_value(settings.MEDIA_CACHE_DIR)
+    container.config.artifact_sweep_interval.from_value(settings.ARTIFACT_SWEEP_INTERVAL)
+    container.config.generated_posts_ttl.from_value(settings.GENERATED_POSTS_TTL)
+    container.config.generated_posts_max_bytes.from_value(settings.GENERATED_POSTS_MAX_BYTES)
+    container.config.media_cache_ttl.from_value(settings.MEDIA_CACHE_TTL)
+    container.config.media_cache_max_bytes.from_value(settings.MEDIA_CACHE_MAX_BYTES)
+
+    container.config.publish_workers.from_value(settings.PUBLISH_WORKERS)
+    container.config.publish_poll_interval.from_value(settings.PUBLISH_POLL_INTERVAL)
+    container.config.publish_lease_seconds.from_value(settings.PUBLISH_LEASE_SECONDS)
+    container.config.publish_max_attempts.from_value(settings.PUBLISH_MAX_ATTEMPTS)
+    container.config.publish_backoff_base.from_value(settings.PUBLISH_BACKOFF_BASE)
+    container.config.publish_backoff_max.from_value(settings.PUBLISH_BACKOFF_MAX)
+    container.config.publish_media_dir.from_value(settings.PUBLISH_MEDIA_DIR)
+    container.config.publish_platforms.from_value(
+        [name for name, enabled in (("linkedin", settings.LINKEDIN_ENABLED), ("x", settings.X_ENABLED)) if enabled]
+    )
+
+    container.config.scheduler_horizon.from_value(settings.SCHEDULER_HORIZON)
+    container.config.scheduler_max_loaded.from_value(settings.SCHEDULER_MAX_LOADED)
+    container.config.scheduler_resync_interval.from_value(settings.SCHEDULER_RESYNC_INTERVAL)
+
+    container.config.cache_backend_url.from_value(settings.CACHE_BACKEND_URL)
+    container.config.post_cache_enabled.from_value(settings.POST_CACHE_ENABLED)
+    container.config.post_cache_ttl.from_value(settings.POST_CACHE_TTL)
+    container.config.post_cache_max_entries.from_value(settings.POST_CACHE_MAX_ENTRIES)
+    container.config.post_cache_max_bytes.from_value(settings.POST_CACHE_MAX_BYTES)
+
+    container.config.db_query_budget.from_value(settings.DB_QUERY_BUDGET)
+    container.config.db_n_plus_one_threshold.from_value(settings.DB_N_PLUS_ONE_THRESHOLD)
+
+    # switched-off networks publish nothing (their modules are never imported).
+    if not settings.LINKEDIN_ENABLED:
+        container.linkedin_publisher.override(providers.Object(None))
+    if not settings.X_ENABLED:
+        container.x_publisher.override(providers.Object(None))
+
+    app = FastAPI(lifespan=lifespan)
 
     app.container = container
 
-    # serves uploaded images; adjust directory for production paths.
-    app.mount(
-        "/uploads",
-        StaticFiles(directory=str(ARTIFACTS_DIR / "uploads")),
-        name="uploads",
+    app.add_exception_handler(HasherBusy, hasher_busy_handler)
+
+    # counts SQL statements per request; response headers only in debug mode.
+    app.add_middleware(
+        QueryStatsMiddleware,
+        aggregates=container.query_aggregates(),
+        expose_headers=settings.DEBUG,
     )
 
-    # attaches modular endpoint groups with prefixes and tags for OpenAPI docs.
+    # request latency per route and requests in flight, exported at /metrics.
+    app.add_middleware(RequestMetricsMiddleware)
+
+    # serves uploaded images under immutable, content-hashed URLs.
+    app.include_router(container.upload_router().router)
+
+    # attaches modular endpoint groups with prefixes and tags for OpenAPI docs; feature
+    # groups that are switched off are not constructed (nor their modules imported).
     app.include_router(container.user_router().router, prefix="/users", tags=["users"])
     app.include_router(container.auth_router().router, prefix="/auth", tags=["auth"])
     app.include_router(container.post_router().router, prefix="/posts", tags=["posts"])
-    app.include_router(container.linkedin_router().router, prefix="/linkedin", tags=["linkedin"])
-    app.include_router(container.x_router().router, prefix="/x", tags=["x"])
-    app.include_router(container.image_generation_router().router, tags=["image-generation"])
+    app.include_router(container.search_router().router)
+    app.include_router(container.metrics_router().router)
+    if settings.LINKEDIN_ENABLED:
+        app.include_router(container.linkedin_router().router, prefix="/linkedin", tags=["linkedin"])
+        app.include_router(container.linkedin_callback_router().router, tags=["linkedin"])
+    if settings.X_ENABLED:
+        app.include_router(container.x_router().router, prefix="/x", tags=["x"])
+    if settings.LINKEDIN_ENABLED or settings.X_ENABLED:
+        app.include_router(container.publish_router().router)
+        app.include_router(container.cross_post_router().router)
+    if settings.IMAGE_GENERATION_ENABLED:
+        app.include_router(container.image_generation_router().router, tags=["image-generation"])
+        if settings.IMAGE_MODEL_PRELOAD:
+            # in the gunicorn master when preload_app is set: forked workers share the weights.
+            from src.generation.images.image_pipeline import preload_pipeline
+            preload_pipeline()
+    if settings.MISTRAL_ENABLED:
+        app.include_router(container.mistral_router().router)
 
-    app.include_router(container.mistral_router().router)
     app.include_router(container.post_planning_router().router)
 
+    if settings.DEBUG:
+        app.include_router(container.debug_router().router)
+
     return app
 
 
@@ -0,0 +1,49 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.instrumentation import RouteQueryAggregates, track_queries
+
+
+def route_template(scope: Scope) -> str:
+    """Route path template (e.g. '/posts/{post_id}') for a routed request, else 'unmatched'."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that tracks the SQL statements issued while handling each request.
+
+    Every HTTP request runs inside `track_queries`; the resulting stats are folded
+    into per-route aggregates (which log budget and N+1 warnings) and, when
+    `expose_headers` is on, reported to the client as `X-DB-Queries` and
+    `X-DB-Time-Ms` response headers.
+
+    Args:
+        app (ASGIApp): The wrapped application.
+        aggregates (RouteQueryAggregates): Per-route aggregate store.
+        expose_headers (bool): Whether to add the debug response headers.
+    """
+
+    def __init__(self, app: ASGIApp, aggregates: RouteQueryAggregates, expose_headers: bool = False):
+        self.app = app
+        self.aggregates = aggregates
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start" and self.expose_headers:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-queries", str(stats.count).encode()))
+                    headers.append((b"x-db-time-ms", f"{stats.total_time * 1000:.2f}".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self.aggregates.observe(route_template(scope), stats)
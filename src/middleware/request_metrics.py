@@ -0,0 +1,47 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.middleware.query_stats import route_template
+from src.utilities.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_FLIGHT
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording the latency of every HTTP request and the requests in flight.
+
+    Latencies are labelled with the route template rather than the raw path, so
+    `/posts/1` and `/posts/2` share a series and unmatched paths cannot blow up the
+    label set. A request that raises is recorded with status 500.
+
+    Args:
+        app (ASGIApp): The wrapped application.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            HTTP_REQUEST_SECONDS.labels(method, route_template(scope), str(status)).observe(
+                time.perf_counter() - start
+            )
@@ -1,9 +1,13 @@
 import os
 import time
+from typing import Optional
 
-import requests
+import httpx
 from pydantic import BaseModel
 
+from src.utilities.http_client import use_client
+from src.utilities.metrics import time_phase
+
 
 class LinkedInToken(BaseModel):
     """
@@ -33,22 +37,27 @@ TOKEN_URL     = "https://www.linkedin.com/oauth/v2/accessToken"
 ME_URL        = "https://api.linkedin.com/v2/userinfo"
 
 
-def exchange_authorization_code(code: str) -> LinkedInToken:
+async def exchange_authorization_code(
+    code: str, client: Optional[httpx.AsyncClient] = None
+) -> LinkedInToken:
     """
     Exchanges an authorization code for a LinkedIn access token.
     
-    This function handles the OAuth code exchange flow, fetching a fresh token
-    and the user's URN. It is designed for FastAPI callback endpoints to securely
-    obtain tokens after user consent, enabling subsequent API interactions.
+    This coroutine handles the OAuth code exchange flow and returns the fresh
+    token. The owner URN is not part of the token response; it is left empty
+    and the caller fills it in with `fetch_owner_urn` before saving the token
+    (exchange, then URN lookup, then save).
     
     Args:
         code (str): Temporary authorization code from LinkedIn redirect.
+        client (Optional[httpx.AsyncClient]): HTTP client to use (normally the shared
+            application client); a temporary one is created when omitted.
     
     Returns:
-        LinkedInToken: Parsed token data including access token and URN.
+        LinkedInToken: Parsed token data (with an empty `owner_urn`).
     
     Raises:
-        requests.HTTPError: If the token exchange or user info request fails.
+        httpx.HTTPStatusError: If the token exchange fails.
     """
     data = dict(
         grant_type    = "authorization_code",
@@ -57,40 +66,64 @@ def exchange_authorization_code(code: str) -> LinkedInToken:
         client_id     = CLIENT_ID,
         client_secret = CLIENT_SECRET,
     )
-    resp = requests.post(TOKEN_URL, data=data, timeout=20)
-    resp.raise_for_status()
+    async with use_client(client) as http:
+        with time_phase("linkedin_oauth", "exchange"):
+            resp = await http.post(TOKEN_URL, data=data)
+            resp.raise_for_status()
     payload = resp.json()
-    
-    # Fetch user URN: required for ownership in LinkedIn API calls
-    me = requests.get(ME_URL,
-                      headers={"Authorization": f"Bearer {payload['access_token']}",
-                               "X-Restli-Protocol-Version": "2.0.0"},
-                      timeout=10).json()
-    urn = f"urn:li:person:{me['sub']}"
-    
     return LinkedInToken(
         access_token = payload["access_token"],
         refresh_token= payload.get("refresh_token"),
         expires_at   = time.time() + payload["expires_in"],
-        owner_urn    = urn,
+        owner_urn    = "",
     )
 
 
-def refresh_access_token(refresh_token: str) -> LinkedInToken:
+async def fetch_owner_urn(access_token: str, client: Optional[httpx.AsyncClient] = None) -> str:
+    """
+    Fetches the LinkedIn member URN for an access token via the userinfo endpoint.
+    
+    Args:
+        access_token (str): Access token of the member.
+        client (Optional[httpx.AsyncClient]): HTTP client to use.
+    
+    Returns:
+        str: Member URN (e.g. 'urn:li:person:ID'), required for ownership in API calls.
+    
+    Raises:
+        httpx.HTTPStatusError: If the userinfo request fails.
+    """
+    async with use_client(client) as http:
+        with time_phase("linkedin_oauth", "userinfo"):
+            resp = await http.get(
+                ME_URL,
+                headers={"Authorization": f"Bearer {access_token}",
+                         "X-Restli-Protocol-Version": "2.0.0"},
+            )
+            resp.raise_for_status()
+    return f"urn:li:person:{resp.json()['sub']}"
+
+
+async def refresh_access_token(
+    refresh_token: str, client: Optional[httpx.AsyncClient] = None
+) -> LinkedInToken:
     """
     Refreshes an expired LinkedIn access token using a refresh token.
     
-    This function is used in long-lived sessions or background tasks within FastAPI
-    to maintain access without re-authentication. 
+    This coroutine is used in long-lived sessions or background tasks to maintain
+    access without re-authentication, without blocking the event loop. Callers
+    should coalesce concurrent refreshes for the same user (see
+    `linkedin_helper.refresh_linkedin_token`).
     
     Args:
         refresh_token (str): Valid refresh token from a previous exchange.
+        client (Optional[httpx.AsyncClient]): HTTP client to use.
     
     Returns:
         LinkedInToken: Updated token data with a new access token.
     
     Raises:
-        requests.HTTPError: If the refresh request fails.
+        httpx.HTTPStatusError: If the refresh request fails.
     """
     data = dict(
         grant_type    = "refresh_token",
@@ -98,12 +131,15 @@ def refresh_access_token(refresh_token: str) -> LinkedInToken:
         client_id     = CLIENT_ID,
         client_secret = CLIENT_SECRET,
     )
-    resp = requests.post(TOKEN_URL, data=data, timeout=20)
-    resp.raise_for_status()
+    async with use_client(client) as http:
+        with time_phase("linkedin_oauth", "refresh"):
+            resp = await http.post(TOKEN_URL, data=data)
+            resp.raise_for_status()
     payload = resp.json()
     return LinkedInToken(
         access_token = payload["access_token"],
-        refresh_token= refresh_token,
+        # LinkedIn may rotate the refresh token; keep the old one if it does not.
+        refresh_token= payload.get("refresh_token") or refresh_token,
         expires_at   = time.time() + payload["expires_in"],
-        owner_urn    = "",  # urn is not refetched, assume it's stored elsewhere.
+        owner_urn    = "",  # urn is not refetched; callers keep the stored one.
     )
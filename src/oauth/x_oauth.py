@@ -0,0 +1,64 @@
+from typing import Dict, Optional
+
+from oauthlib.oauth1 import Client as OAuth1Client
+from pydantic import BaseModel
+
+
+class XCredentials(BaseModel):
+    """
+    Pydantic model for a user's X (Twitter) OAuth 1.0a user-context credentials.
+
+    Attributes:
+        access_token (str): User access token.
+        access_token_secret (str): User access token secret.
+        screen_name (str | None): Handle of the account, if known.
+    """
+    access_token: str
+    access_token_secret: str
+    screen_name: str | None = None
+
+
+def default_credentials(access_token: Optional[str], access_token_secret: Optional[str]) -> Optional[XCredentials]:
+    """Returns the app-wide fallback account (X_ACCESS_TOKEN/_SECRET), or None if unset."""
+    if access_token and access_token_secret:
+        return XCredentials(access_token=access_token, access_token_secret=access_token_secret)
+    return None
+
+
+class OAuth1Signer:
+    """
+    Signs X API requests with OAuth 1.0a (HMAC-SHA1) for one account.
+
+    Only the method and URL (with its query) are signed: X does not include JSON
+    or multipart bodies in the signature base string.
+
+    Args:
+        consumer_key (str): App consumer key.
+        consumer_secret (str): App consumer secret.
+        credentials (XCredentials): The account's access token and secret.
+    """
+
+    def __init__(self, consumer_key: str, consumer_secret: str, credentials: XCredentials):
+        self._client = OAuth1Client(
+            consumer_key,
+            client_secret=consumer_secret,
+            resource_owner_key=credentials.access_token,
+            resource_owner_secret=credentials.access_token_secret,
+        )
+
+    def headers(self, method: str, url: str, params: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Returns the Authorization header for one request (fresh nonce and timestamp).
+
+        Args:
+            params (Optional[Dict[str, str]]): Form-encoded body parameters, which are
+                part of the signature (used by the media upload commands).
+        """
+        if params:
+            _, headers, _ = self._client.sign(
+                url, http_method=method, body=params,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+            return {"Authorization": headers["Authorization"]}
+        _, headers, _ = self._client.sign(url, http_method=method)
+        return {"Authorization": headers["Authorization"]}
@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from typing import Type, TypeVar, Generic, List, Optional, Mapping, Any
 from sqlalchemy.orm import Session, DeclarativeMeta
 from pydantic import BaseModel
@@ -29,6 +30,20 @@ class GenericRepo(Generic[Model, CreateSchema]):
             mapped[target_key] = v
         return mapped
 
+    @contextmanager
+    def _write_transaction(self):
+        # Objects written here already hold their new state (including the primary
+        # key and Python-side defaults after flush), so the commit does not expire
+        # them; otherwise the first attribute access afterwards re-SELECTs the row.
+        expire_on_commit = self.session.expire_on_commit
+        self.session.expire_on_commit = False
+        try:
+            with self.session.begin():
+                yield
+                self.session.flush()
+        finally:
+            self.session.expire_on_commit = expire_on_commit
+
     def get(self, id: int) -> Optional[Model]:
         return self.session.get(self.model, id)
 
@@ -37,11 +52,10 @@ class GenericRepo(Generic[Model, CreateSchema]):
 
     def create(self, obj_in: CreateSchema) -> Model:
         try:
-            with self.session.begin():
+            with self._write_transaction():
                 kwargs = self._to_model_kwargs(obj_in, exclude_unset=False)
                 obj = self.model(**kwargs)
                 self.session.add(obj)
-            self.session.refresh(obj)
             return obj
         except Exception:
             self.session.rollback()
@@ -49,11 +63,10 @@ class GenericRepo(Generic[Model, CreateSchema]):
 
     def update(self, obj: Model, obj_in: CreateSchema) -> Model:
         try:
-            with self.session.begin():
+            with self._write_transaction():
                 kwargs = self._to_model_kwargs(obj_in, exclude_unset=True)
                 for k, v in kwargs.items():
                     setattr(obj, k, v)
-            self.session.refresh(obj)
             return obj
         except Exception:
             self.session.rollback()
@@ -7,5 +7,15 @@ class PostPlanRepo(GenericRepo[PostPlan, PostPlanCreate]):
     def __init__(self, session: Session):
         super().__init__(session, PostPlan)
 
+    def create_owned(self, obj_in: PostPlanCreate, owner_id: int) -> PostPlan:
+        try:
+            with self._write_transaction():
+                obj = PostPlan(owner_id=owner_id, **self._to_model_kwargs(obj_in))
+                self.session.add(obj)
+            return obj
+        except Exception:
+            self.session.rollback()
+            raise
+
     def list_by_account(self, account_id: int):
         return self.list(account_id=account_id)
\ No newline at end of file
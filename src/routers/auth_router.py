@@ -1,5 +1,6 @@
 from src.database.db_config import get_db
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from src.schemas import user_schemas, post_schemas
 from src.services.auth_service import AuthService
 from src.services.user_service import UserService
@@ -27,12 +28,13 @@ class AuthRouter:
         # route setup kept private to encapsulate configuration.
     
         @self.router.post("/register", response_model=user_schemas.UserOut)
-        def register(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
+        async def register(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
             """
             Registers a new user.
             
             This endpoint validates the input, checks for username uniqueness, and creates
-            a user record.
+            a user record. Hashing runs on the password hasher's pool and database
+            work on the threadpool, so the event loop is never blocked.
             
             Args:
                 user (user_schemas.UserCreate): Pydantic model with username and password.
@@ -43,19 +45,23 @@ class AuthRouter:
             
             Raises:
                 HTTPException: 400 if the username is already taken.
+                HasherBusy: If the hashing queue is full (mapped to 429).
             """
-            db_user = UserService.get_user_by_username(db, user.username)
+            user_service = UserService(db)
+            db_user = await run_in_threadpool(user_service.get_user_by_username, user.username)
             if db_user:
                 raise HTTPException(status_code=400, detail="User already exists")
-            return UserService.create_user(db, user.username, user.password)
+            hashed_password = await self.auth_service.hash_password(user.password)
+            return await run_in_threadpool(user_service.create_user_with_hash, user.username, hashed_password)
         
         @self.router.post("/login", response_model=post_schemas.Token)
-        def login(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
+        async def login(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
             """
             Authenticates a user and issues a JWT token.
             
             This endpoint verifies credentials and generates an access token for
-            authenticated sessions.
+            authenticated sessions. Stored hashes made with an outdated bcrypt cost
+            are upgraded on success.
             
             Args:
                 user (user_schemas.UserCreate): Pydantic model with username and password.
@@ -66,9 +72,10 @@ class AuthRouter:
             
             Raises:
                 HTTPException: 401 for incorrect username or password.
+                HasherBusy: If the hashing queue is full (mapped to 429).
             """
-            auth_user = UserService.authenticate_user(db, user.username, user.password)
+            auth_user = await self.auth_service.authenticate(db, user.username, user.password)
             if not auth_user:
                 raise HTTPException(status_code=401, detail="Incorrect username or password")
-            token = self.auth_service.create_access_token({"sub": user.username})
+            token = self.auth_service.create_user_token(auth_user)
             return {"access_token": token, "token_type": "bearer"}
@@ -0,0 +1,69 @@
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, File, Form, UploadFile
+from fastapi.responses import JSONResponse
+
+from src.database.models.user import User
+from src.schemas.social_schemas import CrossPostResponse
+from src.services.auth_service import AuthService
+from src.services.cross_post_service import CrossPostService
+from src.utilities.upload_stream import DEFAULT_MAX_IMAGE_BYTES, ImageStream
+
+
+class CrossPostRouter:
+    """
+    Router class for publishing one post to several networks in a single request.
+
+    Args:
+        auth_service (AuthService): Injected service for authenticating the user.
+        service (CrossPostService): Injected cross-posting service.
+        max_image_bytes (int): Largest accepted image upload.
+    """
+
+    def __init__(
+        self,
+        auth_service: AuthService,
+        service: CrossPostService,
+        max_image_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+    ) -> None:
+        self.router = APIRouter(prefix="/crosspost", tags=["crosspost"])
+        self.auth_service = auth_service
+        self.service = service
+        self.max_image_bytes = max_image_bytes
+        self._setup_routes()
+
+    def _setup_routes(self) -> None:
+
+        @self.router.post("/", response_model=CrossPostResponse, responses={207: {"model": CrossPostResponse}})
+        async def cross_post(
+            text: str = Form(...),
+            platforms: List[Literal["linkedin", "x"]] = Form(["linkedin", "x"]),
+            image: Optional[UploadFile] = File(None),
+            current_user: User = Depends(self.auth_service.get_current_user),
+        ):
+            """
+            Publishes one caption (and optional image) to every selected network concurrently.
+
+            The image is uploaded once and validated once (size cap, sniffed type).
+
+            Args:
+                text (str): Post text.
+                platforms (List[str]): Networks to publish to (repeat the field); both by default.
+                image (Optional[UploadFile]): Image to attach.
+                current_user (User): Authenticated user.
+
+            Returns:
+                CrossPostResponse: Per-network results. The status is 200 if every network
+                succeeded, 207 if only some did and 502 if none did.
+
+            Raises:
+                HTTPException: 413 if the image is too large, 415 if it is not an image.
+            """
+            stream = None
+            if image is not None:
+                stream = await ImageStream.from_upload(image, self.max_image_bytes)
+            results = await self.service.cross_post(current_user.id, text, platforms, stream)
+            succeeded = sum(r.ok for r in results)
+            status = 200 if succeeded == len(results) else 207 if succeeded else 502
+            body = CrossPostResponse(results=results)
+            return JSONResponse(status_code=status, content=body.model_dump())
@@ -0,0 +1,53 @@
+from fastapi import APIRouter
+
+from src.database.db_config import get_pool_stats
+from src.database.instrumentation import RouteQueryAggregates
+from src.utilities.process_memory import worker_memory
+
+
+class DebugRouter:
+    """
+    Router class for diagnostic endpoints; only mounted when DEBUG is enabled.
+    
+    Args:
+        query_aggregates (RouteQueryAggregates): Per-route SQL statement aggregates.
+    """
+    
+    def __init__(self, query_aggregates: RouteQueryAggregates) -> None:
+        self.router = APIRouter(prefix="/debug", tags=["debug"])
+        self.query_aggregates = query_aggregates
+        self._setup_routes()
+
+    def _setup_routes(self) -> None:
+        
+        @self.router.get("/queries")
+        def query_stats() -> dict:
+            """
+            Returns per-route SQL statement counts, DB time and N+1/budget hit counts.
+            """
+            return {
+                "budget": self.query_aggregates.budget,
+                "n_plus_one_threshold": self.query_aggregates.n_plus_one_threshold,
+                "routes": self.query_aggregates.snapshot(),
+            }
+
+        @self.router.get("/db-pool")
+        def pool_stats() -> dict:
+            """
+            Returns the application engine's connection pool statistics.
+            """
+            return get_pool_stats()
+
+        @self.router.get("/memory")
+        def memory() -> dict:
+            """
+            Returns the memory (rss, pss, uss in bytes) of every worker process.
+
+            Under gunicorn this lists all workers of the master; the total pss is what
+            they really use together, shared model weights counted once.
+            """
+            workers = worker_memory()
+            return {
+                "workers": workers,
+                "total_pss": sum(worker.get("pss", 0) for worker in workers),
+            }
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 
 from io import BytesIO
 
@@ -6,12 +7,9 @@ import base64
 
 from typing import List
 
-from diffusers import FlowMatchEulerDiscreteScheduler, FluxPipeline  # Assumed imports for the pipeline.
-
-import torch
-
 from src.schemas.image_generation_request import GenerateRequest
-from src.generation.images.image_pipeline import pipeline
+from src.generation.images.image_pipeline import StepTimer, generation_lock, get_pipeline
+from src.utilities.metrics import MODEL_PHASE_SECONDS
 
 class ImageGenerationRouter:
     """
@@ -19,8 +17,8 @@ class ImageGenerationRouter:
     
     This class defines a route for generating images using a diffusion model (e.g., FluxPipeline),
     handling validation, generation, and base64 encoding. It follows FastAPI best practices for
-    async operations, error handling, and response serialization, with the pipeline assumed
-    to be pre-initialized (e.g., globally or via dependency injection).
+    async operations, error handling, and response serialization. The pipeline (and torch) is
+    loaded on the first request, so processes that never generate images never import it.
     """
     
     def __init__(self) -> None:
@@ -53,20 +51,9 @@ class ImageGenerationRouter:
             if request.height % 8 != 0 or request.width % 8 != 0:
                 raise HTTPException(status_code=400, detail="Height and width must both be multiples of 8")
             
-            # Seed calculation: Uses CPU for deterministic RNG; generates sequential seeds for batch.
-            generator = [torch.Generator(device="cpu").manual_seed(i) for i in range(request.seed, request.seed + request.batch_size)]
-            
-            # Image generation: Calls the pipeline with provided params; assumes 'pipeline' is pre-initialized.
-            images = pipeline(
-                height=request.height,
-                width=request.width,
-                prompt=request.prompt,
-                generator=generator,
-                num_inference_steps=request.steps,
-                guidance_scale=request.cfg,
-                num_images_per_prompt=request.batch_size
-            ).images
-            
+            # Generation is blocking (and the first call loads the model): keep it off the event loop.
+            images = await run_in_threadpool(self._generate, request)
+
             # Base64 conversion: Encodes images for easy transmission; note for prod: prefer S3 URLs.
             base64_images: List[str] = []
             for image in images:
@@ -79,5 +66,26 @@ class ImageGenerationRouter:
                 "images": base64_images,
             }
 
+    @staticmethod
+    def _generate(request: GenerateRequest) -> list:
+        pipeline = get_pipeline()
+        import torch  # already loaded with the pipeline
+
+        # Seed calculation: Uses CPU for deterministic RNG; generates sequential seeds for batch.
+        generator = [torch.Generator(device="cpu").manual_seed(i) for i in range(request.seed, request.seed + request.batch_size)]
+
+        # Image generation: Calls the pipeline with provided params; phases are timed for /metrics.
+        with generation_lock, MODEL_PHASE_SECONDS.labels("stable_diffusion", "generate").time():
+            return pipeline(
+                height=request.height,
+                width=request.width,
+                prompt=request.prompt,
+                generator=generator,
+                num_inference_steps=request.steps,
+                guidance_scale=request.cfg,
+                num_images_per_prompt=request.batch_size,
+                callback_on_step_end=StepTimer(),
+            ).images
+
 
 # image_generation_router = ImageGenerationRouter().router
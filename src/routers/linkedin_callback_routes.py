@@ -1,38 +1,62 @@
+from typing import Optional
+
+import httpx
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import RedirectResponse
-from src.oauth.linkedin_oauth import exchange_authorization_code
-from src.services.user_service import get_current_user, User
-from src.utilities.token_store import save_token
-
-# Defines a dedicated router for callback endpoints to keep the main app clean.
-router = APIRouter()
+from src.database.models.user import User
+from src.oauth.linkedin_oauth import exchange_authorization_code, fetch_owner_urn
+from src.services.auth_service import AuthService
+from src.utilities.token_store import token_store
 
 
-@router.get("/linkedin/callback")
-def linkedin_callback(
-    code: str,  # Authorization code from LinkedIn's redirect.
-    state: str,  # CSRF protection state parameter (should be validated in production).
-    current_user: User = Depends(get_current_user),  # Injected current user for associating the token.
-):
+class LinkedInCallbackRouter:
     """
-    Handles the LinkedIn OAuth callback.
-    
-    This endpoint processes the authorization code from LinkedIn, exchanges it for
-    an access token, stores the token associated with the current user, and redirects
-    to a dashboard.
-    
+    Router class for the LinkedIn OAuth callback endpoint.
+
+    Kept separate from LinkedInRouter so it can be mounted at the path registered
+    as LI_REDIRECT_URI ('/linkedin/callback').
+
     Args:
-        code (str): Temporary authorization code from LinkedIn.
-        state (str): State parameter for CSRF validation (not validated here; add checks in prod).
-        current_user (User): Authenticated user via dependency injection.
-    
-    Returns:
-        RedirectResponse: Redirects to the dashboard with a success query parameter.
-    
-    Note: In production, validate the 'state' parameter to prevent CSRF attacks.
+        auth_service (AuthService): Injected service for identifying the user the
+            LinkedIn connection belongs to.
+        http_client (Optional[httpx.AsyncClient]): Injected application-wide HTTP client.
     """
-    # cache the token in RAM instead of persisting to the DB for ephemeral storage.
-    token = exchange_authorization_code(code)   
-    save_token(current_user.id, token)                 
 
-    return RedirectResponse("/dashboard?linkedin=ok")
+    def __init__(self, auth_service: AuthService, http_client: Optional[httpx.AsyncClient] = None):
+        self.router = APIRouter()
+        self.auth_service = auth_service
+        self.http_client = http_client
+        self._setup_routes()  # Internal method to define routes.
+
+    def _setup_routes(self):
+
+        @self.router.get("/linkedin/callback")
+        async def linkedin_callback(
+            code: str,  # Authorization code from LinkedIn's redirect.
+            state: str,  # CSRF protection state parameter (should be validated in production).
+            current_user: User = Depends(self.auth_service.get_current_user),  # Injected current user for associating the token.
+        ):
+            """
+            Handles the LinkedIn OAuth callback.
+
+            This endpoint exchanges the authorization code for an access token, looks up
+            the member URN (userinfo) and stores the token with it, then redirects to the
+            dashboard. Nothing is stored if either LinkedIn call fails.
+
+            Args:
+                code (str): Temporary authorization code from LinkedIn.
+                state (str): State parameter for CSRF validation (not validated here; add checks in prod).
+                current_user (User): Authenticated user via dependency injection.
+
+            Returns:
+                RedirectResponse: Redirects to the dashboard with a success query parameter.
+
+            Note: In production, validate the 'state' parameter to prevent CSRF attacks.
+            """
+            token = await exchange_authorization_code(code, client=self.http_client)
+            token.owner_urn = await fetch_owner_urn(token.access_token, client=self.http_client)
+            # persisted (encrypted) so every worker sees the connection and it survives restarts.
+            await run_in_threadpool(token_store.save, current_user.id, token)
+
+            return RedirectResponse("/dashboard?linkedin=ok")
@@ -1,39 +1,78 @@
-import os
-import shutil
-import tempfile
+import asyncio
+from typing import List, Optional
 
+import httpx
 from fastapi import (
 	APIRouter,
 	UploadFile,
 	File,
 	Form,
 	Depends,
+	HTTPException,
 )
+from src.database.models.user import User
+from src.services.auth_service import AuthService
 from src.services.linkedin_service import LinkedInApiService  # Service for LinkedIn API interactions.
-from src.utilities.linkedin_helper import get_linkedin_token
+from src.utilities.linkedin_asset_cache import LinkedInAssetCache
+from src.utilities.linkedin_helper import linkedin_token_dependency
+from src.utilities.media_preprocessor import MediaPreprocessor
+from src.utilities.upload_stream import DEFAULT_MAX_IMAGE_BYTES, ImageStream
 
 
 class LinkedInRouter:
     """
     Router class for LinkedIn integration endpoints in FastAPI.
     
-    This class defines routes for posting text and images to LinkedIn, using dependency
-    injection for tokens and handling temporary file uploads securely. It is supposed to
-    ensure reliable social media posting with minimal resource leaks.
+    This class defines routes for posting text and one or more images to LinkedIn, using dependency
+    injection for tokens and streaming uploaded images straight to LinkedIn. It is supposed
+    to ensure reliable social media posting with minimal resource leaks.
+    
+    Args:
+        auth_service (AuthService): Injected service authenticating the user whose
+            LinkedIn token is used.
+        http_client (Optional[httpx.AsyncClient]): Injected application-wide HTTP client
+            shared by all LinkedIn API calls.
+        max_image_bytes (int): Largest accepted image upload.
+        asset_cache (Optional[LinkedInAssetCache]): Reuses assets of images uploaded before.
+        preprocessor (Optional[MediaPreprocessor]): Fits images to LinkedIn's limits before upload.
     """
     
-    def __init__(self) -> None:
-        # sets prefix and tags for OpenAPI grouping; no additional params needed.
+    def __init__(
+        self,
+        auth_service: AuthService,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_image_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+        asset_cache: Optional[LinkedInAssetCache] = None,
+        preprocessor: Optional[MediaPreprocessor] = None,
+    ) -> None:
+        # sets prefix and tags for OpenAPI grouping.
         self.router = APIRouter(prefix="/linkedin", tags=["LinkedIn"])
+        self.auth_service = auth_service
+        self.http_client = http_client
+        self.max_image_bytes = max_image_bytes
+        self.asset_cache = asset_cache
+        self.preprocessor = preprocessor
         self._setup_routes()  # Internal method to configure routes.
 
+    async def _prepare(self, stream: ImageStream) -> ImageStream:
+        # resized/recompressed for LinkedIn, metadata stripped.
+        if self.preprocessor is None:
+            return stream
+        return await self.preprocessor.prepare(stream, "linkedin")
+
+    def _service(self, token, user: User) -> LinkedInApiService:
+        # the user id lets the service save a token it has to refresh mid-request.
+        return LinkedInApiService(token, client=self.http_client, asset_cache=self.asset_cache, user_id=user.id)
+
     def _setup_routes(self) -> None:
         # defines async handlers; kept private for encapsulation.
+        get_linkedin_token = linkedin_token_dependency(self.auth_service, self.http_client)
         
         @self.router.post("/post")
         async def post_text(
             caption: str = Form(...),
-            token=Depends(get_linkedin_token)  # injected LinkedIn token via dependency.
+            token=Depends(get_linkedin_token),  # injected LinkedIn token via dependency.
+            current_user: User = Depends(self.auth_service.get_current_user),  # resolved once, shared with the token dependency.
         ):
             """
             Creates a text post on LinkedIn.
@@ -49,21 +88,22 @@ class LinkedInRouter:
             Returns:
                 dict: Success message and post URN.
             """
-            urn = await LinkedInApiService(token).post_text(caption)
+            urn = await self._service(token, current_user).post_text(caption)
             return {"message": "LinkedIn text post created", "post_urn": urn}
         
         @self.router.post("/post-with-image")
         async def post_image(
             caption: str = Form(...),  
             image: UploadFile = File(...),
-            token=Depends(get_linkedin_token)  
+            token=Depends(get_linkedin_token),
+            current_user: User = Depends(self.auth_service.get_current_user),
         ):
             """
             Creates an image post on LinkedIn.
             
-            This async endpoint handles file uploads by saving to a temporary file,
-            posting via the service, and ensuring cleanup in a finally block. It uses async for efficiency
-            and raising exceptions for errors like invalid tokens or API failures.
+            This async endpoint validates the upload in place (size cap, sniffed image
+            type), fits it to LinkedIn's limits (size, encoding, no metadata) and
+            streams the result to LinkedIn in chunks.
             
             Args:
                 caption (str): Text caption for the image post.
@@ -73,15 +113,44 @@ class LinkedInRouter:
             Returns:
                 dict: Success message and post URN.
             
-            Note: Temp file is always removed to prevent disk clutter; consider async file I/O for very large files.
+            Raises:
+                HTTPException: 413 if the image is too large, 415 if it is not an image.
             """
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-                shutil.copyfileobj(image.file, tmp)
-                tmp_path = tmp.name
-            try:
-                urn = await LinkedInApiService(token).post_with_image(caption, tmp_path)
-                return {"message": "LinkedIn image post created", "post_urn": urn}
-            finally:
-                os.remove(tmp_path)
-
-linkedin_router = LinkedInRouter().router
+            stream = await self._prepare(await ImageStream.from_upload(image, self.max_image_bytes))
+            urn = await self._service(token, current_user).post_with_image(caption, stream)
+            return {"message": "LinkedIn image post created", "post_urn": urn}
+        
+        @self.router.post("/post-with-images")
+        async def post_images(
+            caption: str = Form(...),
+            images: List[UploadFile] = File(...),
+            token=Depends(get_linkedin_token),
+            current_user: User = Depends(self.auth_service.get_current_user),
+        ):
+            """
+            Creates a multi-image post on LinkedIn.
+            
+            Every image is validated like a single upload and the images are then
+            uploaded to LinkedIn concurrently, so a post with several images takes
+            about as long to publish as one with a single image.
+            
+            Args:
+                caption (str): Text caption for the post.
+                images (List[UploadFile]): Uploaded image files, in display order.
+                token: Auth token from dependency.
+            
+            Returns:
+                dict: Success message and post URN.
+            
+            Raises:
+                HTTPException: 422 if more images are sent than LinkedIn allows, 413 if an
+                    image is too large, 415 if a file is not an image.
+            """
+            if len(images) > LinkedInApiService.MAX_IMAGES:
+                raise HTTPException(
+                    status_code=422, detail=f"At most {LinkedInApiService.MAX_IMAGES} images per post"
+                )
+            streams = [await ImageStream.from_upload(image, self.max_image_bytes) for image in images]
+            streams = list(await asyncio.gather(*(self._prepare(stream) for stream in streams)))
+            urn = await self._service(token, current_user).post_with_images(caption, streams)
+            return {"message": "LinkedIn image post created", "post_urn": urn}
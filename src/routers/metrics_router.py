@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from src.utilities.metrics import scrape_registry
+
+
+class MetricsRouter:
+    """
+    Router class exposing application metrics in the Prometheus text format.
+
+    Under gunicorn with PROMETHEUS_MULTIPROC_DIR set, a scrape aggregates every worker.
+    """
+
+    def __init__(self) -> None:
+        self.router = APIRouter(tags=["metrics"])
+        self._setup_routes()
+
+    def _setup_routes(self) -> None:
+
+        @self.router.get("/metrics", include_in_schema=False)
+        def metrics() -> Response:
+            """
+            Returns all registered metrics (request latencies, outbound API phase timings,
+            model phases, cache hits, DB pool and worker memory).
+            """
+            return Response(generate_latest(scrape_registry()), media_type=CONTENT_TYPE_LATEST)
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from typing import List
 
+from src.database.models.user import User
+from src.services.auth_service import AuthService
 from src.services.post_planning_service import PostPlanningService
 from src.schemas.planning import (
     PostPlanCreate,
@@ -11,25 +13,30 @@ from src.schemas.planning import (
 
 
 class PostPlanningRouter:
-    def __init__(self, service: PostPlanningService):
+    # Every route requires a logged-in user: plans belong to their creator, and their
+    # scheduled posts are published on that user's connected accounts.
+    def __init__(self, service: PostPlanningService, auth_service: AuthService):
         self.service = service
+        self.auth_service = auth_service
         self.router = APIRouter(prefix="/planning", tags=["planning"])
         self._attach_routes()
 
     def _attach_routes(self):
+        current_user = Depends(self.auth_service.get_current_user)
+
         @self.router.post("/", response_model=PostPlanRead)
-        def create_plan(data: PostPlanCreate):
+        def create_plan(data: PostPlanCreate, user: User = current_user):
             try:
-                return self.service.create_plan(data)
+                return self.service.create_plan(data, user.id)
             except ValueError as e:
                 raise HTTPException(status_code=400, detail=str(e))
             except Exception as e:
                 raise HTTPException(status_code=500, detail="Failed to create plan") from e
 
         @self.router.post("/{plan_id}/generate", response_model=List[PlannedPostRead])
-        def ai_generate(plan_id: int):
+        def ai_generate(plan_id: int, user: User = current_user):
             try:
-                return self.service.generate_posts(plan_id)
+                return self.service.generate_posts(plan_id, user.id)
             except ValueError as e:
                 raise HTTPException(status_code=404, detail=str(e))
             except Exception as e:
@@ -39,10 +46,10 @@ class PostPlanningRouter:
             "/{plan_id}/posts/{post_id}", response_model=PlannedPostRead
         )
         def update_post(
-            plan_id: int, post_id: int, data: PlannedPostCreate
+            plan_id: int, post_id: int, data: PlannedPostCreate, user: User = current_user
         ):
             try:
-                return self.service.update_post(plan_id, post_id, data)
+                return self.service.update_post(plan_id, post_id, data, user.id)
             except ValueError as e:
                 raise HTTPException(status_code=404, detail=str(e))
             except Exception as e:
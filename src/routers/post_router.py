@@ -1,14 +1,13 @@
-import os
-import shutil
-import uuid
 from typing import Annotated, Optional
 
 from src.database.db_config import get_db
 from src.database.models import user
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response
 from src.schemas import post_schemas
 from src.services.auth_service import AuthService
-from src.services.post_service import PostService
+from src.services.post_cache import PostCache
+from src.services.post_service import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PostService
+from src.utilities.upload_store import UploadStore
 from sqlalchemy.orm import Session
 
 
@@ -21,38 +20,74 @@ class PostRouter:
     
     Args:
         auth_service (AuthService): Injected service for handling user authentication.
+        cache (Optional[PostCache]): Injected cache for serialized feed pages and posts.
+        uploads (Optional[UploadStore]): Injected store for post images.
     """
     
-    def __init__(self, auth_service: AuthService):
+    def __init__(
+        self, auth_service: AuthService, cache: Optional[PostCache] = None, uploads: Optional[UploadStore] = None
+    ):
         # configures the APIRouter; prefixes/tags set in main app.
         self.router = APIRouter()
         self.auth_service = auth_service
+        self.cache = cache
+        self.uploads = uploads
         self._setup_routes()
 
+    def _service(self, db: Session) -> PostService:
+        return PostService(db, cache=self.cache, uploads=self.uploads)
+
     def _setup_routes(self):
         # encapsulates endpoint definitions for better organization.
         
-        @self.router.get("/", response_model=list[post_schemas.Post])
+        @self.router.get("/", response_model=post_schemas.PostPage)
         def list_posts(
             db: Session = Depends(get_db),  # injected DB session.
             category: Optional[str] = Query(None, description="Filter by category"),  # optional query param.
-            sort_by: Optional[str] = Query("likes", description="Sorting: 'likes' or 'newest'")  # optional with default.
+            sort_by: Optional[str] = Query("likes", description="Sorting: 'likes' or 'newest'"),  # optional with default.
+            limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+            cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
         ):
             """
-            Lists posts with optional filtering and sorting.
+            Lists one page of posts with optional filtering and sorting.
             
-            This endpoint fetches posts from the database, applying filters and sorting
-            via the service layer.
+            This endpoint uses keyset pagination: pass the returned `next_cursor` back
+            as `cursor` to fetch the following page. Cursors are tied to the sort order.
+            Pages are served from the post cache as pre-serialized JSON when available.
             
             Args:
                 db (Session): Database session.
                 category (Optional[str]): Filter by post category.
                 sort_by (Optional[str]): Sort order ('likes' or 'newest').
+                limit (int): Page size (1..MAX_PAGE_SIZE).
+                cursor (Optional[str]): Cursor for the next page.
             
             Returns:
-                list[post_schemas.Post]: List of matching posts.
+                post_schemas.PostPage: Posts on this page and the next cursor.
+            
+            Raises:
+                HTTPException: 400 for an unknown sort order or an invalid cursor.
             """
-            return PostService.get_posts(db, category=category, sort_by=sort_by)
+            sort_by = sort_by or "likes"
+
+            def render() -> bytes:
+                items, next_cursor = self._service(db).get_posts(
+                    category=category, sort_by=sort_by, limit=limit, cursor=cursor
+                )
+                page = post_schemas.PostPage(
+                    items=[post_schemas.Post.model_validate(p) for p in items],
+                    next_cursor=next_cursor,
+                )
+                return page.model_dump_json().encode()
+
+            try:
+                if self.cache is None:
+                    body = render()
+                else:
+                    body = self.cache.feed_page(category, sort_by, limit, cursor, render)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            return Response(content=body, media_type="application/json")
         
         @self.router.get("/{post_id}", response_model=post_schemas.Post)
         def get_post_by_id(post_id: int, db: Session = Depends(get_db)):
@@ -72,10 +107,16 @@ class PostRouter:
             Raises:
                 HTTPException: 404 if the post is not found.
             """
-            post = PostService.get_post(db, post_id)
-            if not post:
+            def render() -> Optional[bytes]:
+                post = self._service(db).get_post(post_id)
+                if not post:
+                    return None
+                return post_schemas.Post.model_validate(post).model_dump_json().encode()
+
+            body = render() if self.cache is None else self.cache.post(post_id, render)
+            if body is None:
                 raise HTTPException(status_code=404, detail="Post not found")
-            return post
+            return Response(content=body, media_type="application/json")
         
         @self.router.delete("/{post_id}")
         def delete_post(
@@ -100,7 +141,7 @@ class PostRouter:
             Raises:
                 HTTPException: 403 if not allowed or post not found.
             """
-            success = PostService.delete_post(db, current_user, post_id)
+            success = self._service(db).delete_post(current_user, post_id)
             if not success:
                 raise HTTPException(status_code=403, detail="Not allowed or post not found")
             return {"message": "Deleted"}
@@ -115,9 +156,10 @@ class PostRouter:
             """
             Uploads and associates an image with a post.
             
-            This endpoint handles file uploads securely, generates unique names, and
-            updates the post if owned by the user. It ensures the upload directory exists
-            and uses efficient copying to minimize I/O overhead in FastAPI apps.
+            The upload is streamed into the content-addressed upload store (hashed,
+            size-checked and type-sniffed in one pass, written atomically, stored
+            once however often it is uploaded) and the post then points at its
+            immutable URL. The previous image loses its reference.
             
             Args:
                 post_id (int): ID of the post to update.
@@ -129,17 +171,14 @@ class PostRouter:
                 post_schemas.Post: Updated post data.
             
             Raises:
-                HTTPException: 403 if not allowed or post not found.
+                HTTPException: 403 if not allowed or post not found, 413 if the image is
+                    too large, 415 if it is not an image.
             """
-            os.makedirs("uploads", exist_ok=True)  # directory for uploads.
-            filename = f"{uuid.uuid4().hex}_{image.filename}"  # filename to prevent collisions.
-            filepath = os.path.join("uploads", filename)
-            
-            with open(filepath, "wb") as buffer:
-                shutil.copyfileobj(image.file, buffer)  # stream copy.
-            
-            image_url = f"/uploads/{filename}"
-            post = PostService.update_post_image(db, current_user, post_id, image_url)
+            if self.uploads is None:
+                raise HTTPException(status_code=503, detail="Uploads are not configured")
+            # a sync endpoint already runs on the threadpool, so the blocking write is fine here.
+            image_url = self.uploads.put(image.file)
+            post = self._service(db).update_post_image(current_user, post_id, image_url)
             if not post:
                 raise HTTPException(status_code=403, detail="Not allowed or post not found")
             return post
@@ -162,4 +201,4 @@ class PostRouter:
             Returns:
                 list[post_schemas.Post]: List of user's posts.
             """
-            return PostService.get_user_posts(db, current_user)
+            return self._service(db).get_user_posts(current_user)
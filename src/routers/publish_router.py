@@ -0,0 +1,102 @@
+from typing import Collection, Literal, Optional
+
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from src.database.models.user import User
+from src.schemas.publish_schemas import PublishJobRead
+from src.services.auth_service import AuthService
+from src.services.publish_queue import PublishQueue
+from src.utilities.upload_stream import DEFAULT_MAX_IMAGE_BYTES, ImageStream
+
+
+class PublishRouter:
+    """
+    Router class for queued publishing to LinkedIn and X.
+
+    Unlike the direct `/linkedin` and `/x` endpoints, these only record the post
+    in the durable publish queue and answer 202; background workers publish it
+    within the platform's rate limits and retry transient failures. Clients
+    poll the returned job for the outcome. Platforms switched off in settings
+    are rejected up front instead of queued.
+
+    Args:
+        auth_service (AuthService): Injected service for authenticating the user.
+        queue (PublishQueue): Injected publish queue.
+        platforms (Collection[str]): Enabled platforms ('linkedin', 'x').
+        max_image_bytes (int): Largest accepted image upload.
+    """
+
+    def __init__(
+        self,
+        auth_service: AuthService,
+        queue: PublishQueue,
+        platforms: Collection[str],
+        max_image_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+    ) -> None:
+        self.router = APIRouter(prefix="/publish", tags=["publish"])
+        self.auth_service = auth_service
+        self.queue = queue
+        self.platforms = frozenset(platforms)
+        self.max_image_bytes = max_image_bytes
+        self._setup_routes()
+
+    def _setup_routes(self) -> None:
+
+        @self.router.post("/{platform}", response_model=PublishJobRead, status_code=202)
+        async def enqueue_post(
+            platform: Literal["linkedin", "x"],
+            text: str = Form(...),
+            image: Optional[UploadFile] = File(None),
+            idempotency_key: Optional[str] = Header(None, max_length=255),
+            current_user: User = Depends(self.auth_service.get_current_user),
+        ):
+            """
+            Queues a post for publishing.
+
+            Sending the same `Idempotency-Key` header again returns the job created
+            by the first request instead of publishing twice.
+
+            Args:
+                platform (str): 'linkedin' or 'x'.
+                text (str): Post text.
+                image (Optional[UploadFile]): Image to attach.
+                idempotency_key (Optional[str]): Client key for safe retries.
+                current_user (User): Authenticated user whose account publishes the post.
+
+            Returns:
+                PublishJobRead: The queued (or previously queued) job.
+
+            Raises:
+                HTTPException: 404 if the platform is disabled, 413 if the image is
+                    too large, 415 if it is not an image.
+            """
+            if platform not in self.platforms:
+                raise HTTPException(status_code=404, detail=f"Publishing to {platform} is not enabled")
+            media_path = None
+            if image is not None:
+                stream = await ImageStream.from_upload(image, self.max_image_bytes)
+                media_path = await self.queue.save_media(stream)
+            job, created = await run_in_threadpool(
+                self.queue.enqueue, current_user.id, platform, {"text": text},
+                media_path=media_path, idempotency_key=idempotency_key,
+            )
+            if not created:
+                await run_in_threadpool(self.queue.delete_media, media_path)
+            return job
+
+        @self.router.get("/jobs/{job_id}", response_model=PublishJobRead)
+        async def get_job(
+            job_id: int,
+            current_user: User = Depends(self.auth_service.get_current_user),
+        ):
+            """
+            Returns the status of one of the current user's publish jobs.
+
+            Raises:
+                HTTPException: 404 if the job does not exist or belongs to another user.
+            """
+            job = await run_in_threadpool(self.queue.get, job_id, current_user.id)
+            if job is None:
+                raise HTTPException(status_code=404, detail="Publish job not found")
+            return job
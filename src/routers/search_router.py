@@ -0,0 +1,56 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from src.database.db_config import get_db
+from src.schemas.search_schemas import SearchPage
+from src.services.search_service import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, SearchService
+
+
+class SearchRouter:
+    """
+    Router class for full-text search endpoints in FastAPI.
+    
+    This class exposes ranked, highlighted search over posts and planned posts,
+    backed by the database's full-text index.
+    """
+    
+    def __init__(self) -> None:
+        self.router = APIRouter(prefix="/search", tags=["search"])
+        self._setup_routes()
+
+    def _setup_routes(self) -> None:
+        
+        @self.router.get("/", response_model=SearchPage)
+        def search(
+            db: Annotated[Session, Depends(get_db)],
+            q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+            scope: str = Query("posts", description="'posts' or 'planned_posts'"),
+            limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+            cursor: str | None = Query(None, description="Opaque cursor from the previous page"),
+        ):
+            """
+            Searches post or planned post content.
+            
+            Results are ranked by relevance, matched terms are wrapped in <mark> tags,
+            and pages are fetched with the returned `next_cursor`.
+            
+            Args:
+                db (Session): Database session.
+                q (str): Search terms.
+                scope (str): Which content to search.
+                limit (int): Page size.
+                cursor (str | None): Cursor for the next page.
+            
+            Returns:
+                SearchPage: Hits on this page and the next cursor.
+            
+            Raises:
+                HTTPException: 400 for an unknown scope or an invalid cursor.
+            """
+            try:
+                items, next_cursor = SearchService(db).search(q, scope=scope, limit=limit, cursor=cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,74 @@
+import os
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from src.utilities.renditions import FORMATS, RenditionCache
+from src.utilities.upload_store import UploadStore
+
+# Stored uploads are named by their content hash, so a URL always means the same bytes.
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class UploadRouter:
+    """
+    Router class serving files from the content-addressed upload store.
+
+    Responses carry a year-long immutable Cache-Control and the content hash as
+    ETag, so browsers and CDNs fetch each image once; byte ranges are supported.
+    Smaller or WebP variants for list views are served from the rendition cache.
+
+    Args:
+        store (UploadStore): Injected upload store.
+        renditions (Optional[RenditionCache]): Injected rendition cache; renditions
+            are not served without one.
+    """
+
+    def __init__(self, store: UploadStore, renditions: Optional[RenditionCache] = None) -> None:
+        self.router = APIRouter(prefix=store.url_prefix, tags=["Uploads"])
+        self.store = store
+        self.renditions = renditions
+        self._setup_routes()
+
+    @staticmethod
+    def _serve(path: str, etag: str, request: Request, media_type: Optional[str] = None) -> Response:
+        headers = {"Cache-Control": IMMUTABLE, "ETag": etag}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        # FileResponse answers Range / If-Range requests with 206 partial content.
+        return FileResponse(path, media_type=media_type, headers=headers)
+
+    def _setup_routes(self) -> None:
+        @self.router.get("/{name}")
+        def get_upload(name: str, request: Request):
+            """
+            Serves a stored upload by its hashed name.
+
+            Raises:
+                HTTPException: 404 if no such file is stored.
+            """
+            path = self.store.path_for(name)
+            if path is None or not os.path.isfile(path):
+                raise HTTPException(status_code=404, detail="Not found")
+            return self._serve(path, f'"{name.split(".", 1)[0]}"', request)
+
+        @self.router.get("/{name}/w{width}.{fmt}")
+        async def get_rendition(name: str, width: int, fmt: str, request: Request):
+            """
+            Serves the upload scaled down to `width` pixels and encoded as `fmt`.
+
+            The variant is rendered on first request (on the image worker pool) and
+            cached on disk; e.g. `/uploads/<sha256>.png/w320.webp`.
+
+            Raises:
+                HTTPException: 404 if the upload does not exist, or the width or
+                    format is not one that is offered.
+            """
+            if self.renditions is None:
+                raise HTTPException(status_code=404, detail="Not found")
+            path = await self.renditions.get(name, width, fmt)
+            if path is None:
+                raise HTTPException(status_code=404, detail="Not found")
+            etag = f'"{name.split(".", 1)[0]}-w{width}-{fmt}"'
+            return self._serve(path, etag, request, FORMATS[fmt])
@@ -3,6 +3,7 @@ from typing import Annotated
 from src.database.db_config import get_db
 from src.database.models.user import User
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from src.schemas.user_schemas import UserCreate, UserUpdate, UserOut
 from src.services.auth_service import AuthService
 from src.services.user_service import UserService
@@ -29,7 +30,7 @@ class UserRouter:
         # encapsulates endpoint handlers for organization.
         
         @self.router.post("/register", response_model=UserOut)
-        def register(user: UserCreate, db: Annotated[Session, Depends(get_db)]):
+        async def register(user: UserCreate, db: Annotated[Session, Depends(get_db)]):
             """
             Registers a new user.
             
@@ -45,13 +46,14 @@ class UserRouter:
             
             Raises:
                 HTTPException: 400 if the username is already registered.
+                HasherBusy: If the hashing queue is full (mapped to 429).
             """
-            db_user = UserService.get_user_by_username(db, user.username)
+            user_service = UserService(db)
+            db_user = await run_in_threadpool(user_service.get_user_by_username, user.username)
             if db_user:
                 raise HTTPException(status_code=400, detail="Username already registered")
-            hashed_pw = AuthService.get_password_hash(user.password)
-            new_user = UserService.create_user(db, user.username, hashed_pw)
-            return new_user
+            hashed_pw = await self.auth_service.hash_password(user.password)
+            return await run_in_threadpool(user_service.create_user_with_hash, user.username, hashed_pw)
         
         @self.router.get("/me", response_model=UserOut)
         def get_me(current_user: Annotated[User, Depends(self.auth_service.get_current_user)]):
@@ -70,7 +72,7 @@ class UserRouter:
             return current_user
         
         @self.router.put("/me", response_model=UserOut)
-        def update_me(
+        async def update_me(
             update: UserUpdate,  # input data for updates.
             db: Annotated[Session, Depends(get_db)],
             current_user: Annotated[User, Depends(self.auth_service.get_current_user)]
@@ -80,7 +82,8 @@ class UserRouter:
             
             This endpoint allows partial updates to username or password, hashing new
             passwords securely and committing changes transactionally. It ensures only
-            the authenticated user can modify their own data.
+            the authenticated user can modify their own data, and drops the user from
+            the principal cache so the change is visible on the next request.
             
             Args:
                 update (UserUpdate): Fields to update (username or password).
@@ -89,11 +92,18 @@ class UserRouter:
             
             Returns:
                 UserOut: Updated user data.
+            
+            Raises:
+                HasherBusy: If the hashing queue is full (mapped to 429).
             """
+            old_username = current_user.username
             if update.username:
                 current_user.username = update.username
             if update.password:
-                current_user.hashed_password = AuthService.get_password_hash(update.password)
-            db.commit()
-            db.refresh(current_user)
+                current_user.hashed_password = await self.auth_service.hash_password(update.password)
+                # revokes tokens issued with the old password (when versions are embedded).
+                current_user.token_version = (current_user.token_version or 0) + 1
+            await run_in_threadpool(db.commit)
+            await run_in_threadpool(db.refresh, current_user)
+            self.auth_service.invalidate_user(current_user.id, old_username, current_user.username)
             return current_user
\ No newline at end of file
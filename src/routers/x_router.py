@@ -1,93 +1,216 @@
-import os
-import shutil
-import tempfile
+import time
+from typing import Optional
 
 from fastapi import (
 	APIRouter,
 	UploadFile,
 	File,
 	Form,
+	Depends,
 	HTTPException,
+	Response,
 )
-from src.services.x_service import XApiService
+from fastapi.concurrency import run_in_threadpool
+import httpx
+
+from src.database.models.user import User
+from src.oauth.x_oauth import XCredentials
+from src.services.auth_service import AuthService
+from src.services.x_client_pool import XClientPool, XNotConfigured
+from src.services.x_service import MediaUploadInterrupted, XApiError, XApiService
+from src.utilities.media_preprocessor import MediaPreprocessor
+from src.utilities.rate_limit import RateLimitInfo
+from src.utilities.upload_stream import DEFAULT_MAX_IMAGE_BYTES, DEFAULT_MAX_VIDEO_BYTES, ImageStream
+from src.utilities.x_credential_store import XCredentialStore
 
 
 class XRouter:
     """
     Router class for X (Twitter) integration endpoints in FastAPI.
     
-    This class defines routes for posting text tweets and tweets with images, initializing
-    a shared XApiService instance for API calls.
+    This class defines routes for connecting an X account and posting text tweets
+    and tweets with images as the current user's account. Clients come from the
+    shared per-account pool and are fully async, so a slow X round trip holds
+    neither the event loop nor a threadpool slot.
+    
+    Args:
+        auth_service (AuthService): Injected service authenticating the user whose
+            X account is used.
+        pool (XClientPool): Injected pool of per-account X clients.
+        store (XCredentialStore): Injected store for the users' X credentials.
+        max_image_bytes (int): Largest accepted image upload.
+        max_video_bytes (int): Largest accepted video upload.
+        preprocessor (Optional[MediaPreprocessor]): Fits images to X's limits before upload.
     """
     
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        auth_service: AuthService,
+        pool: XClientPool,
+        store: XCredentialStore,
+        max_image_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+        max_video_bytes: int = DEFAULT_MAX_VIDEO_BYTES,
+        preprocessor: Optional[MediaPreprocessor] = None,
+    ) -> None:
         self.router = APIRouter(prefix="/x", tags=["X (Twitter)"])
-        self._x_service = XApiService()
+        self.auth_service = auth_service
+        self.pool = pool
+        self.store = store
+        self.max_image_bytes = max_image_bytes
+        self.max_video_bytes = max_video_bytes
+        self.preprocessor = preprocessor
         
         self._setup_routes()  # Internal method to configure routes.
 
+    async def _client_for(self, user: User) -> XApiService:
+        try:
+            service = await self.pool.get(user.id)
+        except XNotConfigured as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        if service is None:
+            raise HTTPException(status_code=403, detail="Connect X first")
+        return service
+
+    async def _prepare(self, stream: ImageStream) -> ImageStream:
+        # resized/recompressed for X; videos pass through unchanged.
+        if self.preprocessor is None:
+            return stream
+        return await self.preprocessor.prepare(stream, "x")
+
     def _setup_routes(self) -> None:
-        # defines handlers; uses a local alias for the shared service.
-        x_service = self._x_service  # local alias for the closures below
+        # defines async handlers; each resolves the current user's pooled client.
+        
+        @self.router.put("/credentials", status_code=204)
+        async def connect_account(
+            credentials: XCredentials,
+            current_user: User = Depends(self.auth_service.get_current_user),
+        ):
+            """
+            Stores the current user's X access token and secret (encrypted).
+            
+            Args:
+                credentials (XCredentials): OAuth 1.0a user-context credentials.
+                current_user (User): Authenticated user.
+            """
+            await run_in_threadpool(self.store.save, current_user.id, credentials)
+            self.pool.invalidate(current_user.id)
+            return Response(status_code=204)
+        
+        @self.router.delete("/credentials", status_code=204)
+        async def disconnect_account(current_user: User = Depends(self.auth_service.get_current_user)):
+            """Removes the current user's X credentials."""
+            await run_in_threadpool(self.store.delete, current_user.id)
+            self.pool.invalidate(current_user.id)
+            return Response(status_code=204)
         
         @self.router.post("/tweet")
-        def post_simple_tweet(text: str = Form(...)):
+        async def post_simple_tweet(
+            text: str = Form(...),
+            current_user: User = Depends(self.auth_service.get_current_user),
+        ):
             """
             Posts a simple text tweet to X (Twitter).
             
-            This endpoint uses the service to create a tweet, handling exceptions
-            gracefully with HTTP responses. It aligns with FastAPI's form data handling
-            for straightforward, validated inputs.
+            This endpoint uses the user's pooled client to create a tweet, handling
+            exceptions gracefully with HTTP responses.
             
             Args:
                 text (str): The tweet content.
+                current_user (User): Authenticated user whose X account posts.
             
             Returns:
                 dict: Success message and tweet ID.
             
             Raises:
-                HTTPException: 400 on any posting error.
+                HTTPException: 403 if no X account is connected, 429 if X rate limits
+                    the account, 400 on any other posting error.
             """
+            x_service = await self._client_for(current_user)
             try:
-                result = x_service.post_tweet(text)
-                return {"message": "Tweet posted!", "tweet_id": result.get("id")}
-            except Exception as e:
-                raise HTTPException(status_code=400, detail=str(e))
+                result = await x_service.post_tweet(text)
+            except (XApiError, httpx.HTTPError) as e:
+                raise _as_http_error(e)
+            return {"message": "Tweet posted!", "tweet_id": result.get("id")}
         
         @self.router.post("/tweet-with-image")
-        def post_tweet_with_image(
+        async def post_tweet_with_image(
             text: str = Form(...),  # form field for tweet text.
-            image: UploadFile = File(...)  # image file upload.
+            image: UploadFile = File(...),  # image file upload.
+            current_user: User = Depends(self.auth_service.get_current_user),
         ):
             """
             Posts a tweet with an attached image to X (Twitter).
             
-            This endpoint handles file uploads by saving to a temporary file,
-            posting via the service, and ensuring cleanup in a finally block.
+            This endpoint validates the upload in place (size cap, sniffed image type),
+            fits the image to X's limits (size, encoding, no metadata) and uploads it.
             
             Args:
                 text (str): The tweet text.
                 image (UploadFile): Uploaded image file.
+                current_user (User): Authenticated user whose X account posts.
             
             Returns:
                 dict: Success message and tweet ID.
             
             Raises:
-                HTTPException: 400 on any posting error.
+                HTTPException: 413 if the image is too large, 415 if it is not an
+                    image, 403 if no X account is connected, 429 if X rate limits the
+                    account, 400 on any other posting error.
+            """
+            stream = await self._prepare(await ImageStream.from_upload(image, self.max_image_bytes))
+            x_service = await self._client_for(current_user)
+            try:
+                result = await x_service.post_tweet_with_image(text, stream)
+            except (XApiError, MediaUploadInterrupted, httpx.HTTPError) as e:
+                raise _as_http_error(e)
+            return {"message": "Tweet with image posted!", "tweet_id": result.get("id")}
+        
+        @self.router.post("/tweet-with-media")
+        async def post_tweet_with_media(
+            text: str = Form(...),
+            media: UploadFile = File(...),  # image or MP4/MOV video.
+            current_user: User = Depends(self.auth_service.get_current_user),
+        ):
+            """
+            Posts a tweet with an attached image or video.
+            
+            Large files, GIFs and videos are uploaded in segments, several at a time,
+            and the tweet is created once X has finished processing the media.
+            
+            Args:
+                text (str): The tweet text.
+                media (UploadFile): Uploaded image or video file.
+                current_user (User): Authenticated user whose X account posts.
+            
+            Returns:
+                dict: Success message and tweet ID.
             
-            Note: Temp file is always removed to prevent disk clutter.
+            Raises:
+                HTTPException: 413 if the file is too large, 415 if it is not a supported
+                    image or video, 403 if no X account is connected, 429 if X rate limits
+                    the account, 502 if the upload was interrupted, 400 on any other error.
             """
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-                shutil.copyfileobj(image.file, tmp)
-                tmp_path = tmp.name
+            stream = await ImageStream.from_upload(media, self.max_video_bytes, allow_video=True)
+            if stream.content_type.startswith("image/") and stream.size > self.max_image_bytes:
+                raise HTTPException(status_code=413, detail=f"Image exceeds {self.max_image_bytes} bytes")
+            stream = await self._prepare(stream)
+            x_service = await self._client_for(current_user)
             try:
-                result = x_service.post_tweet_with_image(text, tmp_path)
-                return {"message": "Tweet with image posted!", "tweet_id": result.get("id")}
-            except Exception as e:
-                raise HTTPException(status_code=400, detail=str(e))
-            finally:
-                os.remove(tmp_path)  # Ensure temp file cleanup, even on exceptions.
+                result = await x_service.post_tweet_with_image(text, stream)
+            except (XApiError, MediaUploadInterrupted, httpx.HTTPError) as e:
+                raise _as_http_error(e)
+            return {"message": "Tweet with media posted!", "tweet_id": result.get("id")}
 
 
-# Export router: allows inclusion in the main app via app.include_router(x_router).
-x_router = XRouter().router
+def _as_http_error(error: Exception) -> HTTPException:
+    if isinstance(error, XApiError) and error.status_code == 429:
+        # passes X's window reset on, so clients know when the account can post again.
+        info = RateLimitInfo.from_headers(error.headers)
+        wait: Optional[float] = info.retry_after
+        if wait is None and info.reset_at is not None:
+            wait = max(0.0, info.reset_at - time.time())
+        headers = {"Retry-After": str(int(wait) + 1)} if wait is not None else None
+        return HTTPException(status_code=429, detail=str(error), headers=headers)
+    if isinstance(error, MediaUploadInterrupted) and error.retryable:
+        return HTTPException(status_code=502, detail=str(error))
+    return HTTPException(status_code=400, detail=str(error))
@@ -1,11 +1,12 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 class PlannedPostCreate(BaseModel):
     plan_id: int
     content: str
     scheduled_time: Optional[datetime]
+    platform: Optional[Literal["linkedin", "x"]] = None
 
 class PostPlanCreate(BaseModel):
     account_id: int
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel
@@ -41,13 +42,33 @@ class Post(PostBase):
     
     Attributes:
         id (int): Unique identifier for the post.
+        image_url (Optional[str]): URL of the attached image, if any.
+        category (Optional[str]): Feed category, if any.
+        likes (int): Like counter.
+        created_at (Optional[datetime]): Creation timestamp.
     """
     id: int
+    image_url: Optional[str] = None
+    category: Optional[str] = None
+    likes: int = 0
+    created_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True  # enables compatibility with ORM models (e.g., SQLAlchemy).
 
 
+class PostPage(BaseModel):
+    """
+    Pydantic model for one page of the post feed.
+    
+    Attributes:
+        items (list[Post]): Posts on this page, in feed order.
+        next_cursor (Optional[str]): Opaque cursor for the next page; None on the last page.
+    """
+    items: list[Post]
+    next_cursor: Optional[str] = None
+
+
 class Token(BaseModel):
     """
     Pydantic model for authentication tokens.
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PublishJobRead(BaseModel):
+    """
+    Pydantic model for publish job status responses.
+
+    Attributes:
+        id (int): Job id, used to poll `GET /publish/jobs/{id}`.
+        platform (str): 'linkedin' or 'x'.
+        status (str): 'queued', 'running', 'succeeded' or 'failed'.
+        attempts (int): Publish attempts made so far.
+        max_attempts (int): Attempts before the job is given up.
+        next_attempt_at (datetime): When the job is next due (UTC).
+        external_id (Optional[str]): Id of the published post on the platform.
+        last_error (Optional[str]): Error of the last failed attempt.
+        planned_post_id (Optional[int]): Planned post published by this job, if any.
+        created_at (datetime): When the job was queued.
+        completed_at (Optional[datetime]): When the job succeeded or failed.
+    """
+    id: int
+    platform: str
+    status: str
+    attempts: int
+    max_attempts: int
+    next_attempt_at: datetime
+    external_id: Optional[str] = None
+    last_error: Optional[str] = None
+    planned_post_id: Optional[int] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True  # built from PublishJob rows.
@@ -0,0 +1,31 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    """
+    Pydantic model for a single full-text search result.
+    
+    Attributes:
+        id (int): Id of the matching post or planned post.
+        score (float): Relevance score; higher is more relevant.
+        title (Optional[str]): Title with matched terms wrapped in <mark> (posts only).
+        snippet (Optional[str]): Excerpt of the content around the matches, highlighted.
+    """
+    id: int
+    score: float
+    title: Optional[str] = None
+    snippet: Optional[str] = None
+
+
+class SearchPage(BaseModel):
+    """
+    Pydantic model for one page of search results.
+    
+    Attributes:
+        items (list[SearchHit]): Hits on this page, most relevant first.
+        next_cursor (Optional[str]): Opaque cursor for the next page; None on the last page.
+    """
+    items: list[SearchHit]
+    next_cursor: Optional[str] = None
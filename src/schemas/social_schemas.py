@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
@@ -14,3 +16,30 @@ class TweetResponse(BaseModel):
     """
     message: str
     tweet_id: str | int
+
+
+class CrossPostResult(BaseModel):
+    """
+    Outcome of a cross-post on one network.
+
+    Attributes:
+        platform (str): 'linkedin' or 'x'.
+        ok (bool): Whether the post was published.
+        post_id (Optional[str]): Post URN or tweet id when published.
+        error (Optional[str]): Why publishing failed.
+        retryable (bool): Whether retrying later may succeed.
+        elapsed_ms (float): Time spent publishing to this network.
+    """
+    platform: str
+    ok: bool
+    post_id: Optional[str] = None
+    error: Optional[str] = None
+    retryable: bool = False
+    elapsed_ms: float
+
+
+class CrossPostResponse(BaseModel):
+    """
+    Pydantic model for cross-post responses: one result per selected network.
+    """
+    results: List[CrossPostResult]
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.utilities.artifact_index import ArtifactIndex
+from src.utilities.metrics import ARTIFACT_BYTES, ARTIFACT_EVICTIONS, ARTIFACT_FILES
+from src.utilities.upload_store import UploadStore
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactPolicy:
+    """
+    Retention of one artifact category.
+
+    Args:
+        category (str): Category name, as recorded in the artifact index.
+        directory (str): Where the category's files are written.
+        ttl (Optional[float]): Seconds a file is kept; None or 0 keeps files indefinitely.
+        max_bytes (Optional[int]): Disk quota; the oldest files are evicted beyond it.
+            None or 0 means no quota.
+    """
+
+    def __init__(self, category: str, directory: str, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        self.category = category
+        self.directory = directory
+        self.ttl = ttl or None
+        self.max_bytes = max_bytes or None
+
+
+class ArtifactLifecycleManager:
+    """
+    Background sweeper that keeps ARTIFACTS_DIR within its retention policies.
+
+    Every `interval` seconds each category's files older than its TTL are
+    deleted, then the oldest files until the category fits its quota. Ages and
+    sizes come from the artifact index, which writers update as they write, so a
+    sweep is a few indexed range queries instead of a walk over the directories;
+    the directories are only walked once at startup, to index files written
+    before the index existed and drop entries of files deleted by hand. Uploads
+    are reference counted, so their sweep is the upload store's garbage
+    collection.
+
+    Sweeps run on the threadpool from a single task, so request handling never
+    waits on cleanup. Several processes may sweep at once: an entry is deleted
+    with a conditional DELETE first and only the process that wins it removes
+    the file. Writers rename finished files into place before recording them,
+    so a sweep never sees a partial file.
+
+    Args:
+        index (ArtifactIndex): Index of the artifact files.
+        policies (List[ArtifactPolicy]): One policy per category.
+        interval (float): Seconds between sweeps (0 disables the manager).
+        batch_size (int): Index entries read per query.
+        upload_store (Optional[UploadStore]): Store whose unreferenced uploads are collected.
+        upload_gc_grace (float): Seconds an upload stays unreferenced before it is deleted.
+    """
+
+    def __init__(
+        self,
+        index: ArtifactIndex,
+        policies: List[ArtifactPolicy],
+        interval: float = 300.0,
+        batch_size: int = 500,
+        upload_store: Optional[UploadStore] = None,
+        upload_gc_grace: float = 86400.0,
+    ):
+        self.index = index
+        self.policies = policies
+        self.interval = interval
+        self.batch_size = batch_size
+        self.upload_store = upload_store
+        self.upload_gc_grace = upload_gc_grace
+        self._task: Optional[asyncio.Task] = None
+
+    def reconcile(self) -> None:
+        """Indexes files missing from the index and drops entries whose file is gone."""
+        for policy in self.policies:
+            added, dropped = self.index.reconcile(policy.category, policy.directory)
+            if added or dropped:
+                logger.info("Artifact index %s: indexed %d files, dropped %d missing",
+                            policy.category, added, dropped)
+
+    def sweep(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Applies every policy once and collects unreferenced uploads.
+
+        Returns:
+            Dict[str, int]: Files deleted per category.
+        """
+        now = now or time.time()
+        deleted = {policy.category: self.sweep_category(policy, now) for policy in self.policies}
+        if self.upload_store is not None:
+            deleted["uploads"] = self.upload_store.collect_garbage(self.upload_gc_grace, now)
+        return deleted
+
+    def sweep_category(self, policy: ArtifactPolicy, now: float) -> int:
+        deleted = 0
+        if policy.ttl is not None:
+            while True:
+                expired = self.index.oldest(policy.category, self.batch_size, before=now - policy.ttl)
+                deleted += sum(self._delete(policy.category, row, "ttl") for row in expired)
+                if len(expired) < self.batch_size:
+                    break
+
+        files, total = self.index.totals(policy.category)
+        if policy.max_bytes is not None:
+            while total > policy.max_bytes:
+                oldest = self.index.oldest(policy.category, self.batch_size)
+                for row in oldest:
+                    if self._delete(policy.category, row, "quota"):
+                        deleted += 1
+                    total -= row[2]  # also when another process evicted it first
+                    if total <= policy.max_bytes:
+                        break
+                if len(oldest) < self.batch_size:
+                    break
+            files, total = self.index.totals(policy.category)
+
+        ARTIFACT_FILES.labels(policy.category).set(files)
+        ARTIFACT_BYTES.labels(policy.category).set(total)
+        return deleted
+
+    def _delete(self, category: str, row, reason: str) -> bool:
+        file_id, path, _ = row
+        if not self.index.remove(file_id):
+            return False  # taken by a concurrent sweep
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        ARTIFACT_EVICTIONS.labels(category, reason).inc()
+        return True
+
+    async def run(self) -> None:
+        try:
+            await run_in_threadpool(self.reconcile)
+        except Exception:
+            logger.exception("Artifact index reconciliation failed")
+        while True:
+            try:
+                deleted = await run_in_threadpool(self.sweep)
+                if any(deleted.values()):
+                    logger.info("Artifact sweep deleted %s", deleted)
+            except Exception:
+                logger.exception("Artifact sweep failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Starts the sweeper on the running event loop (no-op if `interval` is 0)."""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self.run(), name="artifact-lifecycle")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
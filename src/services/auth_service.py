@@ -1,14 +1,16 @@
 import os
-from typing import Dict
+from typing import Dict, Optional
 
 from src.database.db_config import get_db
 from src.database.models.user import User
 from dotenv import load_dotenv
 from fastapi import HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from passlib.context import CryptContext
+from src.services.principal_cache import PrincipalCache
 from src.services.user_service import UserService
+from src.utilities.password_hasher import PasswordHasher, password_hasher as shared_password_hasher
 from sqlalchemy.orm import Session
 
 # Load environment variables: ensures secrets like keys are available early;
@@ -27,17 +29,33 @@ class AuthService:
     Args:
         secret_key (str): JWT signing key.
         algorithm (str): JWT encoding algorithm (e.g., HS256).
+        principal_cache (Optional[PrincipalCache]): Cache of authenticated users by
+            token subject; None disables caching.
+        embed_principal (bool): Embed the user id ('uid') and token version ('ver')
+            in issued tokens, so cache misses are primary-key lookups and tokens are
+            revoked when the version is bumped.
+        password_hasher (Optional[PasswordHasher]): bcrypt executor; defaults to the
+            shared instance also used by password_utils.
     """
     
     # class-level defaults: Loaded from .env; overridden in __init__ for flexibility.
     SECRET_KEY = os.getenv("SECRET_KEY")
     ALGORITHM = os.getenv("ALGORITHM")
     
-    def __init__(self, secret_key: str, algorithm: str):
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str,
+        principal_cache: Optional[PrincipalCache] = None,
+        embed_principal: bool = False,
+        password_hasher: Optional[PasswordHasher] = None,
+    ):
         self.secret_key = secret_key
         self.algorithm = algorithm
-        # configured for bcrypt with auto-deprecation for secure hashing.
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.principal_cache = principal_cache
+        self.embed_principal = embed_principal
+        # bcrypt runs on a bounded process pool, off the request threadpool.
+        self.password_hasher = password_hasher or shared_password_hasher
         # OAuth2 scheme: Reinitialized for token extraction in dependencies.
         self.oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
     
@@ -55,13 +73,32 @@ class AuthService:
             str: Signed JWT token string.
         """
         return jwt.encode(data, self.SECRET_KEY, algorithm=self.ALGORITHM)
+
+    def create_user_token(self, user: User) -> str:
+        """
+        Creates an access token for an authenticated user.
+        
+        The subject is the username; with `embed_principal` the token also carries
+        the user id and current token version.
+        
+        Args:
+            user (User): The authenticated user.
+        
+        Returns:
+            str: Signed JWT token string.
+        """
+        claims = {"sub": user.username}
+        if self.embed_principal:
+            claims.update(uid=user.id, ver=user.token_version or 0)
+        return self.create_access_token(claims)
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
         Verifies a plain password against a hashed one.
         
         This utility checks password validity during authentication, using the
-        configured CryptContext for secure comparison without exposing hashes.
+        shared password hasher for secure comparison without exposing hashes.
+        Blocks until the pool returns; async endpoints should use `authenticate`.
         
         Args:
             plain_password (str): Input password to verify.
@@ -70,7 +107,53 @@ class AuthService:
         Returns:
             bool: True if passwords match, False otherwise.
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return self.password_hasher.verify_sync(plain_password, hashed_password)
+    
+    async def authenticate(self, db: Session, username: str, password: str) -> Optional[User]:
+        """
+        Authenticates a user by username and password without blocking the event loop.
+        
+        The user lookup runs on the threadpool and bcrypt on the password hasher's
+        pool. If the stored hash was made with a different bcrypt cost than the
+        configured one, it is replaced with a fresh hash.
+        
+        Args:
+            db (Session): Database session for the user lookup.
+            username (str): Username to authenticate.
+            password (str): Plain password to verify.
+        
+        Returns:
+            Optional[User]: Authenticated user if valid, else None.
+        
+        Raises:
+            HasherBusy: If the hashing queue is full.
+        """
+        user = await run_in_threadpool(UserService(db).get_user_by_username, username)
+        if user is None:
+            return None
+        valid, new_hash = await self.password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
+            return None
+        if new_hash is not None:
+            user.hashed_password = new_hash
+            await run_in_threadpool(db.commit)
+            await run_in_threadpool(db.refresh, user)
+        return user
+    
+    async def hash_password(self, password: str) -> str:
+        """
+        Hashes a plain password on the password hasher's pool.
+        
+        Args:
+            password (str): Plain password to hash.
+        
+        Returns:
+            str: Hashed password string.
+        
+        Raises:
+            HasherBusy: If the hashing queue is full.
+        """
+        return await self.password_hasher.hash(password)
     
     def get_current_user(
         self,
@@ -80,8 +163,10 @@ class AuthService:
         """
         Retrieves the current authenticated user from a JWT token.
         
-        This dependency function decodes and validates the token, fetches the user
-        via UserService, and raises exceptions for invalid cases.
+        This dependency function decodes and validates the token and resolves the
+        user from the principal cache when possible; on a miss it loads the user
+        (by id when the token embeds one, else by username) and caches it. Tokens
+        carrying a version older than the user's current one are rejected.
         
         Args:
             token (str): JWT token from the request (via OAuth2 scheme).
@@ -100,12 +185,40 @@ class AuthService:
                 raise HTTPException(status_code=401, detail="Invalid token")
         except JWTError:
             raise HTTPException(status_code=401, detail="Invalid token")
+        user_id: Optional[int] = payload.get("uid")
+        version: Optional[int] = payload.get("ver")
+        
+        cache = self.principal_cache
+        key = PrincipalCache.key(username, user_id)
+        if cache is not None:
+            snapshot = cache.get(key)
+            # A version mismatch may just mean the snapshot is stale; re-check the DB.
+            if snapshot is not None and (version is None or snapshot["token_version"] == version):
+                return PrincipalCache.attach(db, snapshot)
         
         user_service = UserService(db)
-        user = user_service.get_user_by_username(username)
+        if user_id is not None:
+            user = db.get(User, user_id)
+        else:
+            user = user_service.get_user_by_username(username)
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
+        if version is not None and (user.token_version or 0) != version:
+            raise HTTPException(status_code=401, detail="Token revoked")
+        if cache is not None:
+            cache.put(key, user)
         return user
+
+    def invalidate_user(self, user_id: int, *usernames: Optional[str]) -> None:
+        """
+        Drops cached principals for a user after its username or password changed.
+        
+        Args:
+            user_id (int): Id of the changed user.
+            *usernames (Optional[str]): Usernames the user was cached under (old and new).
+        """
+        if self.principal_cache is not None:
+            self.principal_cache.invalidate(user_id, *usernames)
     
     def get_token_dependency(self):
         """
@@ -132,7 +245,7 @@ class AuthService:
         Returns:
             str: Hashed password string.
         """
-        return self.pwd_context.hash(password)
+        return self.password_hasher.hash_sync(password)
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
@@ -148,4 +261,4 @@ class AuthService:
         Returns:
             bool: True if match, False otherwise.
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return self.password_hasher.verify_sync(plain_password, hashed_password)
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Sequence
+
+from src.schemas.social_schemas import CrossPostResult
+from src.services.publish_worker import Publisher
+from src.services.publishers import PublishError
+from src.utilities.rate_limit import RateLimiterRegistry
+from src.utilities.upload_stream import ImageStream
+
+logger = logging.getLogger(__name__)
+
+
+class CrossPostService:
+    """
+    Publishes the same content to several networks at once.
+
+    The image is buffered in memory once and each network reads it through its
+    own view, so the upload happens once and the publishes run concurrently:
+    the request takes about as long as the slowest network. A failure on one
+    network does not affect the others; it is reported in that network's result.
+    Quota is taken from the same per-account rate limiters as the publish queue.
+
+    Args:
+        publishers (List[Optional[Publisher]]): One publisher per supported network (None if disabled).
+        limiter (Optional[RateLimiterRegistry]): Per-account token buckets shared
+            with the publish workers.
+    """
+
+    def __init__(self, publishers: List[Optional[Publisher]], limiter: Optional[RateLimiterRegistry] = None):
+        self.publishers: Dict[str, Publisher] = {p.platform: p for p in publishers if p is not None}
+        self.limiter = limiter
+
+    async def cross_post(
+        self,
+        user_id: int,
+        text: str,
+        platforms: Sequence[str],
+        image: Optional[ImageStream] = None,
+    ) -> List[CrossPostResult]:
+        """
+        Publishes `text` (and `image`) to each of `platforms` concurrently.
+
+        Returns:
+            List[CrossPostResult]: One result per platform, in the order given.
+        """
+        platforms = list(dict.fromkeys(platforms))  # drop duplicates, keep order
+        if image is not None and len(platforms) > 1:
+            image = await image.buffered()
+        tasks = [
+            self._publish_one(platform, user_id, text,
+                              image.view() if image is not None and len(platforms) > 1 else image)
+            for platform in platforms
+        ]
+        return list(await asyncio.gather(*tasks))
+
+    async def _publish_one(
+        self, platform: str, user_id: int, text: str, image: Optional[ImageStream]
+    ) -> CrossPostResult:
+        start = time.perf_counter()
+
+        def result(**fields) -> CrossPostResult:
+            return CrossPostResult(platform=platform, elapsed_ms=(time.perf_counter() - start) * 1000, **fields)
+
+        publisher = self.publishers.get(platform)
+        if publisher is None:
+            return result(ok=False, error=f"Unsupported platform {platform!r}")
+        bucket = self.limiter.bucket(platform, await publisher.account_key(user_id)) if self.limiter else None
+        if bucket is not None:
+            wait = bucket.reserve()
+            if wait > 0:
+                return result(ok=False, retryable=True, error=f"Rate limited; retry in {wait:.0f}s")
+        try:
+            published = await publisher.publish_content(user_id, text, image)
+        except PublishError as exc:
+            if bucket is not None and exc.rate_limit is not None:
+                exc.rate_limit.apply(bucket)
+            return result(ok=False, retryable=exc.retryable, error=str(exc))
+        except Exception as exc:
+            logger.exception("Cross-posting to %s failed", platform)
+            return result(ok=False, error=repr(exc))
+        if bucket is not None and published.rate_limit is not None:
+            published.rate_limit.apply(bucket)
+        return result(ok=True, post_id=published.external_id)
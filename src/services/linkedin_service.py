@@ -1,9 +1,34 @@
+import asyncio
 import os
+import random
 import time
+from contextlib import AsyncExitStack
+from functools import partial
+from typing import List, Mapping, Optional, Sequence, Tuple, Union
 
 import httpx
-import requests
-from src.oauth.linkedin_oauth import LinkedInToken
+from fastapi.concurrency import run_in_threadpool
+
+from src.oauth.linkedin_oauth import LinkedInToken, refresh_access_token
+from src.services.linkedin_token_refresher import refresh_access_token_preserving_urn, refresh_user_token
+from src.utilities.http_client import use_client
+from src.utilities.linkedin_asset_cache import LinkedInAssetCache
+from src.utilities.metrics import time_phase
+from src.utilities.token_store import TokenStore, token_store
+from src.utilities.upload_stream import ImageStream
+
+
+def _rejected(error: httpx.HTTPStatusError) -> bool:
+    # a client error other than auth or rate limiting: the request content was refused.
+    status = error.response.status_code
+    return 400 <= status < 500 and status not in (401, 403, 429)
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
 
 
 class LinkedInApiService:
@@ -11,12 +36,26 @@ class LinkedInApiService:
     Service class for interacting with the LinkedIn API in FastAPI.
     
     This class manages token refresh and API calls (e.g., posting with images),
-    using async HTTP for non-blocking operations.
+    using async HTTP for non-blocking operations. Calls go through the shared
+    application HTTP client, so connections and TLS sessions are reused across
+    posts; each phase has its own timeout and is timed in the
+    `quibble_outbound_phase_seconds` metric. Multi-image posts register and
+    upload their images concurrently (at most `PARALLEL_UPLOADS` at a time),
+    retrying each image on its own. With an `asset_cache`, an image this owner
+    already uploaded (same bytes) reuses its asset instead of being uploaded
+    again; if LinkedIn rejects a reused asset, the image is uploaded afresh.
     
     Args:
         token (LinkedInToken): Auth token for API requests.
         client_id (str): LinkedIn app client ID (defaults from .env).
         client_secret (str): LinkedIn app client secret (defaults from .env).
+        client (Optional[httpx.AsyncClient]): Shared HTTP client; a temporary one is
+            created per call when omitted.
+        asset_cache (Optional[LinkedInAssetCache]): Content hash → asset cache; every
+            image is uploaded when omitted.
+        user_id (Optional[int]): Owner of `token`; a token refreshed here is saved to
+            `store` for them. Without it a refreshed token lives only in this instance.
+        store (Optional[TokenStore]): Token store (the shared one by default).
     """
     
     def __init__(
@@ -24,36 +63,60 @@ class LinkedInApiService:
         token: LinkedInToken,
         client_id: str = os.getenv("LI_CLIENT_ID"),
         client_secret: str = os.getenv("LI_CLIENT_SECRET"),
+        client: Optional[httpx.AsyncClient] = None,
+        asset_cache: Optional[LinkedInAssetCache] = None,
+        user_id: Optional[int] = None,
+        store: Optional[TokenStore] = None,
     ):
         self.token = token
         self.client_id  = client_id
         self.client_secret = client_secret
+        self.client = client
+        self.asset_cache = asset_cache
+        self.user_id = user_id
+        self.store = store or token_store
+        # headers of the last created post (rate-limit state for the publish queue).
+        self.last_headers: Mapping[str, str] = {}
     
     # API endpoints; kept class-level for easy overriding if needed.
     TOKEN_URL = "https://www.linkedin.com/oauth/v2/accessToken"
     API_BASE  = "https://api.linkedin.com/rest"
     
+    # Per-phase timeouts: small JSON calls fail fast, the binary upload gets time to write.
+    REGISTER_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+    UPLOAD_TIMEOUT   = httpx.Timeout(30.0, connect=5.0, write=120.0)
+    PUBLISH_TIMEOUT  = httpx.Timeout(15.0, connect=5.0)
+    
+    # Multi-image posts: images uploaded at once, LinkedIn's per-post limit, and the
+    # attempts per image with the backoff between them (doubled each time).
+    PARALLEL_UPLOADS = 4
+    MAX_IMAGES       = 20
+    UPLOAD_ATTEMPTS  = 3
+    RETRY_BACKOFF    = 0.5
+    
     async def _ensure_fresh(self):
         """
         Ensures the access token is fresh by refreshing if near expiry.
         
         This internal async method checks and renews the token proactively (within 60s of expiry)
-        using the refresh token, updating the instance's token state. It supports non-blocking
-        calls in FastAPI async routes to prevent expired token errors during API interactions.
+        using the refresh token, updating the instance's token state and, for a known user,
+        saving it like every other refresh (`refresh_user_token`), so the stored refresh token
+        is not left stale. The refresh is async and shared with concurrent refreshes of the same
+        token, so it neither blocks the event loop nor invalidates another request's refresh.
+        Tokens from `get_linkedin_token` are already fresh, so this is a safety net.
         """
         if (self.token.refresh_token and
             self.token.expires_at <= time.time() + 60):
-            data = {
-                "grant_type":    "refresh_token",
-                "refresh_token": self.token.refresh_token,
-                "client_id":     self.client_id,
-                "client_secret": self.client_secret,
-            }
-            r = requests.post(self.TOKEN_URL, data=data, timeout=15)
-            r.raise_for_status()
-            p = r.json()
-            self.token.access_token = p["access_token"]
-            self.token.expires_at   = time.time() + p["expires_in"]
+            refresh = partial(refresh_access_token, client=self.client)
+            if self.user_id is not None:
+                fresh = await refresh_user_token(self.store, self.user_id, refresh)
+                if fresh is None:
+                    return
+            else:
+                fresh = await refresh_access_token_preserving_urn(self.token, refresh)
+            self.token.access_token = fresh.access_token
+            self.token.refresh_token = fresh.refresh_token
+            self.token.expires_at   = fresh.expires_at
     
     def _hdr(self):
         """
@@ -71,27 +134,176 @@ class LinkedInApiService:
             "X-Restli-Protocol-Version": "2.0.0",
         }
     
-    async def post_with_image(self, caption: str, img_path: str) -> str:
+    async def post_text(self, caption: str) -> str:
+        """
+        Posts a text-only update to LinkedIn asynchronously.
+        
+        Args:
+            caption (str): Text of the post.
+        
+        Returns:
+            str: URN of the created post.
+        
+        Raises:
+            httpx.HTTPStatusError: On API request failures.
+        """
+        await self._ensure_fresh()
+        async with use_client(self.client) as client:
+            return await self._publish(client, caption, content=None)
+    
+    async def post_with_image(self, caption: str, image: Union[str, ImageStream]) -> str:
         """
         Posts content with an image to LinkedIn asynchronously.
         
         This method handles the full flow: token refresh, image upload registration,
-        binary upload, and post publication. It uses async HTTP for efficiency in
-        FastAPI, raising exceptions on failures and returning the post URN for reference.
+        binary upload, and post publication, each as a timed phase on the shared
+        client. The image is streamed to LinkedIn in chunks, never read into memory
+        as a whole. It raises on failures and returns the post URN for reference.
         
         Args:
             caption (str): Text caption for the post.
-            img_path (str): Local path to the image file.
+            image (Union[str, ImageStream]): Validated image stream (e.g. straight from
+                an upload), or a local path to the image file.
         
         Returns:
             str: URN of the created post.
         
         Raises:
-            requests.HTTPError: On API request failures (e.g., invalid token, upload errors).
+            httpx.HTTPStatusError: On API request failures (e.g., invalid token, upload errors).
+            httpx.TimeoutException: If a phase exceeds its timeout.
         """
+        if isinstance(image, str):
+            stream = await ImageStream.from_path(image)
+            try:
+                return await self.post_with_image(caption, stream)
+            finally:
+                stream.file.close()
+        
         await self._ensure_fresh()  # Ensure token is valid before proceeding.
-        async with httpx.AsyncClient() as client:
-            # Register upload: Prepares LinkedIn for the image asset.
+        async with use_client(self.client) as client:
+            return await self._publish_images(client, caption, [image])
+    
+    async def post_with_images(self, caption: str, images: Sequence[Union[str, ImageStream]]) -> str:
+        """
+        Posts content with several images (a multi-image post) to LinkedIn asynchronously.
+        
+        Every image is registered and uploaded concurrently, at most `PARALLEL_UPLOADS`
+        at a time, so publishing takes about as long as the slowest upload rather than
+        the sum of them. A failed image is retried on its own (rate limits, server and
+        network errors) without restarting the others; the post is created once all
+        assets are uploaded, in the order the images were given.
+        
+        Args:
+            caption (str): Text caption for the post.
+            images (Sequence[Union[str, ImageStream]]): Validated image streams or local
+                paths; each must have its own file (not views sharing one position).
+        
+        Returns:
+            str: URN of the created post.
+        
+        Raises:
+            ValueError: If no images or more than `MAX_IMAGES` are given.
+            httpx.HTTPStatusError: On API request failures, once an image's retries are used up.
+            httpx.TimeoutException: If a phase exceeds its timeout.
+        """
+        if not images or len(images) > self.MAX_IMAGES:
+            raise ValueError(f"A LinkedIn post takes 1 to {self.MAX_IMAGES} images")
+        if len(images) == 1:
+            return await self.post_with_image(caption, images[0])
+        
+        async with AsyncExitStack() as stack:
+            streams = []
+            for image in images:
+                if isinstance(image, str):
+                    image = await ImageStream.from_path(image)
+                    stack.callback(image.file.close)
+                streams.append(image)
+            
+            await self._ensure_fresh()
+            async with use_client(self.client) as client:
+                return await self._publish_images(client, caption, streams)
+    
+    async def _publish_images(self, client: httpx.AsyncClient, caption: str, images: List[ImageStream]) -> str:
+        # uploads (or reuses) every image, then creates the post; one image is a plain media post.
+        assets = await self._assets_for(client, images, reuse=[True] * len(images))
+        try:
+            return await self._publish(client, caption, content=self._media_content(assets))
+        except httpx.HTTPStatusError as exc:
+            stale = [i for i, (_, cached) in enumerate(assets) if cached]
+            if not stale or not _rejected(exc):
+                raise
+            # LinkedIn refused a reused asset (expired or deleted): upload those images afresh.
+            owner = self.token.owner_urn
+            for i in stale:
+                await run_in_threadpool(self.asset_cache.forget, owner, await images[i].sha256())
+            fresh = await self._assets_for(client, images, reuse=[i not in stale for i in range(len(images))],
+                                           known=assets)
+            return await self._publish(client, caption, content=self._media_content(fresh))
+    
+    @staticmethod
+    def _media_content(assets: List[Tuple[str, bool]]) -> dict:
+        if len(assets) == 1:
+            return {"media": {"id": assets[0][0]}}
+        return {"multiImage": {"images": [{"id": asset} for asset, _ in assets]}}
+    
+    async def _assets_for(
+        self,
+        client: httpx.AsyncClient,
+        images: List[ImageStream],
+        reuse: List[bool],
+        known: Optional[List[Tuple[str, bool]]] = None,
+    ) -> List[Tuple[str, bool]]:
+        # returns (asset URN, came from the cache) per image, uploading at most PARALLEL_UPLOADS at once.
+        # with `known`, images not to be re-uploaded (reuse[i] True) keep their known asset.
+        limit = asyncio.Semaphore(self.PARALLEL_UPLOADS)
+        
+        async def resolve(index: int) -> Tuple[str, bool]:
+            if known is not None and reuse[index]:
+                return known[index]
+            async with limit:
+                return await self._asset_for(client, images[index], reuse[index])
+        
+        tasks = [asyncio.ensure_future(resolve(i)) for i in range(len(images))]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            # one image is beyond retrying: stop the rest instead of finishing uploads nobody uses.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    
+    async def _asset_for(self, client: httpx.AsyncClient, image: ImageStream, reuse: bool) -> Tuple[str, bool]:
+        # looks the image up by content hash before uploading it; records fresh uploads.
+        owner = self.token.owner_urn
+        if self.asset_cache is None or not owner:
+            return await self._upload_image(client, image), False
+        digest = await image.sha256()
+        if reuse:
+            asset = await run_in_threadpool(self.asset_cache.get, owner, digest)
+            if asset is not None:
+                return asset, True
+        asset = await self._upload_image(client, image)
+        await run_in_threadpool(self.asset_cache.put, owner, digest, asset)
+        return asset, False
+    
+    async def _upload_image(self, client: httpx.AsyncClient, image: ImageStream) -> str:
+        # registers and uploads one image, retrying transient failures; returns the asset URN.
+        upload = None
+        for attempt in range(1, self.UPLOAD_ATTEMPTS + 1):
+            try:
+                if upload is None:
+                    upload = await self._register(client)
+                await self._put(client, upload[1], image)
+                return upload[0]
+            except (httpx.HTTPStatusError, httpx.TransportError) as exc:
+                if attempt == self.UPLOAD_ATTEMPTS or not _retryable(exc):
+                    raise
+                await asyncio.sleep(self.RETRY_BACKOFF * 2 ** (attempt - 1) * random.uniform(0.5, 1.0))
+    
+    async def _register(self, client: httpx.AsyncClient) -> Tuple[str, str]:
+        # register upload: prepares LinkedIn for the image asset; returns (asset URN, upload URL).
+        with time_phase("linkedin", "register"):
             reg = await client.post(
                 f"{self.API_BASE}/assets?action=registerUpload",
                 headers=self._hdr(),
@@ -103,31 +315,42 @@ class LinkedInApiService:
                             "relationshipType": "OWNER",
                             "identifier": "urn:li:userGeneratedContent"}]
                     }
-                }
+                },
+                timeout=self.REGISTER_TIMEOUT,
             )
             reg.raise_for_status()
-            val   = reg.json()["value"]
-            asset = val["asset"]
-            url   = val["uploadMechanism"]["com.linkedin.digitalmedia."
-                           "uploading.MediaUploadHttpRequest"]["uploadUrl"]
-            
-            # streams the image file to LinkedIn's upload URL.
-            with open(img_path, "rb") as fh:
-                await client.put(url, content=fh.read(),
-                                 headers={"Content-Type": "image/jpeg"})
-            
-            # creates the post with the uploaded asset and caption.
+        val = reg.json()["value"]
+        url = val["uploadMechanism"]["com.linkedin.digitalmedia."
+                  "uploading.MediaUploadHttpRequest"]["uploadUrl"]
+        return val["asset"], url
+    
+    async def _put(self, client: httpx.AsyncClient, url: str, image: ImageStream) -> None:
+        # streams the image to LinkedIn's upload URL chunk by chunk (from the start on a retry).
+        with time_phase("linkedin", "upload"):
+            up = await client.put(url, content=image.chunks(),
+                                  headers={"Content-Type": image.content_type,
+                                           "Content-Length": str(image.size)},
+                                  timeout=self.UPLOAD_TIMEOUT)
+            up.raise_for_status()
+    
+    async def _publish(self, client: httpx.AsyncClient, caption: str, content: Optional[dict]) -> str:
+        # creates the post; `content` carries media references, None for text-only posts.
+        body = {
+            "author":      self.token.owner_urn,
+            "commentary":  caption,
+            "visibility":  "PUBLIC",
+            "lifecycleState": "PUBLISHED",
+            "distribution":   {"feedDistribution": "MAIN_FEED"},
+        }
+        if content is not None:
+            body["content"] = content
+        with time_phase("linkedin", "publish"):
             pub = await client.post(
                 f"{self.API_BASE}/posts",
                 headers=self._hdr(),
-                json={
-                    "author":      self.token.owner_urn,
-                    "commentary":  caption,
-                    "visibility":  "PUBLIC",
-                    "lifecycleState": "PUBLISHED",
-                    "distribution":   {"feedDistribution": "MAIN_FEED"},
-                    "content": {"media": {"id": asset}}
-                }
+                json=body,
+                timeout=self.PUBLISH_TIMEOUT,
             )
             pub.raise_for_status()
-            return pub.headers["x-linkedin-id"]  # post URN for reference or linking.
+        self.last_headers = pub.headers
+        return pub.headers["x-linkedin-id"]  # post URN for reference or linking.
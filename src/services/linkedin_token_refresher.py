@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import time
+from functools import partial
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.oauth.linkedin_oauth import LinkedInToken, refresh_access_token
+from src.utilities.single_flight import SingleFlight
+from src.utilities.token_store import TokenStore
+
+logger = logging.getLogger(__name__)
+
+RefreshFn = Callable[[str], Awaitable[LinkedInToken]]
+
+# At most one refresh per user (or refresh token) in flight in this process; shared by
+# the request path, the service safety net and the sweeper.
+_refresh_flight = SingleFlight()
+
+
+async def refresh_user_token(
+    store: TokenStore,
+    user_id: int,
+    refresh: RefreshFn = refresh_access_token,
+    min_validity: float = 60.0,
+) -> Optional[LinkedInToken]:
+    """
+    Refreshes a user's stored token unless it is valid for `min_validity` more seconds.
+
+    Concurrent calls for the same user share a single refresh. The token is re-read
+    from the database first, since another worker or the sweeper may already have
+    refreshed it; the refreshed token keeps the stored owner URN and is saved.
+
+    Returns:
+        Optional[LinkedInToken]: The current token, or None if the user has none.
+    """
+    async def _refresh() -> Optional[LinkedInToken]:
+        token = await run_in_threadpool(store.load, user_id)
+        if token is None or not token.refresh_token or token.expires_at > time.time() + min_validity:
+            return token
+        fresh = await refresh_access_token_preserving_urn(token, refresh)
+        await run_in_threadpool(store.save, user_id, fresh)
+        return fresh
+
+    return await _refresh_flight.do(("user", user_id), _refresh)
+
+
+async def refresh_access_token_preserving_urn(
+    token: LinkedInToken, refresh: RefreshFn = refresh_access_token
+) -> LinkedInToken:
+    """
+    Refreshes `token`, keeping its owner URN (the refresh response does not include it).
+
+    Concurrent calls with the same refresh token share a single request to LinkedIn.
+    """
+    async def _refresh() -> LinkedInToken:
+        fresh = await refresh(token.refresh_token)
+        fresh.owner_urn = token.owner_urn
+        return fresh
+
+    return await _refresh_flight.do(("refresh_token", token.refresh_token), _refresh)
+
+
+class LinkedInTokenRefresher:
+    """
+    Background sweeper that refreshes LinkedIn tokens before they expire.
+
+    Every `interval` seconds it asks the store for tokens expiring within
+    `refresh_ahead` seconds (an indexed range scan on `expires_at`), takes the
+    per-token refresh lease and exchanges the refresh token. Refreshing well
+    ahead of expiry keeps the request-path refresh in `get_linkedin_token` a rare
+    fallback. Running one sweeper per worker process is safe: the lease ensures
+    each token is refreshed by a single worker.
+
+    Args:
+        store (TokenStore): Token store to sweep.
+        refresh (Optional[RefreshFn]): Exchanges a refresh token (async); defaults to
+            `refresh_access_token` on `client`.
+        client (Optional[httpx.AsyncClient]): Shared HTTP client for refresh calls.
+        interval (float): Seconds between sweeps.
+        refresh_ahead (float): Refresh tokens expiring within this many seconds.
+        batch_size (int): Maximum tokens refreshed per sweep.
+        lease_seconds (float): How long a claimed token is reserved for this worker.
+    """
+
+    def __init__(
+        self,
+        store: TokenStore,
+        refresh: Optional[RefreshFn] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        interval: float = 600.0,
+        refresh_ahead: float = 86400.0,
+        batch_size: int = 100,
+        lease_seconds: float = 120.0,
+    ):
+        self.store = store
+        self.refresh = refresh or partial(refresh_access_token, client=client)
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh_due(self) -> int:
+        """
+        Runs one sweep.
+
+        Returns:
+            int: Number of tokens refreshed.
+        """
+        due = await run_in_threadpool(
+            self.store.due_for_refresh, time.time() + self.refresh_ahead, self.batch_size
+        )
+        refreshed = 0
+        for user_id in due:
+            if await self.refresh_one(user_id):
+                refreshed += 1
+        return refreshed
+
+    async def refresh_one(self, user_id: int) -> bool:
+        """Refreshes one user's token if its lease can be taken; returns True on success."""
+        if not await run_in_threadpool(self.store.claim_refresh, user_id, self.lease_seconds):
+            return False
+        deadline = time.time() + self.refresh_ahead
+        try:
+            token = await refresh_user_token(self.store, user_id, self.refresh, self.refresh_ahead)
+        except Exception:
+            # Leave the lease to expire so the token is retried on a later sweep,
+            # not hammered by every worker right away.
+            logger.exception("Refreshing LinkedIn token for user %s failed", user_id)
+            return False
+        if token is None or token.expires_at <= deadline:
+            # nothing refreshed (token gone or not refreshable); saving would have released it.
+            await run_in_threadpool(self.store.release_refresh, user_id)
+            return False
+        return True
+
+    async def run(self) -> None:
+        while True:
+            try:
+                refreshed = await self.refresh_due()
+                if refreshed:
+                    logger.info("Refreshed %d LinkedIn tokens", refreshed)
+            except Exception:
+                logger.exception("LinkedIn token sweep failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Starts the sweep loop on the running event loop (no-op if the interval is 0)."""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self.run(), name="linkedin-token-refresher")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
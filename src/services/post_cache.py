@@ -0,0 +1,113 @@
+from typing import Callable, Iterable, Optional
+
+from src.utilities.cache import CacheBackend
+from src.utilities.metrics import record_cache
+
+
+class PostCache:
+    """
+    Cache of pre-serialized post feed pages and single posts.
+
+    Values are the exact JSON bytes sent to the client, so a hit skips both the
+    database and Pydantic serialization. Invalidation is generation-based: every
+    feed scope ('*' for the unfiltered feed, or a category) and every post id has
+    a generation that is part of the entry key, and writers bump the generations
+    their change touches. Entries for older generations are simply never read
+    again and age out through TTL/LRU.
+
+    Args:
+        backend (CacheBackend): In-process or shared (Redis) storage.
+        ttl (float): Entry time-to-live in seconds.
+        enabled (bool): When False every lookup misses and nothing is stored.
+    """
+
+    ALL = "*"
+
+    def __init__(self, backend: CacheBackend, ttl: float = 30.0, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        # Generations must outlive every entry keyed by them (see CacheBackend).
+        self.generation_ttl = 2 * ttl + 60
+
+    def _feed_scope(self, category: Optional[str]) -> str:
+        return f"feed:{category or self.ALL}"
+
+    def _feed_key(self, category: Optional[str], sort_by: str, limit: int, cursor: Optional[str]) -> str:
+        scope = self._feed_scope(category)
+        (generation,) = self.backend.get_generations([scope])
+        return f"{scope}:{generation}:{sort_by}:{limit}:{cursor or ''}"
+
+    def _post_key(self, post_id: int) -> str:
+        scope = f"post:{post_id}"
+        (generation,) = self.backend.get_generations([scope])
+        return f"{scope}:{generation}"
+
+    def _get_or_set(self, key: str, render: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        cached = self.backend.get(key)
+        record_cache("posts", cached is not None)
+        if cached is not None:
+            return cached
+        body = render()
+        if body is not None:
+            self.backend.set(key, body, self.ttl)
+        return body
+
+    def feed_page(
+        self,
+        category: Optional[str],
+        sort_by: str,
+        limit: int,
+        cursor: Optional[str],
+        render: Callable[[], bytes],
+    ) -> bytes:
+        """
+        Returns a serialized feed page, rendering and storing it on a miss.
+
+        Args:
+            category (Optional[str]): Category filter of the page.
+            sort_by (str): Feed ordering.
+            limit (int): Page size.
+            cursor (Optional[str]): Page cursor.
+            render (Callable[[], bytes]): Produces the JSON body on a miss.
+
+        Returns:
+            bytes: JSON body of the page.
+        """
+        if not self.enabled:
+            return render()
+        return self._get_or_set(self._feed_key(category, sort_by, limit, cursor), render)
+
+    def post(self, post_id: int, render: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        """
+        Returns a serialized single post, rendering and storing it on a miss.
+
+        `render` returns None for a missing post; misses are not cached so that a
+        post created afterwards is visible immediately.
+        """
+        if not self.enabled:
+            return render()
+        return self._get_or_set(self._post_key(post_id), render)
+
+    def invalidate_posts(self, post_ids: Iterable[int], categories: Iterable[Optional[str]]) -> None:
+        """
+        Invalidates single-post entries and every feed page that may contain the posts.
+
+        A post appears in the unfiltered feed and in the feed of its own category,
+        so those two scopes are bumped; feeds of other categories stay cached.
+
+        Args:
+            post_ids (Iterable[int]): Ids of the changed posts.
+            categories (Iterable[Optional[str]]): Categories of the changed posts
+                (before and after the change, if it moved).
+        """
+        if not self.enabled:
+            return
+        scopes = {self._feed_scope(None)}
+        scopes.update(self._feed_scope(c) for c in categories if c)
+        scopes.update(f"post:{post_id}" for post_id in post_ids)
+        for scope in scopes:
+            self.backend.bump_generation(scope, self.generation_ttl)
+
+    def stats(self) -> dict:
+        return self.backend.stats()
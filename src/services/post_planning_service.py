@@ -1,5 +1,5 @@
 import logging
-from typing import List, Set
+from typing import List, Optional, Set
 from src.repositories.post_plan_repo import PostPlanRepo
 from src.repositories.planned_post_repo import PlannedPostRepo
 from src.schemas.planning import (
@@ -8,6 +8,7 @@ from src.schemas.planning import (
     PlannedPostCreate,
     PlannedPostRead,
 )
+from src.services.post_scheduler import PostScheduler
 from src.utilities.mistral_client import MistralClient
 
 
@@ -24,13 +25,23 @@ class PostPlanningService:
         plan_repo: PostPlanRepo,
         post_repo: PlannedPostRepo,
         ai_client: MistralClient,
+        scheduler: Optional[PostScheduler] = None,
     ):
         self.plan_repo = plan_repo
         self.post_repo = post_repo
         self.ai_client = ai_client
+        self.scheduler = scheduler
 
-    def create_plan(self, data: PostPlanCreate) -> PostPlanRead:
-        plan = self.plan_repo.create(data)
+    def _owned_plan(self, plan_id: int, owner_id: int):
+        # another user's plan is reported as missing, so plan ids cannot be probed.
+        plan = self.plan_repo.get(plan_id)
+        if not plan or plan.owner_id != owner_id:
+            logger.debug("Plan with id %s not found for user %s", plan_id, owner_id)
+            raise PlanNotFoundError(f"Plan {plan_id} not found")
+        return plan
+
+    def create_plan(self, data: PostPlanCreate, owner_id: int) -> PostPlanRead:
+        plan = self.plan_repo.create_owned(data, owner_id)
         return PostPlanRead(
             id=plan.id,
             account_id=plan.account_id,
@@ -39,11 +50,8 @@ class PostPlanningService:
             posts=[],
         )
 
-    def generate_posts(self, plan_id: int) -> List[PlannedPostRead]:
-        plan = self.plan_repo.get(plan_id)
-        if not plan:
-            logger.debug("Plan with id %s not found when generating posts", plan_id)
-            raise PlanNotFoundError(f"Plan {plan_id} not found")
+    def generate_posts(self, plan_id: int, owner_id: int) -> List[PlannedPostRead]:
+        plan = self._owned_plan(plan_id, owner_id)
 
         prompt = (
             f"Generate 5 engaging, slightly varied LinkedIn/Instagram post drafts for "
@@ -98,8 +106,10 @@ class PostPlanningService:
         return [
             PlannedPostRead(
                 id=p.id,
+                plan_id=p.plan_id,
                 content=p.content,
                 scheduled_time=p.scheduled_time,
+                platform=p.platform,
                 ai_suggested=bool(getattr(p, "ai_suggested", True)),
             )
             for p in created
@@ -110,15 +120,25 @@ class PostPlanningService:
         plan_id: int,
         post_id: int,
         data: PlannedPostCreate,
+        owner_id: int,
     ) -> PlannedPostRead:
+        self._owned_plan(plan_id, owner_id)
         post = self.post_repo.get(post_id)
         if not post or post.plan_id != plan_id:
             raise ValueError(f"Post {post_id} not found in plan {plan_id}")
+        if data.plan_id != plan_id:
+            # moving a post into another plan would publish it as that plan's owner.
+            raise ValueError(f"Post {post_id} cannot be moved out of plan {plan_id}")
 
         updated = self.post_repo.update(post, data)
+        if self.scheduler is not None and updated.platform and updated.queued_at is None:
+            # wakes the scheduler if the post is now due before anything it was waiting for.
+            self.scheduler.notify(updated.id, updated.scheduled_time)
         return PlannedPostRead(
             id=updated.id,
+            plan_id=updated.plan_id,
             content=updated.content,
             scheduled_time=updated.scheduled_time,
+            platform=updated.platform,
             ai_suggested=bool(updated.ai_suggested),
         )
\ No newline at end of file
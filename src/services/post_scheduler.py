@@ -0,0 +1,260 @@
+import asyncio
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from src.database.models.post_planning import PlannedPost, PostPlan
+from src.services.publish_queue import PublishQueue, utcnow
+
+logger = logging.getLogger(__name__)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # scheduled times may arrive timezone-aware from the API; columns hold naive UTC.
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class PostScheduler:
+    """
+    Hands planned posts to the publish queue when their scheduled time comes.
+
+    Instead of polling, the scheduler keeps the upcoming posts of the next
+    `horizon` seconds (at most `max_loaded` of them) in a min-heap and sleeps
+    until the earliest one is due. Posts further out stay in the database and
+    are loaded by the next window; both the window load and the due query are
+    range scans on the (queued_at, scheduled_time) index, so the number of
+    scheduled posts does not matter. When idle it wakes only to reload the
+    window every `resync_interval` seconds, which also picks up posts
+    scheduled through other replicas; posts scheduled through this process
+    wake it directly (`notify`).
+
+    A due post is taken with a short lease (a conditional UPDATE only one
+    replica can win), queued with an idempotency key derived from its id and
+    then marked queued, so several replicas never publish it twice. Posts are
+    published as the plan's authenticated owner; posts of plans without one are
+    unscheduled instead.
+
+    Args:
+        queue (PublishQueue): Queue due posts are handed to.
+        session_factory (Callable[[], Session]): Creates sessions for scheduler queries.
+        horizon (float): Seconds ahead loaded into memory.
+        max_loaded (int): Maximum posts kept in the heap.
+        resync_interval (float): Longest sleep between window reloads.
+        lease_seconds (float): How long a replica holds a post it is handing over.
+        batch_size (int): Due posts handed over per query.
+    """
+
+    def __init__(
+        self,
+        queue: PublishQueue,
+        session_factory: Callable[[], Session],
+        horizon: float = 3600.0,
+        max_loaded: int = 10_000,
+        resync_interval: float = 300.0,
+        lease_seconds: float = 60.0,
+        batch_size: int = 100,
+    ):
+        self.queue = queue
+        self.session_factory = session_factory
+        self.horizon = horizon
+        self.max_loaded = max_loaded
+        self.resync_interval = resync_interval
+        self.lease_seconds = lease_seconds
+        self.batch_size = batch_size
+        self._heap: List[Tuple[datetime, int]] = []
+        self._loaded_until = datetime.min
+        self._heap_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def _pending():
+        # scheduled for a platform and not yet handed to the publish queue.
+        return and_(PlannedPost.queued_at.is_(None), PlannedPost.platform.is_not(None))
+
+    def due_posts(self, now: datetime, limit: int) -> List[int]:
+        """Returns ids of due posts nobody is handing over, oldest first."""
+        stmt = (
+            select(PlannedPost.id)
+            .where(
+                self._pending(),
+                PlannedPost.scheduled_time <= now,
+                or_(PlannedPost.dispatch_lease_until.is_(None), PlannedPost.dispatch_lease_until < now),
+            )
+            .order_by(PlannedPost.scheduled_time)
+            .limit(limit)
+        )
+        with self.session_factory() as db:
+            return list(db.scalars(stmt))
+
+    def dispatch_due(self, now: Optional[datetime] = None) -> int:
+        """
+        Queues every due post this replica can lease.
+
+        Returns:
+            int: Number of posts handed to the publish queue.
+        """
+        now = now or utcnow()
+        dispatched = 0
+        while True:
+            due = self.due_posts(now, self.batch_size)
+            for post_id in due:
+                dispatched += self._dispatch(post_id, now)
+            if len(due) < self.batch_size:
+                return dispatched
+
+    def _dispatch(self, post_id: int, now: datetime) -> bool:
+        leased = and_(
+            PlannedPost.id == post_id,
+            self._pending(),
+            or_(PlannedPost.dispatch_lease_until.is_(None), PlannedPost.dispatch_lease_until < now),
+        )
+        with self.session_factory() as db:
+            won = db.execute(
+                update(PlannedPost)
+                .where(leased)
+                .values(dispatch_lease_until=now + timedelta(seconds=self.lease_seconds))
+            ).rowcount == 1
+            db.commit()
+            if not won:
+                return False
+            content, platform, owner_id = db.execute(
+                select(PlannedPost.content, PlannedPost.platform, PostPlan.owner_id)
+                .join(PostPlan, PlannedPost.plan_id == PostPlan.id)
+                .where(PlannedPost.id == post_id)
+            ).one()
+            if owner_id is None:
+                # no authenticated owner to publish as: unschedule instead of trusting account_id.
+                logger.warning("Planned post %s belongs to a plan without an owner; not publishing it", post_id)
+                db.execute(
+                    update(PlannedPost)
+                    .where(PlannedPost.id == post_id)
+                    .values(platform=None, dispatch_lease_until=None)
+                )
+                db.commit()
+                return False
+        # the idempotency key makes a retry after a lost lease return the same job.
+        self.queue.enqueue(
+            owner_id, platform, {"text": content},
+            idempotency_key=f"planned-post:{post_id}", planned_post_id=post_id,
+        )
+        with self.session_factory() as db:
+            db.execute(
+                update(PlannedPost)
+                .where(PlannedPost.id == post_id)
+                .values(queued_at=utcnow(), dispatch_lease_until=None)
+            )
+            db.commit()
+        return True
+
+    def load_window(self, now: Optional[datetime] = None) -> int:
+        """
+        Replaces the heap with the posts due within the horizon.
+
+        If more than `max_loaded` posts fall in the window, only the earliest are
+        loaded and the window ends at the last of them.
+
+        Returns:
+            int: Number of posts loaded.
+        """
+        now = now or utcnow()
+        until = now + timedelta(seconds=self.horizon)
+        stmt = (
+            select(PlannedPost.scheduled_time, PlannedPost.id)
+            .where(self._pending(), PlannedPost.scheduled_time <= until)
+            .order_by(PlannedPost.scheduled_time)
+            .limit(self.max_loaded)
+        )
+        with self.session_factory() as db:
+            rows = [tuple(row) for row in db.execute(stmt)]
+        if len(rows) == self.max_loaded:
+            until = rows[-1][0]
+        # rows arrive sorted, which is already a valid heap.
+        with self._heap_lock:
+            self._heap = rows
+            self._loaded_until = until
+        return len(rows)
+
+    def notify(self, post_id: int, scheduled_time: Optional[datetime]) -> None:
+        """
+        Tells the scheduler a post was (re)scheduled; safe to call from any thread.
+
+        Posts inside the loaded window are added to the heap and the scheduler is
+        woken if the post is due before its current wake-up time.
+        """
+        if scheduled_time is None:
+            return
+        scheduled_time = _naive_utc(scheduled_time)
+        with self._heap_lock:
+            if scheduled_time > self._loaded_until:
+                return  # picked up by a later window
+            earliest = self._heap[0][0] if self._heap else None
+            heapq.heappush(self._heap, (scheduled_time, post_id))
+        if (earliest is None or scheduled_time < earliest) and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def seconds_until_next(
+        self, now: datetime, resync_at: datetime, dispatched_until: Optional[datetime] = None
+    ) -> float:
+        """
+        Drops heap entries the last pass dispatched and returns how long to sleep.
+
+        Only entries due by `dispatched_until` (the timestamp the pass dispatched at,
+        default `now`) are dropped; one falling due after it is kept and wakes the
+        scheduler at once.
+        """
+        dispatched_until = dispatched_until or now
+        with self._heap_lock:
+            while self._heap and self._heap[0][0] <= dispatched_until:
+                heapq.heappop(self._heap)
+            wake = min(resync_at, self._loaded_until)
+            if self._heap:
+                wake = min(wake, self._heap[0][0])
+        return max(0.0, (wake - now).total_seconds())
+
+    async def run(self) -> None:
+        resync_at = datetime.min
+        while True:
+            # cleared first, so a notify during the pass below is not lost.
+            self._wakeup.clear()
+            now = utcnow()
+            try:
+                if now >= resync_at or now >= self._loaded_until:
+                    await run_in_threadpool(self.load_window, now)
+                    resync_at = now + timedelta(seconds=self.resync_interval)
+                dispatched = await run_in_threadpool(self.dispatch_due, now)
+                if dispatched:
+                    logger.info("Queued %d planned posts for publishing", dispatched)
+            except Exception:
+                logger.exception("Planned post scheduling pass failed")
+                resync_at = now + timedelta(seconds=min(self.resync_interval, 30.0))
+            delay = self.seconds_until_next(utcnow(), resync_at, dispatched_until=now)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Starts the scheduler on the running event loop."""
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self.run(), name="post-scheduler")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
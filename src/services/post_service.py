@@ -1,8 +1,22 @@
-from typing import Optional
+from typing import Optional, Tuple
 
 from src.database.models.post import Post
 from src.database.models.user import User
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
+from src.services.post_cache import PostCache
+from src.utilities.upload_store import UploadStore
+from src.utilities.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+# Page size bounds for the keyset-paginated feed.
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Feed orderings: cursor field name -> model column, in sort-key order (all descending).
+FEED_SORTS = {
+    "likes": (("likes", Post.likes), ("id", Post.id)),
+    "newest": (("created_at", Post.created_at), ("id", Post.id)),
+}
 
 
 class PostService:
@@ -14,12 +28,24 @@ class PostService:
     
     Args:
         db (Session): SQLAlchemy session for database interactions.
+        cache (Optional[PostCache]): Response cache invalidated after every write.
+        uploads (Optional[UploadStore]): Upload store whose reference counts follow
+            the posts' images.
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: Optional[PostCache] = None, uploads: Optional[UploadStore] = None):
         self.db = db  # Store the session for all operations.
+        self.cache = cache
+        self.uploads = uploads
+
+    def _invalidate(self, post_id: int, category: Optional[str]) -> None:
+        # Called after commit, so readers that miss afterwards see the new rows.
+        if self.cache is not None:
+            self.cache.invalidate_posts([post_id], [category])
     
-    def create_post(self, user: User, title: str, content: str) -> Post:
+    def create_post(
+        self, user: User, title: str, content: str, category: Optional[str] = None
+    ) -> Post:
         """
         Creates a new post associated with a user.
         
@@ -30,14 +56,16 @@ class PostService:
             user (User): The owner of the post.
             title (str): Post title.
             content (str): Post content.
+            category (Optional[str]): Feed category.
         
         Returns:
             Post: The created post object.
         """
-        post = Post(title=title, content=content, owner_id=user.id)
+        post = Post(title=title, content=content, owner_id=user.id, category=category)
         self.db.add(post)
         self.db.commit()
         self.db.refresh(post)
+        self._invalidate(post.id, post.category)
         return post
     
     def get_post(self, post_id: int) -> Optional[Post]:
@@ -55,28 +83,83 @@ class PostService:
         """
         return self.db.query(Post).filter(Post.id == post_id).first()
     
-    def get_posts(self, category: Optional[str] = None, sort_by: str = "likes") -> list[Post]:
+    def get_posts(
+        self,
+        category: Optional[str] = None,
+        sort_by: str = "likes",
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Tuple[list[Post], Optional[str]]:
         """
-        Lists posts with optional filtering and sorting.
+        Lists one page of posts with optional filtering and keyset pagination.
         
-        This method builds a query with category filtering and sorting (by likes or creation date),
-        returning all matching posts. It supports pagination potential in FastAPI endpoints.
+        Rows are ordered by the sort key plus id (both descending) and the next page
+        starts strictly after the last row of the previous one, so each page is an
+        index range scan on the matching composite index, regardless of how deep the
+        client has paged.
         
         Args:
             category (Optional[str]): Filter by category (defaults to None for all).
             sort_by (str): Sorting criteria ('likes' descending or 'newest' by creation date).
+            limit (int): Page size, clamped to [1, MAX_PAGE_SIZE].
+            cursor (Optional[str]): Opaque cursor returned with the previous page.
         
         Returns:
-            list[Post]: List of matching posts.
+            Tuple[list[Post], Optional[str]]: Posts on this page and the cursor for the
+            next page (None when there are no more rows).
+        
+        Raises:
+            ValueError: If sort_by is unknown or the cursor is invalid for this sort.
         """
+        if sort_by not in FEED_SORTS:
+            raise ValueError(f"Unknown sort '{sort_by}'; expected one of {sorted(FEED_SORTS)}")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        keys = FEED_SORTS[sort_by]
+        columns = [column for _, column in keys]
+
         query = self.db.query(Post)
         if category:
             query = query.filter(Post.category == category)
-        if sort_by == "likes":
-            query = query.order_by(Post.likes.desc())
-        elif sort_by == "newest":
-            query = query.order_by(Post.created_at.desc())
-        return query.all()
+        if cursor:
+            position = decode_cursor(cursor)
+            if position.get("sort") != sort_by:
+                raise InvalidCursorError("Cursor does not belong to this sort order")
+            try:
+                values = [position[name] for name, _ in keys]
+            except KeyError as e:
+                raise InvalidCursorError("Invalid cursor") from e
+            # a forged cursor must not bind strings or objects against typed columns.
+            for (_, column), value in zip(keys, values):
+                if isinstance(value, bool) or not isinstance(value, column.type.python_type):
+                    raise InvalidCursorError("Invalid cursor")
+            query = query.filter(tuple_(*columns) < tuple_(*values))
+        rows = query.order_by(*(c.desc() for c in columns)).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            position = {name: getattr(last, name) for name, _ in keys}
+            position["sort"] = sort_by
+            next_cursor = encode_cursor(position)
+        return rows, next_cursor
+    
+    def get_user_posts(self, user: User) -> list[Post]:
+        """
+        Retrieves all posts owned by a user, newest first.
+        
+        Args:
+            user (User): The owner whose posts to fetch.
+        
+        Returns:
+            list[Post]: The user's posts.
+        """
+        return (
+            self.db.query(Post)
+            .filter(Post.owner_id == user.id)
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .all()
+        )
     
     def delete_post(self, user: User, post_id: int) -> bool:
         """
@@ -94,8 +177,12 @@ class PostService:
         """
         post = self.get_post(post_id)
         if post and post.owner_id == user.id:
+            post_id, category = post.id, post.category
+            if self.uploads is not None:
+                self.uploads.release(self.db, post.image_url)
             self.db.delete(post)
             self.db.commit()
+            self._invalidate(post_id, category)
             return True
         return False
     
@@ -117,7 +204,12 @@ class PostService:
         post = self.db.query(Post).filter(Post.id == post_id, Post.owner_id == user.id).first()
         if not post:
             return None
+        if self.uploads is not None and post.image_url != image_url:
+            # same transaction as the post, so the counts never drift from the rows.
+            self.uploads.retain(self.db, image_url)
+            self.uploads.release(self.db, post.image_url)
         post.image_url = image_url
         self.db.commit()
         self.db.refresh(post)
+        self._invalidate(post.id, post.category)
         return post
@@ -0,0 +1,62 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from src.database.models.user import User
+from src.utilities.cache import TTLCache
+from src.utilities.metrics import record_cache
+
+
+class PrincipalCache:
+    """
+    Short-lived cache of authenticated users, keyed by JWT subject.
+
+    Stores a plain snapshot of the user's columns rather than ORM instances, so a
+    cached entry is never bound to the session of the request that loaded it.
+    `attach` turns a snapshot back into a User that belongs to the caller's
+    session without issuing a SELECT.
+
+    Args:
+        ttl (float): Seconds a cached principal stays valid; bounds how long a
+            change made on another worker can go unnoticed.
+        max_entries (int): Maximum number of cached principals.
+    """
+
+    COLUMNS = ("id", "username", "hashed_password", "token_version")
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 10_000):
+        self._cache = TTLCache(ttl=ttl, max_entries=max_entries)
+
+    @staticmethod
+    def key(username: Optional[str], user_id: Optional[int]) -> str:
+        return f"id:{user_id}" if user_id is not None else f"name:{username}"
+
+    def get(self, key: str) -> Optional[dict]:
+        snapshot = self._cache.get(key)
+        record_cache("principal", snapshot is not None)
+        return snapshot
+
+    def put(self, key: str, user: User) -> None:
+        self._cache.set(key, {c: getattr(user, c) for c in self.COLUMNS})
+
+    @staticmethod
+    def attach(db: Session, snapshot: dict) -> User:
+        """
+        Rebuilds a User from a snapshot as a persistent instance of `db`.
+
+        `merge(load=False)` trusts the snapshot instead of re-reading the row, so
+        lazy relationships and later updates (e.g. in update_me) work as usual.
+        """
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def invalidate(self, user_id: int, *usernames: Optional[str]) -> None:
+        """Drops cached entries for a user under its id and any of its usernames."""
+        self._cache.delete(self.key(None, user_id))
+        for username in usernames:
+            if username:
+                self._cache.delete(self.key(username, None))
+
+    def stats(self) -> dict:
+        return self._cache.stats()
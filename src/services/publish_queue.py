@@ -0,0 +1,239 @@
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.database.models.publish_job import PublishJob
+from src.utilities.upload_stream import EXTENSIONS, ImageStream
+
+
+def utcnow() -> datetime:
+    # naive UTC, matching the DateTime columns.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class PublishQueue:
+    """
+    Durable outbox of posts to publish on LinkedIn and X.
+
+    Jobs live in the `publish_jobs` table, so they survive restarts and are
+    shared by all worker processes. A job is claimed with a lease (an
+    optimistic UPDATE that only one worker can win) that its worker renews
+    while it publishes; a worker that dies leaves the lease to expire and the
+    job is picked up again. Attached images are stored under `media_dir` until
+    the job is done.
+
+    Args:
+        session_factory (Callable[[], Session]): Creates sessions for queue operations.
+        media_dir (str): Directory for images waiting to be published.
+        max_attempts (int): Attempts before a job is marked failed.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], media_dir: str, max_attempts: int = 5):
+        self.session_factory = session_factory
+        self.media_dir = media_dir
+        self.max_attempts = max_attempts
+        # set by the worker pool so new jobs are picked up without waiting for a poll.
+        self.on_enqueue: Optional[Callable[[], None]] = None
+
+    def enqueue(
+        self,
+        user_id: int,
+        platform: str,
+        payload: dict,
+        media_path: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+        planned_post_id: Optional[int] = None,
+        not_before: Optional[datetime] = None,
+    ) -> Tuple[PublishJob, bool]:
+        """
+        Adds a job, or returns the existing one for the same user and idempotency key.
+
+        Returns:
+            Tuple[PublishJob, bool]: The job (detached) and whether it was created.
+        """
+        job = PublishJob(
+            user_id=user_id,
+            platform=platform,
+            payload=payload,
+            media_path=media_path,
+            idempotency_key=idempotency_key,
+            planned_post_id=planned_post_id,
+            max_attempts=self.max_attempts,
+            next_attempt_at=not_before or utcnow(),
+        )
+        with self.session_factory() as db:
+            db.add(job)
+            try:
+                db.commit()
+            except IntegrityError:
+                # the unique (user_id, idempotency_key) constraint: a retried request.
+                db.rollback()
+                if idempotency_key is None:
+                    raise
+                existing = db.scalars(
+                    select(PublishJob).where(
+                        PublishJob.user_id == user_id,
+                        PublishJob.idempotency_key == idempotency_key,
+                    )
+                ).one()
+                db.expunge(existing)
+                return existing, False
+            db.refresh(job)
+            db.expunge(job)
+        if self.on_enqueue is not None:
+            self.on_enqueue()
+        return job, True
+
+    def get(self, job_id: int, user_id: Optional[int] = None) -> Optional[PublishJob]:
+        """Returns a job (detached), only if it belongs to `user_id` when one is given."""
+        with self.session_factory() as db:
+            job = db.get(PublishJob, job_id)
+            if job is None or (user_id is not None and job.user_id != user_id):
+                return None
+            db.expunge(job)
+            return job
+
+    def claim(self, worker_id: str, limit: int = 1, lease_seconds: float = 300.0,
+              now: Optional[datetime] = None) -> List[PublishJob]:
+        """
+        Leases up to `limit` due jobs to `worker_id` and counts the attempt.
+
+        Due means queued with `next_attempt_at` in the past, or running with an
+        expired lease and attempts left. Candidates come from the (status,
+        next_attempt_at) index; each is then taken with a conditional UPDATE, so
+        concurrent workers never claim the same job. Jobs whose lease expired on
+        their last attempt (the worker died mid-publish) are marked failed.
+
+        Returns:
+            List[PublishJob]: Claimed jobs (detached).
+        """
+        now = now or utcnow()
+        expired = and_(PublishJob.status == "running", PublishJob.lease_until < now)
+        claimable = or_(
+            and_(PublishJob.status == "queued", PublishJob.next_attempt_at <= now),
+            and_(expired, PublishJob.attempts < PublishJob.max_attempts),
+        )
+        claimed = []
+        with self.session_factory() as db:
+            self._fail_exhausted(db, expired, now)
+            candidates = db.scalars(
+                select(PublishJob.id).where(claimable).order_by(PublishJob.next_attempt_at).limit(limit)
+            ).all()
+            for job_id in candidates:
+                won = db.execute(
+                    update(PublishJob)
+                    .where(PublishJob.id == job_id, claimable)
+                    .values(
+                        status="running",
+                        lease_owner=worker_id,
+                        lease_until=now + timedelta(seconds=lease_seconds),
+                        attempts=PublishJob.attempts + 1,
+                    )
+                ).rowcount == 1
+                db.commit()
+                if won:
+                    job = db.get(PublishJob, job_id)
+                    db.expunge(job)
+                    claimed.append(job)
+        return claimed
+
+    def _fail_exhausted(self, db: Session, expired, now: datetime) -> None:
+        exhausted = and_(expired, PublishJob.attempts >= PublishJob.max_attempts)
+        for job_id, media_path in db.execute(
+            select(PublishJob.id, PublishJob.media_path).where(exhausted)
+        ).all():
+            failed = db.execute(
+                update(PublishJob)
+                .where(PublishJob.id == job_id, exhausted)
+                .values(status="failed", lease_owner=None, lease_until=None, completed_at=now,
+                        updated_at=now, last_error="Lease expired on the last attempt")
+            ).rowcount == 1
+            db.commit()
+            if failed:
+                self.delete_media(media_path)
+
+    def renew(self, job_id: int, worker_id: str, lease_seconds: float = 300.0,
+              now: Optional[datetime] = None) -> bool:
+        """Extends a held lease to `lease_seconds` from now; False if it was lost to another worker."""
+        now = now or utcnow()
+        with self.session_factory() as db:
+            renewed = db.execute(
+                update(PublishJob)
+                .where(PublishJob.id == job_id, PublishJob.lease_owner == worker_id,
+                       PublishJob.status == "running")
+                .values(lease_until=now + timedelta(seconds=lease_seconds))
+            ).rowcount == 1
+            db.commit()
+        return renewed
+
+    def complete(self, job_id: int, worker_id: str, external_id: Optional[str]) -> bool:
+        """Marks a leased job succeeded; False if the lease was lost to another worker."""
+        return self._finish(job_id, worker_id, status="succeeded", external_id=external_id,
+                            completed_at=utcnow(), last_error=None)
+
+    def fail(self, job_id: int, worker_id: str, error: str, retry_at: Optional[datetime] = None) -> str:
+        """
+        Records a failed attempt.
+
+        The job is queued again for `retry_at` unless it is None (a permanent error)
+        or the job has used up its attempts, in which case it is marked failed.
+
+        Returns:
+            str: The job's new status ('queued' or 'failed'), or '' if the lease was lost.
+        """
+        with self.session_factory() as db:
+            job = db.get(PublishJob, job_id)
+            if job is None or job.lease_owner != worker_id:
+                return ""
+            attempts = job.attempts
+            max_attempts = job.max_attempts
+        if retry_at is not None and attempts < max_attempts:
+            return "queued" if self._finish(job_id, worker_id, status="queued", next_attempt_at=retry_at,
+                                            last_error=error) else ""
+        return "failed" if self._finish(job_id, worker_id, status="failed", completed_at=utcnow(),
+                                        last_error=error) else ""
+
+    def defer(self, job_id: int, worker_id: str, until: datetime) -> bool:
+        """Puts a leased job back until `until` without counting the attempt (e.g. rate limited)."""
+        return self._finish(job_id, worker_id, status="queued", next_attempt_at=until,
+                            attempts=PublishJob.attempts - 1)
+
+    def _finish(self, job_id: int, worker_id: str, **values) -> bool:
+        with self.session_factory() as db:
+            done = db.execute(
+                update(PublishJob)
+                .where(PublishJob.id == job_id, PublishJob.lease_owner == worker_id,
+                       PublishJob.status == "running")
+                .values(lease_owner=None, lease_until=None, updated_at=utcnow(), **values)
+            ).rowcount == 1
+            db.commit()
+        return done
+
+    async def save_media(self, image: ImageStream) -> str:
+        """Copies a validated image into the media directory (chunk by chunk); returns its path."""
+        await run_in_threadpool(os.makedirs, self.media_dir, exist_ok=True)
+        path = os.path.join(self.media_dir, uuid.uuid4().hex + EXTENSIONS[image.content_type])
+        fh = await run_in_threadpool(open, path, "wb")
+        try:
+            async for chunk in image.chunks():
+                await run_in_threadpool(fh.write, chunk)
+        except BaseException:
+            fh.close()
+            await run_in_threadpool(self.delete_media, path)
+            raise
+        await run_in_threadpool(fh.close)
+        return path
+
+    @staticmethod
+    def delete_media(path: Optional[str]) -> None:
+        if path:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+from datetime import timedelta
+from typing import Dict, List, Optional, Protocol, Union
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.database.models.publish_job import PublishJob
+from src.services.publish_queue import PublishQueue, utcnow
+from src.services.publishers import PublishError, Published
+from src.utilities.rate_limit import RateLimiterRegistry
+from src.utilities.upload_stream import ImageStream
+
+logger = logging.getLogger(__name__)
+
+
+class Publisher(Protocol):
+    platform: str
+
+    async def account_key(self, user_id: int) -> str: ...
+
+    async def publish(self, job: PublishJob) -> Published: ...
+
+    async def publish_content(self, user_id: int, text: str, image: Union[str, ImageStream, None] = None) -> Published: ...
+
+
+class PublishWorkerPool:
+    """
+    Background workers that drain the publish queue.
+
+    Each of the `workers` tasks claims one due job at a time, takes a token from
+    the per-account rate limiter and publishes it. A job whose account is out of
+    quota is put back until the bucket refills, without counting an attempt;
+    rate-limit headers returned by the platform, on success or failure,
+    resynchronise the bucket.
+    Retryable failures are rescheduled with capped exponential backoff and
+    jitter. Workers sleep `poll_interval` seconds when idle, or until a job is
+    enqueued in this process. Running a pool per worker process is safe: jobs
+    are claimed with a lease, renewed every third of `lease_seconds` while the
+    platform call runs so a slow publish is not claimed again. A job whose lease
+    is lost anyway is left to the worker that took it over.
+
+    Args:
+        queue (PublishQueue): Queue to drain.
+        publishers (List[Optional[Publisher]]): One publisher per platform (None if disabled).
+        limiter (RateLimiterRegistry): Per-account token buckets.
+        workers (int): Concurrent publishing tasks (0 disables the pool).
+        poll_interval (float): Seconds between queue polls when idle.
+        lease_seconds (float): How long a claimed job is reserved for its worker.
+        backoff_base (float): Delay before the first retry, doubled per attempt.
+        backoff_max (float): Upper bound on the retry delay.
+    """
+
+    def __init__(
+        self,
+        queue: PublishQueue,
+        publishers: List[Optional[Publisher]],
+        limiter: Optional[RateLimiterRegistry] = None,
+        workers: int = 2,
+        poll_interval: float = 5.0,
+        lease_seconds: float = 300.0,
+        backoff_base: float = 30.0,
+        backoff_max: float = 3600.0,
+    ):
+        self.queue = queue
+        self.publishers: Dict[str, Publisher] = {p.platform: p for p in publishers if p is not None}
+        self.limiter = limiter or RateLimiterRegistry()
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before retrying after `attempts` failed attempts (jittered to spread retries)."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** max(0, attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def run_once(self, worker_id: str) -> bool:
+        """Claims and processes one due job; returns False if none was due."""
+        jobs = await run_in_threadpool(self.queue.claim, worker_id, 1, self.lease_seconds)
+        for job in jobs:
+            await self.process(job, worker_id)
+        return bool(jobs)
+
+    async def process(self, job: PublishJob, worker_id: str) -> None:
+        publisher = self.publishers.get(job.platform)
+        if publisher is None:
+            await run_in_threadpool(self.queue.fail, job.id, worker_id, f"Unknown platform {job.platform!r}")
+            await run_in_threadpool(self.queue.delete_media, job.media_path)
+            return
+
+        bucket = self.limiter.bucket(job.platform, await publisher.account_key(job.user_id))
+        wait = bucket.reserve()
+        if wait > 0:
+            await run_in_threadpool(self.queue.defer, job.id, worker_id, utcnow() + timedelta(seconds=wait))
+            return
+
+        heartbeat = asyncio.create_task(self._keep_leased(job.id, worker_id))
+        try:
+            published = await publisher.publish(job)
+        except PublishError as exc:
+            retry_at = None
+            if exc.retryable:
+                delay = self.backoff(job.attempts)
+                if exc.rate_limit is not None:
+                    exc.rate_limit.apply(bucket)
+                    delay = max(delay, exc.rate_limit.retry_after or 0.0)
+                retry_at = utcnow() + timedelta(seconds=delay)
+            await self._failed(job, worker_id, str(exc), retry_at)
+        except Exception as exc:
+            logger.exception("Publishing job %s failed unexpectedly", job.id)
+            await self._failed(job, worker_id, repr(exc), utcnow() + timedelta(seconds=self.backoff(job.attempts)))
+        else:
+            if published.rate_limit is not None:
+                published.rate_limit.apply(bucket)
+            if await run_in_threadpool(self.queue.complete, job.id, worker_id, published.external_id):
+                await run_in_threadpool(self.queue.delete_media, job.media_path)
+            else:
+                # another worker holds the job now; its attempt still needs the media.
+                logger.error("Publish job %s was published as %s after its lease was lost; "
+                             "it may be posted again", job.id, published.external_id)
+        finally:
+            heartbeat.cancel()
+
+    async def _keep_leased(self, job_id: int, worker_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                renewed = await run_in_threadpool(self.queue.renew, job_id, worker_id, self.lease_seconds)
+            except Exception:
+                logger.exception("Renewing the lease of publish job %s failed", job_id)
+                continue
+            if not renewed:
+                logger.warning("Publish job %s lost its lease while publishing", job_id)
+                return
+
+    async def _failed(self, job: PublishJob, worker_id: str, error: str, retry_at) -> None:
+        status = await run_in_threadpool(self.queue.fail, job.id, worker_id, error, retry_at)
+        if status == "failed":
+            logger.warning("Publish job %s failed permanently: %s", job.id, error)
+            await run_in_threadpool(self.queue.delete_media, job.media_path)
+
+    def notify(self) -> None:
+        """Wakes idle workers (called when a job is enqueued in this process, from any thread)."""
+        if self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _work(self, worker_id: str) -> None:
+        while True:
+            # cleared before claiming, so an enqueue during the claim is not missed.
+            self._wakeup.clear()
+            try:
+                busy = await self.run_once(worker_id)
+            except Exception:
+                logger.exception("Publish worker %s failed to claim a job", worker_id)
+                busy = False
+            if not busy:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self) -> None:
+        """Starts the workers on the running event loop (no-op if `workers` is 0)."""
+        if self._tasks or self.workers <= 0:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self.queue.on_enqueue = self.notify
+        self._tasks = [
+            asyncio.create_task(self._work(f"{self.worker_prefix}:{n}"), name=f"publish-worker-{n}")
+            for n in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        self.queue.on_enqueue = None
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,163 @@
+from typing import Dict, Optional, Tuple, Union
+
+import httpx
+from fastapi import HTTPException
+
+from src.database.models.publish_job import PublishJob
+from src.services.linkedin_service import LinkedInApiService
+from src.services.x_client_pool import XClientPool, XNotConfigured
+from src.services.x_service import ChunkedUpload, MediaUploadInterrupted, XApiError
+from src.utilities.linkedin_asset_cache import LinkedInAssetCache
+from src.utilities.linkedin_helper import get_linkedin_token_for
+from src.utilities.media_preprocessor import MediaPreprocessor
+from src.utilities.rate_limit import RateLimitInfo
+from src.utilities.upload_stream import ImageStream
+
+
+class PublishError(Exception):
+    """
+    A failed publish attempt.
+
+    Args:
+        message (str): What went wrong.
+        retryable (bool): Whether trying again later may succeed (rate limits,
+            server errors, network failures) or not (invalid content, no account).
+        rate_limit (Optional[RateLimitInfo]): Quota reported with the failure.
+    """
+
+    def __init__(self, message: str, retryable: bool, rate_limit: Optional[RateLimitInfo] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.rate_limit = rate_limit
+
+
+class Published:
+    """
+    A successful publish attempt.
+
+    Args:
+        external_id (str): Id of the created post on the platform.
+        rate_limit (Optional[RateLimitInfo]): Quota reported with the response.
+    """
+
+    def __init__(self, external_id: str, rate_limit: Optional[RateLimitInfo] = None):
+        self.external_id = external_id
+        self.rate_limit = rate_limit
+
+
+def _retryable_status(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
+class LinkedInPublisher:
+    """
+    Publishes to the user's LinkedIn account (queued jobs and cross-posts).
+
+    Args:
+        client (Optional[httpx.AsyncClient]): Shared HTTP client.
+        asset_cache (Optional[LinkedInAssetCache]): Reuses assets of images uploaded before.
+        preprocessor (Optional[MediaPreprocessor]): Fits images to LinkedIn's limits before upload.
+    """
+
+    platform = "linkedin"
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        asset_cache: Optional[LinkedInAssetCache] = None,
+        preprocessor: Optional[MediaPreprocessor] = None,
+    ):
+        self.client = client
+        self.asset_cache = asset_cache
+        self.preprocessor = preprocessor
+
+    async def account_key(self, user_id: int) -> str:
+        # LinkedIn quotas are per member.
+        return str(user_id)
+
+    async def publish(self, job: PublishJob) -> Published:
+        """Publishes a queued job; returns the post URN (and reported quota) or raises PublishError."""
+        return await self.publish_content(job.user_id, job.payload.get("text", ""), job.media_path)
+
+    async def publish_content(self, user_id: int, text: str, image: Union[str, ImageStream, None] = None) -> Published:
+        """Publishes `text` with an optional image (path or stream); returns the post URN and reported quota."""
+        try:
+            token = await get_linkedin_token_for(user_id, self.client)
+        except HTTPException as exc:
+            raise PublishError(str(exc.detail), retryable=False)
+        service = LinkedInApiService(token, client=self.client, asset_cache=self.asset_cache, user_id=user_id)
+        if image is not None and self.preprocessor is not None:
+            image = await self.preprocessor.prepare(image, self.platform)
+        try:
+            if image is not None:
+                urn = await service.post_with_image(text, image)
+            else:
+                urn = await service.post_text(text)
+        except httpx.HTTPStatusError as exc:
+            status = exc.response.status_code
+            raise PublishError(
+                f"LinkedIn returned {status}: {exc.response.text[:500]}",
+                retryable=_retryable_status(status),
+                rate_limit=RateLimitInfo.from_headers(exc.response.headers),
+            )
+        except httpx.TransportError as exc:
+            raise PublishError(f"LinkedIn request failed: {exc!r}", retryable=True)
+        return Published(urn, RateLimitInfo.from_headers(service.last_headers))
+
+
+class XPublisher:
+    """
+    Publishes to the user's X account (queued jobs and cross-posts).
+
+    Args:
+        pool (XClientPool): Pool of per-account X clients.
+        preprocessor (Optional[MediaPreprocessor]): Fits images to X's limits before upload.
+    """
+
+    platform = "x"
+
+    def __init__(self, pool: XClientPool, preprocessor: Optional[MediaPreprocessor] = None):
+        self.pool = pool
+        self.preprocessor = preprocessor
+        # interrupted chunked uploads of queued media, resumed by the job's next attempt.
+        self._uploads: Dict[Tuple[int, str], ChunkedUpload] = {}
+
+    async def account_key(self, user_id: int) -> str:
+        # X write limits are per account; users without their own share the default one.
+        return await self.pool.account_key(user_id)
+
+    async def publish(self, job: PublishJob) -> Published:
+        """Publishes a queued job; returns the tweet id (and reported quota) or raises PublishError."""
+        return await self.publish_content(job.user_id, job.payload.get("text", ""), job.media_path)
+
+    async def publish_content(self, user_id: int, text: str, image: Union[str, ImageStream, None] = None) -> Published:
+        """Publishes `text` with an optional image (path or stream); returns the tweet id and reported quota."""
+        try:
+            service = await self.pool.get(user_id)
+        except XNotConfigured as exc:
+            raise PublishError(str(exc), retryable=False)
+        if service is None:
+            raise PublishError("Connect X first", retryable=False)
+        resume_key = (user_id, image) if isinstance(image, str) else None
+        if image is not None and self.preprocessor is not None:
+            image = await self.preprocessor.prepare(image, self.platform)
+        headers: Dict[str, str] = {}
+        try:
+            if image is not None:
+                resume = self._uploads.pop(resume_key, None) if resume_key else None
+                data = await service.post_tweet_with_image(text, image, resume, on_headers=headers.update)
+            else:
+                data = await service.post_tweet(text, on_headers=headers.update)
+        except MediaUploadInterrupted as exc:
+            if resume_key and exc.retryable and exc.upload.resumable:
+                self._uploads[resume_key] = exc.upload
+            raise PublishError(str(exc), retryable=exc.retryable, rate_limit=RateLimitInfo.from_headers(exc.headers))
+        except XApiError as exc:
+            raise PublishError(
+                str(exc),
+                retryable=_retryable_status(exc.status_code),
+                rate_limit=RateLimitInfo.from_headers(exc.headers),
+            )
+        except httpx.TransportError as exc:
+            raise PublishError(f"X request failed: {exc!r}", retryable=True)
+        return Published(str(data.get("id")), RateLimitInfo.from_headers(headers))
@@ -0,0 +1,169 @@
+import hashlib
+import html
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.database.search_index import SEARCHABLE_TABLES, fts_table
+from src.utilities.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+# Search scopes exposed to clients -> indexed tables.
+SEARCH_SCOPES = {
+    "posts": "posts",
+    "planned_posts": "planned_posts",
+}
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+
+# Markers wrapped around matched terms in titles and snippets.
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+# What the database wraps matches in: control characters, so that the highlighted
+# text can be HTML-escaped before they are turned into HIGHLIGHT_START/END.
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+_MATCHED = re.compile(f"{_MATCH_START}([^{_MATCH_START}{_MATCH_END}]*){_MATCH_END}")
+
+
+def _highlighted(fragment: Optional[str]) -> Optional[str]:
+    # Post text is user content: escape all of it, then mark only the matched terms.
+    if fragment is None:
+        return None
+    escaped = html.escape(fragment)
+    marked = _MATCHED.sub(lambda m: f"{HIGHLIGHT_START}{m.group(1)}{HIGHLIGHT_END}", escaped)
+    return marked.replace(_MATCH_START, "").replace(_MATCH_END, "")
+
+
+class SearchService:
+    """
+    Service class for ranked full-text search over posts and planned posts.
+
+    Queries run against the dialect's full-text index (SQLite FTS5 or a Postgres
+    tsvector/GIN index, see `src.database.search_index`). Results are ordered by
+    relevance score, highest first, with the id as tiebreaker, and paginated by
+    keyset on (score, id).
+
+    Args:
+        db (Session): SQLAlchemy session for database interactions.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _fts5_query(query: str) -> Optional[str]:
+        # Quote every term so FTS5 operators in user input are matched literally;
+        # the last term is a prefix match to support search-as-you-type.
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return None
+        quoted = [f'"{t}"' for t in terms]
+        quoted[-1] += "*"
+        return " ".join(quoted)
+
+    def _sqlite_sql(self, table: str, columns: List[str]) -> str:
+        fts = fts_table(table)
+        # Title (first column) matches weigh more than body matches.
+        weights = ", ".join(["10.0"] + ["1.0"] * (len(columns) - 1))
+        title = (
+            f"highlight({fts}, 0, '{_MATCH_START}', '{_MATCH_END}')"
+            if len(columns) > 1 else "NULL"
+        )
+        body = f"snippet({fts}, {len(columns) - 1}, '{_MATCH_START}', '{_MATCH_END}', '…', 24)"
+        return (
+            f"SELECT id, score, title, snippet FROM ("
+            f"SELECT rowid AS id, -bm25({fts}, {weights}) AS score, "
+            f"{title} AS title, {body} AS snippet "
+            f"FROM {fts} WHERE {fts} MATCH :query) "
+            f"WHERE :after_score IS NULL OR score < :after_score "
+            f"OR (score = :after_score AND id > :after_id) "
+            f"ORDER BY score DESC, id LIMIT :limit"
+        )
+
+    def _postgres_sql(self, table: str, columns: List[str]) -> str:
+        options = f"StartSel={_MATCH_START}, StopSel={_MATCH_END}, MaxFragments=2"
+        title = (
+            f"ts_headline(q.cfg, t.{columns[0]}, q.query, 'HighlightAll=true, {options}')"
+            if len(columns) > 1 else "NULL"
+        )
+        body = f"ts_headline(q.cfg, t.{columns[-1]}, q.query, '{options}')"
+        return (
+            f"WITH q AS (SELECT CAST(:config AS regconfig) AS cfg, "
+            f"websearch_to_tsquery(CAST(:config AS regconfig), :query) AS query), "
+            f"ranked AS (SELECT t.id, ts_rank_cd(t.search_vector, q.query)::float8 AS score "
+            f"FROM {table} t, q WHERE t.search_vector @@ q.query) "
+            f"SELECT r.id, r.score, {title} AS title, {body} AS snippet "
+            f"FROM ranked r JOIN {table} t ON t.id = r.id, q "
+            f"WHERE CAST(:after_score AS float8) IS NULL OR r.score < :after_score "
+            f"OR (r.score = :after_score AND r.id > :after_id) "
+            f"ORDER BY r.score DESC, r.id LIMIT :limit"
+        )
+
+    def search(
+        self,
+        query: str,
+        scope: str = "posts",
+        limit: int = DEFAULT_SEARCH_LIMIT,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Runs a ranked full-text search and returns one page of hits.
+
+        Args:
+            query (str): Free-text query entered by the user.
+            scope (str): 'posts' or 'planned_posts'.
+            limit (int): Page size, clamped to [1, MAX_SEARCH_LIMIT].
+            cursor (Optional[str]): Cursor returned with the previous page.
+
+        Returns:
+            Tuple[List[dict], Optional[str]]: Hits ({id, score, title, snippet}) and the
+            cursor for the next page (None on the last page). Titles and snippets are
+            HTML-escaped, with matched terms wrapped in <mark> tags.
+
+        Raises:
+            ValueError: For an unknown scope, an unsupported database, or a cursor
+                that belongs to a different query.
+        """
+        if scope not in SEARCH_SCOPES:
+            raise ValueError(f"Unknown scope '{scope}'; expected one of {sorted(SEARCH_SCOPES)}")
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        table = SEARCH_SCOPES[scope]
+        columns = SEARCHABLE_TABLES[table]
+        fingerprint = hashlib.sha1(f"{scope}\0{query}".encode()).hexdigest()[:16]
+
+        after_score = after_id = None
+        if cursor:
+            position = decode_cursor(cursor)
+            if position.get("q") != fingerprint:
+                raise InvalidCursorError("Cursor does not belong to this search")
+            after_score, after_id = position.get("score"), position.get("id")
+
+        dialect = self.db.get_bind().dialect.name
+        params = {"after_score": after_score, "after_id": after_id, "limit": limit + 1}
+        if dialect == "sqlite":
+            match = self._fts5_query(query)
+            if match is None:
+                return [], None
+            sql = self._sqlite_sql(table, columns)
+            params["query"] = match
+        elif dialect == "postgresql":
+            sql = self._postgres_sql(table, columns)
+            params.update(query=query, config=settings.SEARCH_TEXT_CONFIG)
+        else:
+            raise ValueError(f"Full-text search is not supported on '{dialect}'")
+
+        rows = [dict(row._mapping) for row in self.db.execute(text(sql), params)]
+        for row in rows:
+            row["title"] = _highlighted(row["title"])
+            row["snippet"] = _highlighted(row["snippet"])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor({"q": fingerprint, "score": last["score"], "id": last["id"]})
+        return rows, next_cursor
@@ -1,9 +1,10 @@
 from typing import Optional, List
 
+from src.database.models.post import Post
 from src.database.models.user import User
 from src.schemas.user_schemas import UserUpdate
 from sqlalchemy.orm import Session
-from src.utilities.password_utils import get_password_hash, verify_password  # New import
+from src.utilities.password_utils import get_password_hash, verify_password
 
 
 class UserService:
@@ -36,7 +37,22 @@ class UserService:
         Returns:
             User: The created user object.
         """
-        hashed_password = get_password_hash(password)
+        return self.create_user_with_hash(username, get_password_hash(password))
+    
+    def create_user_with_hash(self, username: str, hashed_password: str) -> User:
+        """
+        Creates a new user from an already hashed password.
+        
+        Used by async endpoints that hash on the password hasher's pool before
+        handing the database work to the threadpool.
+        
+        Args:
+            username (str): Unique username.
+            hashed_password (str): bcrypt hash of the user's password.
+        
+        Returns:
+            User: The created user object.
+        """
         user = User(username=username, hashed_password=hashed_password)
         self.db.add(user)
         self.db.commit()
@@ -103,8 +119,9 @@ class UserService:
         """
         Retrieves all posts owned by a user.
         
-        This method accesses the user's posts via the ORM relationship, suitable
-        for user-specific queries in endpoints like profile views.
+        This method queries posts by owner id in a single statement rather than
+        lazy-loading `user.posts`, so it also works for users that are not attached
+        to this session.
         
         Args:
             user (User): The user whose posts to fetch.
@@ -112,4 +129,4 @@ class UserService:
         Returns:
             List: List of user's posts.
         """
-        return user.posts
+        return self.db.query(Post).filter(Post.owner_id == user.id).all()
@@ -0,0 +1,110 @@
+from typing import Optional, Tuple
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+
+from src.oauth.x_oauth import XCredentials
+from src.services.x_service import XApiService
+from src.utilities.cache import TTLCache
+from src.utilities.x_credential_store import XCredentialStore
+
+
+class XNotConfigured(RuntimeError):
+    """The X consumer key/secret are not set, so no account can post."""
+
+
+# account key of users posting with the default credentials.
+DEFAULT_ACCOUNT = "default"
+
+
+class XClientPool:
+    """
+    Reusable, authenticated X clients, one per account.
+
+    Clients are kept in an LRU cache (at most `max_clients`, each for `ttl`
+    seconds so credentials replaced through another worker are picked up) and
+    all share the application HTTP client's connection pool. Users without
+    stored credentials fall back to the `default_credentials` account (the
+    X_ACCESS_TOKEN / X_ACCESS_TOKEN_SECRET variables) when one is configured;
+    `account_key` tells them apart, so all of those users share one rate limit.
+
+    Args:
+        store (XCredentialStore): Per-user credentials.
+        consumer_key (Optional[str]): App consumer key.
+        consumer_secret (Optional[str]): App consumer secret.
+        client (Optional[httpx.AsyncClient]): Shared HTTP client.
+        default_credentials (Optional[XCredentials]): Fallback account.
+        max_clients (int): Maximum pooled clients.
+        ttl (float): Seconds a pooled client is reused before credentials are re-read.
+        segment_size (int): Bytes per chunked media upload segment.
+        parallel_segments (int): Media upload segments in flight at once.
+    """
+
+    def __init__(
+        self,
+        store: XCredentialStore,
+        consumer_key: Optional[str],
+        consumer_secret: Optional[str],
+        client: Optional[httpx.AsyncClient] = None,
+        default_credentials: Optional[XCredentials] = None,
+        max_clients: int = 1024,
+        ttl: float = 300.0,
+        segment_size: int = 4 * 1024 * 1024,
+        parallel_segments: int = 4,
+    ):
+        self.store = store
+        self.consumer_key = consumer_key
+        self.consumer_secret = consumer_secret
+        self.client = client
+        self.default_credentials = default_credentials
+        self.segment_size = segment_size
+        self.parallel_segments = parallel_segments
+        self._clients = TTLCache(ttl=ttl, max_entries=max_clients)
+
+    async def get(self, user_id: int) -> Optional[XApiService]:
+        """
+        Returns the user's client, or None if the user has no X account to post with.
+
+        Raises:
+            XNotConfigured: If the consumer key or secret is missing.
+        """
+        entry = await self._resolve(user_id)
+        return entry[0] if entry is not None else None
+
+    async def account_key(self, user_id: int) -> str:
+        """
+        Key of the X account the user posts with: DEFAULT_ACCOUNT for users relying on
+        the fallback account, otherwise the user id.
+        """
+        try:
+            entry = await self._resolve(user_id)
+        except XNotConfigured:
+            entry = None
+        return entry[1] if entry is not None else str(user_id)
+
+    async def _resolve(self, user_id: int) -> Optional[Tuple[XApiService, str]]:
+        if not self.consumer_key or not self.consumer_secret:
+            raise XNotConfigured("Missing env vars: X_CONSUMER_KEY, X_CONSUMER_SECRET")
+        entry = self._clients.get(str(user_id))
+        if entry is not None:
+            return entry
+        credentials = await run_in_threadpool(self.store.get, user_id)
+        account = str(user_id)
+        if credentials is None:
+            credentials, account = self.default_credentials, DEFAULT_ACCOUNT
+        if credentials is None:
+            return None
+        service = XApiService(
+            self.consumer_key, self.consumer_secret, credentials, client=self.client,
+            segment_size=self.segment_size, parallel_segments=self.parallel_segments,
+        )
+        entry = (service, account)
+        self._clients.set(str(user_id), entry)
+        return entry
+
+    def invalidate(self, user_id: int) -> None:
+        """Drops the user's pooled client (after their credentials changed)."""
+        self._clients.delete(str(user_id))
+
+    def stats(self) -> dict:
+        return self._clients.stats()
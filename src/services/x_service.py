@@ -1,81 +1,388 @@
-import os
+import asyncio
+import math
+import random
+import time
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Set, Union
 
-import tweepy
+import httpx
+from fastapi.concurrency import run_in_threadpool
+
+from src.oauth.x_oauth import OAuth1Signer, XCredentials
+from src.utilities.http_client import use_client
+from src.utilities.metrics import time_phase
+from src.utilities.upload_stream import ImageStream
+
+
+class XApiError(Exception):
+    """
+    An error response from the X API.
+
+    Attributes:
+        status_code (int): HTTP status of the response.
+        headers (Mapping[str, str]): Response headers (rate-limit state for 429s).
+    """
+
+    def __init__(self, status_code: int, message: str, headers: Mapping[str, str]):
+        super().__init__(f"X returned {status_code}: {message}")
+        self.status_code = status_code
+        self.headers = headers
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, XApiError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+class ChunkedUpload:
+    """
+    State of a chunked (INIT/APPEND/FINALIZE) media upload, kept so it can be resumed.
+
+    Attributes:
+        media_id (str): Id returned by INIT.
+        total_bytes (int): Size of the media.
+        segment_size (int): Bytes per APPEND segment.
+        appended (Set[int]): Segment indexes X has acknowledged.
+        finalized (bool): Whether FINALIZE succeeded.
+        expires_at (float): When X discards the unfinished upload (epoch seconds).
+    """
+
+    def __init__(self, media_id: str, total_bytes: int, segment_size: int, expires_at: float):
+        self.media_id = media_id
+        self.total_bytes = total_bytes
+        self.segment_size = segment_size
+        self.appended: Set[int] = set()
+        self.finalized = False
+        self.expires_at = expires_at
+
+    @property
+    def segments(self) -> int:
+        return max(1, math.ceil(self.total_bytes / self.segment_size))
+
+    def pending(self) -> List[int]:
+        return [i for i in range(self.segments) if i not in self.appended]
+
+    @property
+    def resumable(self) -> bool:
+        # a minute of slack so a resumed upload does not expire half way.
+        return time.time() < self.expires_at - 60
+
+
+class MediaUploadInterrupted(Exception):
+    """
+    A chunked upload failed part way; pass `upload` back to resume it.
+
+    Attributes:
+        upload (ChunkedUpload): Progress so far.
+        retryable (bool): Whether the failure was transient.
+        headers (Mapping[str, str]): Headers of the failed response, if any.
+    """
+
+    def __init__(self, message: str, upload: ChunkedUpload, retryable: bool,
+                 headers: Optional[Mapping[str, str]] = None):
+        super().__init__(message)
+        self.upload = upload
+        self.retryable = retryable
+        self.headers = headers or {}
 
 
 class XApiService:
     """
-    Service class for interacting with the X (Twitter) API in FastAPI.
+    Async client for posting to X (Twitter) as one account.
+    
+    Requests are signed with OAuth 1.0a user-context credentials and sent through
+    the shared application HTTP client, so calls never block the event loop or a
+    threadpool slot while waiting on X. Tweets go through API v2; media through
+    the v1.1 upload endpoint. Small images are sent in one request; larger
+    images, GIFs and videos use the chunked INIT/APPEND/FINALIZE flow with
+    several APPEND segments in flight, retry failed segments with backoff and
+    poll STATUS until X has processed the media. Every phase is timed in the
+    `quibble_outbound_phase_seconds` metric. Instances are cheap to reuse and
+    are pooled per account by `XClientPool`.
     
-    This class initializes Tweepy clients for v2 (tweets) and v1 (media uploads),
-    loading credentials from environment variables and validating them. It provides
-    methods for posting tweets, designed for dependency injection in routes to enable
-    social media features with robust error handling for missing configs.
+    Args:
+        consumer_key (str): App consumer key.
+        consumer_secret (str): App consumer secret.
+        credentials (XCredentials): The account's access token and secret.
+        client (Optional[httpx.AsyncClient]): Shared HTTP client; a temporary one is
+            created per call when omitted.
+        segment_size (int): Bytes per APPEND segment (X accepts up to 5 MB).
+        parallel_segments (int): APPEND requests in flight at once.
     """
     
-    def __init__(self):
-        # load credentials fetched from .env vars for security; avoids hardcoding sensitive data.
-        self.consumer_key = os.getenv("X_CONSUMER_KEY")
-        self.consumer_secret = os.getenv("X_CONSUMER_SECRET")
-        self.access_token = os.getenv("X_ACCESS_TOKEN")
-        self.access_token_secret = os.getenv("X_ACCESS_TOKEN_SECRET")
+    API_BASE = "https://api.twitter.com/2"
+    UPLOAD_URL = "https://upload.twitter.com/1.1/media/upload.json"
+    
+    # Per-phase timeouts: the tweet is a small JSON call, uploads get time to write.
+    TWEET_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+    UPLOAD_TIMEOUT = httpx.Timeout(30.0, connect=5.0, write=120.0)
+    
+    # Images up to this size go in a single request; anything else is chunked.
+    SIMPLE_UPLOAD_MAX = 1024 * 1024
+    # Attempts per APPEND segment, and the backoff between them (doubled each time).
+    APPEND_ATTEMPTS = 3
+    RETRY_BACKOFF = 0.5
+    # Processing status polling: X's check_after_secs when given, else backoff up to
+    # STATUS_BACKOFF_MAX; give up after STATUS_DEADLINE seconds.
+    STATUS_BACKOFF_MAX = 30.0
+    STATUS_DEADLINE = 600.0
+    
+    def __init__(
+        self,
+        consumer_key: str,
+        consumer_secret: str,
+        credentials: XCredentials,
+        client: Optional[httpx.AsyncClient] = None,
+        segment_size: int = 4 * 1024 * 1024,
+        parallel_segments: int = 4,
+    ):
+        self.credentials = credentials
+        self.client = client
+        self.segment_size = segment_size
+        self.parallel_segments = parallel_segments
+        self._signer = OAuth1Signer(consumer_key, consumer_secret, credentials)
+    
+    @staticmethod
+    def _check(response: httpx.Response) -> None:
+        if response.is_error:
+            raise XApiError(response.status_code, response.text[:500], response.headers)
+    
+    @staticmethod
+    def _media_category(content_type: str) -> str:
+        if content_type == "image/gif":
+            return "tweet_gif"
+        return "tweet_video" if content_type.startswith("video/") else "tweet_image"
+    
+    async def upload_media(self, media: ImageStream, resume: Optional[ChunkedUpload] = None) -> str:
+        """
+        Uploads an image or video and returns its media id.
         
-        # checks for missing vars early to fail fast during initialization.
-        missing = [k for k, v in {
-            "X_CONSUMER_KEY": self.consumer_key,
-            "X_CONSUMER_SECRET": self.consumer_secret,
-            "X_ACCESS_TOKEN": self.access_token,
-            "X_ACCESS_TOKEN_SECRET": self.access_token_secret,
-        }.items() if not v]
-        if missing:                     
-            raise RuntimeError(f"Missing env vars: {', '.join(missing)}")
+        Args:
+            media (ImageStream): Validated media stream.
+            resume (Optional[ChunkedUpload]): Interrupted upload of the same media to
+                continue (from `MediaUploadInterrupted.upload`).
         
-        # Tweepy Client: For v2 API operations like creating tweets.
-        self.client = tweepy.Client(
-            consumer_key=self.consumer_key,
-            consumer_secret=self.consumer_secret,
-            access_token=self.access_token,
-            access_token_secret=self.access_token_secret
-        )
-        # OAuth1 Handler required for v1 API (media uploads) due to Twitter's API versioning.
-        self.auth = tweepy.OAuth1UserHandler(
-            self.consumer_key, self.consumer_secret,
-            self.access_token, self.access_token_secret
-        )
-        self.api_v1 = tweepy.API(self.auth)
-    
-    def post_tweet(self, text: str):
+        Raises:
+            XApiError: If X rejects a single-request upload.
+            MediaUploadInterrupted: If a chunked upload fails; it can be resumed.
         """
-        Posts a simple text tweet to X (Twitter).
+        if resume is None and media.content_type.startswith("image/") \
+                and media.content_type != "image/gif" and media.size <= self.SIMPLE_UPLOAD_MAX:
+            return await self._upload_simple(media)
+        return await self.upload_chunked(media, resume)
+    
+    async def _upload_simple(self, image: ImageStream) -> str:
+        async with use_client(self.client) as client:
+            with time_phase("x", "media_upload"):
+                image.file.seek(0)
+                response = await client.post(
+                    self.UPLOAD_URL,
+                    headers=self._signer.headers("POST", self.UPLOAD_URL),
+                    files={"media": (image.filename, image.file, image.content_type)},
+                    timeout=self.UPLOAD_TIMEOUT,
+                )
+                self._check(response)
+        return response.json()["media_id_string"]
+    
+    async def upload_chunked(self, media: ImageStream, resume: Optional[ChunkedUpload] = None) -> str:
+        """
+        Uploads media with INIT, parallel APPENDs, FINALIZE and STATUS polling.
         
-        This method uses the Tweepy client to create a tweet, returning the response data
-        for further processing (e.g., extracting tweet ID in endpoints).
+        Segments already acknowledged in `resume` are not sent again.
+        
+        Raises:
+            MediaUploadInterrupted: On any failure, with the progress made so far.
+        """
+        async with use_client(self.client) as client:
+            if resume is not None and resume.resumable and resume.total_bytes == media.size:
+                upload = resume
+            else:
+                upload = await self._init(client, media)
+            try:
+                await self._append_all(client, media, upload)
+                if not upload.finalized:
+                    info = await self._command(client, "finalize", {"command": "FINALIZE", "media_id": upload.media_id})
+                    upload.finalized = True
+                else:
+                    info = await self._status(client, upload)
+                await self._await_processing(client, upload, info.get("processing_info"))
+            except (XApiError, httpx.TransportError) as exc:
+                raise MediaUploadInterrupted(
+                    f"Media upload {upload.media_id} interrupted: {exc}", upload, _retryable(exc),
+                    getattr(exc, "headers", None),
+                ) from exc
+        return upload.media_id
+    
+    async def _command(self, client: httpx.AsyncClient, phase: str, params: Dict[str, str]) -> dict:
+        # INIT/FINALIZE: form-encoded, so the parameters are part of the signature.
+        with time_phase("x", f"media_{phase}"):
+            response = await client.post(
+                self.UPLOAD_URL,
+                headers=self._signer.headers("POST", self.UPLOAD_URL, params),
+                data=params,
+                timeout=self.TWEET_TIMEOUT,
+            )
+            self._check(response)
+        return response.json() if response.content else {}
+    
+    async def _init(self, client: httpx.AsyncClient, media: ImageStream) -> ChunkedUpload:
+        try:
+            body = await self._command(client, "init", {
+                "command": "INIT",
+                "total_bytes": str(media.size),
+                "media_type": media.content_type,
+                "media_category": self._media_category(media.content_type),
+            })
+        except (XApiError, httpx.TransportError) as exc:
+            # nothing to resume yet.
+            raise MediaUploadInterrupted(
+                f"Media upload could not start: {exc}", ChunkedUpload("", media.size, self.segment_size, 0),
+                _retryable(exc), getattr(exc, "headers", None),
+            ) from exc
+        expires_at = time.time() + float(body.get("expires_after_secs", 86400))
+        return ChunkedUpload(body["media_id_string"], media.size, self.segment_size, expires_at)
+    
+    async def _append_all(self, client: httpx.AsyncClient, media: ImageStream, upload: ChunkedUpload) -> None:
+        pending: Iterator[int] = iter(upload.pending())
+        read_lock = asyncio.Lock()  # one file position: segments are read one at a time
+        
+        def read_segment(index: int) -> bytes:
+            media.file.seek(index * upload.segment_size)
+            return media.file.read(upload.segment_size)
+        
+        async def worker() -> None:
+            while True:
+                async with read_lock:
+                    index = next(pending, None)
+                    if index is None:
+                        return
+                    data = await run_in_threadpool(read_segment, index)
+                await self._append(client, upload, index, data, media)
+                upload.appended.add(index)
+        
+        workers = [asyncio.ensure_future(worker()) for _ in range(max(1, self.parallel_segments))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+    
+    async def _append(
+        self, client: httpx.AsyncClient, upload: ChunkedUpload, index: int, data: bytes, media: ImageStream
+    ) -> None:
+        params = {"command": "APPEND", "media_id": upload.media_id, "segment_index": str(index)}
+        for attempt in range(1, self.APPEND_ATTEMPTS + 1):
+            try:
+                with time_phase("x", "media_append"):
+                    # multipart: the form fields are not part of the OAuth signature.
+                    response = await client.post(
+                        self.UPLOAD_URL,
+                        headers=self._signer.headers("POST", self.UPLOAD_URL),
+                        data=params,
+                        files={"media": (media.filename, data, "application/octet-stream")},
+                        timeout=self.UPLOAD_TIMEOUT,
+                    )
+                    self._check(response)
+                return
+            except (XApiError, httpx.TransportError) as exc:
+                if attempt == self.APPEND_ATTEMPTS or not _retryable(exc):
+                    raise
+                await asyncio.sleep(self.RETRY_BACKOFF * 2 ** (attempt - 1) * random.uniform(0.5, 1.0))
+    
+    async def _status(self, client: httpx.AsyncClient, upload: ChunkedUpload) -> dict:
+        url = f"{self.UPLOAD_URL}?command=STATUS&media_id={upload.media_id}"
+        with time_phase("x", "media_status"):
+            response = await client.get(url, headers=self._signer.headers("GET", url), timeout=self.TWEET_TIMEOUT)
+            self._check(response)
+        return response.json()
+    
+    async def _await_processing(
+        self, client: httpx.AsyncClient, upload: ChunkedUpload, info: Optional[dict]
+    ) -> None:
+        # videos and GIFs are transcoded after FINALIZE; images usually have no processing_info.
+        deadline = time.monotonic() + self.STATUS_DEADLINE
+        delay = 1.0
+        while info is not None and info.get("state") in ("pending", "in_progress"):
+            if time.monotonic() >= deadline:
+                raise XApiError(504, f"media {upload.media_id} still processing", {})
+            wait = info.get("check_after_secs")
+            await asyncio.sleep(float(wait) if wait is not None else delay)
+            delay = min(delay * 2, self.STATUS_BACKOFF_MAX)
+            info = (await self._status(client, upload)).get("processing_info")
+        if info is not None and info.get("state") == "failed":
+            error = info.get("error", {})
+            raise XApiError(400, error.get("message", "media processing failed"), {})
+    
+    async def post_tweet(
+        self,
+        text: str,
+        media_ids: Optional[List[str]] = None,
+        on_headers: Optional[Callable[[Mapping[str, str]], None]] = None,
+    ) -> dict:
+        """
+        Posts a tweet, optionally with already uploaded media.
         
         Args:
             text (str): The tweet content.
+            media_ids (Optional[List[str]]): Media ids from `upload_media`.
+            on_headers (Optional[Callable]): Receives the response headers (rate-limit
+                state) of the created tweet.
         
         Returns:
-            dict: Response data from the Twitter API.
+            dict: Response data from the X API (includes the tweet `id`).
+        
+        Raises:
+            XApiError: If X rejects the tweet.
         """
-        response = self.client.create_tweet(text=text)
-        return response.data
+        body: dict = {"text": text}
+        if media_ids:
+            body["media"] = {"media_ids": media_ids}
+        url = f"{self.API_BASE}/tweets"
+        async with use_client(self.client) as client:
+            with time_phase("x", "create_tweet"):
+                response = await client.post(
+                    url, headers=self._signer.headers("POST", url), json=body, timeout=self.TWEET_TIMEOUT
+                )
+                self._check(response)
+        if on_headers is not None:
+            on_headers(response.headers)
+        return response.json()["data"]
     
-    def post_tweet_with_image(self, text: str, image_path: str):
+    async def post_tweet_with_image(
+        self,
+        text: str,
+        image: Union[str, ImageStream],
+        resume: Optional[ChunkedUpload] = None,
+        on_headers: Optional[Callable[[Mapping[str, str]], None]] = None,
+    ) -> dict:
         """
-        Posts a tweet with an attached image to X (Twitter).
+        Posts a tweet with an attached image or video.
         
-        This method first uploads the image via v1 API to get a media ID, then creates
-        the tweet with the media attached using v2. It handles the hybrid API usage
-        required by Twitter's endpoints for media posts.
+        The media is uploaded first (streamed from the file object, no temporary
+        copy; chunked for large files and video) and the tweet then references
+        its media id.
         
         Args:
             text (str): The tweet text.
-            image_path (str): Path to the local image file.
+            image (Union[str, ImageStream]): Validated media stream, or a path to a
+                local image or video file.
+            resume (Optional[ChunkedUpload]): Interrupted upload of the same media to continue.
+            on_headers (Optional[Callable]): Receives the headers of the tweet response.
         
         Returns:
-            dict: Response data from the Twitter API.
+            dict: Response data from the X API.
+        
+        Raises:
+            XApiError: If X rejects the tweet or a single-request upload.
+            MediaUploadInterrupted: If a chunked upload fails.
         """
-        # Upload image: Uses v1 API to obtain media ID for attachment.
-        media = self.api_v1.media_upload(image_path)
-        response = self.client.create_tweet(text=text, media_ids=[media.media_id])
-        return response.data
+        if isinstance(image, str):
+            stream = await ImageStream.from_path(image, allow_video=True)
+            try:
+                return await self.post_tweet_with_image(text, stream, resume, on_headers)
+            finally:
+                stream.file.close()
+        media_id = await self.upload_media(image, resume)
+        return await self.post_tweet(text, [media_id], on_headers)
@@ -0,0 +1,104 @@
+import os
+import time
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.database.db_config import SessionLocal
+from src.database.models.artifact_file import ArtifactFile
+
+
+class ArtifactIndex:
+    """
+    Index of files written under ARTIFACTS_DIR, backed by the `artifact_files` table.
+
+    Shared by every worker process: writers `record` files after writing them
+    (atomically, under their final name) and the lifecycle manager reads ages
+    and sizes from here instead of rescanning the directories.
+
+    Args:
+        session_factory (Callable[[], Session]): Creates sessions for index operations.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+
+    def record(self, category: str, path: str, size: int, created_at: Optional[float] = None) -> None:
+        """Adds a file, or updates it if the path was rewritten."""
+        created_at = created_at or time.time()
+        with self.session_factory() as db:
+            changed = db.execute(
+                update(ArtifactFile).where(ArtifactFile.path == path)
+                .values(category=category, size=size, created_at=created_at)
+            ).rowcount
+            if not changed:
+                db.add(ArtifactFile(category=category, path=path, size=size, created_at=created_at))
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()  # recorded concurrently by another writer
+
+    def totals(self, category: str) -> Tuple[int, int]:
+        """Returns (file count, total bytes) of a category."""
+        with self.session_factory() as db:
+            files, total = db.execute(
+                select(func.count(ArtifactFile.id), func.coalesce(func.sum(ArtifactFile.size), 0))
+                .where(ArtifactFile.category == category)
+            ).one()
+        return files, total
+
+    def oldest(self, category: str, limit: int, before: Optional[float] = None) -> List[Tuple[int, str, int]]:
+        """Returns up to `limit` (id, path, size) of the oldest files, optionally only those older than `before`."""
+        stmt = select(ArtifactFile.id, ArtifactFile.path, ArtifactFile.size).where(ArtifactFile.category == category)
+        if before is not None:
+            stmt = stmt.where(ArtifactFile.created_at < before)
+        with self.session_factory() as db:
+            return [tuple(row) for row in db.execute(stmt.order_by(ArtifactFile.created_at).limit(limit))]
+
+    def remove(self, file_id: int) -> bool:
+        """Deletes an entry; False if another process already did (so only one deletes the file)."""
+        with self.session_factory() as db:
+            removed = db.execute(delete(ArtifactFile).where(ArtifactFile.id == file_id)).rowcount == 1
+            db.commit()
+        return removed
+
+    def reconcile(self, category: str, directory: str) -> Tuple[int, int]:
+        """
+        Brings a category in line with its directory: files written before the index
+        (or by a crashed writer) are added, entries whose file is gone are dropped.
+
+        Walks the directory, so it is meant for startup, not every sweep.
+
+        Returns:
+            Tuple[int, int]: Entries added and dropped.
+        """
+        on_disk = {}
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(".tmp"):
+                    continue  # still being written
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                on_disk[path] = stat
+        with self.session_factory() as db:
+            known = dict(db.execute(
+                select(ArtifactFile.path, ArtifactFile.id).where(ArtifactFile.category == category)
+            ).all())
+        added = 0
+        for path, stat in on_disk.items():
+            if path not in known:
+                self.record(category, path, stat.st_size, stat.st_mtime)
+                added += 1
+        gone = [file_id for path, file_id in known.items() if path not in on_disk and not os.path.exists(path)]
+        for file_id in gone:
+            self.remove(file_id)
+        return added, len(gone)
+
+
+# Shared instance used by the artifact writers and the lifecycle manager.
+artifact_index = ArtifactIndex(SessionLocal)
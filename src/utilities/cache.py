@@ -0,0 +1,240 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry expiry and entry/byte limits.
+
+    Entries expire `ttl` seconds after they were set; when either limit is
+    exceeded the least recently used entries are evicted. Byte accounting uses
+    `sizeof` (len() by default), which suits bytes/str values.
+
+    Args:
+        ttl (float): Default time-to-live in seconds.
+        max_entries (Optional[int]): Maximum number of entries (None for unbounded).
+        max_bytes (Optional[int]): Maximum total size of values (None for unbounded).
+        sizeof (Callable[[Any], int]): Size function used for byte accounting.
+        clock (Callable[[], float]): Monotonic time source; injectable for tests.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = len,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.clock = clock
+        self._data: "OrderedDict[str, tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, _, value = entry
+            if expires_at <= self.clock():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # would evict everything else and still not fit
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            expires_at = self.clock() + (self.ttl if ttl is None else ttl)
+            self._data[key] = (expires_at, size, value)
+            self._bytes += size
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """Drops expired entries; returns how many were removed."""
+        now = self.clock()
+        with self._lock:
+            expired = [k for k, (exp, _, _) in self._data.items() if exp <= now]
+            for key in expired:
+                self._remove(key)
+            return len(expired)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        while self._data and (
+            (self.max_entries is not None and len(self._data) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._data))
+            self._remove(key)
+            self.evictions += 1
+
+
+class CacheBackend:
+    """
+    Minimal key/value interface shared by the in-process and Redis backends.
+
+    Values are bytes. Generations are a separate keyspace used for invalidation:
+    `bump_generation` replaces a generation with a fresh unique token and
+    `get_generations` reads several at once, with missing ones reading as "0".
+    Because tokens never repeat, an entry keyed by an old generation can never
+    become visible again, even after the generation itself expires.
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def bump_generation(self, key: str, ttl: float) -> str:
+        raise NotImplementedError
+
+    def get_generations(self, keys: list) -> list:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process backend backed by a size-bounded `TTLCache`.
+
+    Generations live in a separate, TTL-only cache so that LRU pressure on cached
+    values can never evict (and thereby reset) a generation early.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int], default_ttl: float):
+        self.values = TTLCache(ttl=default_ttl, max_entries=max_entries, max_bytes=max_bytes)
+        self.generations = TTLCache(ttl=default_ttl)
+        self._bumps = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.values.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.values.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self.values.delete(key)
+
+    def bump_generation(self, key: str, ttl: float) -> str:
+        token = uuid.uuid4().hex
+        self.generations.set(key, token, ttl)
+        self._bumps += 1
+        if self._bumps % 1024 == 0:
+            self.generations.purge_expired()
+        return token
+
+    def get_generations(self, keys: list) -> list:
+        return [self.generations.get(k, "0") for k in keys]
+
+    def stats(self) -> dict:
+        return self.values.stats()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared backend for multi-worker deployments (requires the optional `redis` package).
+
+    Args:
+        url (str): Redis URL, e.g. 'redis://localhost:6379/0'.
+        prefix (str): Key prefix to namespace this application's entries.
+    """
+
+    def __init__(self, url: str, prefix: str = "quibble:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND_URL points to Redis but 'redis' is not installed") from e
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(self.prefix + key, value, px=max(int(ttl * 1000), 1))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def bump_generation(self, key: str, ttl: float) -> str:
+        token = uuid.uuid4().hex
+        self.client.set(self.prefix + "gen:" + key, token, px=max(int(ttl * 1000), 1))
+        return token
+
+    def get_generations(self, keys: list) -> list:
+        values = self.client.mget([self.prefix + "gen:" + k for k in keys])
+        return [v.decode() if v is not None else "0" for v in values]
+
+
+def create_cache_backend(
+    url: Optional[str],
+    max_entries: int,
+    max_bytes: Optional[int],
+    default_ttl: float,
+) -> CacheBackend:
+    """
+    Builds the cache backend selected by CACHE_BACKEND_URL.
+
+    Args:
+        url (Optional[str]): 'redis://...' for a shared backend; empty for in-process.
+        max_entries (int): Entry limit for the in-process backend.
+        max_bytes (Optional[int]): Byte limit for the in-process backend.
+        default_ttl (float): Default entry TTL in seconds.
+
+    Returns:
+        CacheBackend: The configured backend.
+    """
+    if url and url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCacheBackend(url)
+    return MemoryCacheBackend(max_entries=max_entries, max_bytes=max_bytes, default_ttl=default_ttl)
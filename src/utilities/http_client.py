@@ -0,0 +1,70 @@
+import importlib.util
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_client(
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    keepalive_expiry: float = 30.0,
+    connect_timeout: float = 5.0,
+    read_timeout: float = 20.0,
+    write_timeout: float = 20.0,
+    pool_timeout: float = 5.0,
+    http2: bool = True,
+) -> httpx.AsyncClient:
+    """
+    Creates the application-lifetime async HTTP client for outbound API calls.
+
+    One client is shared by every request (via the DI container) so connections,
+    TLS sessions and DNS results are reused across posts instead of being set up
+    for each one. Closed in the app lifespan.
+
+    HTTP/2 needs the optional `h2` package (`httpx[http2]`); without it the client
+    falls back to HTTP/1.1 keep-alive.
+
+    Args:
+        max_connections (int): Upper bound on open connections across all hosts.
+        max_keepalive_connections (int): Idle connections kept for reuse.
+        keepalive_expiry (float): Seconds an idle connection is kept.
+        connect_timeout (float): Default connect timeout in seconds.
+        read_timeout (float): Default read timeout in seconds.
+        write_timeout (float): Default write timeout in seconds.
+        pool_timeout (float): Seconds to wait for a free connection from the pool.
+        http2 (bool): Negotiate HTTP/2 when available.
+
+    Returns:
+        httpx.AsyncClient: Configured client; callers may override timeouts per request.
+    """
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=write_timeout,
+            pool=pool_timeout,
+        ),
+    )
+
+
+@asynccontextmanager
+async def use_client(client: Optional[httpx.AsyncClient]) -> AsyncIterator[httpx.AsyncClient]:
+    """Yields `client` if given (left open), otherwise a short-lived client closed on exit."""
+    if client is not None:
+        yield client
+        return
+    async with httpx.AsyncClient() as own:
+        yield own
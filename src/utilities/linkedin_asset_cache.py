@@ -0,0 +1,75 @@
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.database.db_config import SessionLocal
+from src.database.models.linkedin_asset import LinkedInAsset
+from src.utilities.metrics import record_cache
+
+
+class LinkedInAssetCache:
+    """
+    Content hash → LinkedIn asset URN, per owner, backed by the `linkedin_assets` table.
+
+    Lets a repeated image (a brand image, a regenerated picture) skip
+    registerUpload and the binary upload. Entries are reused for `ttl` seconds
+    (0 disables the cache);
+    an asset LinkedIn no longer accepts is dropped with `forget` by the caller.
+
+    Args:
+        session_factory (Callable[[], Session]): Creates sessions for cache operations.
+        ttl (float): Seconds an uploaded asset is reused.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], ttl: float = 7 * 86400.0):
+        self.session_factory = session_factory
+        self.ttl = ttl
+
+    def get(self, owner_urn: str, sha256: str) -> Optional[str]:
+        """Returns the cached asset URN, or None if unknown or expired."""
+        if self.ttl <= 0:
+            return None
+        with self.session_factory() as db:
+            row = db.get(LinkedInAsset, (owner_urn, sha256))
+            hit = row is not None and row.expires_at > time.time()
+            record_cache("linkedin_asset", hit)
+            return row.asset_urn if hit else None
+
+    def put(self, owner_urn: str, sha256: str, asset_urn: str) -> None:
+        """Inserts or replaces the entry and restarts its expiry."""
+        if self.ttl <= 0:
+            return
+        with self.session_factory() as db:
+            row = db.get(LinkedInAsset, (owner_urn, sha256)) or LinkedInAsset(owner_urn=owner_urn, sha256=sha256)
+            row.asset_urn = asset_urn
+            row.expires_at = time.time() + self.ttl
+            db.add(row)
+            try:
+                db.commit()
+            except IntegrityError:
+                # the same image was uploaded concurrently; either asset will do.
+                db.rollback()
+
+    def forget(self, owner_urn: str, sha256: str) -> None:
+        with self.session_factory() as db:
+            db.execute(delete(LinkedInAsset).where(
+                LinkedInAsset.owner_urn == owner_urn, LinkedInAsset.sha256 == sha256
+            ))
+            db.commit()
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Deletes expired entries; returns how many were removed."""
+        with self.session_factory() as db:
+            removed = db.execute(
+                delete(LinkedInAsset).where(LinkedInAsset.expires_at <= (now or time.time()))
+            ).rowcount
+            db.commit()
+        return removed
+
+
+# Shared instance used by the LinkedIn router and publisher.
+linkedin_asset_cache = LinkedInAssetCache(SessionLocal, ttl=settings.LINKEDIN_ASSET_CACHE_TTL)
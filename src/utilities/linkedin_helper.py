@@ -1,40 +1,70 @@
 import time
+from functools import partial
+from typing import Callable, Optional
 
-from src.database.models.user import User
+import httpx
 from fastapi import Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from src.database.models.user import User
 from src.oauth.linkedin_oauth import LinkedInToken, refresh_access_token
 from src.services.auth_service import AuthService
+from src.services.linkedin_token_refresher import refresh_user_token
 
-from .token_store import get_token, save_token  # in-memory cache
+from .token_store import token_store  # DB-backed, cached per process
 
 
-def get_linkedin_token(
-    current_user: User = Depends(AuthService.get_current_user)
+async def get_linkedin_token_for(
+    user_id: int, client: Optional[httpx.AsyncClient] = None
 ) -> LinkedInToken:
     """
-    Dependency function to retrieve or refresh a LinkedIn token for the current user.
-    
-    This FastAPI dependency fetches a cached token, refreshes it if near expiry (using
-    the refresh token), and updates the cache.
-    
+    Retrieves a user's LinkedIn token, refreshing it if near expiry.
+
+    Fetches the stored token and, if it expires within 60 seconds, refreshes it.
+    Concurrent requests for the same user share one refresh (single flight), so
+    they neither stall the event loop nor race each other's refresh tokens. The
+    background sweeper normally refreshes tokens long before this, so the refresh
+    here is a fallback.
+
     Args:
-        current_user (User): Injected authenticated user from AuthService.
-    
+        user_id (int): Id of the user whose token is needed.
+        client (Optional[httpx.AsyncClient]): Shared HTTP client for the refresh call.
+
     Returns:
         LinkedInToken: Valid (possibly refreshed) token for the user.
-    
+
     Raises:
         HTTPException: 403 if no token is connected for the user.
     """
-    token: LinkedInToken | None = get_token(current_user.id)
+    token: LinkedInToken | None = await run_in_threadpool(token_store.get, user_id)
+
+    # renew if within 60 seconds of expiry to avoid failures.
+    if token is not None and token.refresh_token and token.expires_at <= time.time() + 60:
+        token = await refresh_user_token(
+            token_store, user_id, partial(refresh_access_token, client=client)
+        )
+
     if token is None:
         raise HTTPException(403, "Connect LinkedIn first")
-    
-    # renew if within 60 seconds of expiry to avoid failures.
-    if token.refresh_token and token.expires_at <= time.time() + 60:
-        fresh = refresh_access_token(token.refresh_token)
-        fresh.owner_urn = token.owner_urn  # URN never changes; preserve from original.
-        save_token(current_user.id, fresh)
-        token = fresh
-    
     return token
+
+
+def linkedin_token_dependency(
+    auth_service: AuthService, client: Optional[httpx.AsyncClient] = None
+) -> Callable:
+    """
+    Builds the FastAPI dependency that resolves the current user's LinkedIn token.
+
+    Args:
+        auth_service (AuthService): Service used to authenticate the request.
+        client (Optional[httpx.AsyncClient]): Shared HTTP client for token refreshes.
+
+    Returns:
+        Callable: Async dependency returning a LinkedInToken.
+    """
+    async def get_linkedin_token(
+        current_user: User = Depends(auth_service.get_current_user)
+    ) -> LinkedInToken:
+        return await get_linkedin_token_for(current_user.id, client)
+
+    return get_linkedin_token
@@ -0,0 +1,237 @@
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.config.settings import settings
+from src.utilities.artifact_index import ArtifactIndex, artifact_index
+from src.utilities.metrics import record_cache
+from src.utilities.single_flight import SingleFlight
+from src.utilities.upload_stream import EXTENSIONS, ImageStream, sniff_image_type
+
+logger = logging.getLogger(__name__)
+
+
+class MediaProfile:
+    """
+    Image limits and encoding preferences of one platform.
+
+    Args:
+        name (str): Platform name ('linkedin', 'x').
+        max_side (int): Longest edge in pixels; larger images are scaled down.
+        max_bytes (int): Largest encoded size; quality, then dimensions, are reduced to fit.
+        jpeg_quality (int): Starting JPEG quality.
+        min_quality (int): Lowest JPEG quality tried before scaling down further.
+    """
+
+    def __init__(self, name: str, max_side: int, max_bytes: int, jpeg_quality: int = 85, min_quality: int = 60):
+        self.name = name
+        self.max_side = max_side
+        self.max_bytes = max_bytes
+        self.jpeg_quality = jpeg_quality
+        self.min_quality = min_quality
+
+    @property
+    def tag(self) -> str:
+        # part of the cache key: changing a limit invalidates results made with the old one.
+        fields = (self.name, self.max_side, self.max_bytes, self.jpeg_quality, self.min_quality)
+        return f"{self.name}-{hashlib.sha1(repr(fields).encode()).hexdigest()[:8]}"
+
+
+# LinkedIn feed images display at up to ~1200px wide and are downscaled server side past
+# that; X accepts up to 4096px and 5 MB per image.
+PROFILES: Dict[str, MediaProfile] = {
+    "linkedin": MediaProfile("linkedin", max_side=2048, max_bytes=5 * 1024 * 1024),
+    "x": MediaProfile("x", max_side=4096, max_bytes=5 * 1024 * 1024),
+}
+
+
+# Worker entry point: module-level so it can be pickled into pool processes.
+
+def _transform(data: bytes, profile: MediaProfile) -> Tuple[bytes, str]:
+    """
+    Fits an image to `profile`; returns the encoded bytes and their content type.
+
+    EXIF orientation is applied and all metadata except the colour profile is
+    dropped. Opaque photos become progressive JPEG, images with transparency or
+    few colours (logos, screenshots) PNG. Animated GIFs are returned unchanged.
+    """
+    from PIL import Image, ImageOps  # imported here: pool workers only load what they use
+
+    source_type = sniff_image_type(data[:16])
+    with Image.open(io.BytesIO(data)) as opened:
+        if getattr(opened, "is_animated", False):
+            return data, source_type  # re-encoding would drop or bloat the animation
+        image = ImageOps.exif_transpose(opened)
+        icc_profile = opened.info.get("icc_profile")
+        transparent = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+        graphic = source_type in ("image/png", "image/gif") and image.getcolors(256) is not None
+        lossless = transparent or graphic
+
+        if max(image.size) > profile.max_side:
+            image.thumbnail((profile.max_side, profile.max_side), Image.LANCZOS)
+        if lossless:
+            image = image.convert("RGBA" if transparent else "RGB")
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+
+        while True:
+            qualities = [None] if lossless else range(profile.jpeg_quality, profile.min_quality - 1, -10)
+            for quality in qualities:
+                out = io.BytesIO()
+                if lossless:
+                    image.save(out, format="PNG", optimize=True, icc_profile=icc_profile)
+                else:
+                    image.save(out, format="JPEG", quality=quality, optimize=True, progressive=True,
+                               icc_profile=icc_profile)
+                if out.tell() <= profile.max_bytes:
+                    return out.getvalue(), "image/png" if lossless else "image/jpeg"
+            if max(image.size) <= 256:
+                return out.getvalue(), "image/png" if lossless else "image/jpeg"
+            image = image.resize((max(1, image.width * 3 // 4), max(1, image.height * 3 // 4)), Image.LANCZOS)
+
+
+class MediaPreprocessor:
+    """
+    Fits images to each platform's limits before they are uploaded.
+
+    Images are scaled to the platform's size, recompressed to its byte limit,
+    converted to JPEG or PNG and stripped of metadata (see `_transform`). The
+    work is CPU-bound, so it runs on a process pool (created on first use, like
+    the password hasher's) rather than the request threadpool. Results are kept
+    under `cache_dir` by (content hash, profile), so an image published again,
+    or by another worker process, is not processed twice; concurrent requests
+    for the same result share one job. Videos and unknown platforms pass through.
+
+    Args:
+        cache_dir (str): Directory for processed images.
+        max_workers (Optional[int]): Pool size; defaults to the number of cores.
+        executor (str): 'process' (default) or 'thread' (tests, constrained hosts).
+        profiles (Optional[Dict[str, MediaProfile]]): Profiles by platform; defaults to PROFILES.
+        artifacts (Optional[ArtifactIndex]): Records cached files for the artifact
+            lifecycle manager (category 'media_cache'), which expires and evicts them.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_workers: Optional[int] = None,
+        executor: str = "process",
+        profiles: Optional[Dict[str, MediaProfile]] = None,
+        artifacts: Optional[ArtifactIndex] = None,
+    ):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown executor {executor!r}; expected 'process' or 'thread'")
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor_kind = executor
+        self.profiles = profiles if profiles is not None else PROFILES
+        self.artifacts = artifacts
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.executor_kind == "process":
+                    # spawn: never fork the app process (model weights, DB connections, threads).
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="media-preprocessor"
+                    )
+            return self._executor
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Runs `fn(*args)` on the image pool (for other image work, e.g. renditions)."""
+        return self._get_executor().submit(fn, *args)
+
+    async def prepare(self, image: Union[str, ImageStream], platform: str) -> Union[str, ImageStream]:
+        """
+        Returns `image` fitted to `platform`, as an in-memory (buffered) stream.
+
+        Accepts a stream or a local path. Videos, and images for platforms without
+        a profile, are returned as given; animated GIFs come back unchanged. If an
+        image cannot be processed the original is returned and the platform decides.
+        """
+        profile = self.profiles.get(platform)
+        if profile is None:
+            return image
+        if isinstance(image, str):
+            stream = await ImageStream.from_path(image, allow_video=True)
+            try:
+                if not stream.content_type.startswith("image/"):
+                    return image
+                return await self.prepare(await stream.buffered(), platform)
+            finally:
+                stream.file.close()
+        if not image.content_type.startswith("image/"):
+            return image
+
+        digest = await image.sha256()
+        key = (profile.tag, digest)
+        try:
+            data, content_type = await self._flight.do(key, lambda: self._processed(image, profile, digest))
+        except Exception:
+            logger.exception("Preprocessing %s for %s failed; sending the original", image.filename, platform)
+            return image
+        stem = os.path.splitext(image.filename)[0]
+        return ImageStream.from_bytes(data, content_type, stem + EXTENSIONS[content_type], image.chunk_size)
+
+    async def _processed(self, image: ImageStream, profile: MediaProfile, digest: str) -> Tuple[bytes, str]:
+        path = os.path.join(self.cache_dir, profile.tag, digest)
+        cached = await run_in_threadpool(self._read_cached, path)
+        record_cache("media", cached is not None)
+        if cached is not None:
+            return cached
+        source = await image.read()
+        data, content_type = await asyncio.wrap_future(self.submit(_transform, source, profile))
+        await run_in_threadpool(self._write_cached, path, data)
+        return data, content_type
+
+    @staticmethod
+    def _read_cached(path: str) -> Optional[Tuple[bytes, str]]:
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+        except FileNotFoundError:
+            return None
+        content_type = sniff_image_type(data[:16])
+        return (data, content_type) if content_type else None
+
+    def _write_cached(self, path: str, data: bytes) -> None:
+        # written under a temporary name and renamed, so readers never see a partial file.
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+        if self.artifacts is not None:
+            self.artifacts.record("media_cache", path, len(data))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# Shared instance: used by the LinkedIn and X routers and publishers (via the DI container).
+media_preprocessor = MediaPreprocessor(
+    cache_dir=settings.MEDIA_CACHE_DIR,
+    max_workers=settings.MEDIA_PREPROCESS_WORKERS or None,
+    executor=settings.MEDIA_PREPROCESS_EXECUTOR,
+    artifacts=artifact_index,
+)
@@ -0,0 +1,130 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+
+from src.utilities.process_memory import ProcessMemoryCollector
+
+# With PROMETHEUS_MULTIPROC_DIR set (gunicorn.conf.py), every worker writes its samples
+# to files there and /metrics aggregates all workers; gauges declare how to combine them.
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Inbound HTTP requests, by route template (e.g. '/posts/{post_id}'; 'unmatched' for 404s).
+HTTP_REQUEST_SECONDS = Histogram(
+    "quibble_http_request_seconds",
+    "Duration of HTTP requests",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "quibble_http_requests_in_flight",
+    "HTTP requests being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+# Outbound API calls, by integration ('linkedin', 'linkedin_oauth', ...) and phase
+# ('register', 'upload', 'publish', ...). Buckets span fast JSON calls to slow uploads.
+OUTBOUND_PHASE_SECONDS = Histogram(
+    "quibble_outbound_phase_seconds",
+    "Duration of outbound API call phases",
+    ["service", "phase"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+OUTBOUND_PHASE_ERRORS = Counter(
+    "quibble_outbound_phase_errors_total",
+    "Outbound API call phases that raised, by exception type and HTTP status ('' if none)",
+    ["service", "phase", "error", "status"],
+)
+
+# Local model work: diffusion phases ('encode', 'step', 'vae_decode', 'generate').
+MODEL_PHASE_SECONDS = Histogram(
+    "quibble_model_phase_seconds",
+    "Duration of model inference phases",
+    ["model", "phase"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+TEXT_GENERATION_TOKENS = Counter(
+    "quibble_text_generation_tokens_total",
+    "Tokens produced by text generation",
+    ["model"],
+)
+
+# Cache lookups, by cache ('posts', 'principal', 'linkedin_asset', 'media', 'rendition');
+# the hit ratio is hits / (hits + misses).
+CACHE_REQUESTS = Counter(
+    "quibble_cache_requests_total",
+    "Cache lookups by result ('hit' or 'miss')",
+    ["cache", "result"],
+)
+
+# Database connection pool events ('connects', 'checkouts', 'checkins', 'invalidations')
+# and connections currently checked out, summed over the live workers.
+DB_POOL_EVENTS = Counter("quibble_db_pool_events_total", "Connection pool events", ["event"])
+DB_POOL_CHECKED_OUT = Gauge(
+    "quibble_db_pool_checked_out", "Database connections checked out", multiprocess_mode="livesum"
+)
+
+# Files under ARTIFACTS_DIR, by category, as of the lifecycle manager's last sweep.
+ARTIFACT_BYTES = Gauge(
+    "quibble_artifact_bytes", "Bytes of indexed artifact files", ["category"], multiprocess_mode="mostrecent"
+)
+ARTIFACT_FILES = Gauge(
+    "quibble_artifact_files", "Number of indexed artifact files", ["category"], multiprocess_mode="mostrecent"
+)
+ARTIFACT_EVICTIONS = Counter(
+    "quibble_artifact_evictions_total",
+    "Artifact files deleted by the lifecycle manager, by reason ('ttl' or 'quota')",
+    ["category", "reason"],
+)
+
+# Per-worker memory (rss/pss/uss), to see how much of the model the forked workers share.
+PROCESS_MEMORY = ProcessMemoryCollector()
+REGISTRY.register(PROCESS_MEMORY)
+
+
+def scrape_registry() -> CollectorRegistry:
+    """
+    Returns the registry /metrics should expose: every worker's samples in multiprocess
+    mode, otherwise this process's default registry.
+    """
+    if not os.getenv(MULTIPROC_DIR_ENV):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(PROCESS_MEMORY)
+    return registry
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def _status_of(exc: Exception) -> str:
+    # XApiError carries the status itself, httpx.HTTPStatusError on its response.
+    status: Optional[int] = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return str(status) if status is not None else ""
+
+
+@contextmanager
+def time_phase(service: str, phase: str) -> Iterator[None]:
+    """
+    Records the duration of one phase of an outbound call, and its failure if it raises.
+
+    Usage:
+
+        with time_phase("linkedin", "upload"):
+            await client.put(...)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as exc:
+        OUTBOUND_PHASE_ERRORS.labels(service, phase, type(exc).__name__, _status_of(exc)).inc()
+        raise
+    finally:
+        OUTBOUND_PHASE_SECONDS.labels(service, phase).observe(time.perf_counter() - start)
@@ -1,24 +1,47 @@
-from huggingface_hub import InferenceClient
 from pathlib import Path
 import json
+import os
+import uuid
 from typing import List, Optional
 
+from src.utilities.artifact_index import ArtifactIndex
+from src.utilities.metrics import TEXT_GENERATION_TOKENS, time_phase
+
 class MistralClient:
-    def __init__(self, hf_token: str, model_id: str, save_dir: Optional[str] = None):
-        self.client = InferenceClient(token=hf_token)
+    def __init__(self, hf_token: str, model_id: str, save_dir: Optional[str] = None,
+                 artifacts: Optional[ArtifactIndex] = None):
+        self.hf_token = hf_token
+        self._client = None
         self.model_id = model_id
+        # saved posts are recorded here, so the artifact lifecycle manager can expire them.
+        self.artifacts = artifacts
         if save_dir:
             self.save_dir = Path(save_dir)
             self.save_dir.mkdir(parents=True, exist_ok=True)
         else:
             self.save_dir = None
 
+    @property
+    def client(self):
+        # huggingface_hub is imported on first use: it is slow to import and only the
+        # generation endpoints need it.
+        if self._client is None:
+            from huggingface_hub import InferenceClient
+            self._client = InferenceClient(token=self.hf_token)
+        return self._client
+
     def generate_text(self, prompt: str, max_new_tokens: int = 300) -> str:
-        resp = self.client.text_generation(
-            model=self.model_id,
-            inputs=prompt,
-            parameters={"max_new_tokens": max_new_tokens},
-        )
+        # details=True returns the generated token count along with the text.
+        with time_phase("huggingface", "text_generation"):
+            resp = self.client.text_generation(
+                prompt,
+                model=self.model_id,
+                max_new_tokens=max_new_tokens,
+                details=True,
+            )
+        details = getattr(resp, "details", None)
+        if details is not None and details.generated_tokens:
+            TEXT_GENERATION_TOKENS.labels(self.model_id).inc(details.generated_tokens)
         return getattr(resp, "generated_text", resp)
 
     def generate_posts(self, prompt: str, n: int = 5) -> List[str]:
@@ -33,7 +56,13 @@ class MistralClient:
         """Optional: dump to disk if save_dir is set."""
         if not self.save_dir:
             return
-        fname = f"post_{prompt[:20].replace(' ', '_')}_{int(Path().stat().st_mtime)}.json"
+        # a unique name, written to a temporary file and renamed: concurrent saves of
+        # the same prompt never overwrite each other and no reader sees a partial file.
+        fname = f"post_{prompt[:20].replace(' ', '_').replace(os.sep, '_')}_{uuid.uuid4().hex}.json"
         path = self.save_dir / fname
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
\ No newline at end of file
+        tmp = path.with_name(fname + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        if self.artifacts is not None:
+            self.artifacts.record("generated_posts", str(path), path.stat().st_size)
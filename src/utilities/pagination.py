@@ -0,0 +1,55 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """
+    Encodes keyset position values into an opaque cursor string.
+
+    Datetimes are stored as ISO strings; the cursor is URL-safe base64 of compact
+    JSON without padding, so clients can pass it back verbatim as a query parameter.
+
+    Args:
+        values (Dict[str, Any]): Sort key values of the last row on the page.
+
+    Returns:
+        str: Opaque cursor.
+    """
+    payload = {
+        k: {"dt": v.isoformat()} if isinstance(v, datetime) else v
+        for k, v in values.items()
+    }
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Opaque cursor from a previous page.
+
+    Returns:
+        Dict[str, Any]: The keyset position values.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, dict):
+            raise ValueError("cursor payload must be an object")
+        return {
+            k: datetime.fromisoformat(v["dt"]) if isinstance(v, dict) and "dt" in v else v
+            for k, v in payload.items()
+        }
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
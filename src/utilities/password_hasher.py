@@ -0,0 +1,167 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from src.config.settings import settings
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing queue is full; surfaced to clients as 429."""
+
+
+@lru_cache(maxsize=None)
+def _context(rounds: int) -> CryptContext:
+    # min/max pinned to the configured cost so hashes made with any other cost
+    # are reported as needing an update (rehash-on-login).
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+# Worker entry points: module-level so they can be pickled into pool processes.
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify(password: str, hashed_password: str, rounds: int) -> bool:
+    return _context(rounds).verify(password, hashed_password)
+
+
+def _verify_and_update(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    return _context(rounds).verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a dedicated executor.
+
+    bcrypt is deliberately CPU-heavy; running it on the request threadpool lets a
+    login burst occupy every worker thread. Here it runs in a process pool sized
+    to the machine's cores, and at most `max_pending` operations may be queued or
+    running at once; beyond that callers get HasherBusy instead of waiting.
+
+    The pool is created on first use, so importing this module (including in the
+    pool's own worker processes) is cheap.
+
+    Args:
+        rounds (int): bcrypt cost factor for new hashes. Hashes with a different
+            cost are transparently replaced on the next successful login.
+        max_workers (Optional[int]): Pool size; defaults to the number of cores.
+        max_pending (Optional[int]): Queue limit; defaults to 8 per worker.
+        executor (str): 'process' (default) or 'thread' (tests, constrained hosts).
+    """
+
+    def __init__(
+        self,
+        rounds: int = 12,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        executor: str = "process",
+    ):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown executor {executor!r}; expected 'process' or 'thread'")
+        self.rounds = rounds
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 8
+        self.executor_kind = executor
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.executor_kind == "process":
+                    # spawn: never fork the app process (model weights, DB connections, threads).
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="password-hasher"
+                    )
+            return self._executor
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        executor = self._get_executor()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HasherBusy("Too many password operations in progress")
+            self._pending += 1
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hash, password, self.rounds))
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(_verify, password, hashed_password, self.rounds))
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verifies a password and, if the stored hash uses another cost, rehashes it.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Whether the password matched, and a new hash
+            to store in place of the old one (None when no update is needed).
+        """
+        return await asyncio.wrap_future(
+            self._submit(_verify_and_update, password, hashed_password, self.rounds)
+        )
+
+    def hash_sync(self, password: str) -> str:
+        """Blocking variant of `hash` for synchronous callers; still bounded by the pool."""
+        return self._submit(_hash, password, self.rounds).result()
+
+    def verify_sync(self, password: str, hashed_password: str) -> bool:
+        """Blocking variant of `verify` for synchronous callers."""
+        return self._submit(_verify, password, hashed_password, self.rounds).result()
+
+    def needs_update(self, hashed_password: str) -> bool:
+        return _context(self.rounds).needs_update(hashed_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "executor": self.executor_kind,
+                "workers": self.max_workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "rounds": self.rounds,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# Shared instance: used by AuthService (via the DI container) and password_utils.
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    max_workers=settings.PASSWORD_HASH_WORKERS or None,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING or None,
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+)
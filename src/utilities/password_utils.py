@@ -1,26 +1,29 @@
-from passlib.context import CryptContext
+from src.utilities.password_hasher import password_hasher
 
 
-# bcrypt hashing with auto-deprecation handling;
-# ensures secure, adaptive password storage compliant with best practices.
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Thin synchronous wrappers over the shared PasswordHasher, so hashing done here
+# runs on the same bounded bcrypt pool (and cost) as AuthService.
 
 
 def get_password_hash(password: str) -> str:
     """
     Hashes a plain-text password for secure storage.
     
-    This utility function uses the configured CryptContext to generate a bcrypt hash,
+    This utility function uses the shared PasswordHasher to generate a bcrypt hash,
     suitable for storing in databases during user registration or updates in FastAPI
-    apps.
+    apps. It blocks until the hash is ready; async code should await
+    `password_hasher.hash` instead.
     
     Args:
         password (str): Plain-text password to hash.
     
     Returns:
         str: Hashed password string.
+    
+    Raises:
+        HasherBusy: If the hashing queue is full.
     """
-    return pwd_context.hash(password)
+    return password_hasher.hash_sync(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -37,5 +40,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     
     Returns:
         bool: True if the password matches the hash, False otherwise.
+    
+    Raises:
+        HasherBusy: If the hashing queue is full.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify_sync(plain_password, hashed_password)
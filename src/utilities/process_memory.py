@@ -0,0 +1,68 @@
+import os
+from typing import Dict, Iterator, List, Optional
+
+import psutil
+from prometheus_client.core import GaugeMetricFamily
+
+# Set by gunicorn.conf.py in the master, and inherited by the forked workers.
+MASTER_PID_ENV = "QUIBBLE_MASTER_PID"
+
+
+def memory_usage(pid: Optional[int] = None) -> Dict[str, int]:
+    """
+    Returns a process's memory in bytes: resident (rss), proportional (pss) and unique (uss).
+
+    rss counts pages shared with other processes in full, so it overstates what each
+    forked worker costs; pss splits shared pages between the processes mapping them (the
+    workers' pss adds up to their real total) and uss is what the process alone holds.
+    pss and uss come from /proc/<pid>/smaps and are missing where that is unavailable.
+    """
+    process = psutil.Process(pid)
+    try:
+        info = process.memory_full_info()
+    except (psutil.AccessDenied, NotImplementedError):
+        return {"rss": process.memory_info().rss}
+    usage = {"rss": info.rss, "uss": info.uss}
+    if hasattr(info, "pss"):
+        usage["pss"] = info.pss
+    return usage
+
+
+def worker_memory(master_pid: Optional[int] = None) -> List[Dict[str, int]]:
+    """
+    Returns `memory_usage` of every worker forked by the gunicorn master, with its pid.
+
+    Without a master (plain uvicorn) only the current process is reported.
+    """
+    master_pid = master_pid or int(os.getenv(MASTER_PID_ENV, "0"))
+    pids = [os.getpid()]
+    if master_pid:
+        try:
+            pids = [child.pid for child in psutil.Process(master_pid).children()]
+        except psutil.NoSuchProcess:
+            pass
+    workers = []
+    for pid in sorted(pids):
+        try:
+            workers.append({"pid": pid, **memory_usage(pid)})
+        except psutil.NoSuchProcess:
+            continue  # exited while we were looking
+    return workers
+
+
+class ProcessMemoryCollector:
+    """
+    Prometheus collector exporting `quibble_process_memory_bytes{pid=..., kind=...}`
+    (rss, pss, uss) of every worker (see `worker_memory`), read on each scrape.
+    """
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        family = GaugeMetricFamily(
+            "quibble_process_memory_bytes", "Memory of the worker processes by kind (rss, pss, uss)",
+            labels=["pid", "kind"],
+        )
+        for worker in worker_memory():
+            pid = str(worker.pop("pid"))
+            for kind, value in worker.items():
+                family.add_metric([pid, kind], value)
+        yield family
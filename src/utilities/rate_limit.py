@@ -0,0 +1,158 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+
+class TokenBucket:
+    """
+    Token bucket that can be re-synchronised from an API's rate-limit headers.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. When the
+    platform reports its own view of the quota (remaining calls and reset time)
+    the bucket adopts it, so the local estimate never drifts far from the real
+    limit even though every worker process keeps its own buckets.
+
+    Args:
+        capacity (float): Burst size.
+        rate (float): Tokens added per second.
+        clock (Callable[[], float]): Wall-clock time source (epoch seconds, since
+            reset headers are absolute); injectable for tests.
+    """
+
+    def __init__(self, capacity: float, rate: float, clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.rate = rate
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        Takes a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until one will be.
+        """
+        with self._lock:
+            now = self.clock()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def observe(self, remaining: Optional[int] = None, reset_at: Optional[float] = None) -> None:
+        """Adopts the platform's reported quota (remaining calls, reset epoch seconds)."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            if remaining is not None:
+                self.tokens = min(self.capacity, float(remaining))
+                if remaining <= 0 and reset_at is not None:
+                    self.blocked_until = max(self.blocked_until, reset_at)
+
+    def block_for(self, seconds: float) -> None:
+        """Stops handing out tokens for `seconds` (e.g. after a 429 with Retry-After)."""
+        with self._lock:
+            self.tokens = 0.0
+            self.blocked_until = max(self.blocked_until, self.clock() + seconds)
+
+
+class RateLimitInfo:
+    """
+    Rate-limit state reported by a platform response.
+
+    Attributes:
+        remaining (Optional[int]): Calls left in the current window.
+        reset_at (Optional[float]): Epoch seconds when the window resets.
+        retry_after (Optional[float]): Seconds to wait before retrying (429/503).
+    """
+
+    def __init__(self, remaining: Optional[int] = None, reset_at: Optional[float] = None,
+                 retry_after: Optional[float] = None):
+        self.remaining = remaining
+        self.reset_at = reset_at
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str], now: Optional[float] = None) -> "RateLimitInfo":
+        """
+        Parses X-style (`x-rate-limit-remaining`/`-reset`) and standard `Retry-After` headers.
+        """
+        now = time.time() if now is None else now
+        lower = {k.lower(): v for k, v in headers.items()}
+        remaining = _int(lower.get("x-rate-limit-remaining") or lower.get("x-ratelimit-remaining"))
+        reset_at = _float(lower.get("x-rate-limit-reset") or lower.get("x-ratelimit-reset"))
+        retry_after = None
+        value = lower.get("retry-after")
+        if value:
+            retry_after = _float(value)
+            if retry_after is None:
+                try:
+                    retry_after = max(0.0, parsedate_to_datetime(value).timestamp() - now)
+                except (TypeError, ValueError):
+                    retry_after = None
+        return cls(remaining, reset_at, retry_after)
+
+    def apply(self, bucket: TokenBucket) -> None:
+        if self.remaining is not None or self.reset_at is not None:
+            bucket.observe(self.remaining, self.reset_at)
+        if self.retry_after is not None:
+            bucket.block_for(self.retry_after)
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+# Default per-account write quotas (burst, tokens per second): X allows 300 posts per
+# 3 hours per user, LinkedIn about 150 member shares per day.
+PLATFORM_LIMITS: Dict[str, Tuple[float, float]] = {
+    "x": (300, 300 / (3 * 3600)),
+    "linkedin": (150, 150 / 86400),
+}
+
+
+class RateLimiterRegistry:
+    """
+    Lazily created token buckets, one per (platform, account).
+
+    Args:
+        limits (Mapping[str, Tuple[float, float]]): (capacity, rate) per platform.
+        clock (Callable[[], float]): Time source passed to the buckets.
+    """
+
+    def __init__(self, limits: Mapping[str, Tuple[float, float]] = PLATFORM_LIMITS,
+                 clock: Callable[[], float] = time.time):
+        self.limits = dict(limits)
+        self.clock = clock
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, platform: str, account: str) -> TokenBucket:
+        key = (platform, account)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                capacity, rate = self.limits.get(platform, (60, 1.0))
+                bucket = self._buckets[key] = TokenBucket(capacity, rate, self.clock)
+            return bucket
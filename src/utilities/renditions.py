@@ -0,0 +1,197 @@
+import asyncio
+import io
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.utilities.media_preprocessor import MediaPreprocessor
+from src.utilities.metrics import record_cache
+from src.utilities.single_flight import SingleFlight
+from src.utilities.upload_store import UploadStore
+
+logger = logging.getLogger(__name__)
+
+# Rendition formats by URL extension.
+FORMATS: Dict[str, str] = {"webp": "image/webp", "jpg": "image/jpeg", "png": "image/png"}
+
+
+# Worker entry point: module-level so it can be pickled into pool processes.
+
+def _render(source: str, width: int, fmt: str) -> bytes:
+    """Scales the image at `source` down to `width` (never up) and encodes it as `fmt`, without metadata."""
+    from PIL import Image, ImageOps  # imported here: pool workers only load what they use
+
+    with Image.open(source) as opened:
+        opened.seek(0)  # first frame of an animation
+        image = ImageOps.exif_transpose(opened)
+        if image.width > width:
+            image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+        out = io.BytesIO()
+        if fmt == "jpg":
+            image.convert("RGB").save(out, format="JPEG", quality=82, optimize=True, progressive=True)
+        elif fmt == "webp":
+            alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+            image.convert("RGBA" if alpha else "RGB").save(out, format="WEBP", quality=80, method=4)
+        else:
+            image.save(out, format="PNG", optimize=True)
+        return out.getvalue()
+
+
+class RenditionCache:
+    """
+    Resized / re-encoded variants of stored uploads, made on first request.
+
+    A rendition is identified by the source's content hash, a width from
+    `widths` and a format, so it never changes and can be cached as long as the
+    original. Rendering runs on the image pool (shared with the media
+    preprocessor); concurrent requests for the same rendition share one render.
+    Results are kept under `root`, at most `max_bytes` of them: the least
+    recently served renditions are deleted first. The recency index is per
+    process and rebuilt from file times on start; a rendition evicted by
+    another process is simply rendered again.
+
+    Args:
+        store (UploadStore): Store holding the originals.
+        root (str): Directory for rendered files.
+        pool (MediaPreprocessor): Image worker pool to render on.
+        max_bytes (int): Disk budget for renditions.
+        widths (Sequence[int]): Widths that may be requested (bounds the variants per image).
+    """
+
+    def __init__(
+        self,
+        store: UploadStore,
+        root: str,
+        pool: MediaPreprocessor,
+        max_bytes: int = 512 * 1024 * 1024,
+        widths: Sequence[int] = (160, 320, 640, 1280),
+    ):
+        self.store = store
+        self.root = root
+        self.pool = pool
+        self.max_bytes = max_bytes
+        self.widths = frozenset(widths)
+        self._lru: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def path_for(self, name: str, width: int, fmt: str) -> Optional[str]:
+        """Returns where the rendition is kept, or None if the request is not a valid rendition."""
+        source = self.store.path_for(name)
+        if source is None or width not in self.widths or fmt not in FORMATS:
+            return None
+        digest = name.split(".", 1)[0]
+        return os.path.join(self.root, digest[:2], digest, f"w{width}.{fmt}")
+
+    async def get(self, name: str, width: int, fmt: str) -> Optional[str]:
+        """
+        Returns the path of the rendition, rendering it first if needed.
+
+        Returns:
+            Optional[str]: The file path, or None if the request is invalid or the
+            original does not exist.
+        """
+        path = self.path_for(name, width, fmt)
+        if path is None:
+            return None
+        await run_in_threadpool(self._load)
+        if self._touch(path) and os.path.exists(path):
+            record_cache("rendition", True)
+            return path
+        record_cache("rendition", False)
+        source = self.store.path_for(name)
+        if not await run_in_threadpool(os.path.isfile, source):
+            return None
+        await self._flight.do(path, lambda: self._render(source, path, width, fmt))
+        return path
+
+    async def _render(self, source: str, path: str, width: int, fmt: str) -> None:
+        if await run_in_threadpool(os.path.exists, path):
+            # rendered by another process: adopt it.
+            size = await run_in_threadpool(os.path.getsize, path)
+        else:
+            data = await asyncio.wrap_future(self.pool.submit(_render, source, width, fmt))
+            await run_in_threadpool(self._write, path, data)
+            size = len(data)
+        evicted = self._add(path, size)
+        if evicted:
+            await run_in_threadpool(self._remove, evicted)
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        # written under a temporary name and renamed, so readers never see a partial file.
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+
+    def _load(self) -> None:
+        # builds the recency index from disk once, oldest first.
+        if self._loaded:
+            return
+        found = []
+        for directory, _, files in os.walk(self.root):
+            for filename in files:
+                if filename.endswith(".tmp"):
+                    continue
+                path = os.path.join(directory, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                found.append((stat.st_mtime, path, stat.st_size))
+        found.sort()
+        with self._lock:
+            if self._loaded:
+                return
+            for _, path, size in found:
+                self._lru[path] = size
+                self._bytes += size
+            self._loaded = True
+            evicted = self._evict()
+        self._remove(evicted)
+
+    def _touch(self, path: str) -> bool:
+        with self._lock:
+            if path not in self._lru:
+                return False
+            self._lru.move_to_end(path)
+            return True
+
+    def _add(self, path: str, size: int) -> List[str]:
+        with self._lock:
+            self._bytes += size - self._lru.pop(path, 0)
+            self._lru[path] = size
+            return self._evict(keep=path)
+
+    def _evict(self, keep: Optional[str] = None) -> List[str]:
+        # caller holds the lock; returns the paths to delete (outside it).
+        evicted = []
+        while self._bytes > self.max_bytes and self._lru:
+            path, size = next(iter(self._lru.items()))
+            if path == keep:
+                break  # a rendition larger than the whole budget is still served once
+            del self._lru[path]
+            self._bytes -= size
+            evicted.append(path)
+        return evicted
+
+    @staticmethod
+    def _remove(paths: List[str]) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._lru), "bytes": self._bytes, "max_bytes": self.max_bytes}
@@ -0,0 +1,31 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent async calls that share a key into one in-flight call.
+
+    The first caller for a key runs `fn`; callers arriving while it is running
+    await the same result (or exception) instead of starting their own call.
+    Once the call finishes the key is released, so later callers start afresh.
+
+    The in-flight call runs as its own task: a caller being cancelled (e.g. the
+    client disconnected) does not cancel the call for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(future)
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
@@ -0,0 +1,73 @@
+import base64
+import hashlib
+from typing import Iterable, Optional
+
+from cryptography.fernet import Fernet, MultiFernet
+
+
+class TokenKeyMissing(RuntimeError):
+    """No key to encrypt stored OAuth tokens with is configured."""
+
+
+class TokenCipher:
+    """
+    Symmetric encryption for OAuth tokens stored in the database.
+
+    Uses Fernet (AES-128-CBC + HMAC-SHA256). Several keys may be configured: the
+    first encrypts, all of them decrypt, so keys can be rotated by prepending a
+    new one and re-saving tokens (`rotate`).
+
+    Args:
+        keys (Iterable[str]): Fernet keys (urlsafe base64, 32 bytes). Use
+            `Fernet.generate_key()` to create one.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        fernets = [Fernet(key.strip().encode()) for key in keys if key.strip()]
+        if not fernets:
+            raise ValueError("TokenCipher needs at least one key")
+        self._fernet: Optional[MultiFernet] = MultiFernet(fernets)
+        self._missing = ""
+
+    @classmethod
+    def unconfigured(cls, reason: str) -> "TokenCipher":
+        """A cipher without keys: every operation raises TokenKeyMissing(`reason`)."""
+        cipher = cls.__new__(cls)
+        cipher._fernet = None
+        cipher._missing = reason
+        return cipher
+
+    @property
+    def configured(self) -> bool:
+        return self._fernet is not None
+
+    def require(self) -> MultiFernet:
+        """
+        Raises:
+            TokenKeyMissing: If no key is configured.
+        """
+        if self._fernet is None:
+            raise TokenKeyMissing(self._missing)
+        return self._fernet
+
+    @classmethod
+    def from_secret(cls, secret: str) -> "TokenCipher":
+        """Derives a key from an application secret (fallback when no key is configured)."""
+        key = base64.urlsafe_b64encode(hashlib.sha256(f"linkedin-tokens:{secret}".encode()).digest())
+        return cls([key.decode()])
+
+    def encrypt(self, value: str) -> str:
+        return self.require().encrypt(value.encode()).decode()
+
+    def decrypt(self, value: str) -> str:
+        """
+        Raises:
+            InvalidToken: If the value was not encrypted with any configured key.
+            TokenKeyMissing: If no key is configured.
+        """
+        return self.require().decrypt(value.encode()).decode()
+
+    def rotate(self, value: str) -> str:
+        """Re-encrypts `value` with the primary key."""
+        return self.require().rotate(value.encode()).decode()
+
@@ -1,36 +1,200 @@
-from typing import Dict, Any
+import logging
+import time
+from typing import Callable, List, Optional
 
+from cryptography.fernet import InvalidToken
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
 
-# temporary storage for tokens keyed by user ID; disappears on server restart
-_token_cache: Dict[int, Any] = {}
+from src.config.settings import DEFAULT_SECRET_KEY, settings
+from src.database.db_config import SessionLocal
+from src.database.models.linkedin_token import LinkedInCredential
+from src.oauth.linkedin_oauth import LinkedInToken
+from src.utilities.cache import TTLCache
+from src.utilities.token_cipher import TokenCipher
 
+logger = logging.getLogger(__name__)
 
-def save_token(user_id: int, token_obj: Any) -> None:
+
+class TokenStore:
     """
-    Saves a token object to the in-memory cache.
-    
-    This function stores arbitrary token data associated with a user ID, used in
-    FastAPI dependencies for quick, session-like access without database hits.
-    
+    LinkedIn token store backed by the `linkedin_tokens` table.
+
+    Tokens are encrypted at rest and shared by all worker processes. Reads go
+    through a small in-process cache; an entry is re-read from the database at
+    the latest `cache_ttl` seconds after it was loaded, which bounds how long a
+    worker keeps using a token another worker (or the sweeper) has replaced.
+
+    Args:
+        session_factory (Callable[[], Session]): Creates sessions for store operations.
+        cipher (TokenCipher): Encrypts tokens before they are written.
+        cache_ttl (float): Seconds a token stays in the in-process cache.
+        max_entries (int): Maximum number of cached tokens.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        cipher: TokenCipher,
+        cache_ttl: float = 60.0,
+        max_entries: int = 10_000,
+    ):
+        self.session_factory = session_factory
+        self.cipher = cipher
+        self._cache = TTLCache(ttl=cache_ttl, max_entries=max_entries)
+
+    def get(self, user_id: int) -> Optional[LinkedInToken]:
+        """Returns the user's token, from the cache when possible."""
+        token = self._cache.get(str(user_id))
+        return token if token is not None else self.load(user_id)
+
+    def load(self, user_id: int) -> Optional[LinkedInToken]:
+        """Reads the user's token from the database, bypassing (and refreshing) the cache."""
+        with self.session_factory() as db:
+            row = db.get(LinkedInCredential, user_id)
+            token = self._decode(row) if row is not None else None
+        if token is None:
+            self._cache.delete(str(user_id))
+        else:
+            self._cache.set(str(user_id), token)
+        return token
+
+    def save(self, user_id: int, token: LinkedInToken) -> None:
+        """Inserts or replaces the user's token and releases any refresh lease."""
+        with self.session_factory() as db:
+            row = db.get(LinkedInCredential, user_id) or LinkedInCredential(user_id=user_id)
+            row.owner_urn = token.owner_urn
+            row.access_token = self.cipher.encrypt(token.access_token)
+            row.refresh_token = self.cipher.encrypt(token.refresh_token) if token.refresh_token else None
+            row.expires_at = token.expires_at
+            row.refresh_lease_until = None
+            db.add(row)
+            db.commit()
+        self._cache.set(str(user_id), token)
+
+    def delete(self, user_id: int) -> None:
+        with self.session_factory() as db:
+            row = db.get(LinkedInCredential, user_id)
+            if row is not None:
+                db.delete(row)
+                db.commit()
+        self._cache.delete(str(user_id))
+
+    def due_for_refresh(self, before: float, limit: int = 100) -> List[int]:
+        """
+        Returns users whose refreshable token expires before `before` (epoch seconds).
+
+        Uses the `expires_at` index; tokens currently leased by another worker are skipped.
+        """
+        now = time.time()
+        stmt = (
+            select(LinkedInCredential.user_id)
+            .where(
+                LinkedInCredential.expires_at <= before,
+                LinkedInCredential.refresh_token.is_not(None),
+                or_(
+                    LinkedInCredential.refresh_lease_until.is_(None),
+                    LinkedInCredential.refresh_lease_until < now,
+                ),
+            )
+            .order_by(LinkedInCredential.expires_at)
+            .limit(limit)
+        )
+        with self.session_factory() as db:
+            return list(db.scalars(stmt))
+
+    def claim_refresh(self, user_id: int, lease_seconds: float = 120.0) -> bool:
+        """
+        Atomically takes the refresh lease for a token.
+
+        Only one worker can hold the lease until it expires or `save` releases it,
+        so concurrent sweepers (one per uvicorn worker) never refresh the same token.
+
+        Returns:
+            bool: True if this caller now holds the lease.
+        """
+        now = time.time()
+        stmt = (
+            update(LinkedInCredential)
+            .where(
+                LinkedInCredential.user_id == user_id,
+                or_(
+                    LinkedInCredential.refresh_lease_until.is_(None),
+                    LinkedInCredential.refresh_lease_until < now,
+                ),
+            )
+            .values(refresh_lease_until=now + lease_seconds)
+        )
+        with self.session_factory() as db:
+            claimed = db.execute(stmt).rowcount == 1
+            db.commit()
+        return claimed
+
+    def release_refresh(self, user_id: int) -> None:
+        with self.session_factory() as db:
+            db.execute(
+                update(LinkedInCredential)
+                .where(LinkedInCredential.user_id == user_id)
+                .values(refresh_lease_until=None)
+            )
+            db.commit()
+
+    def _decode(self, row: LinkedInCredential) -> Optional[LinkedInToken]:
+        try:
+            return LinkedInToken(
+                access_token=self.cipher.decrypt(row.access_token),
+                refresh_token=self.cipher.decrypt(row.refresh_token) if row.refresh_token else None,
+                expires_at=row.expires_at,
+                owner_urn=row.owner_urn,
+            )
+        except InvalidToken:
+            # Encrypted with a key that is no longer configured: the user has to reconnect.
+            logger.warning("Cannot decrypt LinkedIn token for user %s; ignoring it", row.user_id)
+            return None
+
+
+def _cipher_from_settings() -> TokenCipher:
+    keys = [key for key in settings.TOKEN_ENCRYPTION_KEYS.split(",") if key.strip()]
+    if keys:
+        return TokenCipher(keys)
+    if not settings.SECRET_KEY or settings.SECRET_KEY == DEFAULT_SECRET_KEY:
+        # a key derived from a public default would protect nothing: refuse to store tokens.
+        return TokenCipher.unconfigured(
+            "Set TOKEN_ENCRYPTION_KEYS (or a SECRET_KEY other than the default) to store OAuth tokens"
+        )
+    logger.warning("TOKEN_ENCRYPTION_KEYS is not set; deriving the token key from SECRET_KEY")
+    return TokenCipher.from_secret(settings.SECRET_KEY)
+
+
+# Shared instance used by the LinkedIn dependencies, the OAuth callback and the sweeper.
+token_store = TokenStore(SessionLocal, _cipher_from_settings(), cache_ttl=settings.LINKEDIN_TOKEN_CACHE_TTL)
+
+
+def save_token(user_id: int, token_obj: LinkedInToken) -> None:
+    """
+    Saves a user's LinkedIn token to the shared token store.
+
+    The token is encrypted and persisted, so it survives restarts and is visible
+    to every worker process.
+
     Args:
         user_id (int): Unique identifier of the user.
-        token_obj (Any): Token data to cache (e.g., LinkedInToken instance).
+        token_obj (LinkedInToken): Token to store.
     """
-    _token_cache[user_id] = token_obj
+    token_store.save(user_id, token_obj)
 
 
-def get_token(user_id: int):
+def get_token(user_id: int) -> Optional[LinkedInToken]:
     """
-    Retrieves a token object from the in-memory cache.
-    
-    This function fetches cached token data by user ID, returning None if not found.
-    It supports FastAPI's dependency injection for token-based operations, with the
-    understanding that cache misses require re-authentication (e.g., via OAuth flows).
-    
+    Retrieves a user's LinkedIn token from the shared token store.
+
+    Served from the in-process cache when possible, otherwise read from the
+    database. A None result means the user has to connect LinkedIn (OAuth flow).
+
     Args:
         user_id (int): Unique identifier of the user.
-    
+
     Returns:
-        Any | None: Cached token object or None if not present.
+        LinkedInToken | None: Stored token or None if not present.
     """
-    return _token_cache.get(user_id)
+    return token_store.get(user_id)
@@ -0,0 +1,193 @@
+import hashlib
+import os
+import re
+import time
+import uuid
+from typing import BinaryIO, Callable, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.database.models.stored_upload import StoredUpload
+from src.utilities.upload_stream import DEFAULT_CHUNK_SIZE, DEFAULT_MAX_IMAGE_BYTES, EXTENSIONS, sniff_image_type
+
+# Public names are "<sha256><extension>"; anything else is not a stored upload.
+_NAME = re.compile(r"^([0-9a-f]{64})(\.[a-z0-9]+)$")
+
+
+class UploadStore:
+    """
+    Content-addressed storage for uploaded images.
+
+    An upload is streamed to a temporary file while its SHA-256 is computed in
+    the same pass; the size limit is enforced as bytes arrive and the type is
+    sniffed from the first chunk. The file is then renamed into place under its
+    hash (sharded by the first two hex digits), so readers never see a partial
+    file and an image uploaded twice is stored once. Because a URL names the
+    content, it never changes meaning and can be cached forever.
+
+    References are counted in the `stored_uploads` table, in the caller's
+    transaction (`retain` / `release`); files nothing has referenced for a
+    grace period are removed by `collect_garbage`.
+
+    Args:
+        root (str): Directory holding the files.
+        session_factory (Callable[[], Session]): Creates sessions for store bookkeeping.
+        url_prefix (str): Path the files are served under.
+        max_bytes (int): Largest accepted upload.
+        chunk_size (int): Bytes read and hashed per step.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        session_factory: Callable[[], Session],
+        url_prefix: str = "/uploads",
+        max_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.root = root
+        self.session_factory = session_factory
+        self.url_prefix = url_prefix.rstrip("/")
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+
+    def path_for(self, name: str) -> Optional[str]:
+        """Returns the file path for a public name ('<sha256>.<ext>'), or None if it is not one."""
+        match = _NAME.match(name)
+        if match is None:
+            return None
+        digest = match.group(1)
+        return os.path.join(self.root, digest[:2], name)
+
+    def digest_of(self, url: Optional[str]) -> Optional[str]:
+        """Returns the content hash named by a store URL, or None for other URLs."""
+        if not url or not url.startswith(self.url_prefix + "/"):
+            return None
+        match = _NAME.match(url[len(self.url_prefix) + 1:])
+        return match.group(1) if match else None
+
+    def put(self, file: BinaryIO) -> str:
+        """
+        Stores an image (read from its current position) and returns its URL.
+
+        Blocking; call it from a threadpool (sync endpoints already run on one).
+
+        Raises:
+            HTTPException: 413 if the upload exceeds `max_bytes`, 415 if it is not a
+                JPEG, PNG, GIF or WebP image.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        tmp = os.path.join(self.root, f".{uuid.uuid4().hex}.tmp")
+        try:
+            digest, content_type, size = self._write(file, tmp)
+            name = digest + EXTENSIONS[content_type]
+            self._register(digest, content_type, size)
+            path = self.path_for(name)
+            if os.path.exists(path):
+                os.remove(tmp)  # already stored: the duplicate is dropped
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return f"{self.url_prefix}/{name}"
+
+    def _write(self, file: BinaryIO, tmp: str) -> Tuple[str, str, int]:
+        # single pass: every chunk is hashed, size-checked and written as it is read.
+        digest = hashlib.sha256()
+        size = 0
+        content_type = None
+        with open(tmp, "wb") as out:
+            while True:
+                chunk = file.read(self.chunk_size)
+                if not chunk:
+                    break
+                if content_type is None:
+                    content_type = sniff_image_type(chunk[:16])
+                    if content_type is None:
+                        raise HTTPException(status_code=415, detail="Unsupported media type; use JPEG, PNG, GIF or WebP")
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Image exceeds {self.max_bytes} bytes")
+                digest.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+        if content_type is None:
+            raise HTTPException(status_code=415, detail="Empty upload")
+        return digest.hexdigest(), content_type, size
+
+    def _register(self, digest: str, content_type: str, size: int) -> None:
+        # new files start orphaned until referenced; a re-upload restarts an orphan's grace period.
+        now = time.time()
+        with self.session_factory() as db:
+            touched = db.execute(
+                update(StoredUpload)
+                .where(StoredUpload.sha256 == digest, StoredUpload.ref_count <= 0)
+                .values(orphaned_at=now)
+            ).rowcount
+            if not touched and db.get(StoredUpload, digest) is None:
+                db.add(StoredUpload(sha256=digest, content_type=content_type, size=size,
+                                    ref_count=0, created_at=now, orphaned_at=now))
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()  # stored concurrently by another request
+
+    def retain(self, db: Session, url: Optional[str]) -> None:
+        """Counts a reference to the upload behind `url` in `db`'s transaction (no-op for other URLs)."""
+        digest = self.digest_of(url)
+        if digest is not None:
+            db.execute(
+                update(StoredUpload)
+                .where(StoredUpload.sha256 == digest)
+                .values(ref_count=StoredUpload.ref_count + 1, orphaned_at=None)
+            )
+
+    def release(self, db: Session, url: Optional[str]) -> None:
+        """Drops a reference in `db`'s transaction; the last one starts the garbage grace period."""
+        digest = self.digest_of(url)
+        if digest is not None:
+            db.execute(
+                update(StoredUpload)
+                .where(StoredUpload.sha256 == digest)
+                .values(
+                    ref_count=StoredUpload.ref_count - 1,
+                    orphaned_at=case((StoredUpload.ref_count <= 1, time.time()), else_=None),
+                )
+            )
+
+    def collect_garbage(self, grace: float = 86400.0, now: Optional[float] = None) -> int:
+        """
+        Deletes files nothing has referenced for `grace` seconds.
+
+        Each row is removed with a conditional DELETE first, so a file that gained
+        a reference (or was uploaded again) in the meantime is kept.
+
+        Returns:
+            int: Number of files removed.
+        """
+        cutoff = (now or time.time()) - grace
+        orphaned = (StoredUpload.ref_count <= 0, StoredUpload.orphaned_at < cutoff)
+        removed = 0
+        with self.session_factory() as db:
+            candidates = db.execute(
+                select(StoredUpload.sha256, StoredUpload.content_type).where(*orphaned)
+            ).all()
+            for digest, content_type in candidates:
+                gone = db.execute(
+                    delete(StoredUpload).where(StoredUpload.sha256 == digest, *orphaned)
+                ).rowcount == 1
+                db.commit()
+                if gone:
+                    try:
+                        os.remove(self.path_for(digest + EXTENSIONS[content_type]))
+                    except FileNotFoundError:
+                        pass
+                    removed += 1
+        return removed
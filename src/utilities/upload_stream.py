@@ -0,0 +1,181 @@
+import hashlib
+import io
+import os
+from typing import AsyncIterator, BinaryIO, Optional
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+# Magic numbers of the image formats LinkedIn and X accept.
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+EXTENSIONS = {
+    "image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif", "image/webp": ".webp",
+    "video/mp4": ".mp4", "video/quicktime": ".mov",
+}
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_IMAGE_BYTES = 10 * 1024 * 1024
+DEFAULT_MAX_VIDEO_BYTES = 512 * 1024 * 1024
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """Returns the image MIME type identified by the leading bytes, or None if unknown."""
+    for signature, content_type in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def sniff_media_type(head: bytes) -> Optional[str]:
+    """Like `sniff_image_type`, but also recognises MP4 and QuickTime video (ISO BMFF)."""
+    if head[4:8] == b"ftyp":
+        return "video/quicktime" if head[8:12] == b"qt  " else "video/mp4"
+    return sniff_image_type(head)
+
+
+class ImageStream:
+    """
+    A validated image (or video, where allowed) that can be sent on in fixed-size chunks.
+
+    Wraps a readable binary file (an UploadFile's spooled file or a file on disk)
+    without copying it: the type is sniffed from the first bytes, not trusted
+    from the client, and the size is checked against `max_bytes` before anything
+    is sent. Memory use per request is one chunk regardless of image size.
+
+    Use `from_upload` / `from_path` rather than the constructor.
+
+    Attributes:
+        file (BinaryIO): Underlying file, positioned at the start of the image.
+        content_type (str): Sniffed MIME type.
+        size (int): Size in bytes.
+        filename (str): Name with an extension matching `content_type` (for SDKs that
+            guess the type from it).
+    """
+
+    def __init__(self, file: BinaryIO, content_type: str, size: int, filename: str, chunk_size: int):
+        self.file = file
+        self.content_type = content_type
+        self.size = size
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self._data: Optional[bytes] = None  # set on buffered images
+        self._sha256: Optional[str] = None
+
+    @classmethod
+    async def from_upload(
+        cls, upload: UploadFile, max_bytes: int, chunk_size: int = DEFAULT_CHUNK_SIZE,
+        allow_video: bool = False,
+    ) -> "ImageStream":
+        """
+        Validates an uploaded image (or, with `allow_video`, an MP4/QuickTime video) in place.
+
+        Raises:
+            HTTPException: 413 if the file exceeds `max_bytes`, 415 if it is not a
+                JPEG, PNG, GIF or WebP image (or allowed video).
+        """
+        return await run_in_threadpool(
+            cls._inspect, upload.file, upload.filename, max_bytes, chunk_size, allow_video
+        )
+
+    @classmethod
+    async def from_path(
+        cls, path: str, max_bytes: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+        allow_video: bool = False,
+    ) -> "ImageStream":
+        """Opens and validates an image (or video) on disk; the caller closes `stream.file`."""
+        fh = await run_in_threadpool(open, path, "rb")
+        try:
+            return await run_in_threadpool(
+                cls._inspect, fh, os.path.basename(path), max_bytes, chunk_size, allow_video
+            )
+        except BaseException:
+            fh.close()
+            raise
+
+    @classmethod
+    def _inspect(
+        cls, file: BinaryIO, filename: Optional[str], max_bytes: Optional[int], chunk_size: int,
+        allow_video: bool = False,
+    ) -> "ImageStream":
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        if max_bytes is not None and size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Image exceeds {max_bytes} bytes")
+        file.seek(0)
+        head = file.read(16)
+        content_type = sniff_media_type(head) if allow_video else sniff_image_type(head)
+        file.seek(0)
+        if content_type is None:
+            allowed = "JPEG, PNG, GIF, WebP, MP4 or MOV" if allow_video else "JPEG, PNG, GIF or WebP"
+            raise HTTPException(status_code=415, detail=f"Unsupported media type; use {allowed}")
+        stem = os.path.splitext(filename or "image")[0] or "image"
+        return cls(file, content_type, size, stem + EXTENSIONS[content_type], chunk_size)
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, content_type: str, filename: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> "ImageStream":
+        """Wraps already validated bytes in memory (a buffered stream; `view()` works on it)."""
+        stream = cls(io.BytesIO(data), content_type, len(data), filename, chunk_size)
+        stream._data = data
+        return stream
+
+    async def read(self) -> bytes:
+        """Returns the whole content (read off the event loop unless already buffered)."""
+        if self._data is not None:
+            return self._data
+        return await run_in_threadpool(self._read_all)
+
+    async def buffered(self) -> "ImageStream":
+        """
+        Reads the image into memory once, for sending it to several consumers at once.
+
+        A file object has a single position, so concurrent readers would corrupt
+        each other's reads; call `view()` on the result to give each one its own.
+        """
+        return ImageStream.from_bytes(await self.read(), self.content_type, self.filename, self.chunk_size)
+
+    def _read_all(self) -> bytes:
+        self.file.seek(0)
+        return self.file.read()
+
+    def view(self) -> "ImageStream":
+        """Returns a stream with its own position over a buffered image's bytes (no copy)."""
+        if self._data is None:
+            raise ValueError("view() needs a buffered image; call buffered() first")
+        stream = ImageStream.from_bytes(self._data, self.content_type, self.filename, self.chunk_size)
+        stream._sha256 = self._sha256
+        return stream
+
+    async def sha256(self) -> str:
+        """Hex SHA-256 of the content, read chunk by chunk off the event loop (computed once)."""
+        if self._sha256 is None:
+            self._sha256 = await run_in_threadpool(self._hash)
+        return self._sha256
+
+    def _hash(self) -> str:
+        digest = hashlib.sha256()
+        if self._data is not None:
+            digest.update(self._data)
+            return digest.hexdigest()
+        self.file.seek(0)
+        for chunk in iter(lambda: self.file.read(self.chunk_size), b""):
+            digest.update(chunk)
+        self.file.seek(0)
+        return digest.hexdigest()
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Yields the image in `chunk_size` pieces, reading each off the event loop."""
+        await run_in_threadpool(self.file.seek, 0)
+        while True:
+            chunk = await run_in_threadpool(self.file.read, self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
@@ -0,0 +1,66 @@
+import logging
+import time
+from typing import Callable, Optional
+
+from cryptography.fernet import InvalidToken
+from sqlalchemy.orm import Session
+
+from src.database.db_config import SessionLocal
+from src.database.models.x_credential import XCredential
+from src.oauth.x_oauth import XCredentials
+from src.utilities.token_cipher import TokenCipher
+from src.utilities.token_store import token_store
+
+logger = logging.getLogger(__name__)
+
+
+class XCredentialStore:
+    """
+    Per-user X credentials backed by the `x_credentials` table, encrypted at rest.
+
+    Args:
+        session_factory (Callable[[], Session]): Creates sessions for store operations.
+        cipher (TokenCipher): Encrypts credentials before they are written.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], cipher: TokenCipher):
+        self.session_factory = session_factory
+        self.cipher = cipher
+
+    def get(self, user_id: int) -> Optional[XCredentials]:
+        with self.session_factory() as db:
+            row = db.get(XCredential, user_id)
+            if row is None:
+                return None
+            try:
+                return XCredentials(
+                    access_token=self.cipher.decrypt(row.access_token),
+                    access_token_secret=self.cipher.decrypt(row.access_token_secret),
+                    screen_name=row.screen_name,
+                )
+            except InvalidToken:
+                # Encrypted with a key that is no longer configured: the user has to reconnect.
+                logger.warning("Cannot decrypt X credentials for user %s; ignoring them", user_id)
+                return None
+
+    def save(self, user_id: int, credentials: XCredentials) -> None:
+        """Inserts or replaces the user's credentials."""
+        with self.session_factory() as db:
+            row = db.get(XCredential, user_id) or XCredential(user_id=user_id)
+            row.access_token = self.cipher.encrypt(credentials.access_token)
+            row.access_token_secret = self.cipher.encrypt(credentials.access_token_secret)
+            row.screen_name = credentials.screen_name
+            row.updated_at = time.time()
+            db.add(row)
+            db.commit()
+
+    def delete(self, user_id: int) -> None:
+        with self.session_factory() as db:
+            row = db.get(XCredential, user_id)
+            if row is not None:
+                db.delete(row)
+                db.commit()
+
+
+# Shared instance; uses the same keys as the LinkedIn token store (TOKEN_ENCRYPTION_KEYS).
+x_credential_store = XCredentialStore(SessionLocal, token_store.cipher)
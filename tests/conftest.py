@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# every model module, so Base.metadata knows all tables (and their relationships resolve).
+from src.database.models import (  # noqa: F401
+    artifact_file,
+    linkedin_asset,
+    linkedin_token,
+    post,
+    post_planning,
+    publish_job,
+    stored_upload,
+    user,
+    x_credential,
+)
+from src.database.models.base import Base
+
+
+@pytest.fixture
+def engine():
+    # in-memory database shared by every connection (and thread) of the test.
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    # modules seed their own rows through this factory.
+    return sessionmaker(bind=engine, autoflush=False)
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from src.database.models.artifact_file import ArtifactFile
+from src.services.artifact_lifecycle import ArtifactLifecycleManager, ArtifactPolicy
+from src.utilities.artifact_index import ArtifactIndex
+from src.utilities.metrics import ARTIFACT_BYTES, ARTIFACT_EVICTIONS
+
+
+@pytest.fixture
+def index(session_factory):
+    return ArtifactIndex(session_factory)
+
+
+def write(index, directory, name, size, created_at, category="posts"):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as fh:
+        fh.write(b"x" * size)
+    index.record(category, path, size, created_at)
+    return path
+
+
+def test_sweep_expires_old_files_then_evicts_oldest_over_quota(index, tmp_path):
+    files = [write(index, tmp_path, f"{n}.json", 100, 1_000.0 + n) for n in range(6)]
+    policy = ArtifactPolicy("posts", str(tmp_path), ttl=50, max_bytes=250)
+    manager = ArtifactLifecycleManager(index, [policy], batch_size=2)
+    evicted = ARTIFACT_EVICTIONS.labels("posts", "quota")._value.get()
+
+    # at 1052 the first two files are past their TTL; two more go to fit the quota.
+    assert manager.sweep(now=1_052.0) == {"posts": 4}
+    assert [os.path.exists(path) for path in files] == [False] * 4 + [True] * 2
+    assert index.totals("posts") == (2, 200)
+    assert ARTIFACT_BYTES.labels("posts")._value.get() == 200
+    assert ARTIFACT_EVICTIONS.labels("posts", "quota")._value.get() == evicted + 2
+
+    # only one of two concurrent sweeps wins an entry (and deletes its file).
+    file_id = index.oldest("posts", 1)[0][0]
+    assert index.remove(file_id) and not index.remove(file_id)
+
+
+def test_reconcile_indexes_unknown_files_and_drops_missing(index, tmp_path):
+    known = write(index, tmp_path, "known.json", 10, 1.0)
+    gone = write(index, tmp_path, "gone.json", 10, 1.0)
+    os.remove(gone)
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "old.json").write_bytes(b"y" * 30)
+    (tmp_path / "partial.json.tmp").write_bytes(b"z")
+
+    assert index.reconcile("posts", str(tmp_path)) == (1, 1)
+    with index.session_factory() as db:
+        paths = sorted(row.path for row in db.query(ArtifactFile))
+    assert paths == [known, str(tmp_path / "nested" / "old.json")]
+    assert index.totals("posts") == (2, 40)
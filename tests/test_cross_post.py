@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.database.models.user import User
+from src.routers.cross_post_router import CrossPostRouter
+from src.services.auth_service import AuthService
+from src.services.cross_post_service import CrossPostService
+from src.services.publishers import PublishError, Published
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x01" * 200_000
+
+
+class SlowPublisher:
+    def __init__(self, platform, delay, error=None):
+        self.platform = platform
+        self.delay = delay
+        self.error = error
+        self.received = []
+
+    async def account_key(self, user_id):
+        return str(user_id)
+
+    async def publish_content(self, user_id, text, image=None):
+        # read the image in chunks while the other network does the same.
+        data = b""
+        if image is not None:
+            async for chunk in image.chunks():
+                data += chunk
+                await asyncio.sleep(0)
+        await asyncio.sleep(self.delay)
+        self.received.append((user_id, text, data))
+        if self.error is not None:
+            raise self.error
+        return Published(f"{self.platform}-post")
+
+
+def app_for(service):
+    auth = AuthService("test-secret", "HS256")
+    app = FastAPI()
+    app.include_router(CrossPostRouter(auth, service).router)
+    app.dependency_overrides[auth.get_current_user] = lambda: User(id=7, username="alice")
+    return TestClient(app)
+
+
+def test_publishes_concurrently_with_one_upload():
+    linkedin, x = SlowPublisher("linkedin", 0.3), SlowPublisher("x", 0.3)
+    client = app_for(CrossPostService([linkedin, x]))
+
+    start = time.perf_counter()
+    response = client.post("/crosspost/", data={"text": "hello", "platforms": ["linkedin", "x"]},
+                           files={"image": ("a.png", PNG, "image/png")})
+    elapsed = time.perf_counter() - start
+
+    assert response.status_code == 200
+    assert [(r["platform"], r["ok"], r["post_id"]) for r in response.json()["results"]] == [
+        ("linkedin", True, "linkedin-post"), ("x", True, "x-post"),
+    ]
+    assert elapsed < 0.55  # about the slowest network, not the sum
+    # both networks read the whole image through their own views.
+    assert linkedin.received == [(7, "hello", PNG)] and x.received == [(7, "hello", PNG)]
+
+
+def test_partial_failure_is_reported_per_network():
+    failing = SlowPublisher("x", 0, error=PublishError("X returned 503", retryable=True))
+    client = app_for(CrossPostService([SlowPublisher("linkedin", 0), failing]))
+
+    response = client.post("/crosspost/", data={"text": "hello"})
+    assert response.status_code == 207
+    linkedin_result, x_result = response.json()["results"]
+    assert linkedin_result["ok"] and linkedin_result["post_id"] == "linkedin-post"
+    assert (x_result["ok"], x_result["retryable"], x_result["error"]) == (False, True, "X returned 503")
+
+    only_x = client.post("/crosspost/", data={"text": "hello", "platforms": ["x"]})
+    assert only_x.status_code == 502
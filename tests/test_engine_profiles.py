@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.config.settings import settings
+from src.database.engine_profiles import (
+    DefaultSQLiteProfile,
+    EngineProfile,
+    PostgresProfile,
+    SQLiteProfile,
+    build_engine,
+    resolve_profile,
+)
+
+
+@pytest.mark.parametrize("url, name, expected", [
+    ("sqlite:///./app.db", None, SQLiteProfile),
+    ("sqlite:///./app.db", "auto", SQLiteProfile),
+    ("postgresql://u:p@db/app", "auto", PostgresProfile),
+    ("postgresql+psycopg2://u:p@db/app", None, PostgresProfile),
+    ("mysql://u:p@db/app", "auto", EngineProfile),
+    ("sqlite:///./app.db", "default", DefaultSQLiteProfile),
+    ("postgresql://u:p@db/app", "default", EngineProfile),
+    ("postgresql://u:p@db/app", "sqlite", SQLiteProfile),
+])
+def test_profile_is_picked_by_name_or_backend(url, name, expected):
+    assert type(resolve_profile(url, name, settings)) is expected
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError, match="Unknown DB_PROFILE"):
+        resolve_profile("sqlite://", "turbo", settings)
+
+
+SQLITE_SETTINGS = SimpleNamespace(
+    DB_PROFILE="auto", SQLITE_JOURNAL_MODE="WAL", SQLITE_SYNCHRONOUS="NORMAL", SQLITE_MMAP_SIZE=0,
+    SQLITE_CACHE_SIZE=-2000, SQLITE_BUSY_TIMEOUT_MS=1234, SQLITE_TEMP_STORE="MEMORY",
+)
+
+
+def test_sqlite_pragmas_are_applied_to_every_new_connection(tmp_path):
+    engine, _ = build_engine(f"sqlite:///{tmp_path / 'app.db'}", SQLITE_SETTINGS)
+    for _ in range(2):  # a fresh connection each time, not a pooled one
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        engine.dispose()
+
+
+def test_default_sqlite_profile_leaves_pragmas_alone(tmp_path):
+    engine, _ = build_engine(f"sqlite:///{tmp_path / 'app.db'}", SQLITE_SETTINGS, "default")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+
+
+class RecordingConnection:
+    # stands in for a psycopg2 connection (not installed for the tests).
+    def __init__(self):
+        self.statements = []
+        self.committed = False
+
+    def cursor(self):
+        return SimpleNamespace(execute=self.statements.append, close=lambda: None)
+
+    def commit(self):
+        self.committed = True
+
+
+def test_postgres_profile_sizes_the_pool_and_sets_statement_timeout():
+    tuned = SimpleNamespace(DB_POOL_SIZE=4, DB_MAX_OVERFLOW=2, DB_POOL_TIMEOUT=7,
+                            DB_POOL_RECYCLE=60, DB_STATEMENT_TIMEOUT_MS=2500)
+    profile = PostgresProfile(tuned)
+    assert profile.engine_kwargs("postgresql://u:p@db/app") == {
+        "pool_size": 4, "max_overflow": 2, "pool_timeout": 7, "pool_recycle": 60, "pool_pre_ping": True,
+    }
+
+    engine = create_engine("sqlite://")
+    before = list(engine.pool.dispatch.connect)
+    profile.configure(engine)
+    [set_timeout] = [fn for fn in engine.pool.dispatch.connect if fn not in before]
+    connection = RecordingConnection()
+    set_timeout(connection, None)
+    assert connection.statements == ["SET statement_timeout = 2500"]
+    assert connection.committed
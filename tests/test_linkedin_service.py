@@ -0,0 +1,186 @@
+import asyncio
+import io
+import json
+import time
+
+import httpx
+from prometheus_client import REGISTRY
+
+from src.oauth.linkedin_oauth import (
+    LinkedInToken,
+    exchange_authorization_code,
+    fetch_owner_urn,
+    refresh_access_token,
+)
+from src.services.linkedin_service import LinkedInApiService
+from src.utilities.linkedin_asset_cache import LinkedInAssetCache
+from src.utilities.upload_stream import ImageStream
+
+UPLOAD_URL = "https://uploads.linkedin.test/image/1"
+
+
+def linkedin_stub(seen):
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, request.url.path, request.extensions["timeout"]))
+        if request.url.path == "/rest/assets":
+            return httpx.Response(200, json={"value": {
+                "asset": "urn:li:digitalmediaAsset:1",
+                "uploadMechanism": {
+                    "com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {"uploadUrl": UPLOAD_URL}
+                },
+            }})
+        if request.method == "PUT":
+            return httpx.Response(201)
+        return httpx.Response(201, headers={"x-linkedin-id": "urn:li:share:42"})
+    return handler
+
+
+def observations(phase):
+    return REGISTRY.get_sample_value(
+        "quibble_outbound_phase_seconds_count", {"service": "linkedin", "phase": phase}
+    ) or 0
+
+
+def test_posts_reuse_the_shared_client_with_phase_timeouts(tmp_path):
+    image = tmp_path / "image.jpg"
+    image.write_bytes(b"\xff\xd8\xff" + b"0" * 64)
+    token = LinkedInToken(access_token="a", expires_at=time.time() + 3600, owner_urn="urn:li:person:1")
+    seen = []
+    before = {phase: observations(phase) for phase in ("register", "upload", "publish")}
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(linkedin_stub(seen))) as client:
+            service = LinkedInApiService(token, client=client)
+            first = await service.post_with_image("hello", str(image))
+            second = await service.post_text("again")
+            assert not client.is_closed  # the shared client outlives the calls
+            return first, second
+
+    assert asyncio.run(run()) == ("urn:li:share:42", "urn:li:share:42")
+    assert [(m, p) for m, p, _ in seen] == [
+        ("POST", "/rest/assets"), ("PUT", "/image/1"), ("POST", "/rest/posts"), ("POST", "/rest/posts"),
+    ]
+    upload_timeout = seen[1][2]
+    assert upload_timeout["write"] == LinkedInApiService.UPLOAD_TIMEOUT.write
+    assert seen[0][2]["read"] == LinkedInApiService.REGISTER_TIMEOUT.read
+    assert observations("register") - before["register"] == 1
+    assert observations("upload") - before["upload"] == 1
+    assert observations("publish") - before["publish"] == 2
+
+
+def test_oauth_calls_keep_the_shared_client_timeouts():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.extensions["timeout"])
+        if request.url.path.endswith("/userinfo"):
+            return httpx.Response(200, json={"sub": "abc"})
+        return httpx.Response(200, json={"access_token": "a", "refresh_token": "r", "expires_in": 60})
+
+    phases = httpx.Timeout(connect=1.0, read=2.0, write=3.0, pool=4.0)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=phases) as client:
+            token = await exchange_authorization_code("code", client=client)
+            assert await fetch_owner_urn(token.access_token, client=client) == "urn:li:person:abc"
+            await refresh_access_token("r", client=client)
+
+    asyncio.run(run())
+    assert seen == [phases.as_dict()] * 3
+
+
+def test_multi_image_post_uploads_concurrently_and_retries_each_image(monkeypatch):
+    monkeypatch.setattr(LinkedInApiService, "RETRY_BACKOFF", 0.0)
+    token = LinkedInToken(access_token="a", expires_at=time.time() + 3600, owner_urn="urn:li:person:1")
+    registered, puts, published = [], [], []
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/rest/assets":
+            n = len(registered)
+            registered.append(n)
+            return httpx.Response(200, json={"value": {
+                "asset": f"urn:li:digitalmediaAsset:{n}",
+                "uploadMechanism": {"com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {
+                    "uploadUrl": f"https://uploads.linkedin.test/image/{n}"}},
+            }})
+        if request.method == "PUT":
+            n = int(request.url.path.rsplit("/", 1)[1])
+            body = await request.aread()
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.05)
+            in_flight["now"] -= 1
+            puts.append(n)
+            if n == 2 and puts.count(2) == 1:
+                return httpx.Response(503)  # one transient failure for the third image
+            assert body.startswith(b"\xff\xd8\xff")
+            return httpx.Response(201)
+        published.append(request.read())
+        return httpx.Response(201, headers={"x-linkedin-id": "urn:li:share:7"})
+
+    images = [
+        ImageStream(io.BytesIO(b"\xff\xd8\xff" + bytes([i]) * 64), "image/jpeg", 68, f"{i}.jpg", 16)
+        for i in range(6)
+    ]
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            started = time.perf_counter()
+            urn = await LinkedInApiService(token, client=client).post_with_images("six", images)
+            return urn, time.perf_counter() - started
+
+    urn, elapsed = asyncio.run(run())
+    assert urn == "urn:li:share:7"
+    assert len(registered) == 6 and sorted(puts) == [0, 1, 2, 2, 3, 4, 5]  # only image 2 retried
+    assert in_flight["max"] == LinkedInApiService.PARALLEL_UPLOADS
+    assert elapsed < 6 * 0.05  # two waves plus one retry, not six uploads in a row
+    body = json.loads(published[0])
+    assert [i["id"] for i in body["content"]["multiImage"]["images"]] == [
+        f"urn:li:digitalmediaAsset:{n}" for n in range(6)
+    ]
+
+
+def test_repeated_images_reuse_their_asset_until_linkedin_rejects_it(session_factory):
+    cache = LinkedInAssetCache(session_factory, ttl=3600)
+    token = LinkedInToken(access_token="a", expires_at=time.time() + 3600, owner_urn="urn:li:person:1")
+    seen, registered, rejected = [], [], set()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, request.url.path))
+        if request.url.path == "/rest/posts" and json.loads(request.read())["content"]["media"]["id"] in rejected:
+            return httpx.Response(422, json={"message": "asset not found"})
+        if request.url.path == "/rest/assets":
+            registered.append(request)
+            n = len(registered)
+            return httpx.Response(200, json={"value": {
+                "asset": f"urn:li:digitalmediaAsset:{n}",
+                "uploadMechanism": {
+                    "com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {"uploadUrl": UPLOAD_URL}
+                },
+            }})
+        return httpx.Response(201, headers={"x-linkedin-id": "urn:li:share:42"})
+
+    def image():
+        return ImageStream(io.BytesIO(b"\xff\xd8\xff" + b"brand" * 20), "image/jpeg", 103, "brand.jpg", 32)
+
+    async def post(service):
+        seen.clear()
+        return await service.post_with_image("hello", image())
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            service = LinkedInApiService(token, client=client, asset_cache=cache)
+            await post(service)
+            assert [p for _, p in seen] == ["/rest/assets", "/image/1", "/rest/posts"]
+            await post(service)
+            assert [p for _, p in seen] == ["/rest/posts"]  # no register, no upload
+            rejected.add("urn:li:digitalmediaAsset:1")  # LinkedIn dropped the asset
+            await post(service)
+            assert [p for _, p in seen] == ["/rest/posts", "/rest/assets", "/image/1", "/rest/posts"]
+
+    asyncio.run(run())
+    digest = asyncio.run(image().sha256())
+    assert cache.get("urn:li:person:1", digest) == "urn:li:digitalmediaAsset:2"
+    assert cache.get("urn:li:person:2", digest) is None  # assets are per owner
+    assert cache.purge_expired(now=time.time() + 7200) == 1
@@ -0,0 +1,150 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy import text
+
+from src.config.settings import DEFAULT_SECRET_KEY, settings
+from src.database.models.linkedin_token import LinkedInCredential
+from src.database.models.user import User
+from src.oauth.linkedin_oauth import LinkedInToken
+from src.services.linkedin_service import LinkedInApiService
+from src.services.linkedin_token_refresher import LinkedInTokenRefresher, refresh_user_token
+from src.utilities.token_cipher import TokenCipher, TokenKeyMissing
+from src.utilities.token_store import TokenStore, _cipher_from_settings
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with session_factory() as db:
+        db.add_all([User(id=1, username="alice"), User(id=2, username="bob")])
+        db.commit()
+    return session_factory
+
+
+@pytest.fixture
+def cipher():
+    return TokenCipher([Fernet.generate_key().decode()])
+
+
+def token(access="access", expires_in=3600.0, refresh="refresh"):
+    return LinkedInToken(
+        access_token=access,
+        refresh_token=refresh,
+        expires_at=time.time() + expires_in,
+        owner_urn="urn:li:person:abc",
+    )
+
+
+def test_tokens_are_encrypted_and_shared_between_stores(session_factory, cipher):
+    TokenStore(session_factory, cipher).save(1, token())
+    with session_factory() as db:
+        raw = db.execute(text("SELECT access_token, refresh_token FROM linkedin_tokens")).one()
+    assert "access" not in raw[0] and "refresh" not in raw[1]
+
+    # A second store plays the part of another worker process.
+    other_worker = TokenStore(session_factory, cipher)
+    loaded = other_worker.get(1)
+    assert loaded.access_token == "access"
+    assert loaded.owner_urn == "urn:li:person:abc"
+    assert other_worker.get(2) is None
+
+
+def test_unreadable_token_is_treated_as_missing(session_factory, cipher):
+    TokenStore(session_factory, cipher).save(1, token())
+    rotated_away = TokenCipher([Fernet.generate_key().decode()])
+    assert TokenStore(session_factory, rotated_away).get(1) is None
+
+
+def test_refresh_lease_is_exclusive(session_factory, cipher):
+    store = TokenStore(session_factory, cipher)
+    store.save(1, token())
+    assert store.claim_refresh(1)
+    assert not store.claim_refresh(1)
+    assert store.due_for_refresh(time.time() + 7200) == []
+    store.release_refresh(1)
+    assert store.due_for_refresh(time.time() + 7200) == [1]
+
+
+def test_sweeper_refreshes_only_tokens_close_to_expiry(session_factory, cipher):
+    store = TokenStore(session_factory, cipher)
+    store.save(1, token(expires_in=60))
+    store.save(2, token(expires_in=10 * 86400))
+    calls = []
+
+    async def refresh(refresh_token):
+        calls.append(refresh_token)
+        return LinkedInToken(
+            access_token="new", refresh_token=refresh_token,
+            expires_at=time.time() + 60 * 86400, owner_urn="",
+        )
+
+    refresher = LinkedInTokenRefresher(store, refresh=refresh, refresh_ahead=86400)
+    assert asyncio.run(refresher.refresh_due()) == 1
+    assert calls == ["refresh"]
+    refreshed = TokenStore(session_factory, cipher).get(1)
+    assert refreshed.access_token == "new"
+    assert refreshed.owner_urn == "urn:li:person:abc"
+    with session_factory() as db:
+        assert db.get(LinkedInCredential, 1).refresh_lease_until is None
+    assert asyncio.run(refresher.refresh_due()) == 0
+
+
+def test_concurrent_refreshes_for_a_user_share_one_request(session_factory, cipher):
+    store = TokenStore(session_factory, cipher)
+    store.save(1, token(expires_in=10))
+    calls = []
+
+    async def refresh(refresh_token):
+        calls.append(refresh_token)
+        await asyncio.sleep(0.05)
+        return LinkedInToken(
+            access_token="new", refresh_token=refresh_token,
+            expires_at=time.time() + 3600, owner_urn="",
+        )
+
+    async def burst():
+        return await asyncio.gather(*(refresh_user_token(store, 1, refresh) for _ in range(5)))
+
+    results = asyncio.run(burst())
+    assert calls == ["refresh"]
+    assert {r.access_token for r in results} == {"new"}
+    assert {r.owner_urn for r in results} == {"urn:li:person:abc"}
+    # Already fresh: no further refresh.
+    asyncio.run(refresh_user_token(store, 1, refresh))
+    assert len(calls) == 1
+
+
+def test_service_saves_a_token_it_refreshes(session_factory, cipher):
+    store = TokenStore(session_factory, cipher)
+    store.save(1, token(expires_in=10))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/oauth/v2/accessToken":
+            return httpx.Response(200, json={"access_token": "new", "refresh_token": "rotated", "expires_in": 3600})
+        assert request.headers["authorization"] == "Bearer new"
+        return httpx.Response(201, headers={"x-linkedin-id": "urn:li:share:1"})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            service = LinkedInApiService(store.get(1), client=client, user_id=1, store=store)
+            return await service.post_text("hi")
+
+    assert asyncio.run(run()) == "urn:li:share:1"
+    saved = TokenStore(session_factory, cipher).get(1)
+    assert (saved.access_token, saved.refresh_token) == ("new", "rotated")
+    assert saved.owner_urn == "urn:li:person:abc"
+
+
+def test_default_secret_is_never_used_as_the_token_key(monkeypatch):
+    monkeypatch.setattr(settings, "TOKEN_ENCRYPTION_KEYS", "")
+    monkeypatch.setattr(settings, "SECRET_KEY", DEFAULT_SECRET_KEY)
+    cipher = _cipher_from_settings()
+    assert not cipher.configured
+    with pytest.raises(TokenKeyMissing, match="TOKEN_ENCRYPTION_KEYS"):
+        cipher.encrypt("access")
+
+    monkeypatch.setattr(settings, "SECRET_KEY", "a-real-secret")
+    assert _cipher_from_settings().decrypt(TokenCipher.from_secret("a-real-secret").encrypt("x")) == "x"
@@ -0,0 +1,105 @@
+import asyncio
+import io
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from src.utilities import media_preprocessor as preprocessing
+from src.utilities.media_preprocessor import MediaPreprocessor, MediaProfile
+from src.utilities.upload_stream import ImageStream
+
+
+def encode(image, fmt, **params) -> bytes:
+    out = io.BytesIO()
+    image.save(out, format=fmt, **params)
+    return out.getvalue()
+
+
+def stream_of(data: bytes, content_type: str, filename: str) -> ImageStream:
+    return ImageStream(io.BytesIO(data), content_type, len(data), filename, 64 * 1024)
+
+
+def photo(width, height) -> Image.Image:
+    # noise compresses badly, like a photo or a generated image.
+    return Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+
+
+@pytest.fixture
+def preprocessor(tmp_path):
+    return MediaPreprocessor(str(tmp_path / "cache"), max_workers=2, executor="thread")
+
+
+def test_large_png_photo_becomes_a_jpeg_within_the_platform_limits(preprocessor):
+    source = encode(photo(3000, 1500), "PNG")
+    original = stream_of(source, "image/png", "generated.png")
+
+    linkedin = asyncio.run(preprocessor.prepare(original, "linkedin"))
+    assert (linkedin.content_type, linkedin.filename) == ("image/jpeg", "generated.jpg")
+    assert linkedin.size <= 5 * 1024 * 1024 < len(source)
+    assert Image.open(io.BytesIO(asyncio.run(linkedin.read()))).size == (2048, 1024)
+
+    x = asyncio.run(preprocessor.prepare(original, "x"))
+    assert Image.open(io.BytesIO(asyncio.run(x.read()))).size == (3000, 1500)
+
+
+def test_orientation_is_applied_and_metadata_stripped(preprocessor):
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotate 90° clockwise on display
+    exif[0x010F] = "PhoneMaker"
+    source = encode(photo(200, 100), "JPEG", exif=exif)
+
+    prepared = asyncio.run(preprocessor.prepare(stream_of(source, "image/jpeg", "p.jpg"), "x"))
+    image = Image.open(io.BytesIO(asyncio.run(prepared.read())))
+    assert image.size == (100, 200)
+    assert not image.getexif()
+
+
+def test_transparent_and_flat_images_stay_lossless(preprocessor):
+    logo = Image.new("RGBA", (300, 300), (200, 30, 30, 0))
+    prepared = asyncio.run(preprocessor.prepare(stream_of(encode(logo, "PNG"), "image/png", "logo.png"), "linkedin"))
+    assert prepared.content_type == "image/png"
+    assert Image.open(io.BytesIO(asyncio.run(prepared.read()))).mode == "RGBA"
+
+
+def test_oversized_output_is_recompressed_then_scaled(tmp_path):
+    tight = MediaPreprocessor(str(tmp_path), executor="thread",
+                              profiles={"x": MediaProfile("x", max_side=4096, max_bytes=60_000)})
+    source = encode(photo(800, 800), "JPEG", quality=95)
+    prepared = asyncio.run(tight.prepare(stream_of(source, "image/jpeg", "big.jpg"), "x"))
+    assert prepared.size <= 60_000
+    assert Image.open(io.BytesIO(asyncio.run(prepared.read()))).size[0] < 800
+
+
+def test_results_are_cached_by_content_and_profile(preprocessor, monkeypatch, tmp_path):
+    calls = []
+    transform = preprocessing._transform
+
+    def counting(data, profile):
+        calls.append(profile.name)
+        return transform(data, profile)
+
+    monkeypatch.setattr(preprocessing, "_transform", counting)
+    source = encode(photo(400, 300), "PNG")
+
+    async def run():
+        # concurrent requests for the same image share one job.
+        await asyncio.gather(*(
+            preprocessor.prepare(stream_of(source, "image/png", f"{n}.png"), "linkedin") for n in range(3)
+        ))
+        await preprocessor.prepare(stream_of(source, "image/png", "again.png"), "linkedin")
+        await preprocessor.prepare(stream_of(source, "image/png", "again.png"), "x")
+        # another process (or a restart) finds the result on disk.
+        fresh = MediaPreprocessor(preprocessor.cache_dir, executor="thread")
+        return await fresh.prepare(stream_of(source, "image/png", "other.png"), "linkedin")
+
+    assert asyncio.run(run()).content_type == "image/jpeg"
+    assert calls == ["linkedin", "x"]
+
+
+def test_videos_and_unknown_platforms_pass_through(preprocessor):
+    video = stream_of(b"\x00\x00\x00\x18ftypmp42" + b"0" * 64, "video/mp4", "clip.mp4")
+    assert asyncio.run(preprocessor.prepare(video, "x")) is video
+    image = stream_of(encode(photo(10, 10), "PNG"), "image/png", "a.png")
+    assert asyncio.run(preprocessor.prepare(image, "mastodon")) is image
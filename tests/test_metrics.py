@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from src.database.engine_profiles import PoolObserver
+from src.middleware.request_metrics import RequestMetricsMiddleware
+from src.services.post_cache import PostCache
+from src.utilities.cache import MemoryCacheBackend
+from src.utilities.metrics import time_phase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_requests_are_timed_per_route_template():
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    route = dict(method="GET", route="/items/{item_id}", status="200")
+    before = sample("quibble_http_request_seconds_count", **route)
+    unmatched = sample("quibble_http_request_seconds_count", method="GET", route="unmatched", status="404")
+
+    assert client.get("/items/1").status_code == 200
+    assert client.get("/items/2").status_code == 200
+    assert client.get("/missing").status_code == 404
+
+    assert sample("quibble_http_request_seconds_count", **route) == before + 2
+    assert sample("quibble_http_request_seconds_count", method="GET", route="unmatched", status="404") == unmatched + 1
+    assert sample("quibble_http_requests_in_flight", method="GET") == 0
+
+
+def test_outbound_errors_carry_the_http_status():
+    request = httpx.Request("POST", "https://api.example.com/posts")
+    error = httpx.HTTPStatusError("rate limited", request=request, response=httpx.Response(429, request=request))
+    labels = dict(service="test", phase="publish", error="HTTPStatusError", status="429")
+    before = sample("quibble_outbound_phase_errors_total", **labels)
+    with pytest.raises(httpx.HTTPStatusError):
+        with time_phase("test", "publish"):
+            raise error
+    assert sample("quibble_outbound_phase_errors_total", **labels) == before + 1
+
+
+def test_cache_hits_and_misses_are_counted():
+    cache = PostCache(MemoryCacheBackend(max_entries=10, max_bytes=None, default_ttl=60), ttl=60)
+    hits, misses = (sample("quibble_cache_requests_total", cache="posts", result=r) for r in ("hit", "miss"))
+    cache.post(1, lambda: b"{}")
+    cache.post(1, lambda: b"{}")
+    assert sample("quibble_cache_requests_total", cache="posts", result="miss") == misses + 1
+    assert sample("quibble_cache_requests_total", cache="posts", result="hit") == hits + 1
+
+
+def test_pool_events_are_exported():
+    engine = create_engine("sqlite://")
+    PoolObserver(engine)
+    checkouts = sample("quibble_db_pool_events_total", event="checkouts")
+    checked_out = sample("quibble_db_pool_checked_out")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert sample("quibble_db_pool_checked_out") == checked_out + 1
+    assert sample("quibble_db_pool_events_total", event="checkouts") == checkouts + 1
+    assert sample("quibble_db_pool_checked_out") == checked_out
+
+
+WORKER = """
+from src.utilities.metrics import CACHE_REQUESTS
+CACHE_REQUESTS.labels("posts", "hit").inc(3)
+"""
+
+SCRAPE = """
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.routers.metrics_router import MetricsRouter
+app = FastAPI()
+app.include_router(MetricsRouter().router)
+print(TestClient(app).get("/metrics").text)
+"""
+
+
+def test_metrics_endpoint_aggregates_worker_processes(tmp_path):
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+
+    def run(code):
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True,
+                                text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        return result.stdout
+
+    run(WORKER)
+    run(WORKER)
+    scraped = run(SCRAPE)
+    assert 'quibble_cache_requests_total{cache="posts",result="hit"} 6.0' in scraped
+    assert "quibble_process_memory_bytes" in scraped
+
+
+def test_step_timer_times_denoising_steps_only():
+    from src.generation.images.image_pipeline import StepTimer
+
+    steps = sample("quibble_model_phase_seconds_count", model="stable_diffusion", phase="step")
+    timer = StepTimer()
+    for step in range(4):
+        assert timer(None, step, 0, {"latents": step}) == {"latents": step}
+    assert sample("quibble_model_phase_seconds_count", model="stable_diffusion", phase="step") == steps + 3
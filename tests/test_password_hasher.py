@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.database.db_config import get_db
+from src.database.models.user import User
+from src.routers.auth_router import AuthRouter
+from src.services.auth_service import AuthService
+from src.utilities.password_hasher import HasherBusy, PasswordHasher
+
+
+@pytest.fixture
+def session(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+def test_process_pool_hash_and_verify():
+    hasher = PasswordHasher(rounds=4, max_workers=2)
+    try:
+        hashed = asyncio.run(hasher.hash("s3cret"))
+        assert hashed.startswith("$2b$04$")
+        assert hasher.verify_sync("s3cret", hashed)
+        assert not asyncio.run(hasher.verify("wrong", hashed))
+    finally:
+        hasher.shutdown()
+
+
+def test_queue_limit_raises_busy():
+    hasher = PasswordHasher(rounds=4, max_workers=1, max_pending=1, executor="thread")
+    try:
+        blocker = hasher._submit(time.sleep, 0.2)
+        with pytest.raises(HasherBusy):
+            hasher.hash_sync("s3cret")
+        blocker.result()
+        assert hasher.verify_sync("s3cret", hasher.hash_sync("s3cret"))
+        assert hasher.stats()["pending"] == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_register_then_login_rehashes_outdated_cost(session, monkeypatch):
+    monkeypatch.setattr(AuthService, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(AuthService, "ALGORITHM", "HS256")
+    old = PasswordHasher(rounds=4, executor="thread")
+    new = PasswordHasher(rounds=5, executor="thread")
+
+    def client_for(hasher):
+        app = FastAPI()
+        auth = AuthService("test-secret", "HS256", password_hasher=hasher)
+        app.include_router(AuthRouter(auth).router)
+        app.dependency_overrides[get_db] = lambda: session
+        return TestClient(app)
+
+    credentials = {"username": "alice", "password": "s3cret"}
+    assert client_for(old).post("/register", json=credentials).status_code == 200
+    assert session.query(User).one().hashed_password.startswith("$2b$04$")
+
+    client = client_for(new)
+    assert client.post("/login", json={**credentials, "password": "wrong-password"}).status_code == 401
+    resp = client.post("/login", json=credentials)
+    assert resp.status_code == 200, resp.text
+    session.expire_all()
+    assert session.query(User).one().hashed_password.startswith("$2b$05$")
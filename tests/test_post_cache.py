@@ -0,0 +1,112 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.database.db_config import get_db
+from src.database.models.post import Post
+from src.database.models.user import User
+from src.routers.post_router import PostRouter
+from src.services.post_cache import PostCache
+from src.services.post_service import PostService
+from src.utilities.cache import MemoryCacheBackend, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeAuthService:
+    def get_current_user(self):
+        return None
+
+
+def test_ttl_cache_expires_and_evicts_lru():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, max_entries=2, clock=clock)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")  # touch 'a' so 'b' is least recently used
+    cache.set("c", b"3")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    clock.now = 11
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_byte_budget():
+    cache = TTLCache(ttl=10, max_bytes=5)
+    cache.set("a", b"123")
+    cache.set("b", b"45")
+    cache.set("c", b"6")
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 3
+    cache.set("huge", b"x" * 10)
+    assert cache.get("huge") is None
+
+
+@pytest.fixture
+def session(session_factory):
+    db = session_factory()
+    db.add(User(id=1, username="owner", hashed_password="x"))
+    db.add_all([
+        Post(id=1, title="a", content="x", owner_id=1, category="tech", likes=5),
+        Post(id=2, title="b", content="y", owner_id=1, category="news", likes=3),
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def cache():
+    return PostCache(MemoryCacheBackend(max_entries=100, max_bytes=None, default_ttl=60), ttl=60)
+
+
+@pytest.fixture
+def client(session, cache):
+    app = FastAPI()
+    app.include_router(PostRouter(FakeAuthService(), cache=cache).router, prefix="/posts")
+    app.dependency_overrides[get_db] = lambda: session
+    return TestClient(app)
+
+
+def _rename_behind_cache(session, post_id, title):
+    session.query(Post).filter(Post.id == post_id).update({"title": title})
+    session.commit()
+
+
+def test_hits_are_served_from_cache(client, session):
+    assert client.get("/posts/1").json()["title"] == "a"
+    _rename_behind_cache(session, 1, "changed")
+    assert client.get("/posts/1").json()["title"] == "a"
+
+
+def test_update_invalidates_post_and_its_feeds_only(client, session, cache):
+    owner = session.get(User, 1)
+    client.get("/posts/1")
+    client.get("/posts/", params={"category": "tech"})
+    client.get("/posts/", params={"category": "news"})
+    _rename_behind_cache(session, 2, "renamed news")
+
+    PostService(session, cache=cache).update_post_image(owner, 1, "/uploads/a.png")
+
+    assert client.get("/posts/1").json()["image_url"] == "/uploads/a.png"
+    tech = client.get("/posts/", params={"category": "tech"}).json()["items"]
+    assert tech[0]["image_url"] == "/uploads/a.png"
+    # The news feed was not touched by the write, so it is still served from cache.
+    news = client.get("/posts/", params={"category": "news"}).json()["items"]
+    assert news[0]["title"] == "b"
+
+
+def test_create_and_delete_invalidate_feed(client, session, cache):
+    owner = session.get(User, 1)
+    assert len(client.get("/posts/").json()["items"]) == 2
+    created = PostService(session, cache=cache).create_post(owner, "c", "z", category="tech")
+    assert len(client.get("/posts/").json()["items"]) == 3
+    PostService(session, cache=cache).delete_post(owner, created.id)
+    assert len(client.get("/posts/").json()["items"]) == 2
+    assert client.get(f"/posts/{created.id}").status_code == 404
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from src.database.db_config import get_db
+from src.database.models.post import Post
+from src.routers.post_router import PostRouter
+from src.services.post_service import PostService
+from src.utilities.pagination import InvalidCursorError, encode_cursor
+
+
+class FakeAuthService:
+    def get_current_user(self):
+        return None
+
+
+@pytest.fixture
+def session(session_factory):
+    db = session_factory()
+    start = datetime(2025, 1, 1)
+    db.add_all(
+        Post(
+            title=f"post {i}",
+            content="body",
+            category="tech" if i % 2 else "news",
+            likes=i % 7,  # plenty of ties, so the id tiebreaker matters
+            created_at=start + timedelta(minutes=i // 3),
+        )
+        for i in range(50)
+    )
+    db.commit()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def client(session):
+    app = FastAPI()
+    app.include_router(PostRouter(FakeAuthService()).router, prefix="/posts")
+    app.dependency_overrides[get_db] = lambda: session
+    return TestClient(app)
+
+
+def _walk(service, **kwargs):
+    seen, cursor = [], None
+    while True:
+        items, cursor = service.get_posts(cursor=cursor, **kwargs)
+        seen.extend(items)
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("sort_by,key", [
+    ("likes", lambda p: (p.likes, p.id)),
+    ("newest", lambda p: (p.created_at, p.id)),
+])
+def test_pages_cover_feed_in_order_without_gaps(session, sort_by, key):
+    posts = _walk(PostService(session), sort_by=sort_by, limit=7)
+    expected = sorted(session.query(Post).all(), key=key, reverse=True)
+    assert [p.id for p in posts] == [p.id for p in expected]
+
+
+def test_category_filter(session):
+    posts = _walk(PostService(session), category="tech", limit=4)
+    assert len(posts) == 25
+    assert {p.category for p in posts} == {"tech"}
+
+
+def test_cursor_is_tied_to_sort_order(session):
+    _, cursor = PostService(session).get_posts(sort_by="likes", limit=5)
+    with pytest.raises(ValueError):
+        PostService(session).get_posts(sort_by="newest", cursor=cursor)
+
+
+@pytest.mark.parametrize("sort_by, position", [
+    ("likes", {"likes": "1 OR 1=1", "id": 5}),
+    ("likes", {"likes": 3, "id": True}),
+    ("likes", {"likes": 3.5, "id": 5}),
+    ("newest", {"created_at": "2026-01-01T00:00:00", "id": 5}),  # a string, not the encoded datetime
+    ("newest", {"created_at": {"dt": "2026-01-01"}, "id": [1]}),
+])
+def test_forged_cursor_values_are_rejected(session, sort_by, position):
+    cursor = encode_cursor({**position, "sort": sort_by})
+    with pytest.raises(InvalidCursorError):
+        PostService(session).get_posts(sort_by=sort_by, cursor=cursor)
+
+
+def test_feed_queries_use_composite_indexes(session):
+    plan = session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT * FROM posts WHERE category = 'tech' "
+        "AND (likes, id) < (3, 10) ORDER BY likes DESC, id DESC LIMIT 21"
+    )).fetchall()
+    detail = " ".join(row[-1] for row in plan)
+    assert "ix_posts_category_likes_id" in detail
+    assert "TEMP B-TREE" not in detail
+
+
+def test_list_endpoint_paginates(client):
+    first = client.get("/posts/", params={"sort_by": "newest", "limit": 10})
+    assert first.status_code == 200, first.text
+    body = first.json()
+    assert len(body["items"]) == 10
+    second = client.get(
+        "/posts/", params={"sort_by": "newest", "limit": 10, "cursor": body["next_cursor"]}
+    ).json()
+    assert not {p["id"] for p in body["items"]} & {p["id"] for p in second["items"]}
+
+
+def test_list_endpoint_rejects_bad_input(client):
+    assert client.get("/posts/", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/posts/", params={"sort_by": "random"}).status_code == 400
+    assert client.get("/posts/", params={"limit": 1000}).status_code == 422
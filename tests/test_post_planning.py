@@ -3,7 +3,9 @@ from datetime import datetime, timezone
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from src.database.models.user import User
 from src.routers.post_planning_router import PostPlanningRouter
+from src.services.auth_service import AuthService
 from src.schemas.planning import (
     PostPlanCreate,
     PostPlanRead,
@@ -12,7 +14,7 @@ from src.schemas.planning import (
 )
 
 class FakePostPlanningService:
-    def create_plan(self, data: PostPlanCreate) -> PostPlanRead:
+    def create_plan(self, data: PostPlanCreate, owner_id: int) -> PostPlanRead:
         # Echo back the minimal PostPlanRead shape
         return PostPlanRead(
             id=1,
@@ -22,7 +24,7 @@ class FakePostPlanningService:
             posts=[],
         )
 
-    def generate_posts(self, plan_id: int) -> list[PlannedPostRead]:
+    def generate_posts(self, plan_id: int, owner_id: int) -> list[PlannedPostRead]:
         now = datetime.now(timezone.utc)
         # Always returns two dummy PlannedPostRead objects
         return [
@@ -42,7 +44,7 @@ class FakePostPlanningService:
             ),
         ]
 
-    def update_post(self, plan_id: int, post_id: int, data: PlannedPostCreate) -> PlannedPostRead:
+    def update_post(self, plan_id: int, post_id: int, data: PlannedPostCreate, owner_id: int) -> PlannedPostRead:
         return PlannedPostRead(
             id=post_id,
             plan_id=plan_id,
@@ -51,14 +53,27 @@ class FakePostPlanningService:
             ai_suggested=False,
         )
 
-@pytest.fixture
-def client():
+def app_for(service):
+    auth = AuthService("test-secret", "HS256")
     app = FastAPI()
-    fake_service = FakePostPlanningService()
     # Mount the router under "/planning"
-    app.include_router(PostPlanningRouter(fake_service).router)
+    app.include_router(PostPlanningRouter(service, auth).router)
+    return app, auth
+
+@pytest.fixture
+def client():
+    app, auth = app_for(FakePostPlanningService())
+    app.dependency_overrides[auth.get_current_user] = lambda: User(id=42, username="alice")
     return TestClient(app)
 
+def test_routes_require_authentication():
+    app, _ = app_for(FakePostPlanningService())
+    client = TestClient(app)
+    assert client.post("/planning/", json={"account_id": 1, "plan_date": "2025-07-30T12:00:00Z"}).status_code == 401
+    assert client.post("/planning/1/generate").status_code == 401
+    payload = {"plan_id": 1, "content": "x", "scheduled_time": None, "platform": "x"}
+    assert client.patch("/planning/1/posts/1", json=payload).status_code == 401
+
 def test_create_plan(client):
     # Use an ISO datetime string for plan_date
     dt = "2025-07-30T12:00:00Z"
@@ -0,0 +1,139 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from src.database.models.post_planning import PlannedPost, PostPlan
+from src.database.models.publish_job import PublishJob
+from src.database.models.user import User
+from src.repositories.planned_post_repo import PlannedPostRepo
+from src.repositories.post_plan_repo import PostPlanRepo
+from src.schemas.planning import PlannedPostCreate, PostPlanCreate
+from src.services.post_planning_service import PlanNotFoundError, PostPlanningService
+from src.services.post_scheduler import PostScheduler
+from src.services.publish_queue import PublishQueue, utcnow
+
+
+@pytest.fixture
+def factory(session_factory):
+    with session_factory() as db:
+        db.add(User(id=2, username="bob"))
+        db.add(PostPlan(id=1, account_id=2, owner_id=2, plan_date=datetime(2026, 1, 1)))
+        db.commit()
+    return session_factory
+
+
+def scheduler_for(factory, tmp_path, **kwargs):
+    return PostScheduler(PublishQueue(factory, str(tmp_path)), factory, **kwargs)
+
+
+def add_posts(factory, *posts):
+    with factory() as db:
+        db.add_all([PlannedPost(**{"plan_id": 1, "content": f"post {i}", **fields}) for i, fields in posts])
+        db.commit()
+
+
+def jobs(factory):
+    with factory() as db:
+        return db.execute(select(PublishJob.planned_post_id, PublishJob.user_id, PublishJob.payload)).all()
+
+
+def test_due_posts_are_queued_once_across_replicas(factory, tmp_path):
+    now = utcnow()
+    add_posts(
+        factory,
+        (1, {"id": 1, "scheduled_time": now - timedelta(minutes=1), "platform": "x"}),
+        (2, {"id": 2, "scheduled_time": now + timedelta(hours=1), "platform": "x"}),
+        (3, {"id": 3, "scheduled_time": now - timedelta(minutes=1)}),  # no platform: a draft
+    )
+    first, second = scheduler_for(factory, tmp_path), scheduler_for(factory, tmp_path)
+    assert first.dispatch_due(now) == 1
+    assert second.dispatch_due(now) == 0
+    assert jobs(factory) == [(1, 2, {"text": "post 1"})]
+
+
+def test_leased_post_is_skipped_until_the_lease_lapses(factory, tmp_path):
+    now = utcnow()
+    add_posts(factory, (1, {"id": 1, "scheduled_time": now, "platform": "linkedin",
+                            "dispatch_lease_until": now + timedelta(seconds=30)}))
+    scheduler = scheduler_for(factory, tmp_path)
+    assert scheduler.dispatch_due(now) == 0
+    # the holder died before marking it queued; another replica takes over.
+    assert scheduler.dispatch_due(now + timedelta(seconds=31)) == 1
+
+
+def test_window_is_bounded_and_sleep_targets_the_next_post(factory, tmp_path):
+    now = datetime(2026, 5, 1, 12, 0)
+    add_posts(factory, *[
+        (i, {"scheduled_time": now + timedelta(minutes=10 + i), "platform": "x"}) for i in range(5)
+    ])
+    add_posts(factory, (9, {"scheduled_time": now + timedelta(days=2), "platform": "x"}))
+    scheduler = scheduler_for(factory, tmp_path, horizon=3600, max_loaded=3)
+    assert scheduler.load_window(now) == 3
+    resync = now + timedelta(minutes=5)
+    assert scheduler.seconds_until_next(now, resync) == 300
+    assert scheduler.seconds_until_next(now, now + timedelta(hours=1)) == 600
+
+    # a post moved earlier inside the window becomes the next wake-up...
+    scheduler.notify(42, (now + timedelta(minutes=2)).replace(tzinfo=timezone.utc))
+    assert scheduler.seconds_until_next(now, now + timedelta(hours=1)) == 120
+    # ...one beyond the loaded window is left to a later load.
+    scheduler.notify(43, now + timedelta(hours=5))
+    assert len(scheduler._heap) == 4
+
+
+def test_post_due_during_a_pass_is_not_dropped(factory, tmp_path):
+    now = datetime(2026, 5, 1, 12, 0)
+    add_posts(factory, (1, {"id": 1, "scheduled_time": now + timedelta(seconds=1), "platform": "x"}))
+    scheduler = scheduler_for(factory, tmp_path)
+    scheduler.load_window(now)
+    assert scheduler.dispatch_due(now) == 0
+    # the pass took two seconds: the post fell due after it dispatched, so wake at once.
+    later = now + timedelta(seconds=2)
+    assert scheduler.seconds_until_next(later, now + timedelta(hours=1), dispatched_until=now) == 0
+    assert scheduler._heap == [(now + timedelta(seconds=1), 1)]
+    assert scheduler.dispatch_due(later) == 1
+
+
+def test_run_wakes_on_notify(factory, tmp_path):
+    scheduler = scheduler_for(factory, tmp_path, resync_interval=3600)
+
+    async def scenario():
+        scheduler.start()
+        await asyncio.sleep(0.05)  # first pass: empty window, sleeps for an hour
+        add_posts(factory, (1, {"id": 1, "scheduled_time": utcnow(), "platform": "x"}))
+        scheduler.notify(1, utcnow())
+        for _ in range(50):
+            await asyncio.sleep(0.02)
+            if jobs(factory):
+                break
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert [row[0] for row in jobs(factory)] == [1]
+
+
+def test_posts_are_published_as_the_plan_owner_never_as_account_id(factory, tmp_path):
+    now = utcnow()
+    with factory() as db:
+        db.add(User(id=3, username="mallory"))
+        db.add(PostPlan(id=2, account_id=2, owner_id=None, plan_date=datetime(2026, 1, 1)))  # unverified
+        db.commit()
+    session = factory()
+    service = PostPlanningService(PostPlanRepo(session), PlannedPostRepo(session), ai_client=None)
+    # mallory names bob's account: the plan is still hers.
+    plan = service.create_plan(PostPlanCreate(account_id=2, plan_date=datetime(2026, 1, 1)), owner_id=3)
+    add_posts(factory,
+              (1, {"id": 1, "plan_id": plan.id, "scheduled_time": now, "platform": "x"}),
+              (2, {"id": 2, "plan_id": 2, "scheduled_time": now, "platform": "x"}),
+              (3, {"id": 3, "scheduled_time": now}))
+    # nor can she schedule a post of bob's plan.
+    with pytest.raises(PlanNotFoundError):
+        service.update_post(1, 3, PlannedPostCreate(plan_id=1, content="hi", scheduled_time=now, platform="x"), 3)
+    session.close()
+
+    assert scheduler_for(factory, tmp_path).dispatch_due(now) == 1
+    assert jobs(factory) == [(1, 3, {"text": "post 1"})]
+    with factory() as db:
+        assert db.get(PlannedPost, 2).platform is None  # unscheduled, not published
@@ -0,0 +1,72 @@
+import pytest
+from fastapi import HTTPException
+
+from src.database.instrumentation import install_query_instrumentation, track_queries
+from src.database.models.user import User
+from src.services.auth_service import AuthService
+from src.services.principal_cache import PrincipalCache
+
+
+@pytest.fixture
+def session(engine, session_factory):
+    install_query_instrumentation(engine)
+    db = session_factory()
+    db.add(User(id=1, username="alice", hashed_password="x"))
+    db.commit()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def auth(monkeypatch):
+    monkeypatch.setattr(AuthService, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(AuthService, "ALGORITHM", "HS256")
+    return AuthService("test-secret", "HS256", principal_cache=PrincipalCache(), embed_principal=True)
+
+
+def test_cache_hit_skips_users_query(session, auth):
+    token = auth.create_user_token(session.get(User, 1))
+    session.expunge_all()
+    assert auth.get_current_user(token, session).username == "alice"
+
+    session.expunge_all()
+    with track_queries() as stats:
+        user = auth.get_current_user(token, session)
+    assert user.id == 1 and user.username == "alice"
+    assert stats.count == 0
+
+    # The attached instance is persistent in the request session.
+    user.username = "alicia"
+    session.commit()
+    assert session.query(User).filter_by(id=1).one().username == "alicia"
+
+
+def test_invalidate_picks_up_username_change(session, monkeypatch):
+    monkeypatch.setattr(AuthService, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(AuthService, "ALGORITHM", "HS256")
+    auth = AuthService("test-secret", "HS256", principal_cache=PrincipalCache())
+    token = auth.create_user_token(session.get(User, 1))
+    auth.get_current_user(token, session)
+
+    user = session.get(User, 1)
+    user.username = "bob"
+    session.commit()
+    auth.invalidate_user(1, "alice", "bob")
+    with pytest.raises(HTTPException) as exc:
+        auth.get_current_user(token, session)
+    assert exc.value.status_code == 401
+
+
+def test_bumped_token_version_revokes_old_tokens(session, auth):
+    user = session.get(User, 1)
+    old_token = auth.create_user_token(user)
+    auth.get_current_user(old_token, session)
+
+    user.token_version += 1
+    session.commit()
+    new_token = auth.create_user_token(user)
+    # The stale cached snapshot is re-checked against the database.
+    assert auth.get_current_user(new_token, session).id == 1
+    with pytest.raises(HTTPException) as exc:
+        auth.get_current_user(old_token, session)
+    assert exc.value.detail == "Token revoked"
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+from prometheus_client import generate_latest
+
+import src.utilities.metrics  # noqa: F401  (registers the memory collector)
+from src.utilities.process_memory import memory_usage, worker_memory
+
+
+def test_memory_usage_reports_shared_pages_once():
+    usage = memory_usage()
+    assert usage["rss"] > 0
+    if "pss" in usage:
+        assert usage["uss"] <= usage["pss"] <= usage["rss"]
+
+
+def test_worker_memory_lists_the_masters_children():
+    children = [subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"]) for _ in range(2)]
+    try:
+        workers = worker_memory(master_pid=os.getpid())
+        assert {w["pid"] for w in workers} >= {child.pid for child in children}
+        assert all(w["rss"] > 0 for w in workers)
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+    # without a master, the current process reports itself.
+    assert [w["pid"] for w in worker_memory()] == [os.getpid()]
+
+
+def test_memory_is_exported_to_prometheus():
+    assert f'quibble_process_memory_bytes{{kind="rss",pid="{os.getpid()}"}}'.encode() in generate_latest()
@@ -0,0 +1,224 @@
+import asyncio
+import os
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.testclient import TestClient
+
+from src.database.models.user import User
+from src.routers.publish_router import PublishRouter
+from src.services.auth_service import AuthService
+from src.services.publish_queue import PublishQueue, utcnow
+from src.services.publish_worker import PublishWorkerPool
+from src.services.publishers import PublishError, Published
+from src.utilities.rate_limit import RateLimitInfo, RateLimiterRegistry, TokenBucket
+
+
+@pytest.fixture
+def queue(tmp_path, session_factory):
+    with session_factory() as db:
+        db.add_all([User(id=1, username="alice"), User(id=2, username="bob")])
+        db.commit()
+    return PublishQueue(session_factory, str(tmp_path / "media"), max_attempts=3)
+
+
+class FakePublisher:
+    platform = "linkedin"
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.published = []
+
+    async def account_key(self, user_id):
+        return str(user_id)
+
+    async def publish(self, job):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        self.published.append(job.id)
+        return outcome if isinstance(outcome, Published) else Published(outcome)
+
+
+def pool_for(queue, publisher, limiter=None):
+    return PublishWorkerPool(queue, [publisher], limiter=limiter, backoff_base=10, backoff_max=60)
+
+
+def test_enqueue_is_idempotent_per_user_and_key(queue):
+    first, created = queue.enqueue(1, "x", {"text": "hi"}, idempotency_key="k1")
+    again, created_again = queue.enqueue(1, "x", {"text": "hi"}, idempotency_key="k1")
+    other, created_other = queue.enqueue(2, "x", {"text": "hi"}, idempotency_key="k1")
+    assert created and not created_again and created_other
+    assert again.id == first.id and other.id != first.id
+
+
+def test_claim_leases_a_job_to_one_worker(queue):
+    job, _ = queue.enqueue(1, "linkedin", {"text": "hi"})
+    assert [j.id for j in queue.claim("w1")] == [job.id]
+    assert queue.claim("w2") == []
+    # an expired lease (crashed worker) makes the job claimable again.
+    later = utcnow() + timedelta(seconds=301)
+    reclaimed = queue.claim("w2", now=later)
+    assert [j.id for j in reclaimed] == [job.id] and reclaimed[0].attempts == 2
+    assert not queue.complete(job.id, "w1", "urn:stale")
+
+
+def test_expired_lease_on_the_last_attempt_fails_the_job(queue, tmp_path):
+    media = tmp_path / "image.jpg"
+    media.write_bytes(b"\xff\xd8\xff")
+    job, _ = queue.enqueue(1, "linkedin", {"text": "hi"}, media_path=str(media))
+    now = utcnow()
+    for attempt in range(3):  # max_attempts=3; every worker dies holding the lease.
+        now += timedelta(seconds=301)
+        assert [j.id for j in queue.claim(f"w{attempt}", now=now)] == [job.id]
+    assert queue.claim("w3", now=now + timedelta(seconds=301)) == []
+    failed = queue.get(job.id)
+    assert failed.status == "failed" and failed.attempts == 3 and failed.lease_owner is None
+    assert not media.exists()
+
+
+def test_retryable_failure_backs_off_then_succeeds(queue):
+    job, _ = queue.enqueue(1, "linkedin", {"text": "hi"})
+    publisher = FakePublisher([PublishError("502", retryable=True), "urn:li:share:1"])
+    pool = pool_for(queue, publisher)
+
+    assert asyncio.run(pool.run_once("w1"))
+    failed = queue.get(job.id)
+    assert failed.status == "queued" and failed.attempts == 1 and failed.last_error == "502"
+    assert failed.next_attempt_at >= utcnow() + timedelta(seconds=4)
+    assert not asyncio.run(pool.run_once("w1"))  # not due yet
+
+    [claimed] = queue.claim("w1", now=failed.next_attempt_at)
+    asyncio.run(pool.process(claimed, "w1"))
+    done = queue.get(job.id)
+    assert done.status == "succeeded" and done.external_id == "urn:li:share:1" and done.attempts == 2
+
+
+def test_permanent_failure_marks_job_failed_and_removes_media(queue, tmp_path):
+    media = tmp_path / "image.jpg"
+    media.write_bytes(b"\xff\xd8\xff")
+    job, _ = queue.enqueue(1, "linkedin", {"text": "hi"}, media_path=str(media))
+    pool = pool_for(queue, FakePublisher([PublishError("Connect LinkedIn first", retryable=False)]))
+    asyncio.run(pool.run_once("w1"))
+    assert queue.get(job.id).status == "failed"
+    assert not media.exists()
+
+
+def test_rate_limit_headers_defer_without_spending_attempts(queue):
+    now = [1_000.0]
+    limiter = RateLimiterRegistry({"linkedin": (5, 0.001)}, clock=lambda: now[0])
+    limited = PublishError("429", retryable=True, rate_limit=RateLimitInfo.from_headers(
+        {"x-rate-limit-remaining": "0", "x-rate-limit-reset": "1600", "Retry-After": "120"}, now=now[0]
+    ))
+    first, _ = queue.enqueue(1, "linkedin", {"text": "a"})
+    second, _ = queue.enqueue(1, "linkedin", {"text": "b"})
+    pool = pool_for(queue, FakePublisher([limited]), limiter=limiter)
+
+    asyncio.run(pool.run_once("w1"))
+    retried = queue.get(first.id)
+    assert retried.status == "queued" and retried.next_attempt_at >= utcnow() + timedelta(seconds=115)
+
+    # the bucket now blocks the account until the reported reset; no attempt is spent.
+    asyncio.run(pool.run_once("w1"))
+    deferred = queue.get(second.id)
+    assert deferred.status == "queued" and deferred.attempts == 0
+    assert deferred.next_attempt_at >= utcnow() + timedelta(seconds=500)
+
+
+def test_rate_limit_headers_of_a_success_sync_the_bucket(queue):
+    now = [1_000.0]
+    limiter = RateLimiterRegistry({"linkedin": (5, 0.001)}, clock=lambda: now[0])
+    exhausted = Published("urn:li:share:1", RateLimitInfo.from_headers(
+        {"x-rate-limit-remaining": "0", "x-rate-limit-reset": "1600"}, now=now[0]
+    ))
+    first, _ = queue.enqueue(1, "linkedin", {"text": "a"})
+    second, _ = queue.enqueue(1, "linkedin", {"text": "b"})
+    pool = pool_for(queue, FakePublisher([exhausted]), limiter=limiter)
+
+    asyncio.run(pool.run_once("w1"))
+    assert queue.get(first.id).status == "succeeded"
+    # the last call of the window was spent: the next job waits for the reset.
+    asyncio.run(pool.run_once("w1"))
+    deferred = queue.get(second.id)
+    assert deferred.status == "queued" and deferred.attempts == 0
+    assert deferred.next_attempt_at >= utcnow() + timedelta(seconds=500)
+
+
+class SlowPublisher(FakePublisher):
+    def __init__(self, outcomes, meanwhile):
+        super().__init__(outcomes)
+        self.meanwhile = meanwhile
+
+    async def publish(self, job):
+        await self.meanwhile()
+        return await super().publish(job)
+
+
+def test_lease_is_renewed_while_a_slow_publish_runs(queue):
+    job, _ = queue.enqueue(1, "linkedin", {"text": "hi"})
+    stolen = []
+
+    async def slow():
+        await asyncio.sleep(0.45)  # outlives the 0.3s lease it was claimed with
+        stolen.extend(await run_in_threadpool(queue.claim, "w2"))
+
+    pool = PublishWorkerPool(queue, [SlowPublisher(["urn:li:share:1"], slow)], lease_seconds=0.3)
+    asyncio.run(pool.run_once("w1"))
+    assert stolen == []
+    assert queue.get(job.id).status == "succeeded"
+
+
+def test_publish_after_a_lost_lease_leaves_the_job_to_its_new_worker(queue, tmp_path):
+    media = tmp_path / "image.jpg"
+    media.write_bytes(b"\xff\xd8\xff")
+    job, _ = queue.enqueue(1, "linkedin", {"text": "hi"}, media_path=str(media))
+
+    async def stalled():
+        # the worker stalled past its lease and another one took the job over.
+        assert queue.claim("w2", now=utcnow() + timedelta(seconds=301))
+
+    asyncio.run(pool_for(queue, SlowPublisher(["urn:li:share:1"], stalled)).run_once("w1"))
+    taken = queue.get(job.id)
+    assert taken.status == "running" and taken.lease_owner == "w2" and taken.external_id is None
+    assert media.exists()  # the new worker's attempt still needs it
+
+
+def test_token_bucket_refills_and_follows_headers():
+    now = [0.0]
+    bucket = TokenBucket(capacity=2, rate=1.0, clock=lambda: now[0])
+    assert bucket.reserve() == 0 and bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(1.0)
+    now[0] = 1.5
+    assert bucket.reserve() == 0
+    bucket.observe(remaining=0, reset_at=10.0)
+    assert bucket.reserve() == pytest.approx(8.5)
+
+
+def test_publish_endpoints_queue_and_report_status(queue):
+    auth = AuthService("test-secret", "HS256")
+    router = PublishRouter(auth, queue, ["linkedin"])  # X is disabled
+    app = FastAPI()
+    app.include_router(router.router)
+    current = {"user": User(id=1, username="alice")}
+    app.dependency_overrides[auth.get_current_user] = lambda: current["user"]
+    client = TestClient(app)
+
+    image = ("a.png", b"\x89PNG\r\n\x1a\n" + b"0" * 32, "image/png")
+    first = client.post("/publish/linkedin", data={"text": "hello"}, files={"image": image},
+                        headers={"Idempotency-Key": "abc"})
+    again = client.post("/publish/linkedin", data={"text": "hello"}, files={"image": image},
+                        headers={"Idempotency-Key": "abc"})
+    assert first.status_code == 202 and first.json()["status"] == "queued"
+    assert again.json()["id"] == first.json()["id"]
+    assert len(os.listdir(queue.media_dir)) == 1  # the duplicate's copy was dropped
+
+    assert client.post("/publish/mastodon", data={"text": "x"}).status_code == 422
+    disabled = client.post("/publish/x", data={"text": "x"}, files={"image": image})
+    assert disabled.status_code == 404 and len(os.listdir(queue.media_dir)) == 1
+
+    job_id = first.json()["id"]
+    assert client.get(f"/publish/jobs/{job_id}").json()["platform"] == "linkedin"
+    current["user"] = User(id=2, username="bob")
+    assert client.get(f"/publish/jobs/{job_id}").status_code == 404
@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.database.instrumentation import (
+    QueryBudgetExceeded,
+    RouteQueryAggregates,
+    install_query_instrumentation,
+    track_queries,
+)
+from src.database.models.post import Post
+from src.database.models.user import User
+from src.middleware.query_stats import QueryStatsMiddleware
+from src.repositories.post_plan_repo import PostPlanRepo
+from src.schemas.planning import PostPlanCreate
+from src.services.user_service import UserService
+
+
+@pytest.fixture
+def engine(engine):
+    install_query_instrumentation(engine)
+    return engine
+
+
+@pytest.fixture
+def session(session_factory):
+    db = session_factory()
+    for uid in range(1, 7):
+        db.add(User(id=uid, username=f"user{uid}", hashed_password="x"))
+        db.add(Post(title="t", content="c", owner_id=uid))
+    db.commit()
+    yield db
+    db.close()
+
+
+def test_counts_statements_only_while_tracking(session):
+    session.execute(text("SELECT 1"))
+    with track_queries() as stats:
+        session.execute(text("SELECT 1"))
+        session.execute(text("SELECT 2"))
+    assert stats.count == 2
+    assert stats.total_time > 0
+
+
+def test_lazy_loading_in_a_loop_is_reported_as_n_plus_one(session):
+    users = session.query(User).all()
+    with track_queries() as stats:
+        for user in users:
+            _ = user.posts
+    with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+        stats.assert_within(max_statements=50, n_plus_one_threshold=5)
+
+
+def test_get_user_posts_is_a_single_query(session):
+    user = session.get(User, 1)
+    with track_queries() as stats:
+        posts = UserService(session).get_user_posts(user)
+    assert len(posts) == 1
+    stats.assert_within(max_statements=1)
+
+
+def test_repo_create_does_not_refresh(session):
+    repo = PostPlanRepo(session)
+    with track_queries() as stats:
+        plan = repo.create(PostPlanCreate(account_id=1, plan_date=datetime(2025, 1, 1)))
+        assert plan.id is not None
+        assert plan.status == "draft"
+    assert [p.split()[0] for p in stats.patterns] == ["INSERT"]
+
+
+def test_middleware_headers_and_aggregates(engine):
+    SessionTest = sessionmaker(bind=engine)
+
+    def get_session():
+        db = SessionTest()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int, db: Session = Depends(get_session)):
+        for _ in range(3):
+            db.execute(text("SELECT id FROM users WHERE id = :id"), {"id": item_id})
+        return {"ok": True}
+
+    aggregates = RouteQueryAggregates(budget=2, n_plus_one_threshold=3)
+    app.add_middleware(QueryStatsMiddleware, aggregates=aggregates, expose_headers=True)
+    resp = TestClient(app).get("/items/1")
+
+    assert resp.headers["x-db-queries"] == "3"
+    route = aggregates.snapshot()["/items/{item_id}"]
+    assert route["requests"] == 1
+    assert route["over_budget"] == 1
+    assert route["n_plus_one"] == 1
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from src.database.schema import ensure_schema
+from src.database.search_index import ensure_search_index
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    # The schema as it was before the new tables and columns were introduced.
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR UNIQUE, "
+            "hashed_password VARCHAR)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE posts (id INTEGER PRIMARY KEY, title VARCHAR, content VARCHAR, "
+            "image_url VARCHAR, owner_id INTEGER REFERENCES users(id))"
+        ))
+        conn.execute(text(
+            "CREATE TABLE post_plans (id INTEGER PRIMARY KEY, account_id INTEGER, "
+            "plan_date DATETIME, status VARCHAR(9))"
+        ))
+        conn.execute(text(
+            "CREATE TABLE planned_posts (id INTEGER PRIMARY KEY, "
+            "plan_id INTEGER REFERENCES post_plans(id), content TEXT, "
+            "scheduled_time DATETIME, ai_suggested BOOLEAN)"
+        ))
+        conn.execute(text("INSERT INTO users (id, username, hashed_password) VALUES (1, 'ann', 'x')"))
+        conn.execute(text("INSERT INTO posts (id, title, content, owner_id) VALUES (1, 'Hello', 'World', 1)"))
+    return engine
+
+
+def test_upgrades_legacy_database(legacy_engine):
+    changes = ensure_schema(legacy_engine)
+
+    inspector = inspect(legacy_engine)
+    tables = set(inspector.get_table_names())
+    for table in ("linkedin_assets", "linkedin_tokens", "publish_jobs", "x_credentials",
+                  "stored_uploads", "artifact_files"):
+        assert table in tables and table in changes
+    assert {"category", "likes", "created_at"} <= {c["name"] for c in inspector.get_columns("posts")}
+    assert "token_version" in {c["name"] for c in inspector.get_columns("users")}
+    assert {"platform", "queued_at", "dispatch_lease_until"} <= {
+        c["name"] for c in inspector.get_columns("planned_posts")
+    }
+    assert "ix_posts_category_likes_id" in {i["name"] for i in inspector.get_indexes("posts")}
+    assert "ix_planned_posts_due" in {i["name"] for i in inspector.get_indexes("planned_posts")}
+
+    with legacy_engine.connect() as conn:
+        likes, created_at = conn.execute(text("SELECT likes, created_at FROM posts WHERE id = 1")).one()
+        assert likes == 0 and created_at is not None
+        assert conn.execute(text("SELECT token_version FROM users WHERE id = 1")).scalar() == 0
+
+    # The full-text index builds on the upgraded tables; a second run is a no-op.
+    ensure_search_index(legacy_engine)
+    assert ensure_schema(legacy_engine) == []
+
+
+def test_creates_everything_on_empty_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+    ensure_schema(engine)
+    assert {"users", "posts", "publish_jobs"} <= set(inspect(engine).get_table_names())
+    assert ensure_schema(engine) == []
@@ -0,0 +1,98 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from src.database.db_config import get_db
+from src.database.models.post import Post
+from src.database.models.post_planning import PlannedPost, PostPlan
+from src.database.search_index import ensure_search_index
+from src.routers.search_router import SearchRouter
+from src.services.search_service import SearchService
+
+
+@pytest.fixture
+def session(session_factory):
+    db = session_factory()
+    db.add_all([
+        Post(id=1, title="Scaling FastAPI", content="Workers, pools and caching"),
+        Post(id=2, title="Weekly update", content="We talked about fastapi and caching"),
+        Post(id=3, title="Gardening", content="Tomatoes need sun"),
+    ])
+    db.add(PostPlan(id=1, account_id=1, plan_date=datetime(2025, 1, 1)))
+    db.add(PlannedPost(id=1, plan_id=1, content="Draft about caching strategies"))
+    db.commit()
+    yield db
+    db.close()
+
+
+def test_ranked_and_highlighted(session):
+    hits, cursor = SearchService(session).search("fastapi")
+    assert [h["id"] for h in hits] == [1, 2]  # title match outranks body match
+    assert hits[0]["title"] == "Scaling <mark>FastAPI</mark>"
+    assert "<mark>fastapi</mark>" in hits[1]["snippet"]
+    assert cursor is None
+
+
+def test_index_follows_writes(session):
+    service = SearchService(session)
+    post = session.get(Post, 3)
+    post.content = "Tomatoes and fastapi"
+    session.commit()
+    assert 3 in [h["id"] for h in service.search("fastapi")[0]]
+
+    session.delete(session.get(Post, 1))
+    session.commit()
+    assert 1 not in [h["id"] for h in service.search("fastapi")[0]]
+    assert service.search("tomatoes")[0][0]["id"] == 3
+
+
+def test_keyset_pagination(session):
+    service = SearchService(session)
+    first, cursor = service.search("caching", limit=1)
+    second, end = service.search("caching", limit=1, cursor=cursor)
+    assert first[0]["id"] != second[0]["id"]
+    assert end is None
+    with pytest.raises(ValueError):
+        service.search("other", limit=1, cursor=cursor)
+
+
+def test_planned_posts_scope_and_prefix_match(session):
+    hits, _ = SearchService(session).search("strat", scope="planned_posts")
+    assert [h["id"] for h in hits] == [1]
+    assert hits[0]["title"] is None
+
+
+def test_operators_in_user_input_are_literal(session):
+    assert SearchService(session).search('fastapi" OR "NEAR(')[0] == []
+
+
+def test_highlights_escape_the_post_text(session):
+    session.add(Post(id=4, title="<script>alert(1)</script> xss",
+                     content='<img src=x onerror="alert(1)"> about xss & more'))
+    session.commit()
+    [hit], _ = SearchService(session).search("xss")
+    assert hit["title"] == "&lt;script&gt;alert(1)&lt;/script&gt; <mark>xss</mark>"
+    assert "&lt;img src=x onerror=&quot;alert(1)&quot;&gt;" in hit["snippet"]
+    assert "<mark>xss</mark> &amp; more" in hit["snippet"]
+    assert "<img" not in hit["snippet"]
+
+
+def test_ensure_search_index_backfills_existing_tables(engine, session):
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE posts_fts"))
+    ensure_search_index(engine)
+    assert [h["id"] for h in SearchService(session).search("tomatoes")[0]] == [3]
+
+
+def test_search_endpoint(session):
+    app = FastAPI()
+    app.include_router(SearchRouter().router)
+    app.dependency_overrides[get_db] = lambda: session
+    client = TestClient(app)
+    resp = client.get("/search/", params={"q": "caching", "limit": 1})
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["next_cursor"]
+    assert client.get("/search/", params={"q": "x", "scope": "users"}).status_code == 400
@@ -0,0 +1,133 @@
+import asyncio
+import io
+import os
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.database.db_config import get_db
+from src.database.models.post import Post
+from src.database.models.stored_upload import StoredUpload
+from src.database.models.user import User
+from src.routers.post_router import PostRouter
+from src.routers.upload_router import IMMUTABLE, UploadRouter
+from src.services.auth_service import AuthService
+from src.utilities.upload_store import UploadStore
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x01" * 200_000
+JPEG = b"\xff\xd8\xff" + b"\x02" * 1000
+
+
+@pytest.fixture
+def store(tmp_path, session_factory):
+    return UploadStore(str(tmp_path / "uploads"), session_factory, max_bytes=300_000, chunk_size=16 * 1024)
+
+
+def stored_files(store):
+    return sorted(p.name for p in Path(store.root).rglob("*") if p.is_file())
+
+
+def test_identical_uploads_are_stored_once_under_their_hash(store):
+    first = store.put(io.BytesIO(PNG))
+    again = store.put(io.BytesIO(PNG))
+    other = store.put(io.BytesIO(JPEG))
+    assert first == again and first.endswith(".png") and other.endswith(".jpg")
+    assert stored_files(store) == sorted([first.rsplit("/", 1)[1], other.rsplit("/", 1)[1]])
+
+
+def test_oversized_and_non_image_uploads_leave_nothing_behind(store):
+    with pytest.raises(HTTPException) as too_large:
+        store.put(io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"0" * 400_000))
+    with pytest.raises(HTTPException) as not_image:
+        store.put(io.BytesIO(b"%PDF-1.7 " * 10))
+    assert (too_large.value.status_code, not_image.value.status_code) == (413, 415)
+    assert stored_files(store) == []
+
+
+def test_references_follow_posts_and_orphans_are_collected(store, session_factory):
+    with session_factory() as db:
+        db.add_all([User(id=1, username="alice"), Post(id=1, title="t", content="c", owner_id=1),
+                    Post(id=2, title="t", content="c", owner_id=1)])
+        db.commit()
+    auth = AuthService("test-secret", "HS256")
+    app = FastAPI()
+    app.include_router(PostRouter(auth, uploads=store).router, prefix="/posts")
+    app.include_router(UploadRouter(store).router)
+    app.dependency_overrides[auth.get_current_user] = lambda: User(id=1, username="alice")
+
+    def override_db():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+
+    png_url = client.post("/posts/1/image", files={"image": ("a.png", PNG, "image/png")}).json()["image_url"]
+    assert client.post("/posts/2/image", files={"image": ("b.png", PNG, "image/png")}).json()["image_url"] == png_url
+    served = client.get(png_url)
+    assert served.content == PNG and served.headers["cache-control"] == IMMUTABLE
+    assert client.get(png_url, headers={"If-None-Match": served.headers["etag"]}).status_code == 304
+
+    def row():
+        with session_factory() as db:
+            return db.get(StoredUpload, store.digest_of(png_url))
+
+    assert row().ref_count == 2
+    client.post("/posts/1/image", files={"image": ("c.jpg", JPEG, "image/jpeg")})
+    assert row().ref_count == 1 and row().orphaned_at is None
+    client.delete("/posts/2")
+    assert row().ref_count == 0 and row().orphaned_at is not None
+
+    assert store.collect_garbage(grace=3600) == 0  # still within the grace period
+    assert store.collect_garbage(grace=0, now=row().orphaned_at + 1) == 1
+    assert client.get(png_url).status_code == 404
+    assert len(stored_files(store)) == 1  # the JPEG post 1 still uses
+
+
+def test_renditions_are_rendered_once_cached_within_budget_and_ranged(store, tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    from src.utilities import renditions as rendering
+    from src.utilities.media_preprocessor import MediaPreprocessor
+    from src.utilities.renditions import RenditionCache
+
+    calls = []
+    render = rendering._render
+
+    def counting(source, width, fmt):
+        calls.append((width, fmt))
+        return render(source, width, fmt)
+
+    monkeypatch.setattr(rendering, "_render", counting)
+    out = io.BytesIO()
+    Image.new("RGB", (1200, 800), (10, 120, 200)).save(out, format="PNG")
+    url = store.put(io.BytesIO(out.getvalue()))
+    pool = MediaPreprocessor(str(tmp_path / "media"), executor="thread")
+    # a tiny budget: each new rendition evicts the least recently served one.
+    cache = RenditionCache(store, str(tmp_path / "renditions"), pool, max_bytes=1, widths=(160, 320))
+    app = FastAPI()
+    app.include_router(UploadRouter(store, renditions=cache).router)
+    client = TestClient(app)
+
+    small = client.get(f"{url}/w320.webp")
+    assert small.status_code == 200 and small.headers["content-type"] == "image/webp"
+    assert small.headers["cache-control"] == IMMUTABLE
+    assert Image.open(io.BytesIO(small.content)).size == (320, 213)
+    assert client.get(f"{url}/w320.webp", headers={"If-None-Match": small.headers["etag"]}).status_code == 304
+    partial = client.get(f"{url}/w320.webp", headers={"Range": "bytes=0-9"})
+    assert partial.status_code == 206 and partial.content == small.content[:10]
+    assert calls == [(320, "webp")]
+
+    assert client.get(f"{url}/w999.webp").status_code == 404  # width not offered
+    assert client.get(f"{url}/w320.gif").status_code == 404
+
+    # concurrent requests for one rendition share a render.
+    async def burst():
+        return await asyncio.gather(*(cache.get(url.rsplit("/", 1)[1], 160, "png") for _ in range(5)))
+
+    assert len(set(asyncio.run(burst()))) == 1
+    assert calls.count((160, "png")) == 1
+    assert cache.stats()["entries"] == 1
+    assert not os.path.exists(cache.path_for(url.rsplit("/", 1)[1], 320, "webp"))
+    assert client.get(f"{url}/w320.webp").content == small.content  # rendered again on demand
@@ -0,0 +1,72 @@
+import asyncio
+import io
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from src.oauth.linkedin_oauth import LinkedInToken
+from src.services.linkedin_service import LinkedInApiService
+from src.utilities.upload_stream import ImageStream, sniff_image_type
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 300_000
+
+
+def upload(data: bytes, filename: str = "photo.jpg") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+def test_sniffs_type_from_content_not_filename():
+    assert sniff_image_type(b"\xff\xd8\xff\xe0") == "image/jpeg"
+    assert sniff_image_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+    assert sniff_image_type(b"%PDF-1.7") is None
+
+    stream = asyncio.run(ImageStream.from_upload(upload(PNG), max_bytes=len(PNG)))
+    assert (stream.content_type, stream.size, stream.filename) == ("image/png", len(PNG), "photo.png")
+
+
+def test_rejects_oversized_and_non_image_uploads():
+    with pytest.raises(HTTPException) as too_large:
+        asyncio.run(ImageStream.from_upload(upload(PNG), max_bytes=1024))
+    assert too_large.value.status_code == 413
+    with pytest.raises(HTTPException) as not_image:
+        asyncio.run(ImageStream.from_upload(upload(b"<svg></svg>"), max_bytes=1024))
+    assert not_image.value.status_code == 415
+
+
+def test_chunks_are_bounded():
+    async def collect():
+        stream = await ImageStream.from_upload(upload(PNG), max_bytes=len(PNG), chunk_size=64 * 1024)
+        return [len(chunk) async for chunk in stream.chunks()]
+
+    sizes = asyncio.run(collect())
+    assert len(sizes) == 5 and max(sizes) == 64 * 1024 and sum(sizes) == len(PNG)
+
+
+def test_linkedin_upload_streams_the_image():
+    received = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/rest/assets":
+            return httpx.Response(200, json={"value": {
+                "asset": "urn:li:digitalmediaAsset:1",
+                "uploadMechanism": {"com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {
+                    "uploadUrl": "https://uploads.linkedin.test/1"}},
+            }})
+        if request.method == "PUT":
+            received.update(body=await request.aread(), headers=request.headers)
+            return httpx.Response(201)
+        return httpx.Response(201, headers={"x-linkedin-id": "urn:li:share:1"})
+
+    token = LinkedInToken(access_token="a", expires_at=time.time() + 3600, owner_urn="urn:li:person:1")
+
+    async def run():
+        stream = await ImageStream.from_upload(upload(PNG), max_bytes=len(PNG), chunk_size=64 * 1024)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await LinkedInApiService(token, client=client).post_with_image("hi", stream)
+
+    assert asyncio.run(run()) == "urn:li:share:1"
+    assert received["body"] == PNG
+    assert received["headers"]["content-type"] == "image/png"
+    assert received["headers"]["content-length"] == str(len(PNG))
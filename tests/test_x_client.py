@@ -0,0 +1,127 @@
+import asyncio
+import io
+
+import httpx
+import pytest
+from cryptography.fernet import Fernet
+from prometheus_client import REGISTRY
+
+from src.database.models.user import User
+from src.oauth.x_oauth import XCredentials
+from src.services.publishers import PublishError, XPublisher
+from src.services.x_client_pool import DEFAULT_ACCOUNT, XClientPool, XNotConfigured
+from src.utilities.token_cipher import TokenCipher
+from src.utilities.upload_stream import ImageStream
+from src.utilities.x_credential_store import XCredentialStore
+
+
+@pytest.fixture
+def store(session_factory):
+    with session_factory() as db:
+        db.add_all([User(id=1, username="alice"), User(id=2, username="bob")])
+        db.commit()
+    return XCredentialStore(session_factory, TokenCipher([Fernet.generate_key().decode()]))
+
+
+def x_stub(seen, tweet_status=201):
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.host, request.url.path, request.headers["authorization"]))
+        if request.url.host == "upload.twitter.com":
+            assert b'name="media"' in request.read()
+            return httpx.Response(200, json={"media_id_string": "m1"})
+        if tweet_status == 429:
+            return httpx.Response(429, headers={"x-rate-limit-remaining": "0", "x-rate-limit-reset": "2000000000"})
+        return httpx.Response(tweet_status, json={"data": {"id": "t1", "text": "hi"}})
+    return handler
+
+
+def observations(phase):
+    return REGISTRY.get_sample_value(
+        "quibble_outbound_phase_seconds_count", {"service": "x", "phase": phase}
+    ) or 0
+
+
+def test_pooled_clients_post_as_their_own_account(store):
+    store.save(1, XCredentials(access_token="alice-token", access_token_secret="s1"))
+    seen = []
+    before = {phase: observations(phase) for phase in ("media_upload", "create_tweet")}
+    image = ImageStream(io.BytesIO(b"\xff\xd8\xff0000"), "image/jpeg", 7, "photo.jpg", 1024)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(x_stub(seen))) as client:
+            pool = XClientPool(store, "ck", "cs", client=client)
+            service = await pool.get(1)
+            assert await pool.get(1) is service  # reused, no second lookup
+            assert await pool.get(2) is None  # bob has no account and there is no fallback
+            return await service.post_tweet_with_image("hi", image)
+
+    assert asyncio.run(run())["id"] == "t1"
+    assert [path for _, path, _ in seen] == ["/1.1/media/upload.json", "/2/tweets"]
+    assert all('oauth_token="alice-token"' in auth and "oauth_signature=" in auth for _, _, auth in seen)
+    assert observations("media_upload") - before["media_upload"] == 1
+    assert observations("create_tweet") - before["create_tweet"] == 1
+
+
+def test_pool_is_bounded_and_falls_back_to_the_default_account(store):
+    fallback = XCredentials(access_token="app-token", access_token_secret="s")
+    pool = XClientPool(store, "ck", "cs", default_credentials=fallback, max_clients=1)
+
+    async def run():
+        first = await pool.get(1)
+        await pool.get(2)  # evicts user 1
+        store.save(1, XCredentials(access_token="alice-token", access_token_secret="s1"))
+        again = await pool.get(1)
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert first.credentials.access_token == "app-token"
+    assert again.credentials.access_token == "alice-token"
+    assert pool.stats()["entries"] == 1
+
+    with pytest.raises(XNotConfigured):
+        asyncio.run(XClientPool(store, None, None).get(1))
+
+
+def test_users_on_the_default_account_share_its_rate_limit_key(store):
+    store.save(1, XCredentials(access_token="alice-token", access_token_secret="s1"))
+    fallback = XCredentials(access_token="app-token", access_token_secret="s")
+    publisher = XPublisher(XClientPool(store, "ck", "cs", default_credentials=fallback))
+
+    async def run():
+        return [await publisher.account_key(user_id) for user_id in (1, 2, 3)]
+
+    assert asyncio.run(run()) == ["1", DEFAULT_ACCOUNT, DEFAULT_ACCOUNT]
+
+
+def test_publisher_reports_rate_limits_as_retryable(store):
+    store.save(1, XCredentials(access_token="t", access_token_secret="s"))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(x_stub([], tweet_status=429))) as client:
+            publisher = XPublisher(XClientPool(store, "ck", "cs", client=client))
+            with pytest.raises(PublishError) as limited:
+                await publisher.publish_content(1, "hi")
+            with pytest.raises(PublishError) as unconnected:
+                await publisher.publish_content(2, "hi")
+            return limited.value, unconnected.value
+
+    limited, unconnected = asyncio.run(run())
+    assert limited.retryable and limited.rate_limit.remaining == 0
+    assert limited.rate_limit.reset_at == 2000000000
+    assert not unconnected.retryable and str(unconnected) == "Connect X first"
+
+
+def test_publisher_returns_the_quota_reported_with_a_tweet(store):
+    store.save(1, XCredentials(access_token="t", access_token_secret="s"))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(201, json={"data": {"id": "t1"}},
+                              headers={"x-rate-limit-remaining": "7", "x-rate-limit-reset": "2000000000"})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await XPublisher(XClientPool(store, "ck", "cs", client=client)).publish_content(1, "hi")
+
+    published = asyncio.run(run())
+    assert published.external_id == "t1"
+    assert published.rate_limit.remaining == 7 and published.rate_limit.reset_at == 2000000000
@@ -0,0 +1,122 @@
+import asyncio
+import io
+import re
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from src.oauth.x_oauth import XCredentials
+from src.services.x_service import MediaUploadInterrupted, XApiService
+from src.utilities.upload_stream import ImageStream, sniff_media_type
+
+SEGMENT = 1024
+VIDEO = b"\x00\x00\x00\x18ftypmp42" + bytes(range(256)) * 40  # ~10 KiB, 11 segments
+
+
+class FakeUploadServer:
+    """Stand-in for X's chunked media upload endpoint (and the tweet endpoint)."""
+
+    def __init__(self, fail_segments=(), processing_polls=0):
+        self.fail_segments = dict.fromkeys(fail_segments, 1)  # segment -> failures left
+        self.processing_polls = processing_polls
+        self.segments = {}
+        self.append_calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.status_calls = 0
+        self.finalized = False
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/2/tweets":
+            return httpx.Response(201, json={"data": {"id": "t1"}})
+        if request.method == "GET":
+            self.status_calls += 1
+            return httpx.Response(200, json={"media_id_string": "m1", "processing_info": self._processing()})
+        body = await request.aread()
+        if b"segment_index" in body:
+            return await self._append(body)
+        form = {k: v[0] for k, v in parse_qs(body.decode()).items()}
+        if form["command"] == "INIT":
+            return httpx.Response(202, json={"media_id_string": "m1", "expires_after_secs": 3600})
+        self.finalized = True
+        return httpx.Response(201, json={"media_id_string": "m1", "processing_info": self._processing()})
+
+    def _processing(self):
+        if self.status_calls < self.processing_polls:
+            return {"state": "in_progress", "check_after_secs": 0}
+        return {"state": "succeeded"}
+
+    async def _append(self, body: bytes) -> httpx.Response:
+        index = int(re.search(rb'name="segment_index"\r\n\r\n(\d+)', body).group(1))
+        self.append_calls.append(index)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        if self.fail_segments.get(index):
+            self.fail_segments[index] -= 1
+            return httpx.Response(503, text="over capacity")
+        data = body.split(b"application/octet-stream\r\n\r\n", 1)[1]
+        self.segments[index] = data[:data.rindex(b"\r\n--")]
+        return httpx.Response(204)
+
+    def assembled(self) -> bytes:
+        return b"".join(self.segments[i] for i in sorted(self.segments))
+
+
+def video_stream():
+    assert sniff_media_type(VIDEO[:16]) == "video/mp4"
+    return ImageStream(io.BytesIO(VIDEO), "video/mp4", len(VIDEO), "clip.mp4", 1024)
+
+
+def run_upload(server, resume=None, parallel=4):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+            service = XApiService("ck", "cs", XCredentials(access_token="t", access_token_secret="s"), client=client,
+                                  segment_size=SEGMENT, parallel_segments=parallel)
+            return await service.post_tweet_with_image("clip", video_stream(), resume)
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(XApiService, "RETRY_BACKOFF", 0.0)
+
+
+def test_segments_are_appended_in_parallel_and_reassemble():
+    server = FakeUploadServer()
+    assert run_upload(server)["id"] == "t1"
+    assert server.assembled() == VIDEO and len(server.segments) == 11
+    assert 1 < server.max_in_flight <= 4
+    assert server.finalized
+
+
+def test_transient_segment_failures_are_retried():
+    server = FakeUploadServer(fail_segments=[3, 7])
+    run_upload(server)
+    assert server.append_calls.count(3) == 2 and server.append_calls.count(7) == 2
+    assert server.assembled() == VIDEO
+
+
+def test_interrupted_upload_resumes_without_resending_segments(monkeypatch):
+    monkeypatch.setattr(XApiService, "APPEND_ATTEMPTS", 1)
+    server = FakeUploadServer(fail_segments=[5])
+    with pytest.raises(MediaUploadInterrupted) as interrupted:
+        run_upload(server, parallel=1)
+    upload = interrupted.value.upload
+    assert interrupted.value.retryable and upload.resumable
+    assert upload.pending() == list(range(5, 11))
+
+    server.append_calls.clear()
+    run_upload(server, resume=upload, parallel=1)
+    assert server.append_calls == list(range(5, 11))
+    assert server.assembled() == VIDEO
+
+
+def test_processing_status_is_polled_until_done():
+    server = FakeUploadServer(processing_polls=3)
+    assert run_upload(server)["id"] == "t1"
+    assert server.status_calls == 3